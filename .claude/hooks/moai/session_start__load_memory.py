@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+SessionStart Hook: Load Memory and Context Hints
+
+Restores cross-session context when a session starts:
+- Last session state from the binary snapshot written by
+  SwarmDB.persist_session_state (memory-mapped, no database access)
+- User preferences (ContextHints entries in SwarmDB session memory)
+- Recent episodes (EpisodicMemory events in SwarmDB, last 24 hours)
+- Relevant semantic knowledge
+- Suggested next actions
+
+Writes .moai/memory/session-context.json and prints a hook response
+({"continue": true, "systemMessage": ...}). Every step degrades
+gracefully: missing memory, import errors or the 2 second budget being
+exceeded never block the session.
+"""
+
+import json
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# src/ of this repository, so moai_flow imports without installation
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "src"))
+
+HOOK_TIMEOUT_SECONDS = 2.0
+RECENT_EPISODE_HOURS = 24
+MAX_EPISODES = 20
+MAX_KNOWLEDGE = 10
+
+
+# ============================================================================
+# Memory Loading
+# ============================================================================
+
+def load_last_session(memory_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the session snapshot persisted at the end of the last session"""
+    try:
+        from moai_flow.memory.session_snapshot import load_session_state
+    except ImportError:
+        return None
+    return load_session_state(memory_dir / "moai-flow" / "session-state.snap")
+
+
+def load_context_hints(db, session_id: str) -> Dict[str, Any]:
+    """Load user preferences, session-specific values overriding global ones"""
+    preferences = dict(db.get_memory("global", "context_hint", "user_preferences") or {})
+    preferences.update(db.get_memory(session_id, "context_hint", "user_preferences") or {})
+    return preferences
+
+
+def load_recent_episodes(db, hours: int = RECENT_EPISODE_HOURS) -> List[Dict[str, Any]]:
+    """Load agent events from the last hours, newest first"""
+    since = datetime.now() - timedelta(hours=hours)
+    return [
+        {
+            "event_type": event["event_type"],
+            "agent_id": event["agent_id"],
+            "agent_type": event["agent_type"],
+            "timestamp": event["timestamp"],
+            "metadata": event["metadata"],
+        }
+        for event in db.get_events(since=since, limit=MAX_EPISODES)
+    ]
+
+
+def load_semantic_knowledge(db, limit: int = MAX_KNOWLEDGE) -> List[Dict[str, Any]]:
+    """Load global semantic memory entries, most recently stored first"""
+    rows = db._get_read_connection().execute(
+        """
+        SELECT key, value FROM session_memory
+        WHERE session_id = 'global' AND memory_type = 'semantic'
+        AND (expires_at IS NULL OR expires_at > strftime('%s', 'now'))
+        ORDER BY timestamp_ms DESC
+        LIMIT ?
+        """,
+        (limit,)
+    ).fetchall()
+    return [{"topic": row[0], "data": json.loads(row[1])} for row in rows]
+
+
+def load_project_state(memory_dir: Path) -> Dict[str, Any]:
+    """Load branch/SPEC state recorded at the end of the last session"""
+    state_file = memory_dir / "last-session-state.json"
+    try:
+        return json.loads(state_file.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def suggest_next_actions(
+    last_state: Dict[str, Any],
+    episodes: List[Dict[str, Any]]
+) -> List[str]:
+    """Suggest what to do next from the last session's state"""
+    suggestions = []
+
+    if last_state.get("uncommitted_changes"):
+        files = last_state.get("uncommitted_files")
+        detail = f" ({files} files)" if files else ""
+        suggestions.append(f"Review uncommitted changes{detail} from the last session")
+
+    for spec_id in last_state.get("specs_in_progress", []):
+        suggestions.append(f"Continue implementation of {spec_id}")
+
+    failed = [e for e in episodes if e.get("event_type") == "error"]
+    if failed:
+        suggestions.append(f"Investigate {len(failed)} agent error(s) from recent sessions")
+
+    return suggestions
+
+
+# ============================================================================
+# Hook Entry Point
+# ============================================================================
+
+def build_context(project_root: Path, session_id: str) -> Dict[str, Any]:
+    """Collect all context; missing sources are left empty"""
+    memory_dir = project_root / ".moai" / "memory"
+    context: Dict[str, Any] = {
+        "user_preferences": {},
+        "recent_episodes": [],
+        "relevant_knowledge": [],
+        "suggested_next_actions": [],
+        "last_session": None,
+    }
+
+    snapshot = load_last_session(memory_dir)
+    if snapshot:
+        context["last_session"] = {
+            "session_id": snapshot["session_id"],
+            "timestamp": snapshot["timestamp"],
+            "active_agents": snapshot["active_agents"],
+        }
+        context["recent_episodes"] = snapshot["recent_events"][:MAX_EPISODES]
+
+    db_path = memory_dir / "swarm.db"
+    if db_path.exists():
+        from moai_flow.memory.swarm_db import SwarmDB
+
+        db = SwarmDB(db_path=db_path)
+        try:
+            context["user_preferences"] = load_context_hints(db, session_id)
+            if not snapshot:
+                context["recent_episodes"] = load_recent_episodes(db)
+            context["relevant_knowledge"] = load_semantic_knowledge(db)
+        finally:
+            db.close()
+
+    context["suggested_next_actions"] = suggest_next_actions(
+        load_project_state(memory_dir), context["recent_episodes"]
+    )
+    return context
+
+
+def format_system_message(context: Dict[str, Any]) -> str:
+    """One-line-per-source summary for the session"""
+    lines = []
+    if context["last_session"]:
+        agents = len(context["last_session"]["active_agents"])
+        lines.append(f"Last session: {agents} active agent(s)")
+    if context["recent_episodes"]:
+        lines.append(f"Recent episodes: {len(context['recent_episodes'])}")
+    if context["relevant_knowledge"]:
+        topics = ", ".join(k["topic"] for k in context["relevant_knowledge"][:5])
+        lines.append(f"Knowledge: {topics}")
+    lines.extend(f"Next: {action}" for action in context["suggested_next_actions"])
+    return "\n".join(lines)
+
+
+def main() -> int:
+    try:
+        hook_input = json.loads(sys.stdin.read() or "{}")
+    except json.JSONDecodeError:
+        hook_input = {}
+
+    project_root = Path(os.environ.get("PROJECT_ROOT") or Path.cwd())
+    session_id = hook_input.get("session_id") or str(uuid.uuid4())
+
+    # Run loading on a daemon thread so the 2s budget is enforced
+    result: Dict[str, Any] = {}
+
+    def load():
+        try:
+            result["context"] = build_context(project_root, session_id)
+        except Exception as e:
+            result["error"] = str(e)
+
+    worker = threading.Thread(target=load, daemon=True)
+    worker.start()
+    worker.join(HOOK_TIMEOUT_SECONDS)
+
+    context = result.get("context")
+    message = ""
+    if context is not None:
+        message = format_system_message(context)
+        try:
+            memory_dir = project_root / ".moai" / "memory"
+            memory_dir.mkdir(parents=True, exist_ok=True)
+            (memory_dir / "session-context.json").write_text(json.dumps({
+                "session_id": session_id,
+                "loaded_at": datetime.now().isoformat(),
+                "context": context,
+            }, default=str))
+        except OSError:
+            pass
+
+    print(json.dumps({"continue": True, "systemMessage": message}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
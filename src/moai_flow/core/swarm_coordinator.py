@@ -44,6 +44,7 @@ from ..topology.ring import RingTopology, create_ring_from_agents
 from ..topology.adaptive import AdaptiveTopology, TopologyMode
 from ..monitoring.metrics_collector import MetricsCollector, TaskMetric, TaskResult
 from ..monitoring.heartbeat_monitor import HeartbeatMonitor, HealthState
+from ..memory.swarm_db import SwarmDB
 
 # Phase 6B: Consensus & Conflict Resolution
 from ..coordination import (
@@ -117,6 +118,7 @@ class SwarmCoordinator(ICoordinator):
         default_consensus: str = "quorum",
         enable_conflict_resolution: bool = True,
         enable_adaptive_optimization: bool = True,
+        swarm_db: Optional[SwarmDB] = None,
     ):
         """
         Initialize SwarmCoordinator with specified topology.
@@ -130,6 +132,8 @@ class SwarmCoordinator(ICoordinator):
             default_consensus: Default consensus algorithm ("quorum", "weighted", default: "quorum")
             enable_conflict_resolution: Enable Phase 6B conflict resolution (default: True)
             enable_adaptive_optimization: Enable Phase 6C adaptive optimization (default: True)
+            swarm_db: SwarmDB for task event logging (optional; enable its
+                group-commit writer for high-volume swarms)
 
         Raises:
             ValueError: If topology_type not supported or consensus_threshold invalid
@@ -178,6 +182,9 @@ class SwarmCoordinator(ICoordinator):
         # State synchronization tracking
         self.synchronized_state: Dict[str, Any] = {}
 
+        # Persistent task event log
+        self.swarm_db = swarm_db
+
         # Phase 6A: Observability components
         self.enable_monitoring = enable_monitoring
         if enable_monitoring:
@@ -1241,6 +1248,26 @@ class SwarmCoordinator(ICoordinator):
             }
             self._pattern_learner.record_event(event)
 
+        # Task event log (queued when SwarmDB group commit is enabled)
+        if self.swarm_db is not None:
+            try:
+                agent_info = self.agent_registry.get(agent_id, {})
+                self.swarm_db.insert_event({
+                    "event_type": "task_complete",
+                    "agent_id": agent_id,
+                    "agent_type": agent_info.get("type", "unknown"),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "metadata": {
+                        "task_id": task_id,
+                        "duration_ms": duration_ms,
+                        "result": "success" if success else "failure",
+                        "tokens_used": tokens_used,
+                        "files_changed": files_changed
+                    }
+                })
+            except Exception as e:
+                logger.error(f"Failed to log task event to SwarmDB: {e}")
+
         return True
 
     def get_agent_health_status(self, agent_id: str) -> Optional[Dict[str, Any]]:
@@ -7,7 +7,7 @@ Events are stored in SwarmDB and logged to .moai/logs/agent-transcripts/.
 
 Architecture:
 - Hook into HookStateManager singleton pattern from .claude/hooks/moai/lib/state_tracking.py
-- Store events in SwarmDB (future integration with moai-flow/memory/swarm_db.py)
+- Store events in SwarmDB via its group-commit writer (moai_flow/memory/swarm_db.py)
 - Log to .moai/logs/agent-transcripts/ with rotation
 - Thread-safe event handling with proper error recovery
 
@@ -23,6 +23,7 @@ Event Schema:
 
 import json
 import logging
+import os
 import threading
 import time
 import uuid
@@ -287,36 +288,69 @@ class AgentLifecycleLogger:
 
 
 # ============================================================================
-# SwarmDB Integration (Future)
+# SwarmDB Integration
 # ============================================================================
 
 class SwarmDBIntegration:
     """
-    Future integration with moai-flow/memory/swarm_db.py
-    Currently stubbed for future implementation.
+    Integration with moai_flow/memory/swarm_db.py.
+
+    Lifecycle events are handed to a SwarmDB group-commit writer so hook
+    callers never wait on a per-event commit, and stored in monthly
+    partitions so retention is a partition drop. Disabled by default; enable
+    with ``enabled=True`` or ``MOAI_SWARMDB_EVENTS=1``.
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None, enabled: Optional[bool] = None):
         self.db_path = db_path or Path.cwd() / ".moai" / "memory" / "swarm.db"
         self.logger = logging.getLogger(__name__)
-        self.enabled = False  # Enable when SwarmDB is implemented
+        if enabled is None:
+            enabled = os.environ.get("MOAI_SWARMDB_EVENTS", "").lower() in ("1", "true")
+        self.enabled = enabled
+        self._db = None
+        self._db_lock = threading.Lock()
+
+    def _get_db(self):
+        """Lazily open SwarmDB with the group-commit writer enabled"""
+        with self._db_lock:
+            if self._db is None:
+                from moai_flow.memory.swarm_db import (
+                    EventPartitionConfig,
+                    GroupCommitConfig,
+                    SwarmDB,
+                )
+
+                self._db = SwarmDB(
+                    self.db_path,
+                    group_commit=GroupCommitConfig(enabled=True),
+                    partition_config=EventPartitionConfig(enabled=True)
+                )
+            return self._db
 
     def store_event(self, event: AgentLifecycleEvent) -> bool:
-        """Store event in SwarmDB (future implementation)"""
+        """Queue event for group commit in SwarmDB"""
         if not self.enabled:
             return False
 
         try:
-            # TODO: Integrate with SwarmDB when implemented
-            # from moai_flow.memory.swarm_db import SwarmDB
-            # db = SwarmDB(self.db_path)
-            # db.insert_event(event.to_dict())
-            self.logger.debug(f"SwarmDB integration not yet implemented: {event.agent_id}")
-            return False
+            self._get_db().insert_event(event.to_dict())
+            return True
         except Exception as e:
             self.logger.error(f"Failed to store event in SwarmDB: {e}")
             return False
 
+    def flush(self) -> None:
+        """Wait until queued events are committed"""
+        if self._db is not None:
+            self._db.flush()
+
+    def close(self) -> None:
+        """Flush queued events and close SwarmDB"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
 
 # ============================================================================
 # AgentLifecycle Hook Functions (Public API)
@@ -408,7 +442,7 @@ def on_agent_spawn(
     # Log event
     _lifecycle_logger.log_event(event)
 
-    # Store in SwarmDB (future)
+    # Store in SwarmDB (group commit)
     _swarm_db.store_event(event)
 
     # Track in HookStateManager if available
@@ -480,7 +514,7 @@ def on_agent_complete(
     # Log event
     _lifecycle_logger.log_event(event)
 
-    # Store in SwarmDB (future)
+    # Store in SwarmDB (group commit)
     _swarm_db.store_event(event)
 
     # Track in HookStateManager if available
@@ -554,7 +588,7 @@ def on_agent_error(
     # Log event
     _lifecycle_logger.log_event(event)
 
-    # Store in SwarmDB (future)
+    # Store in SwarmDB (group commit)
     _swarm_db.store_event(event)
 
     # Track in HookStateManager if available
@@ -3,14 +3,30 @@ MoAI-Flow Memory Module
 
 Cross-session memory system:
 - SwarmDB: SQLite wrapper for persistent storage
+- StorageEngine: Shared connection pool, schema registry and group-commit
+  writer per database file (SwarmDB and the metrics stores run on it)
+- ConnectionManager: Bounded WAL connection pool used by StorageEngine
+- AsyncSwarmDB: asyncio facade batching memory-layer writes on a writer thread
 - SemanticMemory: Long-term knowledge and patterns
+- VectorIndex: Local hashed-vector similarity search used by SemanticMemory
 - EpisodicMemory: Event and decision history
+- Session snapshots: Incremental binary session state (load_session_state)
 - ContextHints: Session hints and user preferences
 """
 
-from .swarm_db import SwarmDB
-from .semantic_memory import SemanticMemory
-from .episodic_memory import EpisodicMemory
+from .swarm_db import (
+    SwarmDB,
+    GroupCommitConfig,
+    SessionMemoryConfig,
+    EventPartitionConfig,
+)
+from .session_snapshot import SnapshotConfig, load_session_state
+from .storage_engine import StorageEngine, WriteChannel
+from .connection_manager import ConnectionManager, ConnectionConfig
+from .async_swarm_db import AsyncSwarmDB, AsyncMemoryConfig, AsyncMemoryView
+from .semantic_memory import SemanticMemory, SemanticCacheConfig
+from .vector_index import HashingVectorizer, VectorIndex, VectorIndexConfig
+from .episodic_memory import EpisodicMemory, EpisodeIndexConfig
 from .context_hints import (
     ContextHints,
     PreferenceCategory,
@@ -22,8 +38,25 @@ from .context_hints import (
 
 __all__ = [
     "SwarmDB",
+    "GroupCommitConfig",
+    "SessionMemoryConfig",
+    "EventPartitionConfig",
+    "SnapshotConfig",
+    "load_session_state",
+    "StorageEngine",
+    "WriteChannel",
+    "ConnectionManager",
+    "ConnectionConfig",
+    "AsyncSwarmDB",
+    "AsyncMemoryConfig",
+    "AsyncMemoryView",
     "SemanticMemory",
+    "SemanticCacheConfig",
+    "HashingVectorizer",
+    "VectorIndex",
+    "VectorIndexConfig",
     "EpisodicMemory",
+    "EpisodeIndexConfig",
     "ContextHints",
     "PreferenceCategory",
     "ExpertiseLevel",
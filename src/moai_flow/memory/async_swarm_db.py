@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+AsyncSwarmDB - asyncio Facade for the Memory Layer
+
+SwarmDB, SemanticMemory, EpisodicMemory and ContextHints are blocking:
+every commit holds the calling thread. AsyncSwarmDB runs their SQLite work
+off the event loop and returns awaitables:
+- One dedicated writer thread executes write calls. Calls that arrive while
+  a batch is committing are coalesced into the next batch, which runs
+  inside StorageEngine.batch(): each call gets a savepoint, the batch gets
+  one COMMIT.
+- A small reader pool runs queries on read-only connections.
+
+A write's awaitable resolves after the batch containing it has committed
+and the engine's group-commit writer (if running) has drained, so rows it
+queued there are durable too; a call that raises fails only its own
+awaitable. If the commit or that drain fails, every call in the batch
+fails with the error.
+
+Example:
+    >>> adb = AsyncSwarmDB(SwarmDB())
+    >>> await adb.insert_event({...})           # Writer thread, batched
+    >>> events = await adb.get_events(limit=10)  # Reader pool
+    >>> semantic = adb.wrap(SemanticMemory(adb.db, "project"))
+    >>> await semantic.store_knowledge("topic", {...})
+    >>> await adb.close()
+"""
+
+import asyncio
+import functools
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .swarm_db import SwarmDB
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class AsyncMemoryConfig:
+    """
+    AsyncSwarmDB thread and batching configuration.
+
+    Attributes:
+        reader_threads: Threads serving read calls (default: 4)
+        max_batch_size: Write calls coalesced into one commit (default: 256)
+    """
+
+    reader_threads: int = 4
+    max_batch_size: int = 256
+
+
+# Read-only methods routed to the reader pool; everything else is a write.
+# SemanticMemory.retrieve_knowledge, get_pattern and get_statistics write
+# access counts, so they stay on the writer.
+_READ_METHODS = frozenset((
+    # SwarmDB
+    "get_connection_stats",
+    "get_event_partitions",
+    "get_group_commit_stats",
+    "iter_events",
+    "get_events",
+    "export_events",
+    "get_agent",
+    "get_active_agents",
+    "get_memory",
+    "get_memory_history",
+    "get_sweeper_stats",
+    "load_session_state",
+    # SemanticMemory
+    "search_knowledge",
+    "list_knowledge",
+    "list_patterns",
+    "search_patterns",
+    # EpisodicMemory
+    "get_event",
+    "get_recent_events",
+    "get_events_by_type",
+    "find_similar_episodes",
+    "get_outcome_statistics",
+    # ContextHints
+    "get_preference",
+    "get_all_preferences",
+    "get_expertise_level",
+    "get_task_patterns",
+    "get_tool_preferences",
+    "get_most_used_tools",
+    "suggest_next_action",
+    "analyze_workflow_patterns",
+    "should_show_verbose_output",
+    "should_enforce_strict_validation",
+    "get_recommended_workflow",
+))
+
+# Sentinel used to stop the writer thread
+_STOP_WRITER = object()
+
+
+class _WriteRequest:
+    """A queued write call and the future awaiting it."""
+
+    __slots__ = ("fn", "args", "kwargs", "loop", "future")
+
+    def __init__(
+        self,
+        fn: Callable,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        loop: asyncio.AbstractEventLoop,
+        future: asyncio.Future
+    ):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.loop = loop
+        self.future = future
+
+
+def _settle(future: asyncio.Future, ok: bool, value: Any) -> None:
+    """Resolve a future on its event loop unless the awaiter gave up"""
+    if future.cancelled():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+# ============================================================================
+# AsyncSwarmDB Implementation
+# ============================================================================
+
+class AsyncMemoryView:
+    """
+    Awaitable view of a blocking memory component (SwarmDB, SemanticMemory,
+    EpisodicMemory, ContextHints).
+
+    Public methods become coroutine functions: known read-only methods
+    (_READ_METHODS) run on the reader pool, all others on the batching
+    writer thread. Non-callable attributes are returned as is.
+    """
+
+    def __init__(self, owner: "AsyncSwarmDB", target: Any):
+        self._owner = owner
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        run = self._owner.read if name in _READ_METHODS else self._owner.write
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run(attr, *args, **kwargs)
+
+        return call
+
+
+class AsyncSwarmDB(AsyncMemoryView):
+    """
+    asyncio facade over SwarmDB and the memory components built on it.
+
+    Features:
+    - SwarmDB methods as coroutines (e.g. await adb.insert_event(...))
+    - Dedicated writer thread coalescing concurrent writes into one commit
+    - Reader thread pool on read-only connections
+    - wrap() for SemanticMemory, EpisodicMemory and ContextHints sharing
+      the same writer
+
+    Example:
+        >>> async with AsyncSwarmDB(SwarmDB()) as adb:
+        ...     await asyncio.gather(*(adb.insert_event(e) for e in events))
+    """
+
+    def __init__(
+        self,
+        db: Optional[SwarmDB] = None,
+        config: Optional[AsyncMemoryConfig] = None,
+        **swarm_db_kwargs
+    ):
+        """
+        Initialize AsyncSwarmDB
+
+        Args:
+            db: SwarmDB to drive (created from swarm_db_kwargs if omitted;
+                a SwarmDB created here is closed by close())
+            config: Thread and batching configuration (defaults to AsyncMemoryConfig())
+            **swarm_db_kwargs: SwarmDB constructor arguments when db is omitted
+        """
+        self._owns_db = db is None
+        self.db = db if db is not None else SwarmDB(**swarm_db_kwargs)
+        super().__init__(self, self.db)
+
+        self.config = config or AsyncMemoryConfig()
+        self.logger = logging.getLogger(__name__)
+        self._closed = False
+
+        # In-memory databases share one connection, so every call runs on
+        # the writer thread to keep it single-threaded
+        self._reads_on_writer = self.db.engine.is_memory
+        self._readers = ThreadPoolExecutor(
+            max_workers=self.config.reader_threads,
+            thread_name_prefix="AsyncSwarmDB-Reader"
+        )
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._stats = {
+            "writes": 0,
+            "write_errors": 0,
+            "batches_committed": 0,
+            "largest_batch": 0,
+            "reads": 0,
+        }
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="AsyncSwarmDB-Writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+
+    def wrap(self, component: Any) -> AsyncMemoryView:
+        """
+        Get an awaitable view of a component built on this SwarmDB
+
+        Args:
+            component: SemanticMemory, EpisodicMemory, ContextHints, ...
+
+        Returns:
+            AsyncMemoryView whose methods return awaitables
+        """
+        return AsyncMemoryView(self, component)
+
+    # ========================================================================
+    # Dispatch
+    # ========================================================================
+
+    async def write(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking write call on the writer thread
+
+        Args:
+            fn: Callable using this SwarmDB (or a component built on it)
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's return value, once its batch has committed
+        """
+        if self._closed:
+            raise RuntimeError("AsyncSwarmDB is closed")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_WriteRequest(fn, args, kwargs, loop, future))
+        return await future
+
+    async def read(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking query on the reader pool
+
+        Args:
+            fn: Callable using this SwarmDB (or a component built on it)
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's return value
+        """
+        if self._reads_on_writer:
+            return await self.write(fn, *args, **kwargs)
+        if self._closed:
+            raise RuntimeError("AsyncSwarmDB is closed")
+
+        self._stats["reads"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, functools.partial(fn, *args, **kwargs)
+        )
+
+    # ========================================================================
+    # Writer Thread
+    # ========================================================================
+
+    def _writer_loop(self) -> None:
+        """Take every queued write call (up to max_batch_size) per commit"""
+        max_batch = self.config.max_batch_size
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP_WRITER:
+                break
+
+            batch = [first]
+            while len(batch) < max_batch:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is _STOP_WRITER:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_WriteRequest]) -> None:
+        """Execute write calls under one engine batch, then resolve futures"""
+        engine = self.db.engine
+        results: List[Tuple[bool, Any]] = []
+        try:
+            with engine.batch():
+                for request in batch:
+                    try:
+                        # A savepoint per call: a raise discards its partial writes
+                        with engine.transaction():
+                            value = request.fn(*request.args, **request.kwargs)
+                        results.append((True, value))
+                    except Exception as e:
+                        results.append((False, e))
+            self._stats["batches_committed"] += 1
+
+            # With group commit, calls like insert_event only queued their rows
+            engine.flush()
+        except Exception as e:
+            self.logger.error(f"Commit of {len(batch)} coalesced writes failed: {e}")
+            results = [(False, e)] * len(batch)
+
+        failed = sum(1 for ok, _ in results if not ok)
+        self._stats["writes"] += len(batch) - failed
+        self._stats["write_errors"] += failed
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+        for request, (ok, value) in zip(batch, results):
+            try:
+                request.loop.call_soon_threadsafe(_settle, request.future, ok, value)
+            except RuntimeError:
+                # The awaiting event loop has been closed
+                pass
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get facade statistics
+
+        Returns:
+            Dictionary with write/batch/read counters and pending writes
+        """
+        stats = dict(self._stats)
+        stats["pending_writes"] = self._queue.qsize()
+        stats["avg_batch_size"] = (
+            (stats["writes"] + stats["write_errors"]) / stats["batches_committed"]
+            if stats["batches_committed"] else 0.0
+        )
+        return stats
+
+    async def flush(self) -> bool:
+        """
+        Wait until every write submitted so far has committed
+
+        Returns:
+            True once the writer (and SwarmDB's group commit, if enabled)
+            has drained
+        """
+        await self.write(lambda: None)
+        return await asyncio.get_running_loop().run_in_executor(None, self.db.flush)
+
+    def _shutdown(self) -> None:
+        """Drain the writer, stop the threads and close an owned SwarmDB"""
+        self._queue.put(_STOP_WRITER)
+        self._writer_thread.join()
+        self._readers.shutdown(wait=True)
+        if self._owns_db:
+            self.db.close()
+
+    async def close(self) -> None:
+        """Commit queued writes, stop the writer and reader threads"""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown)
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+        return False
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+ConnectionManager - Bounded SQLite Connection Pool for SwarmDB
+
+Provides thread-affine SQLite connections with:
+- WAL journal mode and tuned pragmas (synchronous, cache_size, busy timeout)
+- Bounded pools for read-write and read-only connections
+- Reaping of connections owned by threads that have exited
+- Read-only connections so queries never block behind writers
+
+Threads keep their connection between calls (SQLite connections are cheap
+to reuse and expensive to open), but the pool is capped. When a new thread
+needs a connection and the pool is full, connections owned by dead threads
+are closed first; if every slot belongs to a live thread the caller waits
+up to ``acquire_timeout_seconds``.
+
+In-memory databases (``:memory:``) use a single shared connection, since
+every new connection would otherwise open a separate empty database.
+
+Example:
+    >>> manager = ConnectionManager(Path(".moai/memory/swarm.db"))
+    >>> conn = manager.get_connection()       # read-write
+    >>> reader = manager.get_read_connection()  # read-only
+    >>> manager.reap_dead_connections()
+    >>> manager.close_all()
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class ConnectionConfig:
+    """
+    Connection pool and pragma configuration.
+
+    Attributes:
+        max_connections: Maximum pooled read-write connections (default: 64)
+        max_read_connections: Maximum pooled read-only connections (default: 64)
+        acquire_timeout_seconds: Time to wait for a free slot (default: 10.0)
+        busy_timeout_seconds: SQLite busy timeout per connection (default: 10.0)
+        journal_mode: SQLite journal mode (default: "WAL")
+        synchronous: SQLite synchronous level (default: "NORMAL")
+        cache_size_kb: Page cache size per connection in KiB (default: 64000)
+        read_only_queries: Serve queries from read-only connections (default: True)
+    """
+
+    max_connections: int = 64
+    max_read_connections: int = 64
+    acquire_timeout_seconds: float = 10.0
+    busy_timeout_seconds: float = 10.0
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kb: int = 64000
+    read_only_queries: bool = True
+
+
+# How often a blocked acquire re-checks for dead owner threads
+_REAP_POLL_SECONDS = 0.05
+
+
+class _PooledConnection:
+    """Connection plus the thread that owns it."""
+
+    __slots__ = ("conn", "owner")
+
+    def __init__(self, conn: sqlite3.Connection, owner: threading.Thread):
+        self.conn = conn
+        self.owner = owner
+
+
+# ============================================================================
+# ConnectionManager Implementation
+# ============================================================================
+
+class ConnectionManager:
+    """
+    Bounded, thread-affine SQLite connection pool.
+
+    Features:
+    - One read-write and (optionally) one read-only connection per thread
+    - WAL mode so readers and the writer do not block each other
+    - Pool size caps with reaping of connections owned by dead threads
+    - Shared single connection for in-memory databases
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        config: Optional[ConnectionConfig] = None
+    ):
+        """
+        Initialize ConnectionManager
+
+        Args:
+            db_path: Path to SQLite database file, or ":memory:"
+            config: Pool and pragma configuration (defaults to ConnectionConfig())
+        """
+        self.db_path = db_path
+        self.config = config or ConnectionConfig()
+        self.is_memory = str(db_path) == ":memory:"
+
+        self.logger = logging.getLogger(__name__)
+        self._cond = threading.Condition(threading.Lock())
+        self._writers: Dict[int, _PooledConnection] = {}
+        self._readers: Dict[int, _PooledConnection] = {}
+        self._shared_conn: Optional[sqlite3.Connection] = None
+        self._stats = {
+            "connections_opened": 0,
+            "connections_reaped": 0,
+            "acquire_waits": 0,
+        }
+
+        if not self.is_memory and self.config.read_only_queries:
+            # Read-only connections need the file (and WAL mode) to exist
+            self._open_writer().close()
+
+    # ========================================================================
+    # Connection Acquisition
+    # ========================================================================
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's read-write connection"""
+        if self.is_memory:
+            return self._get_shared_connection()
+
+        return self._acquire(self._writers, self.config.max_connections, self._open_writer)
+
+    def get_read_connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's read-only connection.
+
+        Falls back to the read-write connection for in-memory databases or
+        when read-only queries are disabled.
+        """
+        if self.is_memory or not self.config.read_only_queries:
+            return self.get_connection()
+
+        return self._acquire(self._readers, self.config.max_read_connections, self._open_reader)
+
+    def _acquire(
+        self,
+        pool: Dict[int, _PooledConnection],
+        max_size: int,
+        opener
+    ) -> sqlite3.Connection:
+        """Return the thread's pooled connection, opening one if needed"""
+        thread_id = threading.get_ident()
+        current = threading.current_thread()
+
+        with self._cond:
+            entry = pool.get(thread_id)
+            if entry is not None:
+                # Thread identifiers are recycled; adopt the connection
+                entry.owner = current
+                return entry.conn
+
+            deadline = time.monotonic() + self.config.acquire_timeout_seconds
+            waited = False
+            while len(pool) >= max_size:
+                if self._reap_locked(pool):
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(
+                        f"Connection pool exhausted ({max_size} connections "
+                        f"owned by live threads)"
+                    )
+                if not waited:
+                    self._stats["acquire_waits"] += 1
+                    waited = True
+                self._cond.wait(min(remaining, _REAP_POLL_SECONDS))
+
+            conn = opener()
+            pool[thread_id] = _PooledConnection(conn, current)
+            self._stats["connections_opened"] += 1
+            return conn
+
+    def _get_shared_connection(self) -> sqlite3.Connection:
+        """Get the single connection used for in-memory databases"""
+        with self._cond:
+            if self._shared_conn is None:
+                self._shared_conn = sqlite3.connect(
+                    ":memory:",
+                    check_same_thread=False,
+                    timeout=self.config.busy_timeout_seconds
+                )
+                self._shared_conn.row_factory = sqlite3.Row
+                self._stats["connections_opened"] += 1
+            return self._shared_conn
+
+    def _open_writer(self) -> sqlite3.Connection:
+        """Open a read-write connection with tuned pragmas"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            timeout=self.config.busy_timeout_seconds
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode={self.config.journal_mode}")
+        conn.execute(f"PRAGMA synchronous={self.config.synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{self.config.cache_size_kb}")
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            timeout=self.config.busy_timeout_seconds
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute(f"PRAGMA cache_size=-{self.config.cache_size_kb}")
+        return conn
+
+    # ========================================================================
+    # Reaping and Shutdown
+    # ========================================================================
+
+    def _reap_locked(self, pool: Dict[int, _PooledConnection]) -> int:
+        """Close connections whose owner thread has exited (lock held)"""
+        dead = [tid for tid, entry in pool.items() if not entry.owner.is_alive()]
+        for tid in dead:
+            entry = pool.pop(tid)
+            try:
+                entry.conn.close()
+            except Exception as e:
+                self.logger.error(f"Error closing reaped connection: {e}")
+
+        if dead:
+            self._stats["connections_reaped"] += len(dead)
+            self.logger.debug(f"Reaped {len(dead)} connection(s) from exited threads")
+        return len(dead)
+
+    def reap_dead_connections(self) -> int:
+        """
+        Close connections owned by threads that have exited.
+
+        Returns:
+            Number of connections closed
+        """
+        with self._cond:
+            return self._reap_locked(self._writers) + self._reap_locked(self._readers)
+
+    def release_thread_connections(self) -> None:
+        """Close the calling thread's connections (e.g. before a worker exits)"""
+        thread_id = threading.get_ident()
+        with self._cond:
+            for pool in (self._writers, self._readers):
+                entry = pool.pop(thread_id, None)
+                if entry is not None:
+                    entry.conn.close()
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with open connection counts and lifetime counters
+        """
+        with self._cond:
+            return {
+                **self._stats,
+                "write_connections": len(self._writers),
+                "read_connections": len(self._readers),
+                "max_connections": self.config.max_connections,
+                "max_read_connections": self.config.max_read_connections,
+                "in_memory": self.is_memory,
+            }
+
+    def close_all(self) -> None:
+        """Close every pooled connection"""
+        with self._cond:
+            entries = list(self._readers.values()) + list(self._writers.values())
+            conns = [entry.conn for entry in entries]
+            if self._shared_conn is not None:
+                conns.append(self._shared_conn)
+
+            for conn in conns:
+                try:
+                    conn.close()
+                except Exception as e:
+                    self.logger.error(f"Error closing connection: {e}")
+
+            self._readers.clear()
+            self._writers.clear()
+            self._shared_conn = None
+            self._cond.notify_all()
@@ -11,14 +11,16 @@ Manages adaptive assistance through:
 - Intelligent next-action suggestions
 
 Architecture:
-- Persistence via SwarmDB session_memory table
-- Pattern learning from last 100 tasks
+- Preferences persisted via SwarmDB session_memory table
+- Task history in an append-only task_history table (rolling window)
+- Tool usage in a tool_usage counter table
+- Pattern learning from last 100 tasks (aggregated in SQL)
 - Adaptive suggestion engine based on historical patterns
 - Session-scoped preferences with optional TTL
 
 Integration:
 - Namespace: context_hints:{session_id}
-- Storage: JSON-serialized preferences and patterns
+- Storage: JSON-serialized preferences, task metadata per row
 - Memory Type: 'context_hint' in SwarmDB
 
 Version: 1.0.0
@@ -26,7 +28,7 @@ Version: 1.0.0
 
 import json
 import logging
-from collections import Counter, defaultdict
+import time
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -90,6 +92,40 @@ PATTERN_CONFIDENCE_THRESHOLD = 0.7
 SUGGESTION_DECAY_HOURS = 24
 
 
+# ============================================================================
+# Schema Extension for Context Hints
+# ============================================================================
+
+CONTEXT_HINTS_SCHEMA_VERSION = "1.0.0"
+
+CONTEXT_HINTS_SCHEMA = [
+    # Append-only task history (last MAX_TASK_HISTORY rows kept per session)
+    """
+    CREATE TABLE IF NOT EXISTS task_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        task_type TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        success INTEGER,  -- 1/0, NULL when not reported
+        duration_ms REAL,
+        metadata TEXT  -- JSON blob
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_task_history_session ON task_history(session_id, id)",
+
+    # Tool usage counters
+    """
+    CREATE TABLE IF NOT EXISTS tool_usage (
+        session_id TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        last_used_at TEXT,
+        PRIMARY KEY (session_id, tool_name)
+    )
+    """,
+]
+
+
 # ============================================================================
 # ContextHints Implementation
 # ============================================================================
@@ -139,9 +175,81 @@ class ContextHints:
         # Memory namespace for this session
         self.namespace = f"context_hints:{session_id}"
 
-        # Initialize preferences if not exists
+        # Initialize task/tool tables and preferences if not exists
+        self._initialize_schema()
         self._initialize_preferences()
 
+    def _initialize_schema(self) -> None:
+        """Create task history and tool usage tables, then import legacy blobs"""
+        try:
+            self.db.engine.apply_schema(
+                "context_hints", CONTEXT_HINTS_SCHEMA_VERSION, self._migrate_schema
+            )
+            with self.db.transaction() as conn:
+                self._migrate_legacy_blobs(conn.cursor())
+
+        except Exception as e:
+            self.logger.error(f"Failed to initialize ContextHints schema: {e}")
+            raise
+
+    @staticmethod
+    def _migrate_schema(conn) -> None:
+        """Create the context hint tables (run once per version by the engine)"""
+        for statement in CONTEXT_HINTS_SCHEMA:
+            conn.execute(statement)
+
+    def _get_legacy_blob(self, cursor, key: str) -> Any:
+        """Unexpired session_memory blob of this session (None if missing)"""
+        row = cursor.execute(
+            """
+            SELECT value FROM session_memory
+            WHERE session_id = ? AND memory_type = 'context_hint' AND key = ?
+            AND (expires_at IS NULL OR expires_at > ?)
+            """,
+            (self.session_id, self._get_key(key), time.time())
+        ).fetchone()
+        return json.loads(row["value"]) if row else None
+
+    def _migrate_legacy_blobs(self, cursor) -> None:
+        """
+        Import task history and tool stats stored as session_memory blobs
+
+        The blobs (and their retained versions) are deleted in the same
+        transaction, so they are imported at most once.
+        """
+        has_history = cursor.execute(
+            "SELECT 1 FROM task_history WHERE session_id = ? LIMIT 1",
+            (self.session_id,)
+        ).fetchone()
+        if not has_history:
+            history = self._get_legacy_blob(cursor, "task_history")
+            for task in (history or [])[-MAX_TASK_HISTORY:]:
+                task = dict(task)
+                task_type = task.pop("task_type", "unknown")
+                timestamp = task.pop("timestamp", datetime.now().isoformat())
+                self._insert_task(cursor, task_type, timestamp, task)
+
+        has_tools = cursor.execute(
+            "SELECT 1 FROM tool_usage WHERE session_id = ? LIMIT 1",
+            (self.session_id,)
+        ).fetchone()
+        if not has_tools:
+            tool_stats = self._get_legacy_blob(cursor, "tool_stats")
+            cursor.executemany(
+                "INSERT INTO tool_usage (session_id, tool_name, count) VALUES (?, ?, ?)",
+                [(self.session_id, tool, count) for tool, count in (tool_stats or {}).items()]
+            )
+
+        keys = (self._get_key("task_history"), self._get_key("tool_stats"))
+        for table in ("session_memory", "session_memory_history"):
+            cursor.execute(
+                f"""
+                DELETE FROM {table}
+                WHERE session_id = ? AND memory_type = 'context_hint' AND key IN (?, ?)
+                """,
+                (self.session_id, *keys)
+            )
+
     def _initialize_preferences(self) -> None:
         """Initialize default preferences if they don't exist"""
         for category, default_value in DEFAULT_PREFERENCES.items():
@@ -284,28 +392,23 @@ class ContextHints:
             ... })
         """
         try:
-            # Get current task history
-            history = self._get_task_history()
-
-            # Add new task with timestamp
-            task_record = {
-                "task_type": task_type,
-                "timestamp": datetime.now().isoformat(),
-                **metadata
-            }
-            history.append(task_record)
-
-            # Keep only last MAX_TASK_HISTORY tasks
-            if len(history) > MAX_TASK_HISTORY:
-                history = history[-MAX_TASK_HISTORY:]
-
-            # Store updated history
-            self.db.store_memory(
-                session_id=self.session_id,
-                memory_type="context_hint",
-                key=self._get_key("task_history"),
-                value=history
-            )
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
+                self._insert_task(cursor, task_type, datetime.now().isoformat(), metadata)
+
+                # Rolling window: keep only last MAX_TASK_HISTORY tasks
+                cursor.execute(
+                    """
+                    DELETE FROM task_history
+                    WHERE session_id = ? AND id <= (
+                        SELECT id FROM task_history
+                        WHERE session_id = ?
+                        ORDER BY id DESC
+                        LIMIT 1 OFFSET ?
+                    )
+                    """,
+                    (self.session_id, self.session_id, MAX_TASK_HISTORY)
+                )
 
             self.logger.debug(f"Recorded task pattern: {task_type}")
 
@@ -317,15 +420,54 @@ class ContextHints:
         except Exception as e:
             self.logger.error(f"Failed to record task pattern: {e}")
 
-    def _get_task_history(self) -> List[Dict]:
-        """Get task history from storage"""
-        try:
-            history = self.db.get_memory(
-                session_id=self.session_id,
-                memory_type="context_hint",
-                key=self._get_key("task_history")
+    def _insert_task(
+        self,
+        cursor,
+        task_type: str,
+        timestamp: str,
+        metadata: Dict
+    ) -> None:
+        """Append one task row"""
+        success = metadata.get("success")
+        cursor.execute(
+            """
+            INSERT INTO task_history
+            (session_id, task_type, timestamp, success, duration_ms, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                self.session_id,
+                task_type,
+                timestamp,
+                int(bool(success)) if success is not None else None,
+                metadata.get("duration_ms"),
+                json.dumps(metadata, default=str)
             )
-            return history if history else []
+        )
+
+    def _get_task_history(self, limit: int = MAX_TASK_HISTORY) -> List[Dict]:
+        """Get the most recent tasks from storage (oldest first)"""
+        try:
+            conn = self.db._get_read_connection()
+            rows = conn.execute(
+                """
+                SELECT task_type, timestamp, metadata FROM task_history
+                WHERE session_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (self.session_id, limit)
+            ).fetchall()
+
+            history = []
+            for row in reversed(rows):
+                metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+                history.append({
+                    "task_type": row["task_type"],
+                    "timestamp": row["timestamp"],
+                    **metadata
+                })
+            return history
         except Exception as e:
             self.logger.error(f"Failed to get task history: {e}")
             return []
@@ -345,8 +487,7 @@ class ContextHints:
             >>> for pattern in patterns:
             ...     print(pattern['task_type'], pattern['timestamp'])
         """
-        history = self._get_task_history()
-        return history[-limit:] if history else []
+        return self._get_task_history(limit=limit) if limit > 0 else []
 
     # ========================================================================
     # Tool Usage Tracking
@@ -364,19 +505,17 @@ class ContextHints:
             >>> hints.record_tool_usage("manager-tdd")
         """
         try:
-            # Get current tool stats
-            tool_stats = self._get_tool_stats()
-
-            # Increment usage count
-            tool_stats[tool_name] = tool_stats.get(tool_name, 0) + 1
-
-            # Store updated stats
-            self.db.store_memory(
-                session_id=self.session_id,
-                memory_type="context_hint",
-                key=self._get_key("tool_stats"),
-                value=tool_stats
-            )
+            with self.db.transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO tool_usage (session_id, tool_name, count, last_used_at)
+                    VALUES (?, ?, 1, ?)
+                    ON CONFLICT(session_id, tool_name) DO UPDATE SET
+                        count = count + 1,
+                        last_used_at = excluded.last_used_at
+                    """,
+                    (self.session_id, tool_name, datetime.now().isoformat())
+                )
 
             self.logger.debug(f"Recorded tool usage: {tool_name}")
 
@@ -386,12 +525,12 @@ class ContextHints:
     def _get_tool_stats(self) -> Dict[str, int]:
         """Get tool usage statistics"""
         try:
-            stats = self.db.get_memory(
-                session_id=self.session_id,
-                memory_type="context_hint",
-                key=self._get_key("tool_stats")
-            )
-            return stats if stats else {}
+            conn = self.db._get_read_connection()
+            rows = conn.execute(
+                "SELECT tool_name, count FROM tool_usage WHERE session_id = ? ORDER BY rowid",
+                (self.session_id,)
+            ).fetchall()
+            return {row["tool_name"]: row["count"] for row in rows}
         except Exception as e:
             self.logger.error(f"Failed to get tool stats: {e}")
             return {}
@@ -423,8 +562,21 @@ class ContextHints:
             >>> top_tools = hints.get_most_used_tools(3)
             >>> # [('expert-backend', 15), ('manager-tdd', 12), ...]
         """
-        stats = self._get_tool_stats()
-        return Counter(stats).most_common(limit)
+        try:
+            conn = self.db._get_read_connection()
+            rows = conn.execute(
+                """
+                SELECT tool_name, count FROM tool_usage
+                WHERE session_id = ?
+                ORDER BY count DESC, rowid
+                LIMIT ?
+                """,
+                (self.session_id, limit)
+            ).fetchall()
+            return [(row["tool_name"], row["count"]) for row in rows]
+        except Exception as e:
+            self.logger.error(f"Failed to get most used tools: {e}")
+            return []
 
     # ========================================================================
     # Pattern Analysis and Suggestions
@@ -444,22 +596,17 @@ class ContextHints:
             >>> # "Run /moai:3-sync to document recent implementation"
         """
         try:
-            history = self._get_task_history()
+            history = self._get_task_history(limit=1)
             if not history:
                 return None
 
-            # Get recent tasks (last 24 hours)
+            # Only tasks from the last 24 hours count
             recent_cutoff = datetime.now() - timedelta(hours=SUGGESTION_DECAY_HOURS)
-            recent_tasks = [
-                task for task in history
-                if datetime.fromisoformat(task["timestamp"]) > recent_cutoff
-            ]
-
-            if not recent_tasks:
+            last_task = history[-1]
+            if datetime.fromisoformat(last_task["timestamp"]) <= recent_cutoff:
                 return None
 
             # Analyze patterns
-            last_task = recent_tasks[-1]
             task_type = last_task.get("task_type")
 
             # Pattern-based suggestions
@@ -516,54 +663,80 @@ class ContextHints:
             >>> print(f"Success rate: {analysis['success_rate']}")
         """
         try:
-            history = self._get_task_history()
-            if not history:
+            conn = self.db._get_read_connection()
+            cursor = conn.cursor()
+
+            total_tasks = cursor.execute(
+                "SELECT COUNT(*) FROM task_history WHERE session_id = ?",
+                (self.session_id,)
+            ).fetchone()[0]
+            if not total_tasks:
                 return {}
 
-            # Analyze success rates by task type
-            success_by_type = defaultdict(list)
-            for task in history:
-                if "success" in task:
-                    success_by_type[task["task_type"]].append(task["success"])
-
-            success_rate = {
-                task_type: sum(successes) / len(successes)
-                for task_type, successes in success_by_type.items()
-            }
-
-            # Find common task sequences
-            sequences = []
-            for i in range(len(history) - 1):
-                sequence = (history[i]["task_type"], history[i + 1]["task_type"])
-                sequences.append(sequence)
-
-            common_sequences = Counter(sequences).most_common(5)
+            # Success rates and average duration by task type
+            cursor.execute(
+                """
+                SELECT task_type, AVG(success) AS success_rate, AVG(duration_ms) AS avg_duration
+                FROM task_history
+                WHERE session_id = ?
+                GROUP BY task_type
+                ORDER BY MIN(id)
+                """,
+                (self.session_id,)
+            )
+            success_rate = {}
+            average_duration = {}
+            for row in cursor.fetchall():
+                if row["success_rate"] is not None:
+                    success_rate[row["task_type"]] = row["success_rate"]
+                if row["avg_duration"] is not None:
+                    average_duration[row["task_type"]] = row["avg_duration"]
+
+            # Find common task sequences (consecutive task pairs)
+            cursor.execute(
+                """
+                SELECT previous, task_type, COUNT(*) AS occurrences
+                FROM (
+                    SELECT id, task_type,
+                           LAG(task_type) OVER (ORDER BY id) AS previous
+                    FROM task_history
+                    WHERE session_id = ?
+                )
+                WHERE previous IS NOT NULL
+                GROUP BY previous, task_type
+                ORDER BY occurrences DESC, MIN(id)
+                LIMIT 5
+                """,
+                (self.session_id,)
+            )
+            common_sequences = [
+                ((row["previous"], row["task_type"]), row["occurrences"])
+                for row in cursor.fetchall()
+            ]
 
             # Find preferred agents
-            all_agents = []
-            for task in history:
-                agents = task.get("agents_used", [])
-                all_agents.extend(agents)
-
-            preferred_agents = Counter(all_agents).most_common(5)
-
-            # Calculate average duration by task type
-            durations_by_type = defaultdict(list)
-            for task in history:
-                if "duration_ms" in task:
-                    durations_by_type[task["task_type"]].append(task["duration_ms"])
-
-            average_duration = {
-                task_type: sum(durations) / len(durations)
-                for task_type, durations in durations_by_type.items()
-            }
+            cursor.execute(
+                """
+                SELECT agent.value AS agent_name, COUNT(*) AS uses
+                FROM task_history, json_each(task_history.metadata, '$.agents_used') AS agent
+                WHERE task_history.session_id = ?
+                  AND json_type(task_history.metadata, '$.agents_used') = 'array'
+                GROUP BY agent.value
+                ORDER BY uses DESC, MIN(task_history.id)
+                LIMIT 5
+                """,
+                (self.session_id,)
+            )
+            preferred_agents = [
+                (row["agent_name"], row["uses"]) for row in cursor.fetchall()
+            ]
 
             return {
                 "common_sequences": common_sequences,
                 "success_rate": success_rate,
                 "preferred_agents": preferred_agents,
                 "average_duration": average_duration,
-                "total_tasks": len(history)
+                "total_tasks": total_tasks
             }
 
         except Exception as e:
@@ -9,8 +9,8 @@ Stores and retrieves:
 - Temporal sequences (what happened after what)
 
 Enables learning from past actions by:
-- Finding similar past episodes
-- Analyzing outcome statistics
+- Finding similar past episodes (inverted context index, full history)
+- Analyzing outcome statistics (incrementally maintained summary table)
 - Identifying successful patterns
 - Learning from failures
 
@@ -49,6 +49,38 @@ class EventType:
     IMPLEMENTATION_COMPLETE = "impl_complete"  # Implementation complete
 
 
+# ============================================================================
+# Context Index Configuration
+# ============================================================================
+
+@dataclass
+class EpisodeIndexConfig:
+    """
+    Inverted context index configuration.
+
+    Each context entry is indexed as a "key=value" token pointing at the
+    episode. Similar-episode lookups take candidates from the postings of
+    the query's tokens and score only those, so recall covers the full
+    history without scanning it.
+
+    Attributes:
+        max_postings_per_token: Most recent episodes kept per token; bounds
+            index size for very common context values (default: 5000)
+        max_candidates: Candidates scored exactly per lookup (default: 500)
+        max_token_length: Longer key=value tokens are not indexed (default: 256)
+        prune_interval: Recorded episodes between posting-list prunes (default: 100)
+    """
+
+    max_postings_per_token: int = 5000
+    max_candidates: int = 500
+    max_token_length: int = 256
+    prune_interval: int = 100
+
+
+# Parameter chunk size for IN (...) lists
+_SQL_CHUNK_SIZE = 500
+
+
 # ============================================================================
 # Episode Data Structures
 # ============================================================================
@@ -118,18 +150,29 @@ class EpisodicMemory:
         ... })
     """
 
-    def __init__(self, swarm_db: SwarmDB, project_id: str):
+    def __init__(
+        self,
+        swarm_db: SwarmDB,
+        project_id: str,
+        index_config: Optional[EpisodeIndexConfig] = None
+    ):
         """
         Initialize EpisodicMemory
 
         Args:
             swarm_db: SwarmDB instance for persistent storage
             project_id: Project identifier for memory scoping
+            index_config: Context index configuration (defaults to EpisodeIndexConfig())
         """
         self.db = swarm_db
         self.project_id = project_id
+        self.index_config = index_config or EpisodeIndexConfig()
         self.logger = logging.getLogger(__name__)
 
+        # Tokens whose posting lists grew since the last prune
+        self._touched_tokens: set = set()
+        self._episodes_since_prune = 0
+
         # Ensure episode tables exist
         self._initialize_episode_tables()
 
@@ -174,8 +217,102 @@ class EpisodicMemory:
                 ON episodes(session_id)
             """)
 
+            # Inverted context index: "key=value" token -> episode
+            index_existed = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'episode_context_index'"
+            ).fetchone()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS episode_context_index (
+                    project_id TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    episode_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    PRIMARY KEY (project_id, token, episode_id)
+                ) WITHOUT ROWID
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_episode_context_index_recent
+                ON episode_context_index(project_id, token, timestamp)
+            """)
+
+            if not index_existed:
+                self._backfill_context_index(cursor)
+
+            # Outcome counts per (event_type, decision_type, status), kept
+            # current by record_outcome so statistics cost O(groups)
+            summary_existed = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'episode_outcome_summary'"
+            ).fetchone()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS episode_outcome_summary (
+                    project_id TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    decision_type TEXT NOT NULL DEFAULT '',
+                    status TEXT NOT NULL,
+                    outcome_count INTEGER NOT NULL DEFAULT 0,
+                    duration_sum REAL NOT NULL DEFAULT 0,
+                    duration_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (project_id, event_type, decision_type, status)
+                ) WITHOUT ROWID
+            """)
+
+            if not summary_existed:
+                self._backfill_outcome_summary(cursor)
+
         self.logger.debug("Episode tables initialized")
 
+    def _backfill_outcome_summary(self, cursor) -> None:
+        """Summarize outcomes recorded before the summary table existed"""
+        cursor.execute("""
+            INSERT INTO episode_outcome_summary
+            (project_id, event_type, decision_type, status,
+             outcome_count, duration_sum, duration_count)
+            SELECT
+                project_id,
+                event_type,
+                CASE WHEN event_type = 'decision' AND json_valid(event_data)
+                     THEN COALESCE(json_extract(event_data, '$.decision_type'), '')
+                     ELSE '' END,
+                COALESCE(json_extract(outcome, '$.status'), 'unknown'),
+                COUNT(*),
+                COALESCE(SUM(json_extract(outcome, '$.metrics.duration_ms')), 0),
+                COUNT(NULLIF(json_extract(outcome, '$.metrics.duration_ms'), 0))
+            FROM episodes
+            WHERE outcome IS NOT NULL AND json_valid(outcome)
+            GROUP BY 1, 2, 3, 4
+        """)
+
+    def _backfill_context_index(self, cursor) -> None:
+        """Index contexts of episodes recorded before the index existed"""
+        rows = cursor.execute(
+            "SELECT id, project_id, timestamp, context FROM episodes WHERE context IS NOT NULL"
+        ).fetchall()
+
+        postings = []
+        for row in rows:
+            try:
+                context = json.loads(row["context"])
+            except json.JSONDecodeError:
+                continue
+            postings.extend(
+                (row["project_id"], token, row["id"], row["timestamp"])
+                for token in self._context_tokens(context)
+            )
+
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO episode_context_index
+            (project_id, token, episode_id, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            postings
+        )
+        if postings:
+            self.logger.info(f"Indexed context of {len(rows)} existing episodes")
+
     # ========================================================================
     # Event Recording
     # ========================================================================
@@ -231,6 +368,9 @@ class EpisodicMemory:
                 )
             )
 
+            if episode.context:
+                self._index_context(cursor, episode.id, episode.timestamp, episode.context)
+
         self.logger.debug(f"Recorded event: {event_type} ({event_id})")
         return event_id
 
@@ -293,6 +433,12 @@ class EpisodicMemory:
 
         with self.db.transaction() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                "SELECT project_id, event_type, event_data, outcome FROM episodes WHERE id = ?",
+                (event_id,)
+            )
+            row = cursor.fetchone()
+
             cursor.execute(
                 """
                 UPDATE episodes
@@ -302,6 +448,19 @@ class EpisodicMemory:
                 (json.dumps(outcome_data), event_id)
             )
 
+            if row is not None:
+                event_data = self._loads_or_empty(row["event_data"])
+                # A replaced outcome moves the episode to its new group
+                if row["outcome"]:
+                    self._update_outcome_summary(
+                        cursor, row["project_id"], row["event_type"], event_data,
+                        self._loads_or_empty(row["outcome"]), -1
+                    )
+                self._update_outcome_summary(
+                    cursor, row["project_id"], row["event_type"], event_data,
+                    outcome_data, 1
+                )
+
         self.logger.debug(f"Recorded outcome for {event_id}: {outcome}")
 
     # ========================================================================
@@ -430,33 +589,57 @@ class EpisodicMemory:
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
-        query = """
-            SELECT * FROM episodes
-            WHERE project_id = ? AND context IS NOT NULL
-        """
-        params = [self.project_id]
+        # Candidate generation: episodes sharing at least one key=value token
+        candidate_ids = self._find_candidates(
+            cursor,
+            self._context_tokens(current_context),
+            event_type
+        )
 
-        if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type)
+        # Exact scoring on the candidate set only
+        episodes_with_scores = []
+        for chunk in self._chunks(candidate_ids):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT * FROM episodes WHERE id IN ({placeholders})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                episode = self._row_to_episode_dict(row)
+                similarity_score = self._calculate_similarity(
+                    current_context,
+                    episode.get("context") or {}
+                )
+                episodes_with_scores.append((similarity_score, episode["timestamp"], episode))
+
+        # Sort by similarity score, then recency, and return top matches
+        episodes_with_scores.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        results = [episode for _, _, episode in episodes_with_scores[:limit]]
+
+        # Pad with the most recent episodes when too few contexts match
+        if len(results) < limit:
+            seen = {episode["id"] for episode in results}
+            query = """
+                SELECT * FROM episodes
+                WHERE project_id = ? AND context IS NOT NULL
+            """
+            params: List[Any] = [self.project_id]
 
-        query += " ORDER BY timestamp DESC LIMIT 100"
+            if event_type:
+                query += " AND event_type = ?"
+                params.append(event_type)
 
-        cursor.execute(query, params)
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(limit + len(seen))
 
-        # Score episodes by similarity
-        episodes_with_scores = []
-        for row in cursor.fetchall():
-            episode = self._row_to_episode_dict(row)
-            similarity_score = self._calculate_similarity(
-                current_context,
-                episode.get("context", {})
-            )
-            episodes_with_scores.append((similarity_score, episode))
+            cursor.execute(query, params)
+            for row in cursor.fetchall():
+                if len(results) >= limit:
+                    break
+                if row["id"] not in seen:
+                    results.append(self._row_to_episode_dict(row))
 
-        # Sort by similarity score (descending) and return top matches
-        episodes_with_scores.sort(key=lambda x: x[0], reverse=True)
-        return [episode for _, episode in episodes_with_scores[:limit]]
+        return results
 
     def get_outcome_statistics(
         self,
@@ -480,22 +663,18 @@ class EpisodicMemory:
 
         cursor.execute(
             """
-            SELECT event_data, outcome FROM episodes
+            SELECT status, outcome_count, duration_sum, duration_count
+            FROM episode_outcome_summary
             WHERE project_id = ?
               AND event_type = ?
-              AND outcome IS NOT NULL
+              AND decision_type = ?
+              AND outcome_count > 0
             """,
-            (self.project_id, EventType.DECISION_MADE)
+            (self.project_id, EventType.DECISION_MADE, decision_type)
         )
+        groups = cursor.fetchall()
 
-        decisions = []
-        for row in cursor.fetchall():
-            event_data = json.loads(row["event_data"]) if row["event_data"] else {}
-            if event_data.get("decision_type") == decision_type:
-                outcome_data = json.loads(row["outcome"]) if row["outcome"] else {}
-                decisions.append(outcome_data)
-
-        if not decisions:
+        if not groups:
             return {
                 "success_rate": 0.0,
                 "total_decisions": 0,
@@ -503,21 +682,14 @@ class EpisodicMemory:
                 "outcome_counts": {}
             }
 
-        # Calculate statistics
-        total = len(decisions)
-        success_count = sum(1 for d in decisions if d.get("status") == "success")
-
-        durations = [
-            d.get("metrics", {}).get("duration_ms", 0)
-            for d in decisions
-            if d.get("metrics", {}).get("duration_ms")
-        ]
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
+        # Combine per-status groups
+        outcome_counts = {row["status"]: row["outcome_count"] for row in groups}
+        total = sum(outcome_counts.values())
+        success_count = outcome_counts.get("success", 0)
 
-        outcome_counts = {}
-        for decision in decisions:
-            status = decision.get("status", "unknown")
-            outcome_counts[status] = outcome_counts.get(status, 0) + 1
+        duration_sum = sum(row["duration_sum"] for row in groups)
+        duration_count = sum(row["duration_count"] for row in groups)
+        avg_duration = duration_sum / duration_count if duration_count else 0.0
 
         return {
             "success_rate": (success_count / total) * 100,
@@ -555,6 +727,162 @@ class EpisodicMemory:
 
         return episode
 
+    @staticmethod
+    def _loads_or_empty(value: Optional[str]) -> Dict[str, Any]:
+        """Parse a JSON column, treating missing or invalid data as {}"""
+        if not value:
+            return {}
+        try:
+            data = json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _update_outcome_summary(
+        self,
+        cursor,
+        project_id: str,
+        event_type: str,
+        event_data: Dict[str, Any],
+        outcome_data: Dict[str, Any],
+        sign: int
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) one outcome from the summary"""
+        decision_type = ""
+        if event_type == EventType.DECISION_MADE:
+            decision_type = event_data.get("decision_type") or ""
+
+        duration = (outcome_data.get("metrics") or {}).get("duration_ms")
+        has_duration = isinstance(duration, (int, float)) and not isinstance(duration, bool) and duration
+        duration_value = duration if has_duration else 0
+
+        cursor.execute(
+            """
+            INSERT INTO episode_outcome_summary
+            (project_id, event_type, decision_type, status,
+             outcome_count, duration_sum, duration_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(project_id, event_type, decision_type, status) DO UPDATE SET
+                outcome_count = outcome_count + excluded.outcome_count,
+                duration_sum = duration_sum + excluded.duration_sum,
+                duration_count = duration_count + excluded.duration_count
+            """,
+            (
+                project_id,
+                event_type,
+                str(decision_type),
+                str(outcome_data.get("status", "unknown")),
+                sign,
+                sign * duration_value,
+                sign if has_duration else 0
+            )
+        )
+
+    def _context_tokens(self, context: Optional[Dict[str, Any]]) -> List[str]:
+        """Convert a context into indexable key=value tokens"""
+        if not context:
+            return []
+
+        tokens = []
+        for key, value in context.items():
+            token = f"{key}={json.dumps(value, sort_keys=True, default=str)}"
+            if len(token) <= self.index_config.max_token_length:
+                tokens.append(token)
+        return tokens
+
+    def _index_context(
+        self,
+        cursor,
+        episode_id: str,
+        timestamp: str,
+        context: Dict[str, Any]
+    ) -> None:
+        """Add an episode's context tokens to the inverted index"""
+        tokens = self._context_tokens(context)
+        if not tokens:
+            return
+
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO episode_context_index
+            (project_id, token, episode_id, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            [(self.project_id, token, episode_id, timestamp) for token in tokens]
+        )
+
+        self._touched_tokens.update(tokens)
+        self._episodes_since_prune += 1
+        if self._episodes_since_prune >= self.index_config.prune_interval:
+            self._prune_postings(cursor)
+
+    def _prune_postings(self, cursor) -> None:
+        """Trim posting lists of recently used tokens to the configured size"""
+        tokens = list(self._touched_tokens)
+        self._touched_tokens.clear()
+        self._episodes_since_prune = 0
+
+        for chunk in self._chunks(tokens):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"""
+                DELETE FROM episode_context_index
+                WHERE project_id = ? AND (token, episode_id) IN (
+                    SELECT token, episode_id FROM (
+                        SELECT token, episode_id, ROW_NUMBER() OVER (
+                            PARTITION BY token ORDER BY timestamp DESC
+                        ) AS position
+                        FROM episode_context_index
+                        WHERE project_id = ? AND token IN ({placeholders})
+                    )
+                    WHERE position > ?
+                )
+                """,
+                [self.project_id, self.project_id, *chunk,
+                 self.index_config.max_postings_per_token]
+            )
+
+    def _find_candidates(
+        self,
+        cursor,
+        tokens: List[str],
+        event_type: Optional[str]
+    ) -> List[str]:
+        """Episode IDs sharing the most tokens with the query"""
+        if not tokens:
+            return []
+
+        # Query contexts are small; IN lists stay well under SQLite limits
+        placeholders = ", ".join("?" * len(tokens))
+        query = f"""
+            SELECT i.episode_id, COUNT(*) AS matches, MAX(i.timestamp) AS ts
+            FROM episode_context_index i
+        """
+        params: List[Any] = []
+
+        if event_type:
+            query += " JOIN episodes e ON e.id = i.episode_id AND e.event_type = ?"
+            params.append(event_type)
+
+        query += f"""
+            WHERE i.project_id = ? AND i.token IN ({placeholders})
+            GROUP BY i.episode_id
+            ORDER BY matches DESC, ts DESC
+            LIMIT ?
+        """
+        params.extend([self.project_id, *tokens, self.index_config.max_candidates])
+
+        cursor.execute(query, params)
+        return [row["episode_id"] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _chunks(items: List[Any]) -> List[List[Any]]:
+        """Split a list into SQL parameter-sized chunks"""
+        return [
+            items[i:i + _SQL_CHUNK_SIZE]
+            for i in range(0, len(items), _SQL_CHUNK_SIZE)
+        ]
+
     def _calculate_similarity(
         self,
         context1: Dict[str, Any],
@@ -615,6 +943,21 @@ class EpisodicMemory:
 
         with self.db.transaction() as conn:
             cursor = conn.cursor()
+            # Remove deleted outcomes from the summary first
+            cursor.execute(
+                """
+                SELECT event_type, event_data, outcome FROM episodes
+                WHERE project_id = ? AND timestamp < ? AND outcome IS NOT NULL
+                """,
+                (self.project_id, cutoff_date)
+            )
+            for row in cursor.fetchall():
+                self._update_outcome_summary(
+                    cursor, self.project_id, row["event_type"],
+                    self._loads_or_empty(row["event_data"]),
+                    self._loads_or_empty(row["outcome"]), -1
+                )
+
             cursor.execute(
                 """
                 DELETE FROM episodes
@@ -624,6 +967,14 @@ class EpisodicMemory:
             )
             deleted_count = cursor.rowcount
 
+            cursor.execute(
+                """
+                DELETE FROM episode_context_index
+                WHERE project_id = ? AND timestamp < ?
+                """,
+                (self.project_id, cutoff_date)
+            )
+
         self.logger.info(f"Cleaned up {deleted_count} old episodes (>{days} days)")
         return deleted_count
 
@@ -13,21 +13,36 @@ Features:
 - Confidence-based scoring (0.0 - 1.0)
 - Automatic knowledge pruning
 - Category-based organization
-- Full-text search support
-- Access tracking and metrics
+- Full-text search support (FTS5 with BM25 ranking, LIKE fallback)
+- Local hashed-vector similarity search (see vector_index.py)
+- Access tracking and metrics (batched write-back)
+- Read-through LRU cache for knowledge and pattern lookups
 
 Schema Version: 1.0.0
 """
 
+import copy
 import json
 import logging
+import re
+import sqlite3
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .swarm_db import SwarmDB
+from .vector_index import (
+    HashingVectorizer,
+    VectorIndex,
+    VectorIndexConfig,
+    vector_to_blob,
+)
 
 
 # ============================================================================
@@ -46,6 +61,108 @@ class KnowledgeCategory(str, Enum):
     PERFORMANCE_PATTERN = "performance"
 
 
+# ============================================================================
+# Cache Configuration
+# ============================================================================
+
+@dataclass
+class SemanticCacheConfig:
+    """
+    Read-through cache configuration for SemanticMemory.
+
+    The cache is per SemanticMemory instance: writes through this instance
+    invalidate it immediately, writes from other instances become visible
+    once entries expire.
+
+    Attributes:
+        enabled: Enable the lookup cache (default: True)
+        max_entries: Maximum cached lookups before LRU eviction (default: 256)
+        ttl_seconds: Maximum age of a cached lookup (default: 300.0)
+        access_flush_interval_seconds: Maximum delay before buffered access
+            counts are written back (default: 5.0)
+        access_flush_threshold: Buffered accesses that force a write-back (default: 100)
+    """
+
+    enabled: bool = True
+    max_entries: int = 256
+    ttl_seconds: float = 300.0
+    access_flush_interval_seconds: float = 5.0
+    access_flush_threshold: int = 100
+
+
+class _LRUCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (found, value) and refresh recency on a hit"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Tuple, value: Any) -> None:
+        """Insert a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, namespace: str) -> None:
+        """Drop every entry whose key starts with namespace"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == namespace]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def update(self, namespace: str, apply: Callable[[Any], None]) -> None:
+        """Call apply on every cached value whose key starts with namespace"""
+        with self._lock:
+            for key, (_, value) in self._entries.items():
+                if key[0] == namespace:
+                    apply(value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counter snapshot"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
 # ============================================================================
 # Schema Extension for Semantic Memory
 # ============================================================================
@@ -94,6 +211,78 @@ SEMANTIC_MEMORY_SCHEMA = [
     "CREATE INDEX IF NOT EXISTS idx_code_patterns_category ON code_patterns(category)",
 ]
 
+# Full-text index over semantic_knowledge (external content, kept in sync by
+# triggers). Requires SQLite compiled with FTS5; see _initialize_fts().
+SEMANTIC_FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS semantic_knowledge_fts USING fts5(
+        topic, knowledge, tags,
+        content='semantic_knowledge',
+        content_rowid='rowid',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS semantic_knowledge_fts_insert
+    AFTER INSERT ON semantic_knowledge BEGIN
+        INSERT INTO semantic_knowledge_fts(rowid, topic, knowledge, tags)
+        VALUES (new.rowid, new.topic, new.knowledge, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS semantic_knowledge_fts_delete
+    AFTER DELETE ON semantic_knowledge BEGIN
+        INSERT INTO semantic_knowledge_fts(semantic_knowledge_fts, rowid, topic, knowledge, tags)
+        VALUES ('delete', old.rowid, old.topic, old.knowledge, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS semantic_knowledge_fts_update
+    AFTER UPDATE OF topic, knowledge, tags ON semantic_knowledge BEGIN
+        INSERT INTO semantic_knowledge_fts(semantic_knowledge_fts, rowid, topic, knowledge, tags)
+        VALUES ('delete', old.rowid, old.topic, old.knowledge, old.tags);
+        INSERT INTO semantic_knowledge_fts(rowid, topic, knowledge, tags)
+        VALUES (new.rowid, new.topic, new.knowledge, new.tags);
+    END
+    """,
+]
+
+# BM25 column weights for (topic, knowledge, tags)
+FTS_COLUMN_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Hashed vectors for similarity search. SQLite holds the float32 blobs;
+# the memory-mapped matrix files are rebuilt from them when out of date.
+SEMANTIC_VECTOR_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS semantic_vectors (
+        item_key TEXT PRIMARY KEY,  -- Knowledge id, or 'pattern:' || pattern_name
+        project_id TEXT NOT NULL,
+        kind TEXT NOT NULL,  -- 'knowledge' | 'pattern'
+        row_index INTEGER NOT NULL,  -- Row in the matrix file
+        dimensions INTEGER NOT NULL,
+        vector BLOB NOT NULL  -- float32, little-endian
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_semantic_vectors_rows ON semantic_vectors(project_id, kind, row_index)",
+]
+
+# Vector search candidates fetched per requested result, so confidence and
+# category filters applied afterwards still fill the page
+VECTOR_CANDIDATE_FACTOR = 4
+
+VECTOR_KINDS = ("knowledge", "pattern")
+
+
+def _flatten_text(value: Any) -> str:
+    """Concatenate the string and key content of nested JSON data"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(f"{k} {_flatten_text(v)}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_flatten_text(v) for v in value)
+    return ""
+
 
 # ============================================================================
 # SemanticMemory Implementation
@@ -123,22 +312,52 @@ class SemanticMemory:
         ...     "rationale": "Industry standard"
         ... }, confidence=0.9)
         >>> results = memory.search_knowledge("authentication")
+        >>> similar = memory.search_knowledge("API error handling", mode="vector")
     """
 
-    def __init__(self, swarm_db: SwarmDB, project_id: str):
+    def __init__(
+        self,
+        swarm_db: SwarmDB,
+        project_id: str,
+        cache_config: Optional[SemanticCacheConfig] = None,
+        vector_config: Optional[VectorIndexConfig] = None
+    ):
         """
         Initialize SemanticMemory
 
         Args:
             swarm_db: SwarmDB instance for persistent storage
             project_id: Project identifier for scoped memory
+            cache_config: Lookup cache configuration (defaults to SemanticCacheConfig())
+            vector_config: Vector search configuration (defaults to VectorIndexConfig())
         """
         self.db = swarm_db
         self.project_id = project_id
         self.logger = logging.getLogger(__name__)
+        self.fts_enabled = False
+
+        # Read-through cache and buffered access tracking
+        self.cache_config = cache_config or SemanticCacheConfig()
+        self._cache = _LRUCache(self.cache_config.max_entries, self.cache_config.ttl_seconds)
+        self._access_lock = threading.Lock()
+        self._pending_knowledge_access: Dict[str, List[Any]] = {}
+        self._pending_pattern_usage: Dict[str, List[Any]] = {}
+        self._pending_access_total = 0
+        self._last_access_flush = time.monotonic()
+        # Buffered counts are written back when the database closes, and
+        # the FTS index is rebuilt after VACUUM renumbers rowids
+        swarm_db.register_close_hook(self.flush_access_counts)
+        swarm_db.register_vacuum_hook(self.optimize)
+
+        # Hashed-vector indexes, one per kind (built in _initialize_vectors)
+        self.vector_config = vector_config or VectorIndexConfig()
+        self._vectorizer = HashingVectorizer.from_config(self.vector_config)
+        self._vector_indexes: Dict[str, VectorIndex] = {}
 
         # Initialize semantic memory schema
         self._initialize_schema()
+        self._initialize_fts()
+        self._initialize_vectors()
 
     def _initialize_schema(self) -> None:
         """Initialize semantic memory schema extension"""
@@ -158,6 +377,162 @@ class SemanticMemory:
             self.logger.error(f"Failed to initialize SemanticMemory schema: {e}")
             raise
 
+    def _initialize_fts(self) -> None:
+        """Create the FTS5 index, falling back to LIKE search if unavailable"""
+        try:
+            with self.db.transaction() as conn:
+                existed = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'semantic_knowledge_fts'"
+                ).fetchone()
+
+                for statement in SEMANTIC_FTS_SCHEMA:
+                    conn.execute(statement)
+
+                # Index rows written before the FTS table existed
+                if not existed:
+                    conn.execute(
+                        "INSERT INTO semantic_knowledge_fts(semantic_knowledge_fts) "
+                        "VALUES ('rebuild')"
+                    )
+
+            self.fts_enabled = True
+
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"FTS5 unavailable, using LIKE search: {e}")
+
+    def optimize(self) -> None:
+        """
+        Rebuild the FTS5 index from semantic_knowledge
+
+        The index is keyed on implicit rowids, which VACUUM may renumber;
+        SwarmDB.vacuum() calls this through its vacuum hook.
+        """
+        if not self.fts_enabled:
+            return
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO semantic_knowledge_fts(semantic_knowledge_fts) "
+                "VALUES ('rebuild')"
+            )
+
+    def _initialize_vectors(self) -> None:
+        """Create the vector table, vectorize existing rows and load the indexes"""
+        if not self.vector_config.enabled:
+            return
+
+        dims = self.vector_config.dimensions
+        with self.db.transaction() as conn:
+            for statement in SEMANTIC_VECTOR_SCHEMA:
+                conn.execute(statement)
+
+            # Vectors hashed with other settings cannot be compared
+            conn.execute(
+                "DELETE FROM semantic_vectors WHERE project_id = ? AND dimensions != ?",
+                (self.project_id, dims)
+            )
+
+            missing_knowledge = conn.execute(
+                """
+                SELECT k.id, k.topic, k.knowledge, k.tags FROM semantic_knowledge k
+                LEFT JOIN semantic_vectors v ON v.item_key = k.id
+                WHERE k.project_id = ? AND v.item_key IS NULL
+                """,
+                (self.project_id,)
+            ).fetchall()
+            for row in missing_knowledge:
+                vector = self._knowledge_vector(
+                    row["topic"], json.loads(row["knowledge"]), json.loads(row["tags"] or "[]")
+                )
+                self._stage_vector(conn, row["id"], "knowledge", vector)
+
+            missing_patterns = conn.execute(
+                """
+                SELECT p.pattern_name, p.pattern_data, p.tags FROM code_patterns p
+                LEFT JOIN semantic_vectors v ON v.item_key = 'pattern:' || p.pattern_name
+                WHERE p.project_id = ? AND v.item_key IS NULL
+                """,
+                (self.project_id,)
+            ).fetchall()
+            for row in missing_patterns:
+                vector = self._pattern_vector(
+                    row["pattern_name"], json.loads(row["pattern_data"]),
+                    json.loads(row["tags"] or "[]")
+                )
+                self._stage_vector(conn, f"pattern:{row['pattern_name']}", "pattern", vector)
+
+        if missing_knowledge or missing_patterns:
+            self.logger.info(
+                f"Vectorized {len(missing_knowledge)} knowledge entries and "
+                f"{len(missing_patterns)} patterns"
+            )
+
+        for kind in VECTOR_KINDS:
+            self._vector_indexes[kind] = VectorIndex(
+                dims, self._vector_path(kind), self.vector_config
+            )
+        self._load_vectors()
+
+    def _vector_path(self, kind: str) -> Optional[Path]:
+        """Matrix file for a kind (None for in-memory databases)"""
+        if self.db.engine.is_memory:
+            return None
+        directory = Path(self.vector_config.index_dir or self.db.db_path.parent)
+        project = re.sub(r"[^A-Za-z0-9_.-]", "_", self.project_id)
+        return directory / f"{self.db.db_path.name}.{project}.{kind}.vec"
+
+    def _load_vectors(self) -> None:
+        """Register persisted vectors, compacting row numbers if mostly holes"""
+        conn = self.db._get_connection()
+        for kind, index in self._vector_indexes.items():
+            rows = conn.execute(
+                """
+                SELECT item_key, row_index, vector FROM semantic_vectors
+                WHERE project_id = ? AND kind = ?
+                ORDER BY row_index
+                """,
+                (self.project_id, kind)
+            ).fetchall()
+
+            if rows and rows[-1]["row_index"] + 1 > 2 * len(rows):
+                with self.db.transaction() as tx:
+                    tx.executemany(
+                        "UPDATE semantic_vectors SET row_index = ? WHERE item_key = ?",
+                        [(i, row["item_key"]) for i, row in enumerate(rows)]
+                    )
+                rows = [(row["item_key"], i, row["vector"]) for i, row in enumerate(rows)]
+                self.logger.info(f"Compacted {kind} vector matrix to {len(rows)} rows")
+
+            index.load((row[0], row[1], row[2]) for row in rows)
+
+    def _knowledge_vector(self, topic: str, knowledge: Dict[str, Any], tags: List[str]):
+        return self._vectorizer.vectorize(
+            f"{_flatten_text(knowledge)} {' '.join(tags)}", title=topic
+        )
+
+    def _pattern_vector(self, pattern_name: str, pattern_data: Dict[str, Any], tags: List[str]):
+        return self._vectorizer.vectorize(
+            f"{_flatten_text(pattern_data)} {' '.join(tags)}", title=pattern_name
+        )
+
+    def _stage_vector(self, conn: sqlite3.Connection, item_key: str, kind: str, vector) -> int:
+        """Persist a vector inside the caller's transaction, returning its matrix row"""
+        row_index = conn.execute(
+            """
+            SELECT COALESCE(MAX(row_index) + 1, 0) FROM semantic_vectors
+            WHERE project_id = ? AND kind = ?
+            """,
+            (self.project_id, kind)
+        ).fetchone()[0]
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO semantic_vectors
+            (item_key, project_id, kind, row_index, dimensions, vector)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (item_key, self.project_id, kind, row_index, len(vector), vector_to_blob(vector))
+        )
+        return row_index
+
     # ========================================================================
     # Knowledge Storage & Retrieval
     # ========================================================================
@@ -202,6 +577,10 @@ class SemanticMemory:
         category = category or KnowledgeCategory.BEST_PRACTICE
         tags_json = json.dumps(tags or [])
         now = datetime.now().isoformat()
+        vector = (
+            self._knowledge_vector(topic, knowledge, tags or [])
+            if self._vector_indexes else None
+        )
 
         with self.db.transaction() as conn:
             cursor = conn.cursor()
@@ -224,7 +603,12 @@ class SemanticMemory:
                     tags_json
                 )
             )
+            if vector is not None:
+                row_index = self._stage_vector(conn, knowledge_id, "knowledge", vector)
 
+        if vector is not None:
+            self._vector_indexes["knowledge"].add(knowledge_id, row_index, vector)
+        self._cache.invalidate("knowledge")
         self.logger.info(
             f"Stored knowledge: {topic} (confidence={confidence:.2f})"
         )
@@ -245,50 +629,74 @@ class SemanticMemory:
             >>> if knowledge:
             ...     print(knowledge["confidence"])
         """
-        conn = self.db._get_connection()
-        cursor = conn.cursor()
+        cache_key = ("knowledge", topic)
+        found, knowledge = self._cache_get(cache_key)
 
-        cursor.execute(
-            """
-            SELECT * FROM semantic_knowledge
-            WHERE project_id = ? AND topic = ?
-            ORDER BY confidence DESC, updated_at DESC
-            LIMIT 1
-            """,
-            (self.project_id, topic)
-        )
+        if not found:
+            conn = self.db._get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT * FROM semantic_knowledge
+                WHERE project_id = ? AND topic = ?
+                ORDER BY confidence DESC, updated_at DESC
+                LIMIT 1
+                """,
+                (self.project_id, topic)
+            )
+
+            row = cursor.fetchone()
+            if not row:
+                return None
 
-        row = cursor.fetchone()
-        if row:
             knowledge = dict(row)
             knowledge["knowledge"] = json.loads(knowledge["knowledge"])
             knowledge["tags"] = json.loads(knowledge.get("tags", "[]"))
+            self._cache_put(cache_key, knowledge)
 
-            # Update access tracking
-            self._track_access(knowledge["id"])
-
-            return knowledge
+        # Update access tracking (buffered)
+        self._track_access(knowledge["id"])
 
-        return None
+        return copy.deepcopy(knowledge)
 
     def search_knowledge(
         self,
         query: str,
         limit: int = 10,
         min_confidence: float = 0.3,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        offset: int = 0,
+        mode: str = "text"
     ) -> List[Dict[str, Any]]:
         """
-        Search across all knowledge using pattern matching
+        Search across all knowledge, ranked by relevance
+
+        Uses the FTS5 index (BM25 ranking, topic and tags weighted above
+        knowledge text) when available. Query words match stemmed tokens
+        ("caches" finds "caching") and any word may match. Without FTS5,
+        falls back to LIKE substring matching ordered by confidence.
+
+        With mode="vector", ranks by cosine similarity of hashed word and
+        character n-gram vectors instead, so "API error handling" also
+        finds "handle_api_errors".
 
         Args:
             query: Search query string
             limit: Maximum results to return
             min_confidence: Minimum confidence threshold
             category: Optional category filter
+            offset: Number of results to skip (pagination)
+            mode: "text" (FTS5/LIKE) or "vector" (hashed-vector similarity)
 
         Returns:
-            List of matching knowledge dictionaries, sorted by relevance
+            List of matching knowledge dictionaries, sorted by relevance.
+            Each includes "score" (higher is more relevant) and "snippet"
+            (highlighted excerpt); both are None on the LIKE fallback, and
+            "snippet" is None for vector search.
+
+        Raises:
+            ValueError: If mode is unknown, or "vector" while vector search is disabled
 
         Example:
             >>> results = memory.search_knowledge(
@@ -297,8 +705,80 @@ class SemanticMemory:
             ...     category="adr"
             ... )
             >>> for result in results:
-            ...     print(f"{result['topic']}: {result['confidence']}")
+            ...     print(f"{result['topic']}: {result['snippet']}")
+        """
+        if mode == "vector":
+            results = self._search_vector(query, limit, min_confidence, category, offset)
+        elif mode != "text":
+            raise ValueError(f"Unknown search mode: {mode}")
+        elif self.fts_enabled:
+            results = self._search_fts(query, limit, min_confidence, category, offset)
+        else:
+            results = self._search_like(query, limit, min_confidence, category, offset)
+
+        self.logger.debug(
+            f"Search '{query}' returned {len(results)} results"
+        )
+        return results
+
+    def _search_fts(
+        self,
+        query: str,
+        limit: int,
+        min_confidence: float,
+        category: Optional[str],
+        offset: int
+    ) -> List[Dict[str, Any]]:
+        """BM25-ranked search over the FTS5 index"""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+
+        # Quote each term so user input cannot inject FTS5 query syntax
+        match_expr = " OR ".join(f'"{term}"' for term in terms)
+        weights = ", ".join(str(w) for w in FTS_COLUMN_WEIGHTS)
+
+        sql = f"""
+            SELECT k.*,
+                -bm25(semantic_knowledge_fts, {weights}) AS score,
+                snippet(semantic_knowledge_fts, -1, '[', ']', '...', 12) AS snippet
+            FROM semantic_knowledge_fts
+            JOIN semantic_knowledge k ON k.rowid = semantic_knowledge_fts.rowid
+            WHERE semantic_knowledge_fts MATCH ?
+            AND k.project_id = ?
+            AND k.confidence >= ?
         """
+        params = [match_expr, self.project_id, min_confidence]
+
+        if category:
+            sql += " AND k.category = ?"
+            params.append(category)
+
+        sql += " ORDER BY score DESC, k.confidence DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        conn = self.db._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+
+        results = []
+        for row in cursor.fetchall():
+            knowledge = dict(row)
+            knowledge["knowledge"] = json.loads(knowledge["knowledge"])
+            knowledge["tags"] = json.loads(knowledge.get("tags", "[]"))
+            results.append(knowledge)
+
+        return results
+
+    def _search_like(
+        self,
+        query: str,
+        limit: int,
+        min_confidence: float,
+        category: Optional[str],
+        offset: int
+    ) -> List[Dict[str, Any]]:
+        """Unranked LIKE search (fallback when FTS5 is unavailable)"""
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
@@ -328,8 +808,8 @@ class SemanticMemory:
             sql += " AND category = ?"
             params.append(category)
 
-        sql += " ORDER BY confidence DESC, updated_at DESC LIMIT ?"
-        params.append(limit)
+        sql += " ORDER BY confidence DESC, updated_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
 
         cursor.execute(sql, params)
 
@@ -338,13 +818,83 @@ class SemanticMemory:
             knowledge = dict(row)
             knowledge["knowledge"] = json.loads(knowledge["knowledge"])
             knowledge["tags"] = json.loads(knowledge.get("tags", "[]"))
+            knowledge["score"] = None
+            knowledge["snippet"] = None
             results.append(knowledge)
 
-        self.logger.debug(
-            f"Search '{query}' returned {len(results)} results"
+        return results
+
+    def _search_vector(
+        self,
+        query: str,
+        limit: int,
+        min_confidence: float,
+        category: Optional[str],
+        offset: int
+    ) -> List[Dict[str, Any]]:
+        """Cosine-ranked search over the knowledge vector index"""
+        rows = self._vector_candidates(
+            "knowledge", query, limit + offset,
+            """
+            SELECT * FROM semantic_knowledge
+            WHERE id IN ({placeholders}) AND project_id = ? AND confidence >= ?
+            """ + (" AND category = ?" if category else ""),
+            [self.project_id, min_confidence] + ([category] if category else [])
         )
+
+        results = []
+        for row, score in rows[offset:offset + limit]:
+            knowledge = dict(row)
+            knowledge["knowledge"] = json.loads(knowledge["knowledge"])
+            knowledge["tags"] = json.loads(knowledge.get("tags", "[]"))
+            knowledge["score"] = score
+            knowledge["snippet"] = None
+            results.append(knowledge)
         return results
 
+    def _vector_candidates(
+        self,
+        kind: str,
+        query: str,
+        wanted: int,
+        sql: str,
+        params: List[Any]
+    ) -> List[Tuple[sqlite3.Row, float]]:
+        """
+        Top vector matches that pass the SQL filter, best first
+
+        Over-fetches VECTOR_CANDIDATE_FACTOR candidates per wanted result
+        and widens the search until enough pass the filter or the index
+        is exhausted. sql must select from the kind's table with an
+        "{placeholders}" slot for the candidate keys.
+        """
+        index = self._vector_indexes.get(kind)
+        if index is None:
+            raise ValueError("Vector search is disabled (VectorIndexConfig.enabled=False)")
+
+        vector = self._vectorizer.vectorize(query)
+        prefix = "pattern:" if kind == "pattern" else ""
+        key_column = "pattern_name" if kind == "pattern" else "id"
+        conn = self.db._get_read_connection()
+
+        fetch = max(wanted, 1) * VECTOR_CANDIDATE_FACTOR
+        while True:
+            matches = index.search(vector, fetch)
+            scores = {key[len(prefix):]: score for key, score in matches if score > 0}
+            rows = []
+            if scores:
+                rows = conn.execute(
+                    sql.format(placeholders=", ".join("?" * len(scores))),
+                    list(scores) + params
+                ).fetchall()
+            if len(rows) >= wanted or len(matches) < fetch:
+                break
+            fetch *= VECTOR_CANDIDATE_FACTOR
+
+        ranked = [(row, scores[row[key_column]]) for row in rows]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked
+
     def list_knowledge(
         self,
         category: Optional[str] = None,
@@ -440,8 +990,24 @@ class SemanticMemory:
                 """,
                 params
             )
+            updated = cursor.rowcount > 0
+
+            # Text changed: re-vectorize into a new matrix row
+            vector = None
+            if updated and self._vector_indexes and (knowledge is not None or tags is not None):
+                row = cursor.execute(
+                    "SELECT topic, knowledge, tags FROM semantic_knowledge WHERE id = ?",
+                    (knowledge_id,)
+                ).fetchone()
+                vector = self._knowledge_vector(
+                    row["topic"], json.loads(row["knowledge"]), json.loads(row["tags"] or "[]")
+                )
+                row_index = self._stage_vector(conn, knowledge_id, "knowledge", vector)
 
-            return cursor.rowcount > 0
+        if vector is not None:
+            self._vector_indexes["knowledge"].add(knowledge_id, row_index, vector)
+        self._cache.invalidate("knowledge")
+        return updated
 
     # ========================================================================
     # Confidence Management
@@ -472,6 +1038,7 @@ class SemanticMemory:
                 (new_confidence, datetime.now().isoformat(), knowledge_id)
             )
 
+        self._cache.invalidate("knowledge")
         self.logger.debug(
             f"Updated confidence: {knowledge_id} -> {new_confidence:.2f}"
         )
@@ -509,6 +1076,7 @@ class SemanticMemory:
                 (new_confidence, datetime.now().isoformat(), knowledge_id)
             )
 
+        self._cache.invalidate("knowledge")
         self.logger.debug(
             f"Recorded success: {knowledge_id} "
             f"({current_confidence:.2f} -> {new_confidence:.2f})"
@@ -547,6 +1115,7 @@ class SemanticMemory:
                 (new_confidence, datetime.now().isoformat(), knowledge_id)
             )
 
+        self._cache.invalidate("knowledge")
         self.logger.debug(
             f"Recorded failure: {knowledge_id} "
             f"({current_confidence:.2f} -> {new_confidence:.2f})"
@@ -579,15 +1148,28 @@ class SemanticMemory:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                DELETE FROM semantic_knowledge
+                SELECT id FROM semantic_knowledge
                 WHERE project_id = ?
                 AND confidence < ?
                 AND created_at < ?
                 """,
                 (self.project_id, threshold, cutoff_date)
             )
-            pruned = cursor.rowcount
+            pruned_ids = [row["id"] for row in cursor.fetchall()]
+            cursor.executemany(
+                "DELETE FROM semantic_knowledge WHERE id = ?",
+                [(kid,) for kid in pruned_ids]
+            )
+            pruned = len(pruned_ids)
+            if self._vector_indexes:
+                cursor.executemany(
+                    "DELETE FROM semantic_vectors WHERE item_key = ?",
+                    [(kid,) for kid in pruned_ids]
+                )
 
+        if self._vector_indexes:
+            self._vector_indexes["knowledge"].remove(pruned_ids)
+        self._cache.invalidate("knowledge")
         self.logger.info(
             f"Pruned {pruned} low-confidence entries "
             f"(threshold={threshold}, age>{min_age_days}d)"
@@ -609,6 +1191,9 @@ class SemanticMemory:
         """
         Store reusable code pattern
 
+        Storing an existing pattern_name updates it in place, keeping its
+        ID, creation time and usage count.
+
         Args:
             pattern_name: Unique pattern identifier
             pattern_data: Pattern data (code, description, usage)
@@ -635,15 +1220,28 @@ class SemanticMemory:
         confidence = max(0.0, min(1.0, confidence))
         tags_json = json.dumps(tags or [])
         now = datetime.now().isoformat()
+        vector_key = f"pattern:{pattern_name}"
+        vector = (
+            self._pattern_vector(pattern_name, pattern_data, tags or [])
+            if self._vector_indexes else None
+        )
 
         with self.db.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO code_patterns
+                INSERT INTO code_patterns
                 (id, project_id, pattern_name, category, pattern_data,
                  confidence, created_at, updated_at, tags)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(pattern_name) DO UPDATE SET
+                    project_id = excluded.project_id,
+                    category = excluded.category,
+                    pattern_data = excluded.pattern_data,
+                    confidence = excluded.confidence,
+                    updated_at = excluded.updated_at,
+                    tags = excluded.tags
+                RETURNING id
                 """,
                 (
                     pattern_id,
@@ -657,7 +1255,13 @@ class SemanticMemory:
                     tags_json
                 )
             )
+            pattern_id = cursor.fetchone()[0]
+            if vector is not None:
+                row_index = self._stage_vector(conn, vector_key, "pattern", vector)
 
+        if vector is not None:
+            self._vector_indexes["pattern"].add(vector_key, row_index, vector)
+        self._cache.invalidate("patterns")
         self.logger.info(f"Stored pattern: {pattern_name}")
         return pattern_id
 
@@ -671,39 +1275,34 @@ class SemanticMemory:
         Returns:
             Pattern dictionary, or None if not found
         """
-        conn = self.db._get_connection()
-        cursor = conn.cursor()
+        cache_key = ("patterns", "name", pattern_name)
+        found, pattern = self._cache_get(cache_key)
 
-        cursor.execute(
-            """
-            SELECT * FROM code_patterns
-            WHERE project_id = ? AND pattern_name = ?
-            """,
-            (self.project_id, pattern_name)
-        )
+        if not found:
+            conn = self.db._get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT * FROM code_patterns
+                WHERE project_id = ? AND pattern_name = ?
+                """,
+                (self.project_id, pattern_name)
+            )
+
+            row = cursor.fetchone()
+            if not row:
+                return None
 
-        row = cursor.fetchone()
-        if row:
             pattern = dict(row)
             pattern["pattern_data"] = json.loads(pattern["pattern_data"])
             pattern["tags"] = json.loads(pattern.get("tags", "[]"))
+            self._cache_put(cache_key, pattern)
 
-            # Update usage count
-            with self.db.transaction() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    UPDATE code_patterns
-                    SET usage_count = usage_count + 1,
-                        updated_at = ?
-                    WHERE id = ?
-                    """,
-                    (datetime.now().isoformat(), pattern["id"])
-                )
-
-            return pattern
+        # Update usage count (buffered)
+        self._track_pattern_usage(pattern["id"])
 
-        return None
+        return copy.deepcopy(pattern)
 
     def list_patterns(
         self,
@@ -720,6 +1319,11 @@ class SemanticMemory:
         Returns:
             List of pattern dictionaries
         """
+        cache_key = ("patterns", "list", category, limit)
+        found, patterns = self._cache_get(cache_key)
+        if found:
+            return copy.deepcopy(patterns)
+
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
@@ -745,33 +1349,213 @@ class SemanticMemory:
             pattern["tags"] = json.loads(pattern.get("tags", "[]"))
             patterns.append(pattern)
 
+        self._cache_put(cache_key, patterns)
+        return copy.deepcopy(patterns)
+
+    def search_patterns(
+        self,
+        query: str,
+        limit: int = 10,
+        category: Optional[str] = None,
+        min_confidence: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Find code patterns by hashed-vector similarity
+
+        Args:
+            query: Free-text description of the pattern
+            limit: Maximum results
+            category: Optional category filter
+            min_confidence: Minimum confidence threshold
+
+        Returns:
+            List of pattern dictionaries with "score" (cosine similarity),
+            sorted by descending score
+
+        Example:
+            >>> memory.search_patterns("decorator for API errors", limit=3)
+        """
+        rows = self._vector_candidates(
+            "pattern", query, limit,
+            """
+            SELECT * FROM code_patterns
+            WHERE pattern_name IN ({placeholders}) AND project_id = ? AND confidence >= ?
+            """ + (" AND category = ?" if category else ""),
+            [self.project_id, min_confidence] + ([category] if category else [])
+        )
+
+        patterns = []
+        for row, score in rows[:limit]:
+            pattern = dict(row)
+            pattern["pattern_data"] = json.loads(pattern["pattern_data"])
+            pattern["tags"] = json.loads(pattern.get("tags", "[]"))
+            pattern["score"] = score
+            patterns.append(pattern)
         return patterns
 
+    def rebuild_vector_index(self) -> int:
+        """
+        Re-vectorize all knowledge and patterns and rewrite the matrix files
+
+        Needed only after changing how text is vectorized; dimension
+        changes are picked up automatically on startup.
+
+        Returns:
+            Number of vectors rebuilt
+        """
+        if not self._vector_indexes:
+            return 0
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "DELETE FROM semantic_vectors WHERE project_id = ?",
+                (self.project_id,)
+            )
+        for index in self._vector_indexes.values():
+            index.close()
+        self._vector_indexes = {}
+        self._initialize_vectors()
+        return sum(len(index) for index in self._vector_indexes.values())
+
+    def close(self) -> None:
+        """Write back buffered access counts and close the vector matrix files"""
+        self.flush_access_counts()
+        for index in self._vector_indexes.values():
+            index.close()
+
     # ========================================================================
     # Utility Methods
     # ========================================================================
 
+    def _cache_get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Look up a cached value (internal)"""
+        if not self.cache_config.enabled:
+            return False, None
+        return self._cache.get(key)
+
+    def _cache_put(self, key: Tuple, value: Any) -> None:
+        """Store a value in the cache (internal)"""
+        if self.cache_config.enabled:
+            self._cache.put(key, value)
+
     def _track_access(self, knowledge_id: str) -> None:
-        """Track knowledge access (internal)"""
-        with self.db.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE semantic_knowledge
-                SET access_count = access_count + 1,
-                    last_accessed_at = ?
-                WHERE id = ?
-                """,
-                (datetime.now().isoformat(), knowledge_id)
-            )
+        """Buffer a knowledge access for periodic write-back (internal)"""
+        with self._access_lock:
+            pending = self._pending_knowledge_access.setdefault(knowledge_id, [0, None])
+            pending[0] += 1
+            pending[1] = datetime.now().isoformat()
+            self._pending_access_total += 1
+        self._maybe_flush_access_counts()
+
+    def _track_pattern_usage(self, pattern_id: str) -> None:
+        """Buffer a pattern use for periodic write-back (internal)"""
+        with self._access_lock:
+            pending = self._pending_pattern_usage.setdefault(pattern_id, [0, None])
+            pending[0] += 1
+            pending[1] = datetime.now().isoformat()
+            self._pending_access_total += 1
+        self._maybe_flush_access_counts()
+
+    def _maybe_flush_access_counts(self) -> None:
+        """Write back buffered counts once the interval or threshold is hit"""
+        due = (
+            self._pending_access_total >= self.cache_config.access_flush_threshold
+            or time.monotonic() - self._last_access_flush
+            >= self.cache_config.access_flush_interval_seconds
+        )
+        if due:
+            self.flush_access_counts()
+
+    def flush_access_counts(self) -> int:
+        """
+        Write buffered access and usage counts to the database
+
+        The buffers are swapped out first and merged back if the write
+        fails, so no counts are lost. Cached lookups of the updated kind
+        are updated in place so they return the new counts.
+
+        Returns:
+            Number of rows updated
+        """
+        with self._access_lock:
+            knowledge_access = self._pending_knowledge_access
+            pattern_usage = self._pending_pattern_usage
+            self._pending_knowledge_access = {}
+            self._pending_pattern_usage = {}
+            self._pending_access_total = 0
+            self._last_access_flush = time.monotonic()
+
+        if not knowledge_access and not pattern_usage:
+            return 0
+
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    UPDATE semantic_knowledge
+                    SET access_count = access_count + ?,
+                        last_accessed_at = ?
+                    WHERE id = ?
+                    """,
+                    [(count, at, kid) for kid, (count, at) in knowledge_access.items()]
+                )
+                cursor.executemany(
+                    """
+                    UPDATE code_patterns
+                    SET usage_count = usage_count + ?,
+                        updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [(count, at, pid) for pid, (count, at) in pattern_usage.items()]
+                )
+        except Exception:
+            with self._access_lock:
+                for pending, failed in (
+                    (self._pending_knowledge_access, knowledge_access),
+                    (self._pending_pattern_usage, pattern_usage),
+                ):
+                    for key, (count, at) in failed.items():
+                        entry = pending.setdefault(key, [0, at])
+                        entry[0] += count
+                        self._pending_access_total += count
+            raise
+
+        if knowledge_access:
+            self._cache.update("knowledge", self._count_refresher(
+                knowledge_access, "access_count", "last_accessed_at"
+            ))
+        if pattern_usage:
+            self._cache.update("patterns", self._count_refresher(
+                pattern_usage, "usage_count", "updated_at"
+            ))
+        return len(knowledge_access) + len(pattern_usage)
+
+    @staticmethod
+    def _count_refresher(
+        flushed: Dict[str, List[Any]],
+        count_column: str,
+        time_column: str
+    ) -> Callable[[Any], None]:
+        """Function adding flushed counts to a cached row or row list (internal)"""
+        def apply(value: Any) -> None:
+            for row in value if isinstance(value, list) else [value]:
+                entry = flushed.get(row.get("id")) if isinstance(row, dict) else None
+                if entry:
+                    row[count_column] = (row.get(count_column) or 0) + entry[0]
+                    row[time_column] = entry[1]
+        return apply
 
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get semantic memory statistics
 
         Returns:
-            Statistics dictionary
+            Statistics dictionary (including lookup cache counters)
         """
+        # Report access counts that are still buffered
+        self.flush_access_counts()
+
         conn = self.db._get_connection()
         cursor = conn.cursor()
 
@@ -825,6 +1609,10 @@ class SemanticMemory:
             "knowledge": knowledge_stats,
             "patterns": pattern_stats,
             "categories": category_breakdown,
+            "cache": self._cache.stats(),
+            "vectors": {
+                kind: index.get_stats() for kind, index in self._vector_indexes.items()
+            },
             "project_id": self.project_id
         }
 
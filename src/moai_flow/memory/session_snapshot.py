@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Session Snapshots - Compact Binary Session State
+
+File format written by SwarmDB.persist_session_state and read by
+load_session_state (all integers little-endian):
+
+    Header   : magic b"MFSS" | version u16 | reserved u16 | created_ms i64
+    Records  : type u8 | length u32 | payload
+
+A file is one checkpoint segment (the full state) followed by zero or more
+delta segments (changes since the previous segment). Every segment starts
+with a SEGMENT record that carries its record count, so a segment cut
+short by a crash is ignored, and the next delta is written over it.
+Strings in payloads are u32 length-prefixed UTF-8; metadata is kept as its
+JSON text.
+
+Each segment records the last event id of every event table, so a delta
+picks up events in insertion order, including late events whose
+timestamps are older than the previous segment. Version 1 files (which
+kept a timestamp watermark) are still read, and the next persist
+replaces them with a checkpoint.
+
+Deltas are appended, so persisting a session costs only the rows that
+changed. After SnapshotConfig.max_deltas deltas the next persist writes a
+fresh checkpoint (temp file + atomic rename). Loading memory-maps the
+file and replays the segments.
+
+Example:
+    >>> db.persist_session_state()          # Checkpoint or delta
+    >>> state = load_session_state()        # Dict, or None if missing
+    >>> state["active_agents"], state["recent_events"]
+"""
+
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Default snapshot location (relative to the project root)
+DEFAULT_SNAPSHOT_PATH = Path(".moai/memory/moai-flow/session-state.snap")
+
+# Pre-snapshot JSON state file, still readable by load_session_state
+LEGACY_STATE_PATH = Path(".moai/memory/moai-flow/session-state.json")
+
+SNAPSHOT_MAGIC = b"MFSS"
+SNAPSHOT_VERSION = 2
+
+# Versions read_snapshot understands
+_READABLE_VERSIONS = (1, SNAPSHOT_VERSION)
+
+_HEADER = struct.Struct("<4sHHq")
+_RECORD = struct.Struct("<BI")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# Record types
+REC_SEGMENT = 1
+REC_AGENT = 2
+REC_AGENT_REMOVED = 3
+REC_EVENT = 4
+
+# Segment kinds
+SEGMENT_CHECKPOINT = 0
+SEGMENT_DELTA = 1
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class SnapshotConfig:
+    """
+    Session snapshot configuration.
+
+    Attributes:
+        max_deltas: Delta segments appended before a new checkpoint (default: 32)
+        recent_events: Most recent events kept in the state (default: 100)
+    """
+
+    max_deltas: int = 32
+    recent_events: int = 100
+
+
+@dataclass
+class SnapshotState:
+    """Session state replayed from a snapshot file."""
+
+    session_id: str = ""
+    timestamp_ms: int = 0
+    database_path: str = ""
+    agents: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    deltas: int = 0
+    events_watermark: Dict[str, int] = field(default_factory=dict)  # Last event id per table
+    agents_watermark: str = ""
+    version: int = SNAPSHOT_VERSION
+    length: int = 0  # File bytes up to the end of the last complete segment
+
+    def to_dict(self) -> Dict[str, Any]:
+        """State in the shape of the legacy session-state.json"""
+        return {
+            "session_id": self.session_id,
+            "timestamp": datetime.fromtimestamp(
+                self.timestamp_ms / 1000, tz=timezone.utc
+            ).isoformat(),
+            "active_agents": sorted(
+                self.agents.values(), key=lambda a: a["spawn_time"], reverse=True
+            ),
+            "recent_events": [
+                {k: v for k, v in event.items() if k != "timestamp_ms"}
+                for event in self.events
+            ],
+            "database_path": self.database_path,
+            "deltas": self.deltas,
+        }
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+def _pack_str(value: Optional[str]) -> bytes:
+    data = (value or "").encode("utf-8")
+    return _U32.pack(len(data)) + data
+
+
+def _record(rec_type: int, payload: bytes) -> bytes:
+    return _RECORD.pack(rec_type, len(payload)) + payload
+
+
+def encode_segment(
+    kind: int,
+    state: SnapshotState,
+    agents: List[Dict[str, Any]],
+    removed_agents: List[str],
+    events: List[Dict[str, Any]]
+) -> bytes:
+    """
+    Encode one segment (SEGMENT record followed by its data records)
+
+    Args:
+        kind: SEGMENT_CHECKPOINT or SEGMENT_DELTA
+        state: Segment metadata (session, time, watermarks)
+        agents: Active agents to add or replace (metadata as JSON text)
+        removed_agents: Agent ids no longer active
+        events: Events to add (metadata as JSON text)
+
+    Returns:
+        Encoded bytes
+    """
+    records = []
+    for agent in agents:
+        records.append(_record(REC_AGENT, b"".join((
+            _pack_str(agent["agent_id"]),
+            _pack_str(agent["agent_type"]),
+            _pack_str(agent["status"]),
+            _F64.pack(agent["spawn_time"] or 0.0),
+            _pack_str(agent["metadata"]),
+        ))))
+    for agent_id in removed_agents:
+        records.append(_record(REC_AGENT_REMOVED, _pack_str(agent_id)))
+    for event in events:
+        records.append(_record(REC_EVENT, b"".join((
+            _pack_str(event["event_id"]),
+            _pack_str(event["event_type"]),
+            _pack_str(event["agent_id"]),
+            _pack_str(event["timestamp"]),
+            _I64.pack(event["timestamp_ms"] or 0),
+            _pack_str(event["metadata"]),
+        ))))
+
+    segment = b"".join((
+        bytes((kind,)),
+        _U32.pack(len(records)),
+        _I64.pack(state.timestamp_ms),
+        _pack_str(json.dumps(state.events_watermark)),
+        _pack_str(state.agents_watermark),
+        _pack_str(state.session_id),
+        _pack_str(state.database_path),
+    ))
+    return _record(REC_SEGMENT, segment) + b"".join(records)
+
+
+def encode_header(created_ms: int) -> bytes:
+    """Encode the file header"""
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, created_ms)
+
+
+# ============================================================================
+# Decoding
+# ============================================================================
+
+class _Reader:
+    """Sequential field reader over a buffer"""
+
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf, pos: int = 0):
+        self.buf = buf
+        self.pos = pos
+
+    def u8(self) -> int:
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def u32(self) -> int:
+        value = _U32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def i64(self) -> int:
+        value = _I64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def f64(self) -> float:
+        value = _F64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def text(self) -> str:
+        length = self.u32()
+        value = bytes(self.buf[self.pos:self.pos + length]).decode("utf-8")
+        self.pos += length
+        return value
+
+
+def _iter_records(buf, start: int) -> Iterator[Tuple[int, int, int]]:
+    """Yield (type, payload_start, payload_end) until the data runs out"""
+    pos, end = start, len(buf)
+    while pos + _RECORD.size <= end:
+        rec_type, length = _RECORD.unpack_from(buf, pos)
+        payload = pos + _RECORD.size
+        if payload + length > end:
+            return  # Truncated tail
+        yield rec_type, payload, payload + length
+        pos = payload + length
+
+
+def _decode_metadata(raw: str) -> Dict[str, Any]:
+    try:
+        return json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _apply_segment(state: SnapshotState, kind: int, header: _Reader, records, buf) -> None:
+    """Apply one complete segment to state"""
+    state.timestamp_ms = header.i64()
+    if state.version == 1:
+        header.i64()  # Timestamp watermark, superseded by event ids
+        state.events_watermark = {}
+    else:
+        state.events_watermark = json.loads(header.text())
+    state.agents_watermark = header.text()
+    state.session_id = header.text()
+    state.database_path = header.text()
+
+    if kind == SEGMENT_CHECKPOINT:
+        state.agents = {}
+        state.events = []
+        state.deltas = 0
+    else:
+        state.deltas += 1
+
+    new_events = []
+    for rec_type, start, _ in records:
+        r = _Reader(buf, start)
+        if rec_type == REC_AGENT:
+            agent = {
+                "agent_id": r.text(),
+                "agent_type": r.text(),
+                "status": r.text(),
+                "spawn_time": r.f64(),
+                "metadata": _decode_metadata(r.text()),
+            }
+            state.agents[agent["agent_id"]] = agent
+        elif rec_type == REC_AGENT_REMOVED:
+            state.agents.pop(r.text(), None)
+        elif rec_type == REC_EVENT:
+            new_events.append({
+                "event_id": r.text(),
+                "event_type": r.text(),
+                "agent_id": r.text(),
+                "timestamp": r.text(),
+                "timestamp_ms": r.i64(),
+                "metadata": _decode_metadata(r.text()),
+            })
+
+    if new_events:
+        state.events = sorted(
+            new_events + state.events, key=lambda e: e["timestamp_ms"], reverse=True
+        )
+
+
+def read_snapshot(
+    path: Union[str, Path],
+    recent_events: Optional[int] = None
+) -> Optional[SnapshotState]:
+    """
+    Replay a snapshot file
+
+    Args:
+        path: Snapshot file
+        recent_events: Keep only this many newest events (None = all stored)
+
+    Returns:
+        SnapshotState, or None if the file is missing, empty or not a snapshot
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # Empty file
+
+        try:
+            if len(buf) < _HEADER.size:
+                return None
+            magic, version, _, _ = _HEADER.unpack_from(buf, 0)
+            if magic != SNAPSHOT_MAGIC or version not in _READABLE_VERSIONS:
+                return None
+
+            state = SnapshotState(version=version)
+            pending = None  # (kind, header reader, expected records, records)
+            seen_checkpoint = False
+            for rec_type, start, end in _iter_records(buf, _HEADER.size):
+                if rec_type == REC_SEGMENT:
+                    header = _Reader(buf, start)
+                    kind, expected = header.u8(), header.u32()
+                    pending = (kind, header, expected, [])
+                elif pending is not None:
+                    pending[3].append((rec_type, start, end))
+
+                if pending is not None and len(pending[3]) == pending[2]:
+                    kind, header, _, records = pending
+                    if kind == SEGMENT_CHECKPOINT or seen_checkpoint:
+                        _apply_segment(state, kind, header, records, buf)
+                        seen_checkpoint = True
+                    state.length = end
+                    pending = None
+                    if recent_events is not None:
+                        del state.events[recent_events:]
+        finally:
+            buf.close()
+
+    return state if seen_checkpoint else None
+
+
+def load_session_state(
+    path: Optional[Union[str, Path]] = None,
+    recent_events: Optional[int] = SnapshotConfig.recent_events
+) -> Optional[Dict[str, Any]]:
+    """
+    Load the last persisted session state
+
+    Memory-maps the binary snapshot and replays its segments. Falls back to
+    the legacy JSON state file when no snapshot exists.
+
+    Args:
+        path: Snapshot file (defaults to DEFAULT_SNAPSHOT_PATH)
+        recent_events: Keep only this many newest events (None = all stored,
+            default: 100)
+
+    Returns:
+        Dictionary with session_id, timestamp, active_agents, recent_events
+        and database_path, or None if nothing was persisted
+
+    Example:
+        >>> state = load_session_state()
+        >>> if state:
+        ...     print(len(state["active_agents"]), "agents were running")
+    """
+    path = Path(path) if path else DEFAULT_SNAPSHOT_PATH
+    state = read_snapshot(path, recent_events)
+    if state is not None:
+        return state.to_dict()
+
+    legacy = path.with_name(LEGACY_STATE_PATH.name)
+    if legacy.exists():
+        try:
+            return json.loads(legacy.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+    return None
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def write_checkpoint(path: Union[str, Path], segment: bytes, created_ms: int) -> None:
+    """Atomically replace path with a header and one checkpoint segment"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(encode_header(created_ms))
+        f.write(segment)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def append_delta(
+    path: Union[str, Path],
+    segment: bytes,
+    valid_length: Optional[int] = None
+) -> None:
+    """
+    Append a delta segment with a single write
+
+    Anything after the last complete segment (a record torn by a crash)
+    is truncated first; otherwise the reader would stop at the torn
+    record and never see the new segment.
+
+    Args:
+        path: Snapshot file holding a checkpoint
+        segment: Encoded delta segment
+        valid_length: SnapshotState.length from a read_snapshot() of path
+            (read here when not given)
+
+    Raises:
+        ValueError: If path holds no readable checkpoint
+    """
+    if valid_length is None:
+        state = read_snapshot(path, recent_events=0)
+        if state is None:
+            raise ValueError(f"No snapshot checkpoint to append to: {path}")
+        valid_length = state.length
+
+    with open(path, "r+b") as f:
+        if f.seek(0, os.SEEK_END) > valid_length:
+            f.truncate(valid_length)
+            f.seek(valid_length)
+        f.write(segment)
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+StorageEngine - Shared SQLite Storage Layer for MoAI-Flow
+
+One engine per database file, shared by every component that stores data
+in it (SwarmDB, MetricsStorage, MetricsPersistence):
+- Connections and pragmas (bounded WAL pool via ConnectionManager)
+- Read/write separation (read-only query connections)
+- Versioned schema migrations per component
+- A group-commit writer that batches writes from several components into
+  one transaction (one fsync)
+- batch(): run many transaction() blocks on one thread as a single commit,
+  each isolated by a savepoint (used by AsyncSwarmDB)
+
+Components opened on the same path get the same engine from
+``StorageEngine.open()``, so they share file handles, run schema work once
+per process and, when a writer is running, commit metrics and lifecycle
+events together. The engine closes when its last user releases it.
+
+Example:
+    >>> engine = StorageEngine.open(Path(".moai/memory/swarm.db"))
+    >>> engine.apply_schema("my_component", "1.0.0", create_tables)
+    >>> channel = engine.open_channel("events", write_rows)
+    >>> channel.submit(row)  # Committed by the shared writer
+    >>> engine.flush()
+    >>> engine.release()
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Tuple, Union
+
+from .connection_manager import ConnectionConfig, ConnectionManager
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class GroupCommitConfig:
+    """
+    Group-commit writer configuration.
+
+    The writer belongs to the StorageEngine, so every component writing
+    through it shares its batches; the first component to start the writer
+    decides its configuration.
+
+    Attributes:
+        enabled: Enable background group-commit writer (default: False)
+        max_batch_size: Maximum items committed per transaction (default: 200)
+        flush_interval_ms: Maximum time an item waits before commit (default: 50.0)
+        max_queue_size: Bounded queue size; producers block when full (default: 10000)
+        put_timeout_seconds: Time to block on a full queue before writing
+            synchronously, raising write errors to the caller (default: 5.0)
+    """
+
+    enabled: bool = False
+    max_batch_size: int = 200
+    flush_interval_ms: float = 50.0
+    max_queue_size: int = 10000
+    put_timeout_seconds: float = 5.0
+
+
+# Sentinel used to stop the group-commit writer thread
+_STOP_WRITER = object()
+
+# Sentinel waking the writer so flush() does not wait out its interval
+_WAKE_WRITER = object()
+
+SCHEMA_VERSIONS_SQL = """
+CREATE TABLE IF NOT EXISTS storage_schema_versions (
+    component TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Handler writing a batch of one channel's items on the writer connection
+BatchHandler = Callable[[sqlite3.Connection, List[Any]], None]
+
+
+def to_epoch_ms(value: Union[str, datetime]) -> int:
+    """
+    Convert an ISO8601 string or datetime to epoch milliseconds.
+
+    Naive values are local time, as datetime.now() returns them; SQL
+    backfills and triggers read them the same way (julianday(..., 'utc')).
+
+    Raises:
+        ValueError: If the value is not a valid ISO8601 timestamp
+    """
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(str(value))
+    # timestamp() reads naive values as local time
+    return round(moment.timestamp() * 1000)
+
+
+# ============================================================================
+# Write Channels
+# ============================================================================
+
+class WriteChannel:
+    """
+    A component's handle on the engine's group-commit writer.
+
+    Items submitted to a channel are written by its handler, batched with
+    items from every other channel of the same engine. Counters are kept
+    per channel so each component reports its own throughput.
+    """
+
+    def __init__(self, engine: "StorageEngine", name: str, handler: BatchHandler):
+        self.engine = engine
+        self.name = name
+        self.handler = handler
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "sync_fallbacks": 0,
+            "write_errors": 0,
+            "dropped": 0,
+        }
+
+    def submit(self, item: Any) -> None:
+        """Queue one item for the next group commit"""
+        self.engine._enqueue(self, item)
+
+    def submit_many(self, items: Iterable[Any]) -> None:
+        """Queue several items for the next group commit"""
+        for item in items:
+            self.engine._enqueue(self, item)
+
+
+# ============================================================================
+# StorageEngine Implementation
+# ============================================================================
+
+class StorageEngine:
+    """
+    Shared connection pool, schema registry and group-commit writer for one
+    SQLite database.
+
+    Features:
+    - One engine per database file via open()/release() reference counting
+    - Read-write and read-only connections (ConnectionManager)
+    - apply_schema(): per-component versioned migrations, run once
+    - Group-commit writer with per-component write channels
+    """
+
+    _registry: ClassVar[Dict[str, "StorageEngine"]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        connection_config: Optional[ConnectionConfig] = None
+    ):
+        """
+        Initialize StorageEngine
+
+        Prefer StorageEngine.open(), which shares engines between components.
+
+        Args:
+            db_path: Path to SQLite database file, or ":memory:"
+            connection_config: Pool and pragma configuration (defaults to ConnectionConfig())
+        """
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._connections = ConnectionManager(db_path, connection_config)
+        self._users = 0
+        self._registry_key: Optional[str] = None
+        self._local = threading.local()
+
+        # Schema state: (component, version) pairs applied by this process
+        self._schema_lock = threading.Lock()
+        self._applied_schemas: set = set()
+
+        # Group-commit writer state
+        self.writer_config: Optional[GroupCommitConfig] = None
+        self._queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._pending_cond = threading.Condition()
+        self._pending_items = 0
+        self._flush_requested = threading.Event()
+        self._writer_stats = {
+            "items_enqueued": 0,
+            "items_written": 0,
+            "batches_committed": 0,
+            "sync_fallbacks": 0,
+            "write_errors": 0,
+            "items_dropped": 0,
+        }
+
+    @classmethod
+    def open(
+        cls,
+        db_path: Union[str, Path],
+        connection_config: Optional[ConnectionConfig] = None
+    ) -> "StorageEngine":
+        """
+        Get the shared engine for a database file, creating it if needed
+
+        The first caller's connection_config is used; later callers share
+        the existing pool. In-memory databases are never shared. Every
+        open() must be paired with release().
+
+        Args:
+            db_path: Path to SQLite database file, or ":memory:"
+            connection_config: Pool and pragma configuration for a new engine
+
+        Returns:
+            StorageEngine with its user count incremented
+        """
+        if str(db_path) == ":memory:":
+            engine = cls(db_path, connection_config)
+            engine._users = 1
+            return engine
+
+        key = str(Path(db_path).resolve())
+        with cls._registry_lock:
+            engine = cls._registry.get(key)
+            if engine is None:
+                engine = cls(db_path, connection_config)
+                engine._registry_key = key
+                cls._registry[key] = engine
+            engine._users += 1
+            return engine
+
+    def acquire(self) -> "StorageEngine":
+        """Register another user of this engine (paired with release())"""
+        with self._registry_lock:
+            self._users += 1
+        return self
+
+    def release(self) -> None:
+        """Drop one user; the last release flushes the writer and closes the engine"""
+        with self._registry_lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+            if self._registry_key is not None:
+                self._registry.pop(self._registry_key, None)
+        self.close()
+
+    # ========================================================================
+    # Connections
+    # ========================================================================
+
+    @property
+    def is_memory(self) -> bool:
+        """True for in-memory databases (single shared connection)"""
+        return self._connections.is_memory
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's read-write connection"""
+        return self._connections.get_connection()
+
+    def get_read_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection for queries"""
+        return self._connections.get_read_connection()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager for a read-write transaction
+
+        Inside batch() or another transaction() on the same thread (the
+        thread's connection is shared by every component) the transaction
+        becomes a savepoint: an exception rolls back only this block, and
+        the changes are committed by the outermost block.
+        """
+        conn = self.get_connection()
+        if getattr(self._local, "batch_depth", 0) or getattr(self._local, "tx_open", False):
+            with self._savepoint(conn):
+                yield conn
+            return
+
+        self._local.tx_open = True
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"Transaction rolled back: {e}")
+            raise
+        finally:
+            self._local.tx_open = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Commit every transaction() run by this thread inside the block at once
+
+        Used to coalesce many small writes into one commit. Nested batch()
+        blocks join the outermost one, as does a batch() inside a
+        transaction(). An exception escaping the block rolls back the whole
+        batch.
+
+        Example:
+            >>> with engine.batch():
+            ...     db.insert_event(event_a)  # Savepoint, not a commit
+            ...     db.store_memory(...)      # Savepoint, not a commit
+            ... # One COMMIT here
+        """
+        conn = self.get_connection()
+        depth = getattr(self._local, "batch_depth", 0)
+        self._local.batch_depth = depth + 1
+        try:
+            if depth or getattr(self._local, "tx_open", False):
+                # The enclosing batch or transaction commits
+                yield conn
+                return
+
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            self._local.batch_depth = depth
+
+    @contextmanager
+    def _savepoint(self, conn: sqlite3.Connection):
+        """Nested transaction scope inside batch() or transaction() (internal)"""
+        conn.execute("SAVEPOINT engine_tx")
+        try:
+            yield
+        except Exception as e:
+            # A stray commit() inside the block may have ended the transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK TO engine_tx")
+                conn.execute("RELEASE engine_tx")
+            self.logger.error(f"Transaction rolled back to savepoint: {e}")
+            raise
+        if conn.in_transaction:
+            conn.execute("RELEASE engine_tx")
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with open connection counts, reaped connections and waits
+        """
+        return self._connections.get_stats()
+
+    # ========================================================================
+    # Schema Migrations
+    # ========================================================================
+
+    def apply_schema(
+        self,
+        component: str,
+        version: str,
+        migrate: Callable[[sqlite3.Connection], None]
+    ) -> bool:
+        """
+        Run a component's schema migration unless it is already at version
+
+        The version applied is recorded in storage_schema_versions once
+        migrate() succeeds, so later opens (in this or any other process)
+        skip the schema work entirely. An interrupted migration is re-run.
+
+        Args:
+            component: Component name (e.g. "swarm_db")
+            version: Schema version the migration produces
+            migrate: Callable creating/upgrading the component's tables;
+                it may commit intermediate batches
+
+        Returns:
+            True if the migration ran, False if the schema was current
+        """
+        with self._schema_lock:
+            if (component, version) in self._applied_schemas:
+                return False
+
+            conn = self.get_connection()
+            conn.execute(SCHEMA_VERSIONS_SQL)
+            row = conn.execute(
+                "SELECT version FROM storage_schema_versions WHERE component = ?",
+                (component,)
+            ).fetchone()
+
+            ran = row is None or row[0] != version
+            if ran:
+                try:
+                    migrate(conn)
+                    conn.execute(
+                        """
+                        INSERT INTO storage_schema_versions (component, version)
+                        VALUES (?, ?)
+                        ON CONFLICT(component) DO UPDATE SET
+                            version = excluded.version,
+                            updated_at = CURRENT_TIMESTAMP
+                        """,
+                        (component, version)
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                self.logger.info(f"Applied {component} schema v{version}")
+
+            self._applied_schemas.add((component, version))
+            return ran
+
+    def get_schema_versions(self) -> Dict[str, str]:
+        """
+        Get the schema version recorded for each component
+
+        Returns:
+            Dictionary of component name to version
+        """
+        conn = self.get_connection()
+        conn.execute(SCHEMA_VERSIONS_SQL)
+        rows = conn.execute("SELECT component, version FROM storage_schema_versions")
+        return {row[0]: row[1] for row in rows}
+
+    # ========================================================================
+    # Group-Commit Writer
+    # ========================================================================
+
+    @property
+    def writer_running(self) -> bool:
+        """True while the group-commit writer thread is running"""
+        return self._writer_thread is not None
+
+    def open_channel(
+        self,
+        name: str,
+        handler: BatchHandler,
+        config: Optional[GroupCommitConfig] = None
+    ) -> WriteChannel:
+        """
+        Open a write channel, starting the group-commit writer if needed
+
+        Args:
+            name: Channel name used in logs (e.g. "agent_events")
+            handler: Writes a list of queued items on the given connection;
+                called inside the batch transaction, must not commit. If
+                a batch fails it is called again with subsets of its items
+            config: Writer configuration if this call starts the writer
+
+        Returns:
+            WriteChannel for submitting items
+        """
+        self.start_writer(config)
+        return WriteChannel(self, name, handler)
+
+    def start_writer(self, config: Optional[GroupCommitConfig] = None) -> None:
+        """Start the group-commit writer thread (no-op if already running)"""
+        with self._writer_lock:
+            if self._writer_thread is not None:
+                return
+
+            self.writer_config = config or GroupCommitConfig(enabled=True)
+            self._queue = queue.Queue(maxsize=self.writer_config.max_queue_size)
+            self._writer_thread = threading.Thread(
+                target=self._group_commit_loop,
+                name="StorageEngine-GroupCommit",
+                daemon=True
+            )
+            self._writer_thread.start()
+
+        self.logger.info(
+            f"Started group-commit writer for {self.db_path} "
+            f"(batch={self.writer_config.max_batch_size}, "
+            f"interval={self.writer_config.flush_interval_ms}ms)"
+        )
+
+    def _enqueue(self, channel: WriteChannel, item: Any) -> None:
+        """
+        Queue an item for the writer, writing synchronously if full (internal)
+
+        Synchronous writes (queue full, or writer stopped) raise to the
+        caller instead of being logged and dropped like background ones.
+        """
+        if self._writer_thread is None:
+            self._write_now(channel, item)
+            return
+
+        with self._pending_cond:
+            self._pending_items += 1
+
+        try:
+            self._queue.put(
+                (channel, item), timeout=self.writer_config.put_timeout_seconds
+            )
+        except queue.Full:
+            self._mark_done(1)
+            self.logger.warning(
+                f"Group-commit queue full, writing {channel.name} synchronously"
+            )
+            with self._pending_cond:
+                channel.stats["sync_fallbacks"] += 1
+                self._writer_stats["sync_fallbacks"] += 1
+            self._write_now(channel, item)
+            return
+
+        with self._pending_cond:
+            channel.stats["enqueued"] += 1
+            self._writer_stats["items_enqueued"] += 1
+
+    def _write_now(self, channel: WriteChannel, item: Any) -> None:
+        """Write one item in the calling thread, raising on failure (internal)"""
+        try:
+            with self.transaction() as conn:
+                channel.handler(conn, [item])
+        except Exception:
+            with self._pending_cond:
+                channel.stats["write_errors"] += 1
+                self._writer_stats["write_errors"] += 1
+            raise
+
+        with self._pending_cond:
+            channel.stats["written"] += 1
+            channel.stats["batches"] += 1
+            self._writer_stats["items_written"] += 1
+            self._writer_stats["batches_committed"] += 1
+
+    def _mark_done(self, count: int) -> None:
+        """Decrement pending item count and wake flush() waiters (internal)"""
+        with self._pending_cond:
+            self._pending_items -= count
+            if self._pending_items <= 0:
+                self._pending_items = 0
+                self._pending_cond.notify_all()
+
+    def _group_commit_loop(self) -> None:
+        """Background writer: commit queued items every N items or T milliseconds"""
+        max_batch = self.writer_config.max_batch_size
+        interval = self.writer_config.flush_interval_ms / 1000.0
+        stopping = False
+
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+
+            if first is _STOP_WRITER:
+                break
+            if first is _WAKE_WRITER:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + interval
+
+            while len(batch) < max_batch:
+                if self._flush_requested.is_set():
+                    remaining = 0.0
+                else:
+                    remaining = deadline - time.monotonic()
+
+                try:
+                    if remaining <= 0:
+                        entry = self._queue.get_nowait()
+                    else:
+                        entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if entry is _STOP_WRITER:
+                    stopping = True
+                    break
+                if entry is _WAKE_WRITER:
+                    break
+                batch.append(entry)
+
+            self._commit_batch(batch)
+            self._mark_done(len(batch))
+
+    def _commit_batch(self, batch: List[Tuple[WriteChannel, Any]]) -> None:
+        """
+        Write one batch, every channel's items in a single transaction (internal)
+
+        If the shared transaction fails, each channel is retried in its own
+        transaction, then each item of a failing channel on its own, so
+        only the items that cannot be written are dropped.
+        """
+        grouped: Dict[WriteChannel, List[Any]] = {}
+        for channel, item in batch:
+            grouped.setdefault(channel, []).append(item)
+
+        try:
+            with self.transaction() as conn:
+                for channel, items in grouped.items():
+                    channel.handler(conn, items)
+        except Exception as e:
+            self._writer_stats["write_errors"] += 1
+            names = ", ".join(channel.name for channel in grouped)
+            self.logger.error(f"Group commit of {len(batch)} items ({names}) failed: {e}")
+            if len(grouped) == 1:
+                (channel, items), = grouped.items()
+                self._retry_items(channel, items)
+            else:
+                for channel, items in grouped.items():
+                    self._retry_channel(channel, items)
+            return
+
+        for channel, items in grouped.items():
+            channel.stats["written"] += len(items)
+            channel.stats["batches"] += 1
+        self._writer_stats["items_written"] += len(batch)
+        self._writer_stats["batches_committed"] += 1
+
+    def _retry_channel(self, channel: WriteChannel, items: List[Any]) -> None:
+        """Write one channel's items of a failed batch on their own (internal)"""
+        try:
+            with self.transaction() as conn:
+                channel.handler(conn, items)
+        except Exception as e:
+            self.logger.error(f"Write of {len(items)} {channel.name} items failed: {e}")
+            self._retry_items(channel, items)
+            return
+
+        channel.stats["written"] += len(items)
+        channel.stats["batches"] += 1
+        self._writer_stats["items_written"] += len(items)
+        self._writer_stats["batches_committed"] += 1
+
+    def _retry_items(self, channel: WriteChannel, items: List[Any]) -> None:
+        """Write a failed channel's items one at a time, dropping bad ones (internal)"""
+        channel.stats["write_errors"] += 1
+        written = 0
+        if len(items) > 1:
+            for item in items:
+                try:
+                    with self.transaction() as conn:
+                        channel.handler(conn, [item])
+                except Exception as e:
+                    self.logger.error(f"Dropped {channel.name} item: {e}")
+                else:
+                    written += 1
+
+        dropped = len(items) - written
+        channel.stats["dropped"] += dropped
+        self._writer_stats["items_dropped"] += dropped
+        if written:
+            channel.stats["written"] += written
+            channel.stats["batches"] += 1
+            self._writer_stats["items_written"] += written
+            self._writer_stats["batches_committed"] += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued item has been committed
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        if self._writer_thread is None:
+            return True
+        with self._pending_cond:
+            if self._pending_items == 0:
+                return True
+
+        self._flush_requested.set()
+        try:
+            # A full queue means the writer is busy and will not wait
+            self._queue.put_nowait(_WAKE_WRITER)
+        except queue.Full:
+            pass
+        try:
+            with self._pending_cond:
+                return self._pending_cond.wait_for(
+                    lambda: self._pending_items == 0, timeout=timeout
+                )
+        finally:
+            self._flush_requested.clear()
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """
+        Get group-commit writer statistics (all channels)
+
+        Returns:
+            Dictionary with enqueued/written/batch counters and queue depth
+        """
+        stats = dict(self._writer_stats)
+        stats["running"] = self._writer_thread is not None
+        stats["queue_depth"] = self._queue.qsize() if self._queue else 0
+        stats["pending_items"] = self._pending_items
+        return stats
+
+    def _stop_writer(self) -> None:
+        """Drain queued items and stop the writer thread (internal)"""
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is None:
+                return
+            self._queue.put(_STOP_WRITER)
+            thread.join()
+            self._writer_thread = None
+
+        # Items enqueued after the sentinel are written synchronously
+        leftover = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP_WRITER and entry is not _WAKE_WRITER:
+                leftover.append(entry)
+        if leftover:
+            self._commit_batch(leftover)
+            self._mark_done(len(leftover))
+
+    # ========================================================================
+    # Shutdown
+    # ========================================================================
+
+    def close(self) -> None:
+        """Stop the writer (committing queued items) and close all connections"""
+        self._stop_writer()
+        self._connections.close_all()
+        self.logger.debug(f"Storage engine for {self.db_path} closed")
@@ -7,47 +7,129 @@ Provides persistent storage for:
 - Cross-session memory and context
 - Agent communication logs
 - Resource utilization metrics
-- Phase 6A Observability metrics (task, agent, swarm-level)
-
-Phase 6A Observability Extensions:
-- Task metrics: duration, result, token usage, files changed
-- Agent metrics: success rates, error counts, performance stats
-- Swarm metrics: health, throughput, latency, resource utilization
-- Optimized time-series indexing for fast queries
-- 30-day default retention with auto-cleanup
 
 Integration Points:
 - SemanticMemory: Long-term knowledge patterns
 - EpisodicMemory: Event and decision history
 - ContextHints: Session hints and user preferences
-- MetricsStorage: Dedicated metrics persistence (Phase 6A)
+- MetricsStorage: Owns the task/agent/swarm metrics tables (Phase 6A);
+  open it on the same file to share SwarmDB's StorageEngine
 
 Architecture:
 - SQLite backend for simplicity and zero-dependency deployment
-- Thread-safe operations with connection pooling
-- Schema migrations for version compatibility
+- Shared StorageEngine per database file (connection pool, group-commit
+  writer, versioned schema migrations)
+- Read-only connections for queries (readers never block the writer)
 - JSON storage for flexible event metadata
 - Optimized indexing for time-series queries
 
-Schema Version: 2.0.0 (Phase 6A Extended)
+Schema Version: 3.1.0 (metrics tables moved to MetricsStorage)
 """
 
 import json
 import logging
 import sqlite3
 import threading
+import time
+import uuid
+import weakref
+from collections.abc import Mapping
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .connection_manager import ConnectionConfig
+from . import session_snapshot as snapshots
+from .session_snapshot import SnapshotConfig, SnapshotState
+from .storage_engine import GroupCommitConfig, StorageEngine, WriteChannel
+from .storage_engine import to_epoch_ms as _to_epoch_ms
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class SessionMemoryConfig:
+    """
+    Session memory storage configuration.
+
+    Each (session_id, memory_type, key) has exactly one live row that is
+    updated in place. Optionally, the last K versions of each key are kept
+    in session_memory_history. Rows stored with ttl_hours get an indexed
+    expires_at; expired rows are hidden from reads and deleted by the
+    sweeper in small batches.
+
+    Attributes:
+        history_versions: Versions kept per key in history, 0 disables (default: 0)
+        ttl_sweeper_enabled: Run the background expiry sweeper (default: False)
+        sweep_interval_seconds: Time between sweeper runs (default: 60.0)
+        sweep_batch_size: Expired rows deleted per transaction (default: 500)
+        sweep_pause_ms: Pause between batches to release the write lock (default: 10.0)
+    """
+
+    history_versions: int = 0
+    ttl_sweeper_enabled: bool = False
+    sweep_interval_seconds: float = 60.0
+    sweep_batch_size: int = 500
+    sweep_pause_ms: float = 10.0
+
+
+_PARTITION_GRANULARITIES = ("month", "week", "day")
+
+
+@dataclass
+class EventPartitionConfig:
+    """
+    Time-partitioned agent event storage configuration.
+
+    When enabled, agent events are written to one table per time range
+    (e.g. agent_events_2025_01) registered in agent_event_partitions.
+    Retention drops whole partitions instead of deleting rows, and
+    time-bounded queries only touch overlapping partitions. Partitioning is
+    recorded in schema_info, so a partitioned database stays partitioned
+    for every SwarmDB that opens it.
+
+    Attributes:
+        enabled: Partition agent events by time (default: False)
+        granularity: Partition size, "month" | "week" | "day" (default: "month")
+    """
+
+    enabled: bool = False
+    granularity: str = "month"
+
+    def __post_init__(self):
+        if self.granularity not in _PARTITION_GRANULARITIES:
+            raise ValueError(
+                f"Invalid partition granularity: {self.granularity} "
+                f"(expected one of {', '.join(_PARTITION_GRANULARITIES)})"
+            )
+
+
+# Rows copied per statement when moving legacy events into partitions
+_PARTITION_MIGRATION_CHUNK = 5000
+
+_EVENT_COLUMNS = (
+    "id, event_id, event_type, agent_id, agent_type, timestamp, timestamp_ms, metadata, created_at"
+)
+
+# Rows backfilled per transaction by the schema v3 timestamp migration
+_MIGRATION_BATCH_SIZE = 5000
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO {table}
+    (event_id, event_type, agent_id, agent_type, timestamp, metadata, timestamp_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 # ============================================================================
 # Database Schema
 # ============================================================================
 
-SCHEMA_VERSION = "2.0.0"
+SCHEMA_VERSION = "3.1.0"
 
 SCHEMA_SQL = """
 -- Agent lifecycle events table
@@ -57,14 +139,19 @@ CREATE TABLE IF NOT EXISTS agent_events (
     event_type TEXT NOT NULL,  -- 'spawn' | 'complete' | 'error'
     agent_id TEXT NOT NULL,
     agent_type TEXT NOT NULL,
-    timestamp TEXT NOT NULL,  -- ISO8601 format
+    timestamp TEXT NOT NULL,  -- ISO8601 format, as supplied
+    timestamp_ms INTEGER,  -- Epoch milliseconds (UTC), used for ordering and ranges
     metadata TEXT,  -- JSON blob
     created_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_agent_events_agent_id ON agent_events(agent_id);
-CREATE INDEX IF NOT EXISTS idx_agent_events_event_type ON agent_events(event_type);
-CREATE INDEX IF NOT EXISTS idx_agent_events_timestamp ON agent_events(timestamp);
+-- Time partitions of agent_events (see EventPartitionConfig)
+CREATE TABLE IF NOT EXISTS agent_event_partitions (
+    name TEXT PRIMARY KEY,
+    range_start TEXT NOT NULL,  -- Inclusive ISO8601 lower bound
+    range_end TEXT NOT NULL,  -- Exclusive ISO8601 upper bound
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
 
 -- Agent state registry (current/active agents)
 CREATE TABLE IF NOT EXISTS agent_registry (
@@ -81,7 +168,8 @@ CREATE TABLE IF NOT EXISTS agent_registry (
 CREATE INDEX IF NOT EXISTS idx_agent_registry_status ON agent_registry(status);
 CREATE INDEX IF NOT EXISTS idx_agent_registry_agent_type ON agent_registry(agent_type);
 
--- Cross-session memory (future integration)
+-- Cross-session memory (one live row per session/type/key, see
+-- _migrate_session_memory for the unique index)
 CREATE TABLE IF NOT EXISTS session_memory (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     session_id TEXT NOT NULL,
@@ -89,56 +177,27 @@ CREATE TABLE IF NOT EXISTS session_memory (
     key TEXT NOT NULL,
     value TEXT,  -- JSON blob
     timestamp TEXT NOT NULL,
+    timestamp_ms INTEGER,  -- Epoch milliseconds (UTC)
     ttl_hours INTEGER,  -- Time-to-live in hours (NULL = permanent)
-    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1,  -- Incremented on every upsert
+    expires_at REAL  -- Unix time derived from ttl_hours (NULL = permanent)
 );
 
-CREATE INDEX IF NOT EXISTS idx_session_memory_session_id ON session_memory(session_id);
 CREATE INDEX IF NOT EXISTS idx_session_memory_memory_type ON session_memory(memory_type);
 CREATE INDEX IF NOT EXISTS idx_session_memory_key ON session_memory(key);
 
--- Task metrics table (Phase 6A Observability)
-CREATE TABLE IF NOT EXISTS task_metrics (
-    task_id TEXT NOT NULL,
-    agent_id TEXT NOT NULL,
-    duration_ms INTEGER,
-    result TEXT NOT NULL,  -- 'success' | 'failure' | 'timeout' | 'cancelled'
-    tokens_used INTEGER DEFAULT 0,
-    files_changed INTEGER DEFAULT 0,
-    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (task_id, timestamp)
-);
-
-CREATE INDEX IF NOT EXISTS idx_task_metrics_agent ON task_metrics(agent_id, timestamp);
-CREATE INDEX IF NOT EXISTS idx_task_metrics_time ON task_metrics(timestamp);
-CREATE INDEX IF NOT EXISTS idx_task_metrics_result ON task_metrics(result, timestamp);
-
--- Agent metrics table (Phase 6A Observability)
-CREATE TABLE IF NOT EXISTS agent_metrics (
-    metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    agent_id TEXT NOT NULL,
-    metric_type TEXT NOT NULL,  -- 'duration' | 'success_rate' | 'error_count' | 'throughput'
-    value REAL NOT NULL,
-    metadata TEXT,  -- JSON blob for additional data
-    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE INDEX IF NOT EXISTS idx_agent_metrics_agent ON agent_metrics(agent_id, metric_type, timestamp);
-CREATE INDEX IF NOT EXISTS idx_agent_metrics_type ON agent_metrics(metric_type, timestamp);
-
--- Swarm metrics table (Phase 6A Observability)
-CREATE TABLE IF NOT EXISTS swarm_metrics (
-    metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
-    swarm_id TEXT NOT NULL,
-    metric_type TEXT NOT NULL,  -- 'health' | 'throughput' | 'latency' | 'resource'
-    value REAL NOT NULL,
-    metadata TEXT,  -- JSON blob for additional data
-    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+-- Previous versions of session memory (opt-in, last K per key)
+CREATE TABLE IF NOT EXISTS session_memory_history (
+    session_id TEXT NOT NULL,
+    memory_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value TEXT,  -- JSON blob
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (session_id, memory_type, key, version)
 );
 
-CREATE INDEX IF NOT EXISTS idx_swarm_metrics_swarm ON swarm_metrics(swarm_id, metric_type, timestamp);
-CREATE INDEX IF NOT EXISTS idx_swarm_metrics_type ON swarm_metrics(metric_type, timestamp);
-
 -- Schema version tracking
 CREATE TABLE IF NOT EXISTS schema_info (
     key TEXT PRIMARY KEY,
@@ -149,6 +208,163 @@ CREATE TABLE IF NOT EXISTS schema_info (
 INSERT OR REPLACE INTO schema_info (key, value) VALUES ('version', ?);
 """
 
+# Schema v3 indexes on epoch-millisecond columns, created once the columns
+# exist and are backfilled (see SwarmDB._migrate_timestamps). Shapes match
+# get_events/iter_events (agent, type or time range, ordered by time); the
+# trailing event_type makes per-agent counts covering.
+# They are ascending on purpose: SQLite walks them backwards for
+# newest-first scans, and the implicit rowid then matches the id tie-break.
+EVENT_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_{name}_agent_time
+    ON {name}(agent_id, timestamp_ms, event_type);
+CREATE INDEX IF NOT EXISTS idx_{name}_type_time ON {name}(event_type, timestamp_ms);
+CREATE INDEX IF NOT EXISTS idx_{name}_time ON {name}(timestamp_ms)
+"""
+
+SCHEMA_V3_INDEX_SQL = """
+-- Writers that predate schema v3 (or use raw SQL) omit timestamp_ms;
+-- naive timestamps are local time. Recreated so older bodies are replaced.
+DROP TRIGGER IF EXISTS trg_agent_events_timestamp_ms;
+CREATE TRIGGER trg_agent_events_timestamp_ms
+AFTER INSERT ON agent_events WHEN NEW.timestamp_ms IS NULL
+BEGIN
+    UPDATE agent_events
+    SET timestamp_ms = COALESCE(
+        CAST(ROUND((julianday(NEW.timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER),
+        CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER)
+    )
+    WHERE rowid = NEW.rowid;
+END
+"""
+
+# Indexes on TEXT timestamps (schema v2) replaced by the v3 indexes above
+_LEGACY_INDEXES = (
+    "idx_{name}_agent_id",
+    "idx_{name}_event_type",
+    "idx_{name}_timestamp",
+)
+_LEGACY_SCHEMA_INDEXES = (
+    "idx_session_memory_session_id",
+)
+
+# Tables whose TEXT timestamp is mirrored into timestamp_ms
+_TIMESTAMP_MS_TABLES = ("agent_events", "session_memory")
+
+# Phase 6A metrics tables created by SwarmDB before schema 3.1.0; they now
+# belong to MetricsStorage (see SwarmDB._release_metrics_tables)
+_LEGACY_METRICS_TABLES = ("task_metrics", "agent_metrics", "swarm_metrics")
+
+EVENT_PARTITION_SQL = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT UNIQUE NOT NULL,
+    event_type TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    agent_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    timestamp_ms INTEGER,
+    metadata TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _partition_for(granularity: str, timestamp_ms: int) -> Tuple[str, str, str]:
+    """
+    Map an event time to its partition.
+
+    Args:
+        granularity: "month" | "week" | "day"
+        timestamp_ms: Event time in epoch milliseconds
+
+    Returns:
+        Tuple of (table name, inclusive start, exclusive end) with ISO8601
+        date bounds (UTC)
+    """
+    day = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).date()
+
+    if granularity == "month":
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        name = f"agent_events_{start:%Y_%m}"
+    elif granularity == "week":
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+        iso_year, iso_week, _ = start.isocalendar()
+        name = f"agent_events_{iso_year}_w{iso_week:02d}"
+    else:
+        start = day
+        end = start + timedelta(days=1)
+        name = f"agent_events_{start:%Y_%m_%d}"
+
+    return name, start.isoformat(), end.isoformat()
+
+
+def _bound_ms(bound: str) -> int:
+    """Partition bound (an ISO8601 UTC date) to epoch milliseconds"""
+    return _to_epoch_ms(datetime.fromisoformat(bound).replace(tzinfo=timezone.utc))
+
+
+# ============================================================================
+# Event Records
+# ============================================================================
+
+_UNDECODED = object()
+
+
+class EventRecord(Mapping):
+    """
+    Read-only agent event row yielded by SwarmDB.iter_events.
+
+    Behaves like the dict returned by get_events, but the metadata JSON is
+    only decoded when "metadata" is accessed, so streaming consumers that
+    never look at it skip the parsing cost. Use raw_metadata for the stored
+    JSON text and to_dict() for a plain dict.
+    """
+
+    __slots__ = ("_row", "_metadata")
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+        self._metadata = _UNDECODED
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "metadata":
+            return self.metadata
+        try:
+            return self._row[key]
+        except IndexError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row.keys())
+
+    def __len__(self) -> int:
+        return len(self._row.keys())
+
+    def __repr__(self) -> str:
+        return f"EventRecord({self._row['event_id']!r}, {self._row['event_type']!r})"
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Decoded metadata (empty dict when missing or invalid)"""
+        if self._metadata is _UNDECODED:
+            raw = self._row["metadata"]
+            try:
+                self._metadata = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                self._metadata = {}
+        return self._metadata
+
+    @property
+    def raw_metadata(self) -> Optional[str]:
+        """Metadata JSON text as stored"""
+        return self._row["metadata"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with decoded metadata"""
+        return dict(self)
+
 
 # ============================================================================
 # SwarmDB Implementation
@@ -159,11 +375,13 @@ class SwarmDB:
     SQLite-based persistent storage for multi-agent coordination.
 
     Features:
-    - Thread-safe connection pooling
+    - Bounded WAL connection pool with read-only query connections
     - Automatic schema initialization
     - Transaction support
     - JSON metadata storage
     - Query helpers for common operations
+    - Bulk event ingestion and optional group-commit writer
+    - Optional time-partitioned event storage with partition-drop retention
 
     Example:
         >>> db = SwarmDB()
@@ -174,55 +392,129 @@ class SwarmDB:
         ...     "timestamp": "2025-01-01T00:00:00",
         ...     "metadata": {"prompt": "Design API"}
         ... })
+
+    Group commit (high-volume event logging):
+        >>> db = SwarmDB(group_commit=GroupCommitConfig(enabled=True))
+        >>> db.insert_event({...})  # Queued, committed in batches
+        >>> db.flush()  # Block until all queued events are durable
+
+    Partitioned events (retention drops whole months):
+        >>> db = SwarmDB(partition_config=EventPartitionConfig(enabled=True))
+        >>> db.get_events(since="2025-01-01T00:00:00")  # Scans overlapping partitions only
+        >>> db.cleanup_old_events(days=30)  # DROP TABLE per expired partition
+
+    Shared storage (one pool and group commit for events and metrics):
+        >>> db = SwarmDB(db_path=path, group_commit=GroupCommitConfig(enabled=True))
+        >>> metrics = MetricsPersistence(db_path=path)  # Same StorageEngine
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        group_commit: Optional[GroupCommitConfig] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        memory_config: Optional[SessionMemoryConfig] = None,
+        partition_config: Optional[EventPartitionConfig] = None,
+        snapshot_config: Optional[SnapshotConfig] = None,
+        engine: Optional[StorageEngine] = None
+    ):
         """
         Initialize SwarmDB
 
         Args:
             db_path: Path to SQLite database file (defaults to .moai/memory/swarm.db)
+            group_commit: Group-commit writer configuration (disabled by default)
+            connection_config: Connection pool configuration, used when this
+                SwarmDB opens the database's StorageEngine (defaults to ConnectionConfig())
+            memory_config: Session memory configuration (defaults to SessionMemoryConfig())
+            partition_config: Agent event partitioning (defaults to EventPartitionConfig())
+            snapshot_config: Session snapshot settings (defaults to SnapshotConfig())
+            engine: StorageEngine to run on (defaults to the shared engine for db_path)
         """
-        self.db_path = db_path or Path.cwd() / ".moai" / "memory" / "swarm.db"
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if engine is not None:
+            self.db_path = Path(engine.db_path)
+        else:
+            self.db_path = Path(db_path) if db_path else Path.cwd() / ".moai" / "memory" / "swarm.db"
+            if str(self.db_path) != ":memory:":
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.logger = logging.getLogger(__name__)
         self._lock = threading.RLock()
-        self._connection_pool: Dict[int, sqlite3.Connection] = {}
+        self._engine = engine.acquire() if engine else StorageEngine.open(
+            self.db_path, connection_config
+        )
+        self.memory_config = memory_config or SessionMemoryConfig()
+        self.snapshot_config = snapshot_config or SnapshotConfig()
+
+        # Event partitioning state (granularity is None when unpartitioned)
+        self.partition_config = partition_config or EventPartitionConfig()
+        self._partition_granularity: Optional[str] = None
+        self._known_partitions: set = set()
+
+        # TTL sweeper state
+        self._sweeper_thread: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+        self._sweeper_stats = {
+            "runs": 0,
+            "batches": 0,
+            "rows_deleted": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_run_duration_ms": 0.0,
+        }
+
+        # Group-commit channel on the engine's shared writer
+        self.group_commit_config = group_commit or GroupCommitConfig()
+        self._event_channel: Optional[WriteChannel] = None
+        self._close_hooks: List[Any] = []
+        self._vacuum_hooks: List[Any] = []
+        self._closed = False
 
         # Initialize schema
-        self._initialize_schema()
+        try:
+            self._initialize_schema()
+        except Exception:
+            self._engine.release()
+            raise
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
-        thread_id = threading.get_ident()
-
-        if thread_id not in self._connection_pool:
-            conn = sqlite3.connect(
-                str(self.db_path),
-                check_same_thread=False,
-                timeout=10.0
+        if self.group_commit_config.enabled:
+            self._event_channel = self._engine.open_channel(
+                "agent_events", self._write_event_rows, self.group_commit_config
             )
-            conn.row_factory = sqlite3.Row  # Enable dict-like row access
-            self._connection_pool[thread_id] = conn
 
-        return self._connection_pool[thread_id]
+        if self.memory_config.ttl_sweeper_enabled:
+            self._start_ttl_sweeper()
+
+    @property
+    def engine(self) -> StorageEngine:
+        """StorageEngine this SwarmDB runs on"""
+        return self._engine
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get thread-local read-write database connection"""
+        return self._engine.get_connection()
+
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Get thread-local read-only connection for queries"""
+        return self._engine.get_read_connection()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with open connection counts, reaped connections and waits
+        """
+        return self._engine.get_connection_stats()
 
     def _initialize_schema(self) -> None:
         """Initialize database schema"""
         with self._lock:
             try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-
-                # Execute schema with version
-                for statement in SCHEMA_SQL.split(';'):
-                    statement = statement.strip()
-                    if statement:
-                        # Replace version placeholder
-                        statement = statement.replace('?', f"'{SCHEMA_VERSION}'")
-                        cursor.execute(statement)
+                self._engine.apply_schema("swarm_db", SCHEMA_VERSION, self._migrate_schema)
 
+                conn = self._get_connection()
+                self._initialize_event_partitions(conn)
                 conn.commit()
                 self.logger.info(f"Initialized SwarmDB schema v{SCHEMA_VERSION}")
 
@@ -230,22 +522,385 @@ class SwarmDB:
                 self.logger.error(f"Failed to initialize schema: {e}")
                 raise
 
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """Create tables and upgrade older databases (run once per version by the engine)"""
+        cursor = conn.cursor()
+
+        # Execute schema with version
+        for statement in SCHEMA_SQL.split(';'):
+            statement = statement.strip()
+            if statement:
+                # Replace version placeholder
+                statement = statement.replace('?', f"'{SCHEMA_VERSION}'")
+                cursor.execute(statement)
+
+        self._migrate_session_memory(conn)
+        self._migrate_timestamps(conn)
+        self._release_metrics_tables(conn)
+
+    def _migrate_session_memory(self, conn: sqlite3.Connection) -> None:
+        """
+        Upgrade session_memory from append-only rows to one row per key.
+
+        Databases created before the unique index may contain many versions
+        per key; they are compacted once before the index is created.
+        """
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(session_memory)")}
+        if "version" not in columns:
+            conn.execute(
+                "ALTER TABLE session_memory ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+            )
+        if "expires_at" not in columns:
+            conn.execute("ALTER TABLE session_memory ADD COLUMN expires_at REAL")
+            # Backfill from the (local time) write timestamp
+            conn.execute(
+                """
+                UPDATE session_memory
+                SET expires_at = CAST(strftime('%s', timestamp, 'utc') AS REAL)
+                                 + ttl_hours * 3600
+                WHERE ttl_hours IS NOT NULL
+                """
+            )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_session_memory_expires_at
+            ON session_memory(expires_at) WHERE expires_at IS NOT NULL
+            """
+        )
+
+        has_unique_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            ("idx_session_memory_unique",)
+        ).fetchone()
+        if has_unique_index:
+            return
+
+        removed = self._compact_session_memory(conn, self.memory_config.history_versions)
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_session_memory_unique
+            ON session_memory(session_id, memory_type, key)
+            """
+        )
+        if removed:
+            self.logger.info(f"Compacted {removed} stale session memory rows")
+
+    def _migrate_timestamps(self, conn: sqlite3.Connection) -> None:
+        """
+        Upgrade TEXT time columns to schema v3 epoch milliseconds.
+
+        Adding the column is O(1); existing rows are then backfilled in
+        rowid ranges of _MIGRATION_BATCH_SIZE, committing after each batch
+        so other connections can write while a large database upgrades. The
+        backfill resumes where it stopped if interrupted. v3 indexes are
+        created once the columns are populated and the v2 TEXT timestamp
+        indexes are dropped.
+        """
+        partitions = [
+            row["name"] for row in conn.execute("SELECT name FROM agent_event_partitions")
+        ]
+        tables = list(_TIMESTAMP_MS_TABLES) + partitions
+
+        for table in tables:
+            columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if "timestamp_ms" not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN timestamp_ms INTEGER")
+        conn.commit()
+
+        state = conn.execute(
+            "SELECT value FROM schema_info WHERE key = 'timestamp_ms_backfill'"
+        ).fetchone()
+        if state is None or state["value"] != "complete":
+            backfilled = sum(self._backfill_timestamp_ms(conn, table) for table in tables)
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO schema_info (key, value)
+                VALUES ('timestamp_ms_backfill', 'complete')
+                """
+            )
+            if backfilled:
+                self.logger.info(f"Backfilled timestamp_ms for {backfilled} rows")
+
+        for index in _LEGACY_SCHEMA_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+        # executescript: the trigger bodies contain semicolons
+        conn.executescript(SCHEMA_V3_INDEX_SQL)
+        for table in ["agent_events"] + partitions:
+            for index in _LEGACY_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index.format(name=table)}")
+            self._create_event_indexes(conn, table)
+
+    def _backfill_timestamp_ms(self, conn: sqlite3.Connection, table: str) -> int:
+        """Fill NULL timestamp_ms from the TEXT timestamp in rowid batches (internal)"""
+        bounds = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {table}").fetchone()
+        if bounds[0] is None:
+            return 0
+
+        updated = 0
+        low, high = bounds
+        while low <= high:
+            cursor = conn.execute(
+                f"""
+                UPDATE {table}
+                SET timestamp_ms = CAST(ROUND((
+                    COALESCE(
+                        julianday(timestamp, 'utc'), julianday(created_at), julianday('now')
+                    )
+                    - 2440587.5) * 86400000) AS INTEGER)
+                WHERE rowid >= ? AND rowid < ? AND timestamp_ms IS NULL
+                """,
+                (low, low + _MIGRATION_BATCH_SIZE)
+            )
+            conn.commit()
+            updated += cursor.rowcount
+            low += _MIGRATION_BATCH_SIZE
+
+        return updated
+
+    def _create_event_indexes(self, conn: sqlite3.Connection, table: str) -> None:
+        """Create the v3 event indexes on agent_events or a partition (internal)"""
+        for statement in EVENT_INDEX_SQL.format(name=table).split(';'):
+            if statement.strip():
+                conn.execute(statement)
+
+    def _release_metrics_tables(self, conn: sqlite3.Connection) -> None:
+        """
+        Drop the empty Phase 6A metrics tables older schemas created.
+
+        MetricsStorage owns task/agent/swarm metrics now. Tables holding rows,
+        or belonging to a metrics component sharing this file, are left alone.
+        """
+        owners = conn.execute(
+            """
+            SELECT 1 FROM storage_schema_versions
+            WHERE component IN ('metrics_storage', 'metrics_persistence')
+            """
+        ).fetchone()
+        if owners:
+            return
+
+        for table in _LEGACY_METRICS_TABLES:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,)
+            ).fetchone()
+            if exists and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None:
+                conn.execute(f"DROP TABLE {table}")
+
     @contextmanager
     def transaction(self):
         """Context manager for database transactions"""
-        conn = self._get_connection()
-        try:
+        with self._engine.transaction() as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Transaction rolled back: {e}")
-            raise
+
+    # ========================================================================
+    # Event Partitions
+    # ========================================================================
+
+    def _initialize_event_partitions(self, conn: sqlite3.Connection) -> None:
+        """
+        Load (or enable) time partitioning of agent events.
+
+        Rows found in the unpartitioned agent_events table (an existing
+        database, or events written by an older SwarmDB) are moved into
+        their partitions so every event lives in exactly one time range.
+        """
+        row = conn.execute(
+            "SELECT value FROM schema_info WHERE key = 'event_partition_granularity'"
+        ).fetchone()
+
+        if row:
+            granularity = row["value"]
+            requested = self.partition_config.granularity
+            if self.partition_config.enabled and requested != granularity:
+                self.logger.warning(
+                    f"Ignoring partition granularity '{requested}': "
+                    f"database is partitioned by {granularity}"
+                )
+        elif self.partition_config.enabled:
+            granularity = self.partition_config.granularity
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO schema_info (key, value)
+                VALUES ('event_partition_granularity', ?)
+                """,
+                (granularity,)
+            )
+        else:
+            granularity = None
+
+        self._partition_granularity = granularity
+        if granularity is not None:
+            self._known_partitions = {
+                row["name"] for row in conn.execute("SELECT name FROM agent_event_partitions")
+            }
+            moved = self._move_events_into_partitions(conn)
+            if moved:
+                self.logger.info(f"Moved {moved} events into {granularity} partitions")
+
+        self._rebuild_events_view(conn)
+
+    def _move_events_into_partitions(self, conn: sqlite3.Connection) -> int:
+        """Move rows from the unpartitioned agent_events table (internal)"""
+        moved = 0
+        last_id = 0
+
+        while True:
+            rows = conn.execute(
+                f"""
+                SELECT {_EVENT_COLUMNS} FROM agent_events
+                WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                (last_id, _PARTITION_MIGRATION_CHUNK)
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            grouped: Dict[str, List[Tuple]] = {}
+            for row in rows:
+                name = self._ensure_partition(conn, row["timestamp_ms"])
+                grouped.setdefault(name, []).append(tuple(row)[1:])
+
+            for name, partition_rows in grouped.items():
+                conn.executemany(
+                    f"""
+                    INSERT INTO {name}
+                    (event_id, event_type, agent_id, agent_type, timestamp, timestamp_ms,
+                     metadata, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    partition_rows
+                )
+            moved += len(rows)
+
+        if moved:
+            # Unqualified DELETE truncates the table without visiting rows
+            conn.execute("DELETE FROM agent_events")
+        return moved
+
+    def _ensure_partition(self, conn: sqlite3.Connection, timestamp_ms: int) -> str:
+        """Create the partition holding timestamp_ms if needed, return its name (internal)"""
+        name, range_start, range_end = _partition_for(self._partition_granularity, timestamp_ms)
+        if name in self._known_partitions:
+            return name
+
+        conn.execute(EVENT_PARTITION_SQL.format(name=name))
+        self._create_event_indexes(conn, name)
+        inserted = conn.execute(
+            """
+            INSERT OR IGNORE INTO agent_event_partitions (name, range_start, range_end)
+            VALUES (?, ?, ?)
+            """,
+            (name, range_start, range_end)
+        ).rowcount
+        if inserted:
+            self._rebuild_events_view(conn)
+            self.logger.debug(f"Created event partition {name} [{range_start}, {range_end})")
+
+        self._known_partitions.add(name)
+        return name
+
+    def _rebuild_events_view(self, conn: sqlite3.Connection) -> None:
+        """Recreate agent_events_all as a UNION ALL over every partition (internal)"""
+        tables = ["agent_events"] + [
+            row["name"] for row in conn.execute(
+                "SELECT name FROM agent_event_partitions ORDER BY range_start"
+            )
+        ]
+        union = " UNION ALL ".join(f"SELECT {_EVENT_COLUMNS} FROM {table}" for table in tables)
+        conn.execute("DROP VIEW IF EXISTS agent_events_all")
+        conn.execute(f"CREATE VIEW agent_events_all AS {union}")
+
+    def _write_event_rows(self, conn: sqlite3.Connection, rows: List[Tuple]) -> None:
+        """Insert event rows, routing each to its time partition (internal)"""
+        if self._partition_granularity is None:
+            conn.executemany(_INSERT_EVENT_SQL.format(table="agent_events"), rows)
+            return
+
+        grouped: Dict[str, List[Tuple]] = {}
+        for row in rows:
+            grouped.setdefault(self._ensure_partition(conn, row[6]), []).append(row)
+
+        for name, partition_rows in grouped.items():
+            insert_sql = _INSERT_EVENT_SQL.format(table=name)
+            try:
+                conn.executemany(insert_sql, partition_rows)
+            except sqlite3.OperationalError as e:
+                if "no such table" not in str(e):
+                    raise
+                # Dropped by retention in another connection since we cached it
+                self._known_partitions.discard(name)
+                self._ensure_partition(conn, partition_rows[0][6])
+                conn.executemany(insert_sql, partition_rows)
+
+    def _event_sources(
+        self,
+        conn: sqlite3.Connection,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None
+    ) -> List[str]:
+        """Tables that may hold events in [since_ms, until_ms], newest first (internal)"""
+        if self._partition_granularity is None:
+            return ["agent_events"]
+
+        rows = conn.execute(
+            """
+            SELECT name, range_start, range_end FROM agent_event_partitions
+            ORDER BY range_start DESC
+            """
+        ).fetchall()
+
+        return [
+            row["name"] for row in rows
+            if (since_ms is None or _bound_ms(row["range_end"]) > since_ms)
+            and (until_ms is None or _bound_ms(row["range_start"]) <= until_ms)
+        ]
+
+    def get_event_partitions(self) -> List[Dict[str, Any]]:
+        """
+        List agent event partitions
+
+        Returns:
+            List of dicts with name, range_start and range_end, oldest first
+            (empty when events are not partitioned)
+        """
+        conn = self._get_read_connection()
+        cursor = conn.execute(
+            """
+            SELECT name, range_start, range_end FROM agent_event_partitions
+            ORDER BY range_start
+            """
+        )
+        return [dict(row) for row in cursor.fetchall()]
 
     # ========================================================================
     # Agent Event Operations
     # ========================================================================
 
+    def _build_event_row(
+        self,
+        event_data: Dict[str, Any],
+        event_id: Optional[str] = None
+    ) -> Tuple:
+        """Validate event data and build an agent_events row tuple (internal)"""
+        timestamp = event_data["timestamp"]
+        try:
+            timestamp_ms = _to_epoch_ms(timestamp)
+        except ValueError:
+            # Unparseable timestamps are ordered by arrival time
+            timestamp_ms = round(time.time() * 1000)
+
+        return (
+            event_id or str(uuid.uuid4()),
+            event_data["event_type"],
+            event_data["agent_id"],
+            event_data["agent_type"],
+            timestamp,
+            json.dumps(event_data.get("metadata", {})),
+            timestamp_ms
+        )
+
     def insert_event(
         self,
         event_data: Dict[str, Any],
@@ -254,6 +909,9 @@ class SwarmDB:
         """
         Insert agent lifecycle event
 
+        With group commit enabled the event is queued and committed by the
+        background writer; call flush() to wait for durability.
+
         Args:
             event_data: Event data dictionary with keys:
                 - event_type: 'spawn' | 'complete' | 'error'
@@ -266,79 +924,270 @@ class SwarmDB:
         Returns:
             event_id of inserted event
         """
-        import uuid
+        row = self._build_event_row(event_data, event_id)
+
+        if self._event_channel is not None:
+            self._event_channel.submit(row)
+        else:
+            with self.transaction() as conn:
+                self._write_event_rows(conn, [row])
+
+        self.logger.debug(f"Inserted event: {row[0]} ({row[1]})")
+        return row[0]
+
+    def insert_events(self, events: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Insert multiple agent lifecycle events in a single transaction
 
-        event_id = event_id or str(uuid.uuid4())
+        Args:
+            events: Iterable of event data dictionaries (see insert_event).
+                An optional "event_id" key is used as the event ID.
+
+        Returns:
+            List of event_ids in input order
+
+        Example:
+            >>> db.insert_events([
+            ...     {"event_type": "spawn", "agent_id": "a1", "agent_type": "expert-backend",
+            ...      "timestamp": "2025-01-01T00:00:00"},
+            ...     {"event_type": "complete", "agent_id": "a1", "agent_type": "expert-backend",
+            ...      "timestamp": "2025-01-01T00:00:05"},
+            ... ])
+        """
+        rows = [
+            self._build_event_row(event_data, event_data.get("event_id"))
+            for event_data in events
+        ]
+        if not rows:
+            return []
 
         with self.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO agent_events
-                (event_id, event_type, agent_id, agent_type, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event_id,
-                    event_data["event_type"],
-                    event_data["agent_id"],
-                    event_data["agent_type"],
-                    event_data["timestamp"],
-                    json.dumps(event_data.get("metadata", {}))
-                )
-            )
+            self._write_event_rows(conn, rows)
+
+        self.logger.debug(f"Inserted {len(rows)} events")
+        return [row[0] for row in rows]
+
+    # ========================================================================
+    # Group-Commit Writer
+    # ========================================================================
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued events have been committed
+
+        The writer is shared by every component on this database's
+        StorageEngine, so their queued writes are committed too.
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        if self._event_channel is None:
+            return True
+        return self._engine.flush(timeout)
+
+    def get_group_commit_stats(self) -> Dict[str, Any]:
+        """
+        Get group-commit writer statistics
+
+        Returns:
+            Dictionary with this SwarmDB's enqueued/written/batch counters
+            and the shared writer's queue depth
+        """
+        channel_stats = self._event_channel.stats if self._event_channel else {}
+        writer_stats = self._engine.get_writer_stats()
+        return {
+            "events_enqueued": channel_stats.get("enqueued", 0),
+            "events_written": channel_stats.get("written", 0),
+            "batches_committed": channel_stats.get("batches", 0),
+            "sync_fallbacks": channel_stats.get("sync_fallbacks", 0),
+            "write_errors": channel_stats.get("write_errors", 0),
+            "events_dropped": channel_stats.get("dropped", 0),
+            "enabled": self._event_channel is not None,
+            "queue_depth": writer_stats["queue_depth"],
+            "pending_events": writer_stats["pending_items"],
+        }
+
+    def iter_events(
+        self,
+        agent_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        columns: Optional[Iterable[str]] = None
+    ) -> Iterator[EventRecord]:
+        """
+        Stream agent events in (timestamp_ms, id) order
 
-        self.logger.debug(f"Inserted event: {event_id} ({event_data['event_type']})")
-        return event_id
+        Rows are fetched in pages of batch_size with keyset pagination, so
+        memory stays flat regardless of history size and no read transaction
+        is held between pages. Filters run in SQL; metadata JSON is decoded
+        lazily (see EventRecord). With partitioning enabled only partitions
+        overlapping [since, until] are visited.
+
+        Args:
+            agent_id: Filter by agent ID
+            event_type: Filter by event type
+            since: Only events at or after this time (ISO8601 or datetime)
+            until: Only events at or before this time (ISO8601 or datetime)
+            ascending: Oldest first instead of newest first
+            limit: Maximum number of events to yield (None = all)
+            batch_size: Rows fetched per query
+            columns: Columns to select (defaults to all; timestamp_ms and id
+                are always included for pagination)
+
+        Yields:
+            EventRecord per event
+
+        Raises:
+            ValueError: If since or until is not a valid timestamp
+
+        Example:
+            >>> for event in db.iter_events(agent_id="a1", ascending=True):
+            ...     replay(event["event_type"], event["timestamp"])
+        """
+        # Read-your-writes: commit any queued events first
+        self.flush()
+
+        since_ms = _to_epoch_ms(since) if since is not None else None
+        until_ms = _to_epoch_ms(until) if until is not None else None
+
+        if columns is None:
+            select = "*"
+        else:
+            wanted = list(columns)
+            select = ", ".join(wanted + [c for c in ("timestamp_ms", "id") if c not in wanted])
+
+        if ascending:
+            keyset, order = ">", "ASC"
+        else:
+            keyset, order = "<", "DESC"
+
+        conn = self._get_read_connection()
+        sources = self._event_sources(conn, since_ms, until_ms)
+        if ascending:
+            sources.reverse()
+
+        remaining = limit
+        for table in sources:
+            base = f"SELECT {select} FROM {table} WHERE 1=1"
+            params: List[Any] = []
+
+            if agent_id:
+                base += " AND agent_id = ?"
+                params.append(agent_id)
+
+            if event_type:
+                base += " AND event_type = ?"
+                params.append(event_type)
+
+            if since_ms is not None:
+                base += " AND timestamp_ms >= ?"
+                params.append(since_ms)
+
+            if until_ms is not None:
+                base += " AND timestamp_ms <= ?"
+                params.append(until_ms)
+
+            cursor_key: Optional[Tuple[int, int]] = None
+            while remaining is None or remaining > 0:
+                query = base
+                page_params = list(params)
+                if cursor_key is not None:
+                    query += f" AND (timestamp_ms, id) {keyset} (?, ?)"
+                    page_params.extend(cursor_key)
+
+                page_size = batch_size if remaining is None else min(batch_size, remaining)
+                query += f" ORDER BY timestamp_ms {order}, id {order} LIMIT ?"
+                page_params.append(page_size)
+
+                rows = conn.execute(query, page_params).fetchall()
+                for row in rows:
+                    yield EventRecord(row)
+
+                if remaining is not None:
+                    remaining -= len(rows)
+                if len(rows) < page_size:
+                    break
+                cursor_key = (rows[-1]["timestamp_ms"], rows[-1]["id"])
+
+            if remaining is not None and remaining <= 0:
+                return
 
     def get_events(
         self,
         agent_id: Optional[str] = None,
         event_type: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None
     ) -> List[Dict[str, Any]]:
         """
         Query agent events
 
+        Materializes up to ``limit`` events; use iter_events() to stream
+        larger result sets.
+
         Args:
             agent_id: Filter by agent ID
             event_type: Filter by event type
             limit: Maximum number of events to return
+            since: Only events at or after this time (ISO8601 or datetime)
+            until: Only events at or before this time (ISO8601 or datetime)
 
         Returns:
-            List of event dictionaries
+            List of event dictionaries, newest first
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM agent_events WHERE 1=1"
-        params = []
-
-        if agent_id:
-            query += " AND agent_id = ?"
-            params.append(agent_id)
+        return [
+            event.to_dict()
+            for event in self.iter_events(
+                agent_id=agent_id,
+                event_type=event_type,
+                since=since,
+                until=until,
+                limit=limit,
+                batch_size=max(limit, 1)
+            )
+        ]
 
-        if event_type:
-            query += " AND event_type = ?"
-            params.append(event_type)
+    def export_events(
+        self,
+        output_path: Union[str, Path],
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        agent_id: Optional[str] = None
+    ) -> int:
+        """
+        Stream events to a JSON Lines file, oldest first
 
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
+        Args:
+            output_path: Destination .jsonl file
+            since: Only events at or after this time (ISO8601 or datetime)
+            until: Only events at or before this time (ISO8601 or datetime)
+            agent_id: Filter by agent ID
 
-        cursor.execute(query, params)
+        Returns:
+            Number of events written
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        events = []
-        for row in cursor.fetchall():
-            event = dict(row)
-            # Parse JSON metadata
-            if event.get("metadata"):
-                try:
-                    event["metadata"] = json.loads(event["metadata"])
-                except json.JSONDecodeError:
-                    event["metadata"] = {}
-            events.append(event)
+        count = 0
+        with output_path.open("w") as f:
+            for event in self.iter_events(
+                agent_id=agent_id, since=since, until=until, ascending=True
+            ):
+                f.write(json.dumps(event.to_dict()))
+                f.write("\n")
+                count += 1
 
-        return events
+        self.logger.info(f"Exported {count} events to {output_path}")
+        return count
 
     # ========================================================================
     # Agent Registry Operations
@@ -352,8 +1201,6 @@ class SwarmDB:
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """Register agent in registry"""
-        import time
-
         with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -381,8 +1228,6 @@ class SwarmDB:
         duration_ms: Optional[int] = None
     ) -> None:
         """Update agent status"""
-        import time
-
         with self.transaction() as conn:
             cursor = conn.cursor()
 
@@ -412,7 +1257,7 @@ class SwarmDB:
 
     def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get agent from registry"""
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
         cursor.execute(
             "SELECT * FROM agent_registry WHERE agent_id = ?",
@@ -433,7 +1278,7 @@ class SwarmDB:
 
     def get_active_agents(self) -> List[Dict[str, Any]]:
         """Get all active (spawned/running) agents"""
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -456,7 +1301,7 @@ class SwarmDB:
         return agents
 
     # ========================================================================
-    # Session Memory Operations (Future Integration)
+    # Session Memory Operations
     # ========================================================================
 
     def store_memory(
@@ -466,27 +1311,76 @@ class SwarmDB:
         key: str,
         value: Any,
         ttl_hours: Optional[int] = None
-    ) -> None:
-        """Store session memory (future integration with SemanticMemory/EpisodicMemory)"""
+    ) -> int:
+        """
+        Store session memory, replacing the current value for the key
+
+        Args:
+            session_id: Session identifier
+            memory_type: Memory type ('semantic' | 'episodic' | 'context_hint')
+            key: Memory key
+            value: JSON-serializable value
+            ttl_hours: Time-to-live in hours (None = permanent)
+
+        Returns:
+            New version number of the key
+        """
+        history_versions = self.memory_config.history_versions
+        expires_at = time.time() + ttl_hours * 3600 if ttl_hours is not None else None
+        now = datetime.now()
+
         with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
                 INSERT INTO session_memory
-                (session_id, memory_type, key, value, timestamp, ttl_hours)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (session_id, memory_type, key, value, timestamp, timestamp_ms,
+                 ttl_hours, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(session_id, memory_type, key) DO UPDATE SET
+                    value = excluded.value,
+                    timestamp = excluded.timestamp,
+                    timestamp_ms = excluded.timestamp_ms,
+                    ttl_hours = excluded.ttl_hours,
+                    expires_at = excluded.expires_at,
+                    version = session_memory.version + 1
+                RETURNING version
                 """,
                 (
                     session_id,
                     memory_type,
                     key,
                     json.dumps(value),
-                    datetime.now().isoformat(),
-                    ttl_hours
+                    now.isoformat(),
+                    _to_epoch_ms(now),
+                    ttl_hours,
+                    expires_at
                 )
             )
+            version = cursor.fetchone()[0]
+
+            if history_versions > 0:
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO session_memory_history
+                    (session_id, memory_type, key, version, value, timestamp)
+                    SELECT session_id, memory_type, key, version, value, timestamp
+                    FROM session_memory
+                    WHERE session_id = ? AND memory_type = ? AND key = ?
+                    """,
+                    (session_id, memory_type, key)
+                )
+                cursor.execute(
+                    """
+                    DELETE FROM session_memory_history
+                    WHERE session_id = ? AND memory_type = ? AND key = ?
+                    AND version <= ?
+                    """,
+                    (session_id, memory_type, key, version - history_versions)
+                )
 
-        self.logger.debug(f"Stored memory: {session_id}/{memory_type}/{key}")
+        self.logger.debug(f"Stored memory: {session_id}/{memory_type}/{key} (v{version})")
+        return version
 
     def get_memory(
         self,
@@ -494,17 +1388,16 @@ class SwarmDB:
         memory_type: str,
         key: str
     ) -> Optional[Any]:
-        """Retrieve session memory"""
-        conn = self._get_connection()
+        """Retrieve session memory (expired entries are treated as missing)"""
+        conn = self._get_read_connection()
         cursor = conn.cursor()
         cursor.execute(
             """
             SELECT value FROM session_memory
             WHERE session_id = ? AND memory_type = ? AND key = ?
-            ORDER BY timestamp DESC
-            LIMIT 1
+            AND (expires_at IS NULL OR expires_at > ?)
             """,
-            (session_id, memory_type, key)
+            (session_id, memory_type, key, time.time())
         )
 
         row = cursor.fetchone()
@@ -516,95 +1409,498 @@ class SwarmDB:
 
         return None
 
+    def get_memory_history(
+        self,
+        session_id: str,
+        memory_type: str,
+        key: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve retained versions of a session memory key (newest first)
+
+        Only populated when SessionMemoryConfig.history_versions > 0.
+
+        Args:
+            session_id: Session identifier
+            memory_type: Memory type
+            key: Memory key
+            limit: Maximum number of versions to return
+
+        Returns:
+            List of {"version", "value", "timestamp"} dictionaries
+        """
+        conn = self._get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT version, value, timestamp FROM session_memory_history
+            WHERE session_id = ? AND memory_type = ? AND key = ?
+            ORDER BY version DESC
+            LIMIT ?
+            """,
+            (session_id, memory_type, key, limit if limit is not None else -1)
+        )
+
+        history = []
+        for row in cursor.fetchall():
+            try:
+                value = json.loads(row["value"])
+            except (TypeError, json.JSONDecodeError):
+                value = None
+            history.append({
+                "version": row["version"],
+                "value": value,
+                "timestamp": row["timestamp"]
+            })
+
+        return history
+
+    def compact_memory(self, history_versions: Optional[int] = None) -> Dict[str, int]:
+        """
+        Compact session memory to one live row per key
+
+        Needed only for databases written before upserts; new writes never
+        create duplicate rows. Superseded rows are dropped, or moved into
+        session_memory_history when history retention is enabled, and
+        history is trimmed to the last K versions per key.
+
+        Args:
+            history_versions: Versions to keep per key (defaults to
+                SessionMemoryConfig.history_versions)
+
+        Returns:
+            Dictionary with removed_rows and trimmed_history counts
+        """
+        keep = self.memory_config.history_versions if history_versions is None else history_versions
+
+        with self.transaction() as conn:
+            removed = self._compact_session_memory(conn, keep)
+            cursor = conn.execute(
+                """
+                DELETE FROM session_memory_history
+                WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY session_id, memory_type, key
+                            ORDER BY version DESC
+                        ) AS rank
+                        FROM session_memory_history
+                    )
+                    WHERE rank > ?
+                )
+                """,
+                (keep,)
+            )
+            trimmed = cursor.rowcount
+
+        self.logger.info(f"Compacted session memory: {removed} rows removed, {trimmed} history rows trimmed")
+        return {"removed_rows": removed, "trimmed_history": trimmed}
+
+    def _compact_session_memory(self, conn: sqlite3.Connection, keep_versions: int) -> int:
+        """Collapse duplicate session_memory rows into the newest one per key"""
+        # Rank rows newest-first per key; rank 1 stays live
+        conn.execute("DROP TABLE IF EXISTS temp.session_memory_ranked")
+        conn.execute(
+            """
+            CREATE TEMP TABLE session_memory_ranked AS
+            SELECT id, session_id, memory_type, key, value, timestamp,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY session_id, memory_type, key
+                       ORDER BY timestamp DESC, id DESC
+                   ) AS rank,
+                   COUNT(*) OVER (
+                       PARTITION BY session_id, memory_type, key
+                   ) AS total
+            FROM session_memory
+            """
+        )
+
+        if keep_versions > 0:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO session_memory_history
+                (session_id, memory_type, key, version, value, timestamp)
+                SELECT session_id, memory_type, key, total - rank + 1, value, timestamp
+                FROM session_memory_ranked
+                WHERE rank <= ?
+                """,
+                (keep_versions,)
+            )
+
+        conn.execute(
+            """
+            UPDATE session_memory
+            SET version = (
+                SELECT total FROM session_memory_ranked r WHERE r.id = session_memory.id
+            )
+            WHERE id IN (SELECT id FROM session_memory_ranked WHERE rank = 1 AND total > 1)
+            """
+        )
+        cursor = conn.execute(
+            "DELETE FROM session_memory WHERE id IN "
+            "(SELECT id FROM session_memory_ranked WHERE rank > 1)"
+        )
+        removed = cursor.rowcount
+        conn.execute("DROP TABLE temp.session_memory_ranked")
+        return removed
+
+    # ========================================================================
+    # TTL Sweeper
+    # ========================================================================
+
+    def _start_ttl_sweeper(self) -> None:
+        """Start the background expiry sweeper thread"""
+        self._sweeper_stop.clear()
+        self._sweeper_thread = threading.Thread(
+            target=self._ttl_sweeper_loop,
+            name="SwarmDB-TTLSweeper",
+            daemon=True
+        )
+        self._sweeper_thread.start()
+        self.logger.debug("Started TTL sweeper")
+
+    def _ttl_sweeper_loop(self) -> None:
+        """Periodically delete expired session memory"""
+        while not self._sweeper_stop.wait(self.memory_config.sweep_interval_seconds):
+            try:
+                self.sweep_expired_memory()
+            except Exception as e:
+                self._sweeper_stats["errors"] += 1
+                self.logger.error(f"TTL sweep failed: {e}")
+
+    def sweep_expired_memory(self, max_batches: Optional[int] = None) -> int:
+        """
+        Delete expired session memory in small batches
+
+        Each batch is its own short transaction and batches are separated by
+        a short pause, so the write lock is never held for long.
+
+        Args:
+            max_batches: Stop after this many batches (None = until done)
+
+        Returns:
+            Number of rows deleted
+        """
+        batch_size = self.memory_config.sweep_batch_size
+        pause = self.memory_config.sweep_pause_ms / 1000.0
+        started = time.perf_counter()
+        deleted = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            with self.transaction() as conn:
+                expired = conn.execute(
+                    """
+                    DELETE FROM session_memory
+                    WHERE id IN (
+                        SELECT id FROM session_memory
+                        WHERE expires_at IS NOT NULL AND expires_at <= ?
+                        LIMIT ?
+                    )
+                    RETURNING session_id, memory_type, key
+                    """,
+                    (time.time(), batch_size)
+                ).fetchall()
+
+                if expired:
+                    conn.executemany(
+                        """
+                        DELETE FROM session_memory_history
+                        WHERE session_id = ? AND memory_type = ? AND key = ?
+                        """,
+                        [tuple(row) for row in expired]
+                    )
+
+            batches += 1
+            deleted += len(expired)
+            if len(expired) < batch_size or self._sweeper_stop.is_set():
+                break
+            time.sleep(pause)
+
+        with self._lock:
+            self._sweeper_stats["runs"] += 1
+            self._sweeper_stats["batches"] += batches
+            self._sweeper_stats["rows_deleted"] += deleted
+            self._sweeper_stats["last_run_at"] = datetime.now().isoformat()
+            self._sweeper_stats["last_run_duration_ms"] = (time.perf_counter() - started) * 1000
+
+        if deleted:
+            self.logger.debug(f"Swept {deleted} expired session memory rows")
+        return deleted
+
+    def get_sweeper_stats(self) -> Dict[str, Any]:
+        """
+        Get TTL sweeper statistics.
+
+        Returns:
+            Dictionary with run/batch/row counters, last run info, and the
+            number of expired rows still awaiting deletion
+        """
+        conn = self._get_read_connection()
+        pending = conn.execute(
+            """
+            SELECT COUNT(*) FROM session_memory
+            WHERE expires_at IS NOT NULL AND expires_at <= ?
+            """,
+            (time.time(),)
+        ).fetchone()[0]
+
+        return {
+            **self._sweeper_stats,
+            "enabled": self._sweeper_thread is not None and self._sweeper_thread.is_alive(),
+            "expired_pending": pending,
+        }
+
+    def _stop_ttl_sweeper(self) -> None:
+        """Stop the sweeper thread"""
+        if self._sweeper_thread is None:
+            return
+
+        self._sweeper_stop.set()
+        self._sweeper_thread.join(timeout=5.0)
+        self._sweeper_thread = None
+
     # ========================================================================
     # Maintenance Operations
     # ========================================================================
 
     def cleanup_old_events(self, days: int = 30) -> int:
-        """Delete events older than specified days"""
-        from datetime import timedelta
+        """
+        Delete events older than specified days
 
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        With partitioning enabled, partitions entirely before the cutoff are
+        dropped and only the partition straddling it is deleted row by row.
+        The returned count then covers only those rows: counting a dropped
+        partition would scan the whole table.
+        """
+        # timestamp_ms is UTC epoch time
+        cutoff_ms = _to_epoch_ms(datetime.now(timezone.utc) - timedelta(days=days))
 
-        with self.transaction() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM agent_events WHERE timestamp < ?",
-                (cutoff_date,)
-            )
-            deleted_count = cursor.rowcount
+        if self._partition_granularity is not None:
+            deleted_count = self._drop_expired_partitions(cutoff_ms)
+        else:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM agent_events WHERE timestamp_ms < ?",
+                    (cutoff_ms,)
+                )
+                deleted_count = cursor.rowcount
 
         self.logger.info(f"Cleaned up {deleted_count} old events (>{days} days)")
         return deleted_count
 
-    def persist_session_state(self, session_id: Optional[str] = None) -> str:
+    def _drop_expired_partitions(self, cutoff_ms: int) -> int:
+        """
+        Drop partitions that end before cutoff_ms, trim the boundary one (internal)
+
+        Returns the rows deleted from the boundary partition; dropped
+        partitions are not counted.
+        """
+        deleted_count = 0
+        expired = []
+
+        with self.transaction() as conn:
+            partitions = conn.execute(
+                "SELECT name, range_start, range_end FROM agent_event_partitions"
+            ).fetchall()
+
+            for row in partitions:
+                name = row["name"]
+                if _bound_ms(row["range_end"]) <= cutoff_ms:
+                    conn.execute(f"DROP TABLE IF EXISTS {name}")
+                    conn.execute("DELETE FROM agent_event_partitions WHERE name = ?", (name,))
+                    self._known_partitions.discard(name)
+                    expired.append(name)
+                elif _bound_ms(row["range_start"]) < cutoff_ms:
+                    deleted_count += conn.execute(
+                        f"DELETE FROM {name} WHERE timestamp_ms < ?",
+                        (cutoff_ms,)
+                    ).rowcount
+
+            if expired:
+                self._rebuild_events_view(conn)
+
+        if expired:
+            self.logger.info(f"Dropped {len(expired)} expired event partition(s)")
+        return deleted_count
+
+    def persist_session_state(
+        self,
+        session_id: Optional[str] = None,
+        path: Optional[Union[str, Path]] = None,
+        checkpoint: bool = False
+    ) -> str:
         """
-        Persist current session state to .moai/memory/moai-flow/
+        Persist current session state as a binary snapshot
+
+        The first call (and every SnapshotConfig.max_deltas-th after it)
+        writes a checkpoint with all active agents and the most recent
+        events. Other calls append a delta holding only agents updated and
+        events recorded since the previous snapshot. See session_snapshot.py
+        for the format; read it back with load_session_state().
 
         Args:
-            session_id: Session ID to persist (defaults to current session)
+            session_id: Session ID to persist (defaults to the snapshot's
+                session, or a new ID for a checkpoint)
+            path: Snapshot file (defaults to .moai/memory/moai-flow/session-state.snap)
+            checkpoint: Write a full checkpoint even if a delta would do
 
         Returns:
             Path to persisted state file
         """
-        from uuid import uuid4
+        state_file = Path(path) if path else snapshots.DEFAULT_SNAPSHOT_PATH
+
+        # Include events still waiting in the group-commit queue
+        self.flush()
+
+        config = self.snapshot_config
+        previous = None if checkpoint else snapshots.read_snapshot(state_file)
+        if previous is not None and (
+            previous.deltas >= config.max_deltas
+            or previous.version != snapshots.SNAPSHOT_VERSION
+        ):
+            previous = None
+
+        now_ms = _to_epoch_ms(datetime.now(timezone.utc))
+        conn = self._get_read_connection()
+        agents_watermark = conn.execute(
+            "SELECT COALESCE(MAX(last_updated), '') FROM agent_registry"
+        ).fetchone()[0]
+
+        if previous is None:
+            # Checkpoint: all active agents and the newest events
+            agents = [
+                dict(row) for row in conn.execute("""
+                    SELECT agent_id, agent_type, status, spawn_time, metadata
+                    FROM agent_registry
+                    WHERE status IN ('spawned', 'running')
+                """)
+            ]
+            removed: List[str] = []
+            # Watermark first: events inserted meanwhile reappear in the
+            # next delta and are skipped there as already seen
+            events_watermark = {
+                table: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                for table in self._event_sources(conn)
+            }
+            events = self._snapshot_events(config.recent_events)
+            kind = snapshots.SEGMENT_CHECKPOINT
+            session_id = session_id or str(uuid.uuid4())
+        else:
+            # Delta: agents touched and events recorded since the last segment
+            agents, removed = [], []
+            for row in conn.execute("""
+                SELECT agent_id, agent_type, status, spawn_time, metadata
+                FROM agent_registry
+                WHERE last_updated >= ?
+            """, (previous.agents_watermark,)):
+                agent = dict(row)
+                known = previous.agents.get(agent["agent_id"])
+                if agent["status"] not in ("spawned", "running"):
+                    if known is not None:
+                        removed.append(agent["agent_id"])
+                elif known is None or known["status"] != agent["status"] or (
+                    known["metadata"] != json.loads(agent["metadata"] or "{}")
+                ):
+                    agents.append(agent)
+
+            seen = {event["event_id"] for event in previous.events}
+            events, events_watermark = self._snapshot_events_after(
+                conn, previous.events_watermark, config.recent_events
+            )
+            events = [event for event in events if event["event_id"] not in seen]
+            kind = snapshots.SEGMENT_DELTA
+            session_id = session_id or previous.session_id
+            if not (agents or removed or events) and session_id == previous.session_id:
+                return str(state_file)
+
+        segment_state = SnapshotState(
+            session_id=session_id,
+            timestamp_ms=now_ms,
+            database_path=str(self.db_path),
+            events_watermark=events_watermark,
+            agents_watermark=agents_watermark,
+        )
+        segment = snapshots.encode_segment(kind, segment_state, agents, removed, events)
 
-        state_file = Path(".moai/memory/moai-flow/session-state.json")
-        state_file.parent.mkdir(parents=True, exist_ok=True)
+        if kind == snapshots.SEGMENT_CHECKPOINT:
+            snapshots.write_checkpoint(state_file, segment, now_ms)
+        else:
+            snapshots.append_delta(state_file, segment, previous.length)
 
-        # Collect current session state
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        self.logger.debug(
+            f"Persisted session {'checkpoint' if previous is None else 'delta'} "
+            f"({len(agents)} agents, {len(removed)} removed, {len(events)} events)"
+        )
+        return str(state_file)
 
-        # Get active agents
-        cursor.execute("""
-            SELECT agent_id, agent_type, status, spawn_time, metadata
-            FROM agent_registry
-            WHERE status IN ('spawned', 'running')
-        """)
-        active_agents = [
+    def _snapshot_events(self, limit: int) -> List[Dict[str, Any]]:
+        """Newest events for a snapshot, metadata left as JSON text"""
+        return [
             {
-                "agent_id": row[0],
-                "agent_type": row[1],
-                "status": row[2],
-                "spawn_time": row[3],
-                "metadata": json.loads(row[4]) if row[4] else {}
+                "event_id": event["event_id"],
+                "event_type": event["event_type"],
+                "agent_id": event["agent_id"],
+                "timestamp": event["timestamp"],
+                "timestamp_ms": event["timestamp_ms"],
+                "metadata": event.raw_metadata,
             }
-            for row in cursor.fetchall()
+            for event in self.iter_events(
+                limit=limit,
+                columns=("event_id", "event_type", "agent_id", "timestamp", "metadata")
+            )
         ]
 
-        # Get recent events (last 100)
-        cursor.execute("""
-            SELECT event_id, event_type, agent_id, timestamp, metadata
-            FROM agent_events
-            ORDER BY timestamp DESC
-            LIMIT 100
-        """)
-        recent_events = [
-            {
-                "event_id": row[0],
-                "event_type": row[1],
-                "agent_id": row[2],
-                "timestamp": row[3],
-                "metadata": json.loads(row[4]) if row[4] else {}
-            }
-            for row in cursor.fetchall()
-        ]
+    def _snapshot_events_after(
+        self,
+        conn: sqlite3.Connection,
+        watermark: Dict[str, int],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Events inserted after a per-table id watermark (internal)
 
-        # Build state object
-        state = {
-            "session_id": session_id or str(uuid4()),
-            "timestamp": datetime.now().isoformat(),
-            "active_agents": active_agents,
-            "recent_events": recent_events,
-            "database_path": str(self.db_path)
-        }
+        Returns up to limit of the latest inserted events per table, whatever
+        their timestamps, and the advanced watermark. Dropped partitions
+        leave the watermark.
+        """
+        events: List[Dict[str, Any]] = []
+        advanced: Dict[str, int] = {}
+        for table in self._event_sources(conn):
+            last_id = watermark.get(table, 0)
+            rows = conn.execute(
+                f"""
+                SELECT id, event_id, event_type, agent_id, timestamp, timestamp_ms, metadata
+                FROM {table}
+                WHERE id > ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (last_id, limit)
+            ).fetchall()
+            advanced[table] = rows[0]["id"] if rows else last_id
+            events.extend(
+                {key: row[key] for key in row.keys() if key != "id"} for row in rows
+            )
+        return events, advanced
 
-        # Write to file
-        with state_file.open("w") as f:
-            json.dump(state, f, indent=2)
+    @staticmethod
+    def load_session_state(
+        path: Optional[Union[str, Path]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load the state written by persist_session_state (no database access)
 
-        return str(state_file)
+        Args:
+            path: Snapshot file (defaults to .moai/memory/moai-flow/session-state.snap)
+
+        Returns:
+            Dictionary with session_id, timestamp, active_agents and
+            recent_events, or None if nothing was persisted
+        """
+        return snapshots.load_session_state(path)
 
     def cleanup(self, days: int = 30) -> Dict[str, int]:
         """
@@ -618,40 +1914,106 @@ class SwarmDB:
             Dictionary with cleanup statistics
         """
         deleted_events = self.cleanup_old_events(days)
+        expired_memory = self.sweep_expired_memory()
 
         # Additional cleanup: mark stale agents as error
+        # last_updated is written as local ISO8601, so compare it as text
+        # against a local cutoff instead of calling datetime() per row
+        now = datetime.now()
         with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE agent_registry
                 SET status = 'error', last_updated = ?
                 WHERE status IN ('spawned', 'running')
-                AND datetime(last_updated) < datetime('now', '-1 hour')
-            """, (datetime.now().isoformat(),))
+                AND last_updated < ?
+            """, (now.isoformat(), (now - timedelta(hours=1)).isoformat()))
             stale_agents = cursor.rowcount
 
         return {
             "deleted_events": deleted_events,
+            "expired_memory": expired_memory,
             "cleaned_stale_agents": stale_agents
         }
 
     def vacuum(self) -> None:
-        """Optimize database storage"""
-        conn = self._get_connection()
-        conn.execute("VACUUM")
+        """
+        Optimize database storage
+
+        VACUUM may renumber implicit rowids, so registered vacuum hooks
+        (e.g. SemanticMemory rebuilding its FTS index) run afterwards.
+        """
+        self._get_connection().execute("VACUUM")
+
+        with self._lock:
+            hooks = list(self._vacuum_hooks)
+        for ref in hooks:
+            callback = ref()
+            if callback is not None:
+                callback()
+
         self.logger.info("Database vacuumed")
 
-    def close(self) -> None:
-        """Close all database connections"""
+    @staticmethod
+    def _hook_ref(callback):
+        """Weak reference to a bound method, strong to anything else (internal)"""
+        if hasattr(callback, "__self__"):
+            return weakref.WeakMethod(callback)
+        return lambda: callback
+
+    def register_vacuum_hook(self, callback) -> None:
+        """
+        Run a callback after each vacuum().
+
+        Components keyed on implicit rowids (such as external-content FTS
+        indexes) rebuild themselves here. Bound methods are held weakly.
+
+        Args:
+            callback: Zero-argument callable
+        """
         with self._lock:
-            for conn in self._connection_pool.values():
-                try:
-                    conn.close()
-                except Exception as e:
-                    self.logger.error(f"Error closing connection: {e}")
+            self._vacuum_hooks.append(self._hook_ref(callback))
 
-            self._connection_pool.clear()
-            self.logger.debug("All connections closed")
+    def register_close_hook(self, callback) -> None:
+        """
+        Run a callback when the database is closed, before the engine is released.
+
+        Bound methods are held weakly so the hook does not keep its owner
+        (e.g. a SemanticMemory with buffered writes) alive.
+
+        Args:
+            callback: Zero-argument callable
+        """
+        with self._lock:
+            self._close_hooks.append(self._hook_ref(callback))
+
+    def _run_close_hooks(self) -> None:
+        """Call registered close hooks, logging failures (internal)"""
+        hooks, self._close_hooks = self._close_hooks, []
+        for ref in hooks:
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Close hook failed: {e}")
+
+    def close(self) -> None:
+        """Run close hooks, flush queued events and release the storage engine"""
+        self._stop_ttl_sweeper()
+
+        with self._lock:
+            if self._closed:
+                return
+            self._run_close_hooks()
+            if self._event_channel is not None:
+                self._engine.flush()
+                self._event_channel = None
+            # The last user of the engine closes its connections
+            self._engine.release()
+            self._closed = True
+            self.logger.debug("Storage engine released")
 
     def __enter__(self):
         """Context manager entry"""
@@ -668,9 +2030,6 @@ class SwarmDB:
 # ============================================================================
 
 if __name__ == "__main__":
-    import time
-    import uuid
-
     print("=== SwarmDB Example Usage ===\n")
 
     # Initialize database
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+VectorIndex - Local Hashed-Vector Similarity Search
+
+Dependency-light vector search used by SemanticMemory:
+- HashingVectorizer: feature-hashed word and character n-gram vectors
+  (no vocabulary, no model download, stable across processes)
+- VectorIndex: float32 row matrix in a memory-mapped file, scored with
+  batched NumPy cosine similarity
+- Optional IVF (inverted file) partitioning: rows are grouped around
+  k-means centroids and a query only scores the closest clusters
+
+NumPy is optional. Without it scoring falls back to pure Python over the
+query's non-zero dimensions, and IVF partitioning is unavailable.
+
+Example:
+    >>> vectorizer = HashingVectorizer(dimensions=512)
+    >>> index = VectorIndex(512, path=Path("knowledge.vec"))
+    >>> index.add("k1", 0, vectorizer.vectorize("Use JWT refresh tokens"))
+    >>> index.search(vectorizer.vectorize("jwt tokens"), k=5)
+    [('k1', 0.71)]
+"""
+
+import heapq
+import logging
+import math
+import mmap
+import re
+import sys
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class VectorIndexConfig:
+    """
+    Hashed-vector search configuration.
+
+    Attributes:
+        enabled: Build vectors on writes and allow vector search (default: True)
+        dimensions: Hashed vector size, a power of two (default: 512)
+        char_ngram_size: Character n-gram length, 0 disables n-grams (default: 3)
+        char_ngram_weight: Weight of n-gram features relative to words (default: 0.5)
+        title_weight: Weight of topic/pattern-name words relative to body words (default: 2.0)
+        ivf_clusters: IVF partitions, 0 disables partitioning (default: 0)
+        ivf_probe: Closest partitions scored per query (default: 8)
+        ivf_min_rows: Live rows required before partitions are trained (default: 50000)
+        index_dir: Directory for matrix files (default: next to the database)
+    """
+
+    enabled: bool = True
+    dimensions: int = 512
+    char_ngram_size: int = 3
+    char_ngram_weight: float = 0.5
+    title_weight: float = 2.0
+    ivf_clusters: int = 0
+    ivf_probe: int = 8
+    ivf_min_rows: int = 50000
+    index_dir: Optional[Path] = None
+
+
+# Suffixes folded by the light stemmer, longest first
+_STEM_SUFFIXES = ("ing", "ers", "er", "ed", "es", "s", "e")
+
+# Words: camelCase/PascalCase humps, acronyms and digit runs
+_WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Rows scored per NumPy matrix product
+_SCORE_CHUNK_ROWS = 65536
+
+# Rows sampled to train IVF centroids
+_IVF_TRAIN_SAMPLE = 65536
+_IVF_TRAIN_ITERATIONS = 10
+
+
+# ============================================================================
+# HashingVectorizer
+# ============================================================================
+
+class HashingVectorizer:
+    """
+    Feature-hashing text vectorizer.
+
+    Text is split into words (snake_case and camelCase are split, so
+    "handle_api_errors" and "API error handling" share "api", "error" and
+    "handl"), lightly stemmed, and expanded with character n-grams. Each
+    feature is hashed (CRC32) to a signed slot; counts are log-scaled and
+    the vector is L2-normalized, so a dot product is cosine similarity.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 512,
+        char_ngram_size: int = 3,
+        char_ngram_weight: float = 0.5,
+        title_weight: float = 2.0
+    ):
+        if dimensions <= 0 or dimensions & (dimensions - 1):
+            raise ValueError(f"dimensions must be a power of two: {dimensions}")
+
+        self.dimensions = dimensions
+        self.char_ngram_size = char_ngram_size
+        self.char_ngram_weight = char_ngram_weight
+        self.title_weight = title_weight
+        self._mask = dimensions - 1
+
+    @classmethod
+    def from_config(cls, config: VectorIndexConfig) -> "HashingVectorizer":
+        """Build a vectorizer from a VectorIndexConfig"""
+        return cls(
+            dimensions=config.dimensions,
+            char_ngram_size=config.char_ngram_size,
+            char_ngram_weight=config.char_ngram_weight,
+            title_weight=config.title_weight
+        )
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase, lightly stemmed words"""
+        words = []
+        for word in _WORD_PATTERN.findall(text):
+            word = word.lower()
+            for suffix in _STEM_SUFFIXES:
+                if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                    word = word[:-len(suffix)]
+                    break
+            words.append(word)
+        return words
+
+    def _add_features(self, weights: Dict[str, float], text: str, weight: float) -> None:
+        n = self.char_ngram_size
+        for word in self.tokenize(text):
+            weights["w:" + word] = weights.get("w:" + word, 0.0) + weight
+            if n > 0:
+                padded = f"<{word}>"
+                gram_weight = weight * self.char_ngram_weight
+                for i in range(len(padded) - n + 1):
+                    gram = "c:" + padded[i:i + n]
+                    weights[gram] = weights.get(gram, 0.0) + gram_weight
+
+    def vectorize(self, text: str, title: str = "") -> array:
+        """
+        Hash text into a normalized float32 vector
+
+        Args:
+            text: Body text
+            title: Title text weighted by title_weight (topic, pattern name)
+
+        Returns:
+            array('f') of length dimensions (all zeros for empty text)
+        """
+        weights: Dict[str, float] = {}
+        if title:
+            self._add_features(weights, title, self.title_weight)
+        self._add_features(weights, text, 1.0)
+
+        vector = array("f", bytes(4 * self.dimensions))
+        for feature, weight in weights.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            value = 1.0 + math.log(weight) if weight >= 1.0 else weight
+            vector[h & self._mask] += -value if h & 0x80000000 else value
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm > 0:
+            for i, v in enumerate(vector):
+                if v:
+                    vector[i] = v / norm
+        return vector
+
+
+def vector_to_blob(vector: array) -> bytes:
+    """Serialize a float32 vector as little-endian bytes"""
+    if sys.byteorder == "big":
+        vector = array("f", vector)
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def blob_to_vector(blob: bytes) -> array:
+    """Deserialize little-endian float32 bytes"""
+    vector = array("f")
+    vector.frombytes(blob)
+    if sys.byteorder == "big":
+        vector.byteswap()
+    return vector
+
+
+# ============================================================================
+# VectorIndex
+# ============================================================================
+
+class VectorIndex:
+    """
+    Row matrix of float32 vectors with top-k cosine search.
+
+    Row numbers are assigned by the caller (SemanticMemory keeps them in
+    SQLite), so several writers can append to one matrix file without
+    coordinating. Row r lives at byte offset r * dimensions * 4. Rows that
+    are not registered through add() or load() (replaced, removed, or
+    written by another instance) are never returned.
+
+    With a path the matrix is a file scored through a memory map; without
+    one (in-memory databases) it is kept in a bytearray.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        path: Optional[Path] = None,
+        config: Optional[VectorIndexConfig] = None
+    ):
+        """
+        Initialize VectorIndex
+
+        Args:
+            dimensions: Vector size
+            path: Matrix file (None keeps the matrix in memory)
+            config: IVF settings (defaults to VectorIndexConfig())
+        """
+        self.dimensions = dimensions
+        self.path = Path(path) if path else None
+        self.config = config or VectorIndexConfig()
+        self.logger = logging.getLogger(__name__)
+
+        self._row_bytes = 4 * dimensions
+        self._lock = threading.RLock()
+        self._row_of: Dict[str, int] = {}
+        self._key_at: Dict[int, str] = {}
+        self._live = bytearray()  # 1 per registered row
+        self._rows = 0  # Rows backed by the matrix (highest row + 1)
+
+        self._buffer = bytearray() if self.path is None else None
+        self._file = None
+        self._mapped = None  # (rows, np.memmap) for file-backed scoring
+
+        # IVF state (NumPy only)
+        self._centroids = None
+        self._assign = array("i")  # Cluster per row, -1 = unassigned
+        self._trained_rows = 0
+
+    # ========================================================================
+    # Storage
+    # ========================================================================
+
+    def _open_file(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "r+b" if self.path.exists() else "w+b")
+        return self._file
+
+    def _write_row(self, row: int, blob: bytes) -> None:
+        offset = row * self._row_bytes
+        if self._buffer is not None:
+            end = offset + self._row_bytes
+            if len(self._buffer) < end:
+                self._buffer.extend(bytes(end - len(self._buffer)))
+            self._buffer[offset:end] = blob
+        else:
+            f = self._open_file()
+            f.seek(offset)
+            f.write(blob)
+            f.flush()
+
+    def _grow(self, rows: int) -> None:
+        if rows > self._rows:
+            self._live.extend(bytes(rows - self._rows))
+            self._assign.extend([-1] * (rows - self._rows))
+            self._rows = rows
+
+    def load(self, entries: Iterable[Tuple[str, int, bytes]]) -> None:
+        """
+        Register persisted rows, rewriting the matrix if it is out of date
+
+        The matrix file is reused when its size matches the highest row;
+        otherwise (missing, truncated by a crash, or from other dimensions)
+        it is rebuilt from the given blobs.
+
+        Args:
+            entries: (key, row, float32 blob) tuples
+        """
+        entries = list(entries)
+        with self._lock:
+            self._reset()
+            rows = max((row for _, row, _ in entries), default=-1) + 1
+            self._grow(rows)
+            for key, row, _ in entries:
+                self._row_of[key] = row
+                self._key_at[row] = key
+                self._live[row] = 1
+
+            expected = rows * self._row_bytes
+            if self._buffer is not None or not self._file_matches(expected):
+                if self._buffer is None:
+                    self._open_file().truncate(0)
+                for _, row, blob in entries:
+                    self._write_row(row, blob)
+                if self._buffer is None:
+                    self._file.truncate(expected)
+                    self._file.flush()
+
+    def _file_matches(self, size: int) -> bool:
+        return self.path.exists() and self.path.stat().st_size == size
+
+    def _reset(self) -> None:
+        self._row_of.clear()
+        self._key_at.clear()
+        self._live = bytearray()
+        self._assign = array("i")
+        self._rows = 0
+        self._mapped = None
+        self._centroids = None
+        self._trained_rows = 0
+        if self._buffer is not None:
+            self._buffer = bytearray()
+
+    def add(self, key: str, row: int, vector: array) -> None:
+        """
+        Write a vector at row and make it searchable as key
+
+        A previous row registered for key stops being returned.
+
+        Args:
+            key: Item key
+            row: Matrix row (caller-assigned, unique per matrix)
+            vector: Normalized float32 vector
+        """
+        blob = vector_to_blob(vector)
+        with self._lock:
+            self._write_row(row, blob)
+            self._grow(row + 1)
+
+            previous = self._row_of.get(key)
+            if previous is not None:
+                self._live[previous] = 0
+                self._key_at.pop(previous, None)
+
+            self._row_of[key] = row
+            self._key_at[row] = key
+            self._live[row] = 1
+
+            if self._centroids is not None:
+                scores = self._centroids @ np.frombuffer(blob, dtype="<f4")
+                self._assign[row] = int(np.argmax(scores))
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """
+        Stop returning keys
+
+        Returns:
+            Number of keys removed
+        """
+        removed = 0
+        with self._lock:
+            for key in keys:
+                row = self._row_of.pop(key, None)
+                if row is not None:
+                    self._live[row] = 0
+                    self._key_at.pop(row, None)
+                    removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._row_of
+
+    # ========================================================================
+    # Search
+    # ========================================================================
+
+    def search(self, query: array, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k rows by cosine similarity
+
+        Args:
+            query: Normalized query vector (same dimensions)
+            k: Results to return
+
+        Returns:
+            [(key, score)] sorted by descending score
+        """
+        if k <= 0 or not any(query):
+            return []
+
+        with self._lock:
+            if not self._row_of:
+                return []
+            if NUMPY_AVAILABLE:
+                return self._search_numpy(query, k)
+            return self._search_python(query, k)
+
+    def _matrix(self):
+        """(rows, dimensions) float32 view of the matrix (NumPy only)"""
+        if self._buffer is not None:
+            return np.frombuffer(
+                self._buffer, dtype="<f4", count=self._rows * self.dimensions
+            ).reshape(self._rows, self.dimensions)
+
+        if self._mapped is None or self._mapped[0] != self._rows:
+            if self._file is not None:
+                self._file.flush()
+            self._mapped = (
+                self._rows,
+                np.memmap(self.path, dtype="<f4", mode="r", shape=(self._rows, self.dimensions)),
+            )
+        return self._mapped[1]
+
+    def _search_numpy(self, query: array, k: int) -> List[Tuple[str, float]]:
+        q = np.asarray(query, dtype=np.float32)
+        matrix = self._matrix()
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+
+        self._maybe_train(matrix, live)
+        if self._centroids is not None:
+            probe = min(self.config.ivf_probe, len(self._centroids))
+            closest = np.argpartition(-(self._centroids @ q), probe - 1)[:probe]
+            assign = np.frombuffer(self._assign, dtype=np.int32)
+            candidates = np.flatnonzero(live & np.isin(assign, closest))
+            scores = matrix[candidates] @ q if len(candidates) else np.empty(0, np.float32)
+        else:
+            candidates = np.flatnonzero(live)
+            scores = np.empty(len(candidates), dtype=np.float32)
+            for start in range(0, len(candidates), _SCORE_CHUNK_ROWS):
+                rows = candidates[start:start + _SCORE_CHUNK_ROWS]
+                # Contiguous row ranges avoid a gather copy on the memory map
+                first, last = rows[0], rows[-1] + 1
+                block = matrix[first:last] @ q
+                scores[start:start + len(rows)] = block[rows - first]
+        del matrix, live
+
+        if not len(candidates):
+            return []
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._key_at[int(candidates[i])], float(scores[i])) for i in top]
+
+    def _search_python(self, query: array, k: int) -> List[Tuple[str, float]]:
+        nonzero = [(i, v) for i, v in enumerate(query) if v]
+        dims = self.dimensions
+
+        if self._buffer is not None:
+            view = memoryview(self._buffer).cast("f")
+            source = None
+        else:
+            self._open_file().flush()
+            source = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(source).cast("f")
+
+        try:
+            scored = (
+                (sum(v * view[row * dims + i] for i, v in nonzero), key)
+                for row, key in self._key_at.items()
+            )
+            top = heapq.nlargest(k, scored)
+        finally:
+            view.release()
+            if source is not None:
+                source.close()
+
+        return [(key, score) for score, key in top]
+
+    # ========================================================================
+    # IVF Partitioning
+    # ========================================================================
+
+    def _maybe_train(self, matrix, live) -> None:
+        """Train (or retrain after the index doubles) IVF centroids"""
+        clusters = self.config.ivf_clusters
+        live_rows = int(live.sum())
+        if clusters <= 0 or live_rows < max(self.config.ivf_min_rows, clusters):
+            return
+        if self._centroids is not None and live_rows < 2 * self._trained_rows:
+            return
+
+        rng = np.random.default_rng(0)
+        rows = np.flatnonzero(live)
+        sample = np.sort(rng.choice(rows, min(len(rows), _IVF_TRAIN_SAMPLE), replace=False))
+        points = np.asarray(matrix[sample])
+
+        # Spherical k-means: assign by cosine, re-normalize the means
+        centroids = points[rng.choice(len(points), clusters, replace=False)].copy()
+        for _ in range(_IVF_TRAIN_ITERATIONS):
+            nearest = np.argmax(points @ centroids.T, axis=1)
+            for c in range(clusters):
+                members = points[nearest == c]
+                if len(members):
+                    mean = members.sum(axis=0)
+                    norm = np.linalg.norm(mean)
+                    if norm > 0:
+                        centroids[c] = mean / norm
+
+        assign = np.frombuffer(self._assign, dtype=np.int32)
+        assign[:] = -1
+        for start in range(0, len(rows), _SCORE_CHUNK_ROWS):
+            chunk = rows[start:start + _SCORE_CHUNK_ROWS]
+            assign[chunk] = np.argmax(np.asarray(matrix[chunk]) @ centroids.T, axis=1)
+        del assign
+
+        self._centroids = centroids
+        self._trained_rows = live_rows
+        self.logger.info(f"Trained {clusters} IVF partitions over {live_rows} vectors")
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with live/total rows and IVF state
+        """
+        with self._lock:
+            return {
+                "vectors": len(self._row_of),
+                "matrix_rows": self._rows,
+                "dimensions": self.dimensions,
+                "backend": "numpy" if NUMPY_AVAILABLE else "python",
+                "path": str(self.path) if self.path else None,
+                "ivf_trained": self._centroids is not None,
+                "ivf_clusters": 0 if self._centroids is None else len(self._centroids),
+            }
+
+    def close(self) -> None:
+        """Release the memory map and matrix file"""
+        with self._lock:
+            self._mapped = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
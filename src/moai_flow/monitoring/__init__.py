@@ -5,6 +5,8 @@ This module provides comprehensive observability infrastructure for swarm coordi
 
 Core Components:
 - MetricsCollector: <1ms overhead async metrics collection
+- MetricRingBuffer: Bounded columnar in-memory metric history
+- TaskAggregate / QuantileSketch: Streaming, mergeable task statistics
 - MetricsStorage: SQLite-backed metrics persistence with optimized querying
 - HeartbeatMonitor: Active heartbeat monitoring with failure detection
 - HealthReporter: Comprehensive health report generation and export
@@ -75,8 +77,12 @@ from .metrics_collector import (
     AgentMetric,
     SwarmMetric,
     TaskResult,
-    MetricType as CollectorMetricType
+    MetricType as CollectorMetricType,
+    AsyncWorkerConfig,
+    BackpressurePolicy,
 )
+from .metric_buffer import MetricBufferConfig, MetricRingBuffer
+from .metric_aggregates import AggregateConfig, QuantileSketch, TaskAggregate
 from .health_reporter import HealthReporter, Alert, AlertSeverity
 
 # Storage package (Phase 7) - re-exported for convenience
@@ -84,9 +90,11 @@ from .storage import (
     MetricsPersistence,
     RetentionPolicy,
     CompressionConfig,
+    HistogramConfig,
     MetricsQuery,
     QueryFilter,
     AggregationFunc,
+    PercentileMode,
     MetricsExporter,
     ExportFormat,
 )
@@ -107,15 +115,24 @@ __all__ = [
     "SwarmMetric",
     "TaskResult",
     "CollectorMetricType",
+    "AsyncWorkerConfig",
+    "BackpressurePolicy",
+    "MetricBufferConfig",
+    "MetricRingBuffer",
+    "AggregateConfig",
+    "QuantileSketch",
+    "TaskAggregate",
     "StorageTaskResult",
 
     # Storage package (Phase 7)
     "MetricsPersistence",
     "RetentionPolicy",
     "CompressionConfig",
+    "HistogramConfig",
     "MetricsQuery",
     "QueryFilter",
     "AggregationFunc",
+    "PercentileMode",
     "MetricsExporter",
     "ExportFormat",
 ]
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Metric Aggregates - Streaming Statistics and Quantile Sketches
+
+Incrementally maintained task statistics for MetricsCollector:
+- TaskAggregate: count, sum, min, max, Welford mean/variance, result
+  counts, token/file totals and a duration QuantileSketch
+- QuantileSketch: mergeable log-bucket sketch (DDSketch-style) with a
+  bounded relative error; keeps exact values while small
+- AggregateIndex: TaskAggregates per key (global and per agent) and per
+  fixed time bucket, with a per-key horizon below which rows were evicted
+  or dropped as too late
+
+Recording is O(1); a stats query merges the buckets of one key, so it is
+O(buckets) regardless of how many metrics were recorded. Aggregates and
+sketches from several collectors merge with TaskAggregate.merge(); use
+to_dict()/from_dict() to move them between processes.
+
+Example:
+    >>> total = collector_a.get_aggregate()
+    >>> total.merge(collector_b.get_aggregate())
+    >>> total.quantile(0.99)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Time buckets per key when neither the config nor a retention window
+# sets the limit (one day of minute buckets)
+DEFAULT_MAX_BUCKETS = 1440
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class AggregateConfig:
+    """
+    Streaming aggregate configuration.
+
+    Attributes:
+        bucket_seconds: Width of a time bucket (default: 60)
+        max_buckets: Time buckets kept per key; the oldest are dropped.
+            None lets MetricsCollector size it to the retention window,
+            or 1440 (one day of minute buckets) without one (default: None)
+        relative_accuracy: Quantile relative error once a sketch switches
+            to log buckets (default: 0.01)
+        exact_threshold: Values a sketch keeps exactly before switching
+            to log buckets (default: 128)
+        max_bins: Log buckets per sketch; the lowest are collapsed
+            beyond this (default: 2048)
+    """
+
+    bucket_seconds: int = 60
+    max_buckets: Optional[int] = None
+    relative_accuracy: float = 0.01
+    exact_threshold: int = 128
+    max_bins: int = 2048
+
+
+# ============================================================================
+# Quantile Sketch
+# ============================================================================
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over non-negative values.
+
+    Up to exact_threshold values are kept as-is and quantiles are exact.
+    Beyond that, values fall into logarithmic buckets whose bounds grow by
+    gamma = (1 + a) / (1 - a), so any quantile is within relative error a.
+    Values <= 0 share a zero bucket.
+    """
+
+    __slots__ = (
+        "relative_accuracy", "exact_threshold", "max_bins",
+        "_inv_log_gamma", "_gamma", "exact", "bins", "zero_count", "count"
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        exact_threshold: int = 128,
+        max_bins: int = 2048
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.exact_threshold = exact_threshold
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+
+        self.exact: Optional[List[float]] = []  # None once bucketed
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add one value"""
+        self.count += 1
+        if self.exact is not None:
+            self.exact.append(value)
+            if len(self.exact) > self.exact_threshold:
+                self._to_bins()
+            return
+        self._add_to_bins(value, 1)
+
+    def _add_to_bins(self, value: float, weight: int) -> None:
+        if value <= 0:
+            self.zero_count += weight
+            return
+        key = math.ceil(math.log(value) * self._inv_log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _to_bins(self) -> None:
+        values, self.exact = self.exact, None
+        for value in values:
+            self._add_to_bins(value, 1)
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins into one to respect max_bins"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins + 1
+        target = keys[excess]
+        self.bins[target] += sum(self.bins.pop(k) for k in keys[:excess])
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's values (accuracy settings must match)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative_accuracy")
+        self.count += other.count
+        if self.exact is not None and other.exact is not None:
+            self.exact.extend(other.exact)
+            if len(self.exact) > self.exact_threshold:
+                self._to_bins()
+            return
+
+        if self.exact is not None:
+            self._to_bins()
+        if other.exact is not None:
+            for value in other.exact:
+                self._add_to_bins(value, 1)
+        else:
+            self.zero_count += other.zero_count
+            for key, weight in other.bins.items():
+                self.bins[key] = self.bins.get(key, 0) + weight
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0 <= q <= 1)
+
+        Exact values use linear interpolation between closest ranks, so
+        quantile(0.5) matches statistics.median.
+
+        Returns:
+            Quantile estimate (0.0 for an empty sketch)
+        """
+        if not self.count:
+            return 0.0
+        q = min(max(q, 0.0), 1.0)
+
+        if self.exact is not None:
+            values = sorted(self.exact)
+            position = q * (len(values) - 1)
+            lower = math.floor(position)
+            upper = min(lower + 1, len(values) - 1)
+            return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Midpoint (in relative terms) of (gamma^(k-1), gamma^k]
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (see from_dict)"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "exact_threshold": self.exact_threshold,
+            "max_bins": self.max_bins,
+            "exact": list(self.exact) if self.exact is not None else None,
+            "bins": {str(k): v for k, v in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch from to_dict() output"""
+        sketch = cls(data["relative_accuracy"], data["exact_threshold"], data["max_bins"])
+        sketch.exact = list(data["exact"]) if data["exact"] is not None else None
+        sketch.bins = {int(k): v for k, v in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        return sketch
+
+
+# ============================================================================
+# Task Aggregate
+# ============================================================================
+
+class TaskAggregate:
+    """
+    Running task statistics (durations, results, tokens, files).
+
+    Mean and variance use Welford's update and Chan's parallel merge, so
+    aggregates combine without revisiting the metrics.
+    """
+
+    __slots__ = (
+        "count", "sum", "min", "max", "mean", "m2",
+        "result_counts", "total_tokens", "total_files", "sketch"
+    )
+
+    def __init__(self, result_kinds: int, config: Optional[AggregateConfig] = None):
+        config = config or AggregateConfig()
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.result_counts = [0] * result_kinds
+        self.total_tokens = 0
+        self.total_files = 0
+        self.sketch = QuantileSketch(
+            config.relative_accuracy, config.exact_threshold, config.max_bins
+        )
+
+    def add(self, duration_ms: float, result: int, tokens: int, files: int) -> None:
+        """Add one task (result is the result code index)"""
+        self.count += 1
+        self.sum += duration_ms
+        if duration_ms < self.min:
+            self.min = duration_ms
+        if duration_ms > self.max:
+            self.max = duration_ms
+        delta = duration_ms - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (duration_ms - self.mean)
+        self.result_counts[result] += 1
+        self.total_tokens += tokens
+        self.total_files += files
+        self.sketch.add(duration_ms)
+
+    def merge(self, other: "TaskAggregate") -> "TaskAggregate":
+        """Fold other into this aggregate; returns self"""
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(other.result_counts) > len(self.result_counts):
+            self.result_counts.extend([0] * (len(other.result_counts) - len(self.result_counts)))
+        for i, n in enumerate(other.result_counts):
+            self.result_counts[i] += n
+        self.total_tokens += other.total_tokens
+        self.total_files += other.total_files
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance of durations"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Duration quantile, clamped to the exact min/max"""
+        if not self.count:
+            return 0.0
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (see from_dict)"""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean,
+            "m2": self.m2,
+            "result_counts": list(self.result_counts),
+            "total_tokens": self.total_tokens,
+            "total_files": self.total_files,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskAggregate":
+        """Rebuild an aggregate from to_dict() output"""
+        aggregate = cls(len(data["result_counts"]))
+        aggregate.count = data["count"]
+        aggregate.sum = data["sum"]
+        aggregate.min = data["min"] if data["min"] is not None else math.inf
+        aggregate.max = data["max"] if data["max"] is not None else -math.inf
+        aggregate.mean = data["mean"]
+        aggregate.m2 = data["m2"]
+        aggregate.result_counts = list(data["result_counts"])
+        aggregate.total_tokens = data["total_tokens"]
+        aggregate.total_files = data["total_files"]
+        aggregate.sketch = QuantileSketch.from_dict(data["sketch"])
+        return aggregate
+
+
+# ============================================================================
+# Time-Bucketed Index
+# ============================================================================
+
+class AggregateIndex:
+    """
+    TaskAggregates per key and per time bucket.
+
+    Each key keeps at most max_buckets buckets. Evicting the oldest moves
+    the key's horizon to its end; rows older than the horizon are not in
+    the index (late arrivals are counted in dropped_rows), so callers
+    answer that range from the raw metrics instead.
+
+    Not thread-safe; MetricsCollector guards it with its lock.
+    """
+
+    def __init__(self, result_kinds: int, config: Optional[AggregateConfig] = None):
+        self.config = config or AggregateConfig()
+        self.result_kinds = result_kinds
+        self.bucket_us = self.config.bucket_seconds * 1_000_000
+        self.max_buckets = self.config.max_buckets or DEFAULT_MAX_BUCKETS
+        self.dropped_rows = 0
+        self._buckets: Dict[Any, Dict[int, TaskAggregate]] = {}
+        self._horizons: Dict[Any, int] = {}
+
+    def new_aggregate(self) -> TaskAggregate:
+        """Empty aggregate with this index's settings"""
+        return TaskAggregate(self.result_kinds, self.config)
+
+    def add(
+        self,
+        keys: Iterable[Any],
+        timestamp_us: int,
+        duration_ms: float,
+        result: int,
+        tokens: int,
+        files: int
+    ) -> None:
+        """Add one task to the current bucket of every key"""
+        bucket = timestamp_us - timestamp_us % self.bucket_us
+        dropped = False
+        for key in keys:
+            buckets = self._buckets.get(key)
+            if buckets is None:
+                buckets = self._buckets[key] = {}
+            aggregate = buckets.get(bucket)
+            if aggregate is None:
+                if bucket < self._horizons.get(key, bucket):
+                    dropped = True
+                    continue
+                aggregate = buckets[bucket] = self.new_aggregate()
+                if len(buckets) > self.max_buckets:
+                    oldest = min(buckets)
+                    del buckets[oldest]
+                    self._horizons[key] = oldest + self.bucket_us
+                    if oldest == bucket:
+                        dropped = True
+                        continue
+            aggregate.add(duration_ms, result, tokens, files)
+        if dropped:
+            self.dropped_rows += 1
+
+    def expire(self, cutoff_us: int) -> None:
+        """Drop buckets that end before cutoff_us"""
+        for key in list(self._buckets):
+            buckets = self._buckets[key]
+            for bucket in [b for b in buckets if b + self.bucket_us <= cutoff_us]:
+                del buckets[bucket]
+            if not buckets:
+                del self._buckets[key]
+
+    def horizon(self, key: Any) -> Optional[int]:
+        """Time before which the key's rows are not indexed (None if none evicted)"""
+        return self._horizons.get(key)
+
+    def buckets(self, key: Any) -> List[Tuple[int, TaskAggregate]]:
+        """(bucket_start_us, aggregate) pairs of a key, oldest first"""
+        return sorted(self._buckets.get(key, {}).items())
+
+    def keys(self) -> List[Any]:
+        """Keys with at least one bucket"""
+        return list(self._buckets)
+
+    def bucket_count(self) -> int:
+        """Total buckets held across keys"""
+        return sum(len(b) for b in self._buckets.values())
+
+
+__all__ = [
+    "AggregateConfig",
+    "QuantileSketch",
+    "TaskAggregate",
+    "AggregateIndex",
+]
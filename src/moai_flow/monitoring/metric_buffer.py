@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+MetricRingBuffer - Bounded Columnar In-Memory Metric Storage
+
+Fixed-capacity ring buffer used by MetricsCollector instead of lists of
+metric dataclasses:
+- Numeric columns are typed arrays (array module), preallocated once
+- String columns (agent/swarm ids, metric types) are interned per buffer
+  and stored as int32 codes
+- Id columns (task ids) split "task-123" into an interned prefix and an
+  int64 suffix, so unique ids do not grow the string table
+- Timestamps are int64 epoch microseconds; ISO strings are only built when
+  a row is materialized
+- Metadata is kept sparsely, only for rows that have any
+- The oldest row is overwritten once the buffer is full, and rows older
+  than the retention window are evicted
+
+A stored task metric costs ~45 bytes of columns instead of the ~430 bytes
+of a TaskMetric dataclass with its dict, strings and timestamp.
+
+Rows read back as metric objects through the factory passed to the buffer,
+so len(), indexing and iteration behave like the former lists. Statistics
+read the typed columns directly via select().
+
+Example:
+    >>> buffer = MetricRingBuffer(
+    ...     capacity=1000,
+    ...     columns=(("agent_id", STRING), ("value", "d")),
+    ...     factory=lambda timestamp, values, metadata: (timestamp, values),
+    ... )
+    >>> buffer.append(now_us(), ("agent-1", 0.95))
+    >>> for agent_codes, values in buffer.select(("agent_id", "value")):
+    ...     ...
+"""
+
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Column type for interned strings (stored as int32 codes)
+STRING = "s"
+
+# Column type for ids: interned prefix code plus numeric suffix
+ID = "n"
+
+_DIGITS = "0123456789"
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class MetricBufferConfig:
+    """
+    In-memory metric retention for MetricsCollector.
+
+    Attributes:
+        task_capacity: Task metrics kept in memory (default: 100000)
+        agent_capacity: Agent metrics kept in memory (default: 20000)
+        swarm_capacity: Swarm metrics kept in memory (default: 20000)
+        retention_seconds: Evict metrics older than this; None keeps them
+            until overwritten (default: None)
+    """
+
+    task_capacity: int = 100_000
+    agent_capacity: int = 20_000
+    swarm_capacity: int = 20_000
+    retention_seconds: Optional[float] = None
+
+
+# ============================================================================
+# Timestamp Helpers
+# ============================================================================
+
+def now_us() -> int:
+    """Current UTC time as epoch microseconds"""
+    return time.time_ns() // 1000
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Datetime to epoch microseconds (naive values are local time)"""
+    value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_US
+
+
+def format_timestamp(timestamp_us: int) -> str:
+    """Epoch microseconds to the collector's ISO format ("...Z")"""
+    return (_EPOCH + timedelta(microseconds=timestamp_us)).isoformat() + "Z"
+
+
+def parse_timestamp(value: str) -> Optional[int]:
+    """ISO timestamp to epoch microseconds (None if unparseable)"""
+    try:
+        return to_epoch_us(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# String Interning
+# ============================================================================
+
+class _Interner:
+    """Bidirectional string <-> int code table"""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _split_id(value: str) -> Tuple[str, int]:
+    """Split "task-123" into ("task-", 123); -1 when there is no clean numeric suffix"""
+    prefix = value.rstrip(_DIGITS)
+    digits = value[len(prefix):]
+    if digits and len(digits) <= 18 and (digits[0] != "0" or digits == "0"):
+        return prefix, int(digits)
+    return value, -1
+
+
+# ============================================================================
+# MetricRingBuffer Implementation
+# ============================================================================
+
+class MetricRingBuffer:
+    """
+    Fixed-capacity columnar ring buffer of metric rows.
+
+    Not thread-safe; MetricsCollector guards it with its lock.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        columns: Sequence[Tuple[str, str]],
+        factory: Callable[[str, Tuple, Dict[str, Any]], Any],
+        retention_seconds: Optional[float] = None
+    ):
+        """
+        Initialize MetricRingBuffer
+
+        Args:
+            capacity: Maximum rows kept
+            columns: (name, typecode) pairs; typecode is an array typecode,
+                STRING for interned strings or ID for prefix + number ids
+            factory: Builds a metric object from (timestamp, values, metadata)
+            retention_seconds: Evict rows older than this (optional)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.factory = factory
+        self.retention_us = (
+            int(retention_seconds * 1_000_000) if retention_seconds else None
+        )
+
+        self.names = tuple(name for name, _ in columns)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._columns: List[array] = []
+        self._interners: List[Optional[_Interner]] = []
+        self._suffixes: List[Optional[array]] = []
+        for _, typecode in columns:
+            is_string = typecode in (STRING, ID)
+            self._columns.append(array("i" if is_string else typecode, [0]) * capacity)
+            self._interners.append(_Interner() if is_string else None)
+            self._suffixes.append(array("q", [0]) * capacity if typecode == ID else None)
+        self._timestamps = array("q", [0]) * capacity
+
+        # Sparse per-slot data
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._raw_timestamps: Dict[int, str] = {}
+
+        # Slots whose timestamp is older than the previous row's; while
+        # empty, timestamps are sorted and time ranges are found by bisection
+        self._unordered: set = set()
+
+        self._head = 0  # Next slot to write
+        self._size = 0
+        self._last_timestamp = 0
+
+    # ========================================================================
+    # Writing
+    # ========================================================================
+
+    def append(
+        self,
+        timestamp_us: int,
+        values: Sequence[Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        raw_timestamp: Optional[str] = None
+    ) -> None:
+        """
+        Append a row, overwriting the oldest one when full
+
+        Args:
+            timestamp_us: Row time as epoch microseconds
+            values: Column values in column order
+            metadata: Row metadata (kept only if non-empty)
+            raw_timestamp: Timestamp string to return instead of the
+                formatted timestamp_us (for caller-supplied timestamps)
+        """
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        slot = self._head
+        for column, interner, suffixes, value in zip(
+            self._columns, self._interners, self._suffixes, values
+        ):
+            if interner is None:
+                column[slot] = value
+            elif suffixes is None:
+                column[slot] = interner.intern(value)
+            else:
+                prefix, suffixes[slot] = _split_id(value)
+                column[slot] = interner.intern(prefix)
+        self._timestamps[slot] = timestamp_us
+        if metadata:
+            self._metadata[slot] = metadata
+        if raw_timestamp is not None:
+            self._raw_timestamps[slot] = raw_timestamp
+
+        if self._size and timestamp_us < self._last_timestamp:
+            self._unordered.add(slot)
+        self._last_timestamp = timestamp_us
+
+        self._head = (slot + 1) % self.capacity
+        self._size += 1
+
+        if self.retention_us is not None:
+            self.expire(timestamp_us)
+
+        for interner in self._interners:
+            if interner is not None and len(interner) > 2 * self.capacity:
+                self._compact_interners()
+                break
+
+    def expire(self, now: Optional[int] = None) -> int:
+        """
+        Evict rows older than the retention window
+
+        Args:
+            now: Current time as epoch microseconds (default: now_us())
+
+        Returns:
+            Number of rows evicted
+        """
+        if self.retention_us is None:
+            return 0
+        cutoff = (now if now is not None else now_us()) - self.retention_us
+        evicted = 0
+        while self._size and self._timestamps[self._oldest_slot()] < cutoff:
+            self._evict_oldest()
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Drop all rows and interned strings"""
+        self._metadata.clear()
+        self._raw_timestamps.clear()
+        self._unordered.clear()
+        self._interners = [
+            _Interner() if interner is not None else None for interner in self._interners
+        ]
+        self._head = self._size = 0
+
+    def _oldest_slot(self) -> int:
+        return (self._head - self._size) % self.capacity
+
+    def _evict_oldest(self) -> None:
+        slot = self._oldest_slot()
+        self._metadata.pop(slot, None)
+        self._raw_timestamps.pop(slot, None)
+        self._unordered.discard(slot)
+        self._size -= 1
+        # The next row is now the oldest; its order relative to the evicted row no longer matters
+        self._unordered.discard((slot + 1) % self.capacity)
+
+    def _compact_interners(self) -> None:
+        """Rebuild string tables from live rows (amortized O(1) per append)"""
+        slots = list(self._slots())
+        for i, interner in enumerate(self._interners):
+            if interner is None:
+                continue
+            column = self._columns[i]
+            fresh = _Interner()
+            for slot in slots:
+                column[slot] = fresh.intern(interner.values[column[slot]])
+            self._interners[i] = fresh
+
+    # ========================================================================
+    # Reading
+    # ========================================================================
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("metric index out of range")
+        return self._materialize((self._oldest_slot() + index) % self.capacity)
+
+    def __iter__(self) -> Iterator[Any]:
+        for slot in self._slots():
+            yield self._materialize(slot)
+
+    def _slots(self) -> Iterator[int]:
+        start = self._oldest_slot()
+        for i in range(self._size):
+            yield (start + i) % self.capacity
+
+    def _materialize(self, slot: int) -> Any:
+        values = tuple(
+            column[slot] if interner is None
+            else interner.values[column[slot]] if suffixes is None or suffixes[slot] < 0
+            else interner.values[column[slot]] + str(suffixes[slot])
+            for column, interner, suffixes in zip(
+                self._columns, self._interners, self._suffixes
+            )
+        )
+        timestamp = self._raw_timestamps.get(slot)
+        if timestamp is None:
+            timestamp = format_timestamp(self._timestamps[slot])
+        return self.factory(timestamp, values, self._metadata.get(slot, {}))
+
+    def oldest_timestamp(self) -> Optional[int]:
+        """Timestamp of the oldest row (None when empty)"""
+        return self._timestamps[self._oldest_slot()] if self._size else None
+
+    def code(self, name: str, value: str) -> Optional[int]:
+        """Interned code of value in a STRING column (None if never stored)"""
+        return self._interners[self._index[name]].codes.get(value)
+
+    def decode(self, name: str, code: int) -> str:
+        """String for a code of a STRING column"""
+        return self._interners[self._index[name]].values[code]
+
+    def select(
+        self,
+        names: Sequence[str],
+        start_us: Optional[int] = None,
+        end_us: Optional[int] = None
+    ) -> List[Tuple[Sequence, ...]]:
+        """
+        Column data for rows within [start_us, end_us], oldest first
+
+        The name "timestamp" selects the epoch-microsecond column. Returns
+        one tuple of column sequences per contiguous run of slots (at most
+        two, as the ring wraps); each sequence is an array slice.
+
+        Args:
+            names: Columns to return
+            start_us: Inclusive lower time bound (optional)
+            end_us: Inclusive upper time bound (optional)
+
+        Returns:
+            List of tuples with one sequence per requested column
+        """
+        if self.retention_us is not None:
+            self.expire()
+            retained = now_us() - self.retention_us
+            start_us = retained if start_us is None else max(start_us, retained)
+
+        columns = [
+            self._timestamps if name == "timestamp" else self._columns[self._index[name]]
+            for name in names
+        ]
+
+        if self._unordered and (start_us is not None or end_us is not None):
+            # Timestamps are not sorted: filter row by row
+            selected = [
+                slot for slot in self._slots()
+                if (start_us is None or self._timestamps[slot] >= start_us)
+                and (end_us is None or self._timestamps[slot] <= end_us)
+            ]
+            return [tuple([column[slot] for slot in selected] for column in columns)]
+
+        first = 0 if start_us is None else self._bisect(start_us, right=False)
+        last = self._size if end_us is None else self._bisect(end_us, right=True)
+        if first >= last:
+            return []
+
+        start = self._oldest_slot()
+        lo = (start + first) % self.capacity
+        count = last - first
+        runs = [(lo, min(lo + count, self.capacity))]
+        if lo + count > self.capacity:
+            runs.append((0, lo + count - self.capacity))
+        return [tuple(column[a:b] for column in columns) for a, b in runs]
+
+    def _bisect(self, timestamp_us: int, right: bool) -> int:
+        """Logical index of the first row after (right) / at-or-after timestamp_us"""
+        start = self._oldest_slot()
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._timestamps[(start + mid) % self.capacity]
+            if value < timestamp_us or (right and value == timestamp_us):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the column arrays"""
+        arrays = self._columns + [a for a in self._suffixes if a is not None]
+        arrays.append(self._timestamps)
+        return sum(column.itemsize * len(column) for column in arrays)
+
+
+__all__ = [
+    "MetricRingBuffer",
+    "MetricBufferConfig",
+    "STRING",
+    "ID",
+    "now_us",
+    "to_epoch_us",
+    "format_timestamp",
+    "parse_timestamp",
+]
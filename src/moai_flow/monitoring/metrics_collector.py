@@ -13,21 +13,41 @@ Features:
 - Integration with SwarmCoordinator
 - MetricsStorage persistence layer
 - Graceful degradation on storage failures
+- Bounded memory: columnar ring buffers with a retention window
+- O(buckets) statistics from streaming aggregates and quantile sketches
+- Batch-draining async worker with a backpressure policy
+- Lock-free recording: per-thread staging buffers merged by the worker,
+  monotonic-ns timestamps formatted only on export, sampled overhead
 
 Version: 1.0.0
 Phase: 6A (Weeks 1-2) - Observability Infrastructure
 """
 
 import asyncio
+import heapq
 import logging
+import math
+import threading
 import time
-from dataclasses import dataclass, field, asdict
+from collections import deque
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime, timedelta
 from enum import Enum
-from queue import Queue, Empty
+from operator import itemgetter
 from threading import Thread, Lock
-from typing import Any, Dict, List, Optional, Tuple
-from statistics import mean, median
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .metric_aggregates import AggregateConfig, AggregateIndex, TaskAggregate
+from .metric_buffer import (
+    ID,
+    STRING,
+    MetricBufferConfig,
+    MetricRingBuffer,
+    format_timestamp,
+    now_us,
+    parse_timestamp,
+    to_epoch_us,
+)
 
 
 # ============================================================================
@@ -49,6 +69,45 @@ class TaskResult(Enum):
     TIMEOUT = "timeout"
 
 
+class BackpressurePolicy(Enum):
+    """What record_* does when its thread's staging buffer is full"""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued metric
+    BLOCK = "block"              # Wait up to block_timeout_ms, then drop
+    SAMPLE = "sample"            # Keep 1 in N above the high-water mark
+
+
+# ============================================================================
+# Configuration Classes
+# ============================================================================
+
+@dataclass
+class AsyncWorkerConfig:
+    """
+    Async worker batching and backpressure.
+
+    Each recording thread stages metrics in its own buffer of queue_size
+    entries; the worker merges all buffers every flush_interval_ms, or
+    sooner once a buffer holds max_batch_size metrics.
+
+    Attributes:
+        max_batch_size: Metrics stored and persisted per batch (default: 256)
+        flush_interval_ms: Longest time a metric waits in a thread
+            buffer (default: 50)
+        backpressure: Policy when a thread buffer is full (default: DROP_OLDEST)
+        block_timeout_ms: BLOCK: longest wait for buffer space (default: 50)
+        sample_every: SAMPLE: keep one metric in this many (default: 10)
+        high_water_mark: SAMPLE: buffer fill ratio at which sampling
+            starts (default: 0.8)
+    """
+
+    max_batch_size: int = 256
+    flush_interval_ms: float = 50.0
+    backpressure: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST
+    block_timeout_ms: float = 50.0
+    sample_every: int = 10
+    high_water_mark: float = 0.8
+
+
 # ============================================================================
 # Metric Data Structures
 # ============================================================================
@@ -115,6 +174,124 @@ class SwarmMetric:
         return asdict(self)
 
 
+# ============================================================================
+# Ring Buffer Row Layouts
+# ============================================================================
+
+# Result column stores the index into this tuple
+_RESULTS = tuple(TaskResult)
+_RESULT_CODES = {result: code for code, result in enumerate(_RESULTS)}
+
+_TASK_COLUMNS = (
+    ("task_id", ID),
+    ("agent_id", STRING),
+    ("duration_ms", "d"),
+    ("result", "b"),
+    ("tokens_used", "q"),
+    ("files_changed", "i"),
+)
+_AGENT_COLUMNS = (("agent_id", STRING), ("metric_type", STRING), ("value", "d"))
+_SWARM_COLUMNS = (("swarm_id", STRING), ("metric_type", STRING), ("value", "d"))
+
+
+def _checked_values(metric_type: "MetricType", values: Tuple) -> Tuple:
+    """
+    Convert a staged row's values to their column types
+
+    Raises KeyError, TypeError or ValueError for a malformed row, so one
+    bad record can be dropped before it joins a shared batch.
+    """
+    if metric_type is MetricType.TASK:
+        task_id, agent_id, duration_ms, result, tokens, files = values
+        return (
+            task_id, agent_id, float(duration_ms), _RESULT_CODES[result],
+            int(tokens), int(files),
+        )
+    owner_id, metric_type_name, value = values
+    return (owner_id, metric_type_name, float(value))
+
+
+def _task_from_row(timestamp: str, values: Tuple, metadata: Dict[str, Any]) -> TaskMetric:
+    task_id, agent_id, duration_ms, result, tokens_used, files_changed = values
+    return TaskMetric(
+        task_id, agent_id, duration_ms, _RESULTS[result],
+        tokens_used, files_changed, timestamp, metadata
+    )
+
+
+def _agent_from_row(timestamp: str, values: Tuple, metadata: Dict[str, Any]) -> AgentMetric:
+    return AgentMetric(*values, timestamp=timestamp, metadata=metadata)
+
+
+def _swarm_from_row(timestamp: str, values: Tuple, metadata: Dict[str, Any]) -> SwarmMetric:
+    return SwarmMetric(*values, timestamp=timestamp, metadata=metadata)
+
+
+# Storage methods per metric type: (single metric, batch)
+_SAVE_METHODS = {
+    MetricType.TASK: ("save_task_metric", "save_task_metrics_batch"),
+    MetricType.AGENT: ("save_agent_metric", "save_agent_metrics_batch"),
+    MetricType.SWARM: ("save_swarm_metric", "save_swarm_metrics_batch"),
+}
+
+# Field names of a staged row's values, per metric type (to_dict() order)
+_ROW_FIELDS = {
+    MetricType.TASK: tuple(name for name, _ in _TASK_COLUMNS),
+    MetricType.AGENT: tuple(name for name, _ in _AGENT_COLUMNS),
+    MetricType.SWARM: tuple(name for name, _ in _SWARM_COLUMNS),
+}
+
+
+# ============================================================================
+# Thread Staging Buffers
+# ============================================================================
+
+# Staged row: (metric_type, monotonic_ns, values, metadata, timestamp).
+# timestamp is a caller-supplied ISO string or None.
+_row_time = itemgetter(1)
+
+
+def _clock_offset_ns() -> int:
+    """Current wall-clock minus monotonic time, mapping staged rows to epoch time"""
+    return time.time_ns() - time.monotonic_ns()
+
+# Enum member lookups are slow on the recording path; bind them once
+_TASK, _AGENT, _SWARM = MetricType.TASK, MetricType.AGENT, MetricType.SWARM
+
+
+class _ThreadBuffer:
+    """
+    Metrics staged by one recording thread.
+
+    Only the owning thread appends and updates the counters; the worker
+    pops from the left. Both deque operations are atomic, so neither
+    side takes a lock.
+    """
+
+    __slots__ = ("thread", "rows", "recorded", "dropped", "sampled_out", "blocked", "sample_tick")
+
+    def __init__(self, thread: Thread):
+        self.thread = thread
+        self.rows: deque = deque()
+        self.recorded = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.blocked = 0
+        self.sample_tick = 0
+
+    def drain(self) -> List[Tuple]:
+        """Pop the rows staged so far, oldest first (worker side)"""
+        rows = self.rows
+        popleft = rows.popleft
+        drained = []
+        for _ in range(len(rows)):
+            try:
+                drained.append(popleft())
+            except IndexError:  # Owner dropped its oldest row meanwhile
+                break
+        return drained
+
+
 # ============================================================================
 # MetricsCollector Implementation
 # ============================================================================
@@ -133,7 +310,10 @@ class MetricsCollector:
     - Configurable enable/disable via constructor
     - Automatic aggregation and statistics calculation
     - Graceful degradation if storage fails
-    - Thread-safe metric recording
+    - Thread-safe metric recording; async mode stages metrics per thread
+      without locks and merges them in a worker thread
+    - Bounded in-memory history (MetricBufferConfig capacities and retention)
+    - Streaming per-agent aggregates with mergeable quantile sketches
 
     Example:
         >>> storage = MetricsStorage()
@@ -156,7 +336,11 @@ class MetricsCollector:
         storage: Optional[Any] = None,
         async_mode: bool = True,
         enabled: bool = True,
-        queue_size: int = 1000
+        queue_size: int = 1000,
+        buffer_config: Optional[MetricBufferConfig] = None,
+        aggregate_config: Optional[AggregateConfig] = None,
+        worker_config: Optional[AsyncWorkerConfig] = None,
+        overhead_sample_every: int = 1000
     ):
         """
         Initialize MetricsCollector
@@ -165,31 +349,91 @@ class MetricsCollector:
             storage: MetricsStorage instance for persistence (optional)
             async_mode: Enable async background collection (default: True)
             enabled: Enable/disable metrics collection (default: True)
-            queue_size: Maximum async queue size (default: 1000)
+            queue_size: Metrics each recording thread can stage before
+                backpressure applies (default: 1000)
+            buffer_config: In-memory capacities and retention window
+                (defaults to MetricBufferConfig())
+            aggregate_config: Time bucket and sketch settings for task
+                statistics (defaults to AggregateConfig())
+            worker_config: Async batching and backpressure policy
+                (defaults to AsyncWorkerConfig())
+            overhead_sample_every: Time one record_* call in this many
+                for get_collection_overhead() (default: 1000)
         """
         self.storage = storage
         self.async_mode = async_mode
         self.enabled = enabled
+        self.buffer_config = buffer_config or MetricBufferConfig()
+        self.worker_config = worker_config or AsyncWorkerConfig()
         self.logger = logging.getLogger(__name__)
 
-        # In-memory metric storage
-        self._task_metrics: List[TaskMetric] = []
-        self._agent_metrics: List[AgentMetric] = []
-        self._swarm_metrics: List[SwarmMetric] = []
+        # In-memory metric storage (bounded columnar ring buffers; len(),
+        # indexing and iteration yield TaskMetric/AgentMetric/SwarmMetric)
+        retention = self.buffer_config.retention_seconds
+        self._task_metrics = MetricRingBuffer(
+            self.buffer_config.task_capacity, _TASK_COLUMNS, _task_from_row, retention
+        )
+        self._agent_metrics = MetricRingBuffer(
+            self.buffer_config.agent_capacity, _AGENT_COLUMNS, _agent_from_row, retention
+        )
+        self._swarm_metrics = MetricRingBuffer(
+            self.buffer_config.swarm_capacity, _SWARM_COLUMNS, _swarm_from_row, retention
+        )
+
+        # Task statistics per time bucket, globally (key None) and per agent;
+        # without an explicit limit the buckets span the retention window
+        aggregate_config = aggregate_config or AggregateConfig()
+        if aggregate_config.max_buckets is None and retention:
+            aggregate_config = replace(
+                aggregate_config,
+                max_buckets=math.ceil(retention / aggregate_config.bucket_seconds) + 1
+            )
+        self._task_aggregates = AggregateIndex(len(_RESULTS), aggregate_config)
+
+        # Latest (timestamp_us, value) per swarm and metric type
+        self._swarm_latest: Dict[str, Dict[str, Tuple[int, float]]] = {}
 
         # Thread-safe access
         self._lock = Lock()
 
-        # Async collection queue
+        # Per-thread staging buffers (registered under _stats_lock) and the
+        # counters of buffers whose threads have exited
+        self._local = threading.local()
+        self._thread_buffers: List[_ThreadBuffer] = []
+        self._stats_lock = Lock()
+        self._queue_stats = {
+            "processed": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "max_queue_depth": 0,
+            "dropped": 0,
+            "sampled_out": 0,
+            "blocked": 0,
+            "persist_errors": 0,
+        }
+        self._retired_records = 0
+        self._fast_depth = -1  # Sync mode: every row takes the slow path
+
+        # Sampled collection overhead (running totals, constant memory)
+        self._overhead_sample_every = max(1, overhead_sample_every)
+        self._overhead_samples = 0
+        self._overhead_total_ns = 0
+        self._overhead_max_ns = 0
+
+        # Async collection: thread buffers merged by a worker thread
         if self.async_mode:
-            self._queue: Queue = Queue(maxsize=queue_size)
+            self._buffer_capacity = queue_size
+            self._sample_depth = int(queue_size * self.worker_config.high_water_mark)
+            self._wake_depth = min(self.worker_config.max_batch_size, queue_size)
+            # Below this depth staging is a plain append
+            self._fast_depth = min(self._wake_depth - 1, self._sample_depth, queue_size)
+            self._flush_lock = Lock()
+            self._wakeup = threading.Event()
+            self._drained = threading.Condition(Lock())
             self._worker_thread: Optional[Thread] = None
             self._shutdown = False
             self._start_async_worker()
 
-        # Performance tracking
-        self._collection_times: List[float] = []
-
         self.logger.info(
             f"MetricsCollector initialized "
             f"(async={async_mode}, enabled={enabled})"
@@ -235,50 +479,39 @@ class MetricsCollector:
         if not self.enabled:
             return
 
-        start_time = time.perf_counter()
-
-        metric = TaskMetric(
-            task_id=task_id,
-            agent_id=agent_id,
-            duration_ms=duration_ms,
-            result=result,
-            tokens_used=tokens_used,
-            files_changed=files_changed,
-            metadata=metadata or {}
-        )
-
-        if self.async_mode:
-            # Queue for async processing
-            try:
-                self._queue.put_nowait((MetricType.TASK, metric))
-            except Exception as e:
-                self.logger.warning(f"Async queue full, recording synchronously: {e}")
-                self._record_task_sync(metric)
-        else:
-            # Synchronous recording
-            self._record_task_sync(metric)
-
-        # Track collection overhead
-        collection_time = (time.perf_counter() - start_time) * 1000  # ms
-        self._collection_times.append(collection_time)
-
-        if collection_time > 1.0:
-            self.logger.warning(
-                f"Metric collection took {collection_time:.2f}ms (target: <1ms)"
-            )
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._register_thread_buffer()
+        tick = buffer.recorded
+        buffer.recorded = tick + 1
+        start_ns = 0 if tick % self._overhead_sample_every else time.perf_counter_ns()
+
+        self._record_row(buffer, (
+            _TASK,
+            time.monotonic_ns(),
+            (task_id, agent_id, duration_ms, result, tokens_used, files_changed),
+            metadata,
+            None,
+        ))
+
+        if start_ns:
+            self._track_overhead(start_ns)
 
     def _record_task_sync(self, metric: TaskMetric) -> None:
-        """Record task metric synchronously (internal)"""
-        with self._lock:
-            self._task_metrics.append(metric)
-
-        # Persist to storage if available
-        if self.storage:
-            try:
-                self.storage.save_task_metric(metric.to_dict())
-            except Exception as e:
-                self.logger.error(f"Failed to persist task metric: {e}")
-                # Graceful degradation: continue with in-memory only
+        """Record a TaskMetric synchronously, keeping its timestamp (internal)"""
+        self._record_metric_sync(MetricType.TASK, metric, (
+            metric.task_id, metric.agent_id, metric.duration_ms,
+            metric.result, metric.tokens_used, metric.files_changed,
+        ))
+
+    def _store_task(self, timestamp_us: int, values: Tuple, metadata: Optional[Dict[str, Any]]) -> None:
+        """Add a checked task row to the buffer and aggregates (lock held)"""
+        task_id, agent_id, duration_ms, result, tokens, files = values
+        self._task_metrics.append(timestamp_us, values, metadata)
+        self._task_aggregates.add(
+            (None, agent_id), timestamp_us, duration_ms, result, tokens, files
+        )
 
     # ========================================================================
     # Agent Metrics
@@ -310,32 +543,30 @@ class MetricsCollector:
         if not self.enabled:
             return
 
-        metric = AgentMetric(
-            agent_id=agent_id,
-            metric_type=metric_type,
-            value=value,
-            metadata=metadata or {}
-        )
-
-        if self.async_mode:
-            try:
-                self._queue.put_nowait((MetricType.AGENT, metric))
-            except Exception as e:
-                self.logger.warning(f"Async queue full, recording synchronously: {e}")
-                self._record_agent_sync(metric)
-        else:
-            self._record_agent_sync(metric)
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._register_thread_buffer()
+        tick = buffer.recorded
+        buffer.recorded = tick + 1
+        start_ns = 0 if tick % self._overhead_sample_every else time.perf_counter_ns()
+
+        self._record_row(buffer, (
+            _AGENT,
+            time.monotonic_ns(),
+            (agent_id, metric_type, value),
+            metadata,
+            None,
+        ))
+
+        if start_ns:
+            self._track_overhead(start_ns)
 
     def _record_agent_sync(self, metric: AgentMetric) -> None:
-        """Record agent metric synchronously (internal)"""
-        with self._lock:
-            self._agent_metrics.append(metric)
-
-        if self.storage:
-            try:
-                self.storage.save_agent_metric(metric.to_dict())
-            except Exception as e:
-                self.logger.error(f"Failed to persist agent metric: {e}")
+        """Record an AgentMetric synchronously, keeping its timestamp (internal)"""
+        self._record_metric_sync(
+            MetricType.AGENT, metric, (metric.agent_id, metric.metric_type, metric.value)
+        )
 
     # ========================================================================
     # Swarm Metrics
@@ -369,33 +600,246 @@ class MetricsCollector:
         if not self.enabled:
             return
 
-        metric = SwarmMetric(
-            swarm_id=swarm_id,
-            metric_type=metric_type,
-            value=value,
-            timestamp=timestamp or datetime.utcnow().isoformat() + "Z",
-            metadata=metadata or {}
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._register_thread_buffer()
+        tick = buffer.recorded
+        buffer.recorded = tick + 1
+        start_ns = 0 if tick % self._overhead_sample_every else time.perf_counter_ns()
+
+        self._record_row(buffer, (
+            _SWARM,
+            time.monotonic_ns(),
+            (swarm_id, metric_type, value),
+            metadata,
+            timestamp,
+        ))
+
+        if start_ns:
+            self._track_overhead(start_ns)
+
+    def _record_swarm_sync(self, metric: SwarmMetric) -> None:
+        """Record a SwarmMetric synchronously, keeping its timestamp (internal)"""
+        self._record_metric_sync(
+            MetricType.SWARM, metric, (metric.swarm_id, metric.metric_type, metric.value)
         )
 
-        if self.async_mode:
-            try:
-                self._queue.put_nowait((MetricType.SWARM, metric))
-            except Exception as e:
-                self.logger.warning(f"Async queue full, recording synchronously: {e}")
-                self._record_swarm_sync(metric)
+    def _store_swarm(
+        self,
+        timestamp_us: int,
+        values: Tuple,
+        metadata: Optional[Dict[str, Any]],
+        timestamp: Optional[str]
+    ) -> None:
+        """Add a swarm row to its buffer, keeping caller-supplied timestamps verbatim (lock held)"""
+        raw_timestamp = None
+        if timestamp is not None:
+            parsed = parse_timestamp(timestamp)
+            if parsed is None:
+                raw_timestamp = timestamp
+            else:
+                timestamp_us = parsed
+                if format_timestamp(parsed) != timestamp:
+                    raw_timestamp = timestamp
+
+        swarm_id, metric_type, value = values
+        self._swarm_metrics.append(timestamp_us, values, metadata, raw_timestamp)
+        latest = self._swarm_latest.setdefault(swarm_id, {})
+        previous = latest.get(metric_type)
+        if previous is None or timestamp_us >= previous[0]:
+            latest[metric_type] = (timestamp_us, value)
+
+    # ========================================================================
+    # Recording Fast Path
+    # ========================================================================
+
+    def _register_thread_buffer(self) -> _ThreadBuffer:
+        """Create and register the calling thread's staging buffer"""
+        buffer = _ThreadBuffer(threading.current_thread())
+        with self._stats_lock:
+            # Fold in buffers of exited threads that the worker has emptied
+            live = []
+            for other in self._thread_buffers:
+                if other.thread.is_alive() or other.rows:
+                    live.append(other)
+                else:
+                    self._retire_buffer(other)
+            live.append(buffer)
+            self._thread_buffers = live
+        self._local.buffer = buffer
+        return buffer
+
+    def _retire_buffer(self, buffer: _ThreadBuffer) -> None:
+        """Keep an exited thread's counters (_stats_lock held)"""
+        self._retired_records += buffer.recorded
+        self._queue_stats["dropped"] += buffer.dropped
+        self._queue_stats["sampled_out"] += buffer.sampled_out
+        self._queue_stats["blocked"] += buffer.blocked
+
+    def _record_row(self, buffer: _ThreadBuffer, row: Tuple) -> None:
+        """Stage a row for the worker, or store it now in sync mode"""
+        rows = buffer.rows
+        if len(rows) < self._fast_depth:
+            rows.append(row)
         else:
-            self._record_swarm_sync(metric)
+            self._stage_slow(buffer, row)
 
-    def _record_swarm_sync(self, metric: SwarmMetric) -> None:
-        """Record swarm metric synchronously (internal)"""
-        with self._lock:
-            self._swarm_metrics.append(metric)
+    def _stage_slow(self, buffer: _ThreadBuffer, row: Tuple) -> None:
+        """Sync mode, or a buffer deep enough for wake-up and backpressure checks"""
+        if not self.async_mode:
+            self._store_rows([row], batch=False)
+            return
+
+        rows = buffer.rows
+        depth = len(rows)
+        if depth >= self._sample_depth and self.worker_config.backpressure == BackpressurePolicy.SAMPLE:
+            buffer.sample_tick += 1
+            if buffer.sample_tick % self.worker_config.sample_every:
+                buffer.sampled_out += 1
+                return
 
-        if self.storage:
+        if depth >= self._buffer_capacity and not self._make_room(buffer):
+            buffer.dropped += 1
+            return
+
+        rows.append(row)
+        if depth + 1 >= self._wake_depth and not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _make_room(self, buffer: _ThreadBuffer) -> bool:
+        """Apply the backpressure policy to a full buffer; False drops the new row"""
+        policy = self.worker_config.backpressure
+        if policy == BackpressurePolicy.DROP_OLDEST:
             try:
-                self.storage.save_swarm_metric(metric.to_dict())
-            except Exception as e:
-                self.logger.error(f"Failed to persist swarm metric: {e}")
+                buffer.rows.popleft()
+                buffer.dropped += 1
+            except IndexError:  # The worker drained it meanwhile
+                pass
+            return True
+
+        if policy == BackpressurePolicy.BLOCK:
+            buffer.blocked += 1
+            self._wakeup.set()
+            deadline = time.monotonic() + self.worker_config.block_timeout_ms / 1000
+            with self._drained:
+                while len(buffer.rows) >= self._buffer_capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._drained.wait(remaining)
+            return True
+
+        return False
+
+    def _record_metric_sync(self, metric_type: MetricType, metric: Any, values: Tuple) -> None:
+        """Store a metric dataclass now, keeping its timestamp"""
+        timestamp_us = parse_timestamp(metric.timestamp)
+        if timestamp_us is None:
+            timestamp_us = now_us()
+        offset = _clock_offset_ns()
+        row = (
+            metric_type,
+            timestamp_us * 1000 - offset,
+            values,
+            metric.metadata,
+            metric.timestamp if metric_type == MetricType.SWARM else None,
+        )
+        self._store_rows([row], batch=False, offset=offset)
+
+    def _store_rows(
+        self, rows: List[Tuple], batch: bool = True, offset: Optional[int] = None
+    ) -> None:
+        """
+        Store staged rows under one lock, then persist them per metric type
+
+        Each row is converted to its column types first; a malformed row
+        is logged, counted in persist_errors and dropped on its own.
+        Monotonic times are mapped to epoch time with the clock offset
+        sampled now, so wall-clock steps (NTP, suspend) apply per batch.
+        """
+        if offset is None:
+            offset = _clock_offset_ns()
+        checked = []
+        for metric_type, monotonic_ns, values, metadata, timestamp in rows:
+            try:
+                values = _checked_values(metric_type, values)
+            except (KeyError, TypeError, ValueError) as e:
+                with self._stats_lock:
+                    self._queue_stats["persist_errors"] += 1
+                self.logger.error(f"Dropped malformed {metric_type.value} metric {values!r}: {e!r}")
+                continue
+            checked.append((metric_type, monotonic_ns, values, metadata, timestamp))
+        rows = checked
+
+        with self._lock:
+            for metric_type, monotonic_ns, values, metadata, timestamp in rows:
+                timestamp_us = (monotonic_ns + offset) // 1000
+                if metric_type is _TASK:
+                    self._store_task(timestamp_us, values, metadata)
+                elif metric_type is _AGENT:
+                    self._agent_metrics.append(timestamp_us, values, metadata)
+                else:
+                    self._store_swarm(timestamp_us, values, metadata, timestamp)
+
+        if not self.storage:
+            return
+
+        # Timestamps are formatted here, on export, not when recording
+        grouped: Dict[MetricType, List[Dict[str, Any]]] = {}
+        for metric_type, monotonic_ns, values, metadata, timestamp in rows:
+            data = dict(zip(_ROW_FIELDS[metric_type], values))
+            if metric_type is _TASK:
+                data["result"] = _RESULTS[data["result"]].value
+            data["timestamp"] = timestamp or format_timestamp((monotonic_ns + offset) // 1000)
+            data["metadata"] = metadata or {}
+            grouped.setdefault(metric_type, []).append(data)
+
+        for metric_type, metrics in grouped.items():
+            self._persist(metric_type, metrics, batch)
+
+    def _track_overhead(self, start_ns: int) -> None:
+        """Account one sampled record_* call"""
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        with self._stats_lock:
+            self._overhead_samples += 1
+            self._overhead_total_ns += elapsed_ns
+            if elapsed_ns > self._overhead_max_ns:
+                self._overhead_max_ns = elapsed_ns
+
+        if elapsed_ns > 1_000_000:
+            self.logger.warning(
+                f"Metric collection took {elapsed_ns / 1e6:.2f}ms (target: <1ms)"
+            )
+
+    # ========================================================================
+    # Persistence
+    # ========================================================================
+
+    def _persist(self, metric_type: MetricType, metrics: List[Dict[str, Any]], batch: bool = True) -> None:
+        """
+        Hand metric dictionaries to storage (internal)
+
+        Batches go to save_*_metrics_batch when the storage has it,
+        otherwise one save_*_metric call per metric. Failures are logged
+        and counted; metrics stay in memory (graceful degradation).
+        """
+        if not self.storage or not metrics:
+            return
+
+        single_name, batch_name = _SAVE_METHODS[metric_type]
+        try:
+            save_batch = getattr(self.storage, batch_name, None) if batch else None
+            if save_batch is not None:
+                save_batch(metrics)
+            else:
+                save = getattr(self.storage, single_name)
+                for metric in metrics:
+                    save(metric)
+        except Exception as e:
+            with self._stats_lock:
+                self._queue_stats["persist_errors"] += len(metrics)
+            self.logger.error(f"Failed to persist {len(metrics)} {metric_type.value} metric(s): {e}")
 
     # ========================================================================
     # Statistics and Aggregation
@@ -410,6 +854,9 @@ class MetricsCollector:
         """
         Get task statistics with optional filtering
 
+        Answered from the streaming aggregates in O(time buckets); see
+        get_aggregate(). Percentiles come from quantile sketches.
+
         Args:
             agent_id: Filter by agent (optional)
             time_range: Time range (start_time, end_time) (optional)
@@ -423,6 +870,9 @@ class MetricsCollector:
                 "median_duration_ms": float,
                 "min_duration_ms": float,
                 "max_duration_ms": float,
+                "stddev_duration_ms": float,
+                "p95_duration_ms": float,
+                "p99_duration_ms": float,
                 "success_rate": float,
                 "total_tokens": int,
                 "total_files_changed": int,
@@ -434,54 +884,175 @@ class MetricsCollector:
             >>> print(f"Average duration: {stats['avg_duration_ms']:.0f}ms")
             Average duration: 3500ms
         """
-        with self._lock:
-            metrics = list(self._task_metrics)
+        return self.stats_from_aggregate(self.get_aggregate(agent_id, time_range))
 
-        # Filter by agent_id
-        if agent_id:
-            metrics = [m for m in metrics if m.agent_id == agent_id]
+    def get_aggregate(
+        self,
+        agent_id: Optional[str] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> TaskAggregate:
+        """
+        Get merged task aggregate (counts, Welford variance, quantile sketch)
+
+        Merges the time buckets of the global or per-agent aggregates, so
+        the cost is O(buckets). Buckets cut by the time range are rebuilt
+        exactly from the in-memory metrics while those still cover them,
+        otherwise counted whole. Time older than the oldest kept bucket
+        (evicted buckets and rows that arrived too late for them) is
+        scanned from the in-memory metrics.
+
+        Aggregates from several collectors combine with
+        TaskAggregate.merge(); pass the result to stats_from_aggregate().
+
+        Args:
+            agent_id: Filter by agent (optional)
+            time_range: Time range (start_time, end_time) (optional)
 
-        # Filter by time_range
+        Returns:
+            TaskAggregate (a new object owned by the caller)
+
+        Example:
+            >>> total = collector_a.get_aggregate()
+            >>> total.merge(collector_b.get_aggregate())
+            >>> MetricsCollector.stats_from_aggregate(total)["p99_duration_ms"]
+        """
+        start_us = end_us = None
         if time_range:
-            start_time, end_time = time_range
-            metrics = [
-                m for m in metrics
-                if start_time <= datetime.fromisoformat(m.timestamp.replace("Z", "")) <= end_time
-            ]
+            start_us, end_us = (to_epoch_us(t) for t in time_range)
 
-        if not metrics:
-            return {
-                "count": 0,
-                "avg_duration_ms": 0.0,
-                "median_duration_ms": 0.0,
-                "min_duration_ms": 0.0,
-                "max_duration_ms": 0.0,
-                "success_rate": 0.0,
-                "total_tokens": 0,
-                "total_files_changed": 0,
-                "results_breakdown": {}
+        index = self._task_aggregates
+        width = index.bucket_us
+        with self._lock:
+            retention = self.buffer_config.retention_seconds
+            if retention:
+                index.expire(now_us() - int(retention * 1_000_000))
+
+            total = index.new_aggregate()
+            horizon_us = index.horizon(agent_id)
+            if horizon_us is not None and (start_us is None or start_us < horizon_us):
+                self._aggregate_rows(
+                    total,
+                    agent_id,
+                    start_us,
+                    horizon_us - 1 if end_us is None else min(end_us, horizon_us - 1)
+                )
+
+            oldest_us = self._task_metrics.oldest_timestamp()
+            for bucket, aggregate in index.buckets(agent_id):
+                last_us = bucket + width - 1
+                if (start_us is not None and last_us < start_us) or (
+                    end_us is not None and bucket > end_us
+                ):
+                    continue
+                partial = (start_us is not None and bucket < start_us) or (
+                    end_us is not None and last_us > end_us
+                )
+                if partial and oldest_us is not None and oldest_us <= bucket:
+                    self._aggregate_rows(
+                        total,
+                        agent_id,
+                        bucket if start_us is None else max(bucket, start_us),
+                        last_us if end_us is None else min(last_us, end_us)
+                    )
+                else:
+                    total.merge(aggregate)
+        return total
+
+    def _aggregate_rows(
+        self,
+        total: TaskAggregate,
+        agent_id: Optional[str],
+        start_us: Optional[int],
+        end_us: int
+    ) -> None:
+        """Add in-memory task rows within [start_us, end_us] to total (lock held)"""
+        agent_code = None
+        if agent_id is not None:
+            agent_code = self._task_metrics.code("agent_id", agent_id)
+            if agent_code is None:
+                return
+        runs = self._task_metrics.select(
+            ("agent_id", "duration_ms", "result", "tokens_used", "files_changed"),
+            start_us,
+            end_us
+        )
+        for columns in runs:
+            for agent, duration, result, tokens, files in zip(*columns):
+                if agent_code is None or agent == agent_code:
+                    total.add(duration, result, tokens, files)
+
+    @staticmethod
+    def stats_from_aggregate(aggregate: TaskAggregate) -> Dict[str, Any]:
+        """
+        Build the get_task_stats() dictionary from a TaskAggregate
+
+        Args:
+            aggregate: Aggregate from get_aggregate() (possibly merged)
+
+        Returns:
+            Statistics dictionary (see get_task_stats)
+        """
+        count = aggregate.count
+        if not count:
+            return MetricsCollector._empty_task_stats()
+
+        success_count = aggregate.result_counts[_RESULT_CODES[TaskResult.SUCCESS]]
+        return {
+            "count": count,
+            "avg_duration_ms": aggregate.sum / count,
+            "median_duration_ms": aggregate.quantile(0.5),
+            "min_duration_ms": aggregate.min,
+            "max_duration_ms": aggregate.max,
+            "stddev_duration_ms": aggregate.variance ** 0.5,
+            "p95_duration_ms": aggregate.quantile(0.95),
+            "p99_duration_ms": aggregate.quantile(0.99),
+            "success_rate": (success_count / count) * 100,
+            "total_tokens": aggregate.total_tokens,
+            "total_files_changed": aggregate.total_files,
+            "results_breakdown": {
+                _RESULTS[code].value: n
+                for code, n in enumerate(aggregate.result_counts) if n
             }
+        }
 
-        # Calculate statistics
-        durations = [m.duration_ms for m in metrics]
+    def get_duration_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 95, 99),
+        agent_id: Optional[str] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> Dict[str, float]:
+        """
+        Get task duration percentiles from the quantile sketches
 
-        success_count = sum(1 for m in metrics if m.result == TaskResult.SUCCESS)
+        Exact while a sketch holds few values (AggregateConfig.exact_threshold),
+        then within AggregateConfig.relative_accuracy.
+
+        Args:
+            percentiles: Percentiles in 0-100 (default: (50, 95, 99))
+            agent_id: Filter by agent (optional)
+            time_range: Time range (start_time, end_time) (optional)
 
-        results_breakdown: Dict[str, int] = {}
-        for m in metrics:
-            result_key = m.result.value
-            results_breakdown[result_key] = results_breakdown.get(result_key, 0) + 1
+        Returns:
+            Dictionary like {"p50": 1400.0, "p95": 3100.0, "p99": 4800.0}
+        """
+        aggregate = self.get_aggregate(agent_id, time_range)
+        return {f"p{p:g}": aggregate.quantile(p / 100) for p in percentiles}
 
+    @staticmethod
+    def _empty_task_stats() -> Dict[str, Any]:
         return {
-            "count": len(metrics),
-            "avg_duration_ms": mean(durations),
-            "median_duration_ms": median(durations),
-            "min_duration_ms": min(durations),
-            "max_duration_ms": max(durations),
-            "success_rate": (success_count / len(metrics)) * 100 if metrics else 0.0,
-            "total_tokens": sum(m.tokens_used for m in metrics),
-            "total_files_changed": sum(m.files_changed for m in metrics),
-            "results_breakdown": results_breakdown
+            "count": 0,
+            "avg_duration_ms": 0.0,
+            "median_duration_ms": 0.0,
+            "min_duration_ms": 0.0,
+            "max_duration_ms": 0.0,
+            "stddev_duration_ms": 0.0,
+            "p95_duration_ms": 0.0,
+            "p99_duration_ms": 0.0,
+            "success_rate": 0.0,
+            "total_tokens": 0,
+            "total_files_changed": 0,
+            "results_breakdown": {}
         }
 
     def get_agent_performance(
@@ -560,9 +1131,15 @@ class MetricsCollector:
             Topology health: 0.95
         """
         with self._lock:
-            metrics = [m for m in self._swarm_metrics if m.swarm_id == swarm_id]
+            latest = dict(self._swarm_latest.get(swarm_id, {}))
+            history = (
+                [m.to_dict() for m in self._swarm_metrics if m.swarm_id == swarm_id]
+                if include_history and latest else None
+            )
+        last_updated_us = max((t for t, _ in latest.values()), default=None)
+        latest_by_name = {name: value for name, (_, value) in latest.items()}
 
-        if not metrics:
+        if last_updated_us is None:
             return {
                 "swarm_id": swarm_id,
                 "topology_health": 0.0,
@@ -572,21 +1149,16 @@ class MetricsCollector:
                 "history": [] if include_history else None
             }
 
-        # Get latest value for each metric type
-        latest_metrics: Dict[str, SwarmMetric] = {}
-        for metric in sorted(metrics, key=lambda m: m.timestamp):
-            latest_metrics[metric.metric_type] = metric
-
         result = {
             "swarm_id": swarm_id,
-            "topology_health": latest_metrics.get("topology_health", SwarmMetric(swarm_id, "topology_health", 0.0)).value,
-            "message_throughput": latest_metrics.get("message_throughput", SwarmMetric(swarm_id, "message_throughput", 0.0)).value,
-            "consensus_latency_ms": latest_metrics.get("consensus_latency", SwarmMetric(swarm_id, "consensus_latency", 0.0)).value,
-            "last_updated": max((m.timestamp for m in metrics), default=None)
+            "topology_health": latest_by_name.get("topology_health", 0.0),
+            "message_throughput": latest_by_name.get("message_throughput", 0.0),
+            "consensus_latency_ms": latest_by_name.get("consensus_latency", 0.0),
+            "last_updated": format_timestamp(last_updated_us)
         }
 
         if include_history:
-            result["history"] = [m.to_dict() for m in metrics]
+            result["history"] = history
 
         return result
 
@@ -605,47 +1177,115 @@ class MetricsCollector:
         self.logger.debug("Async worker thread started")
 
     def _async_worker(self) -> None:
-        """Background worker thread that processes metric queue"""
+        """Background worker thread merging the thread buffers"""
+        interval = self.worker_config.flush_interval_ms / 1000
         while not self._shutdown:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
             try:
-                # Get metric from queue with timeout
-                metric_type, metric = self._queue.get(timeout=0.1)
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Error in async worker: {e}")
 
-                # Process based on type
-                if metric_type == MetricType.TASK:
-                    self._record_task_sync(metric)
-                elif metric_type == MetricType.AGENT:
-                    self._record_agent_sync(metric)
-                elif metric_type == MetricType.SWARM:
-                    self._record_swarm_sync(metric)
+    def flush(self) -> int:
+        """
+        Merge every thread's staged metrics into the collector now
 
-                self._queue.task_done()
+        The worker does this every flush_interval_ms; call it to make
+        just-recorded metrics visible to queries immediately.
 
-            except Empty:
-                # Timeout, continue loop
-                continue
-            except Exception as e:
-                self.logger.error(f"Error in async worker: {e}")
+        Returns:
+            Number of metrics merged
+        """
+        if not self.async_mode:
+            return 0
+
+        with self._flush_lock:
+            with self._stats_lock:
+                buffers = list(self._thread_buffers)
+
+            runs = [run for run in (buffer.drain() for buffer in buffers) if run]
+            with self._drained:
+                self._drained.notify_all()
+            if not runs:
+                return 0
+
+            # Each thread's rows are already in time order
+            merged = runs[0] if len(runs) == 1 else list(heapq.merge(*runs, key=_row_time))
+            max_batch = self.worker_config.max_batch_size
+            stats = self._queue_stats
+            for start in range(0, len(merged), max_batch):
+                batch = merged[start:start + max_batch]
+                try:
+                    self._store_rows(batch)
+                except Exception as e:
+                    self.logger.error(f"Failed to store {len(batch)} metrics: {e}")
+                stats["batches"] += 1
+                stats["largest_batch"] = max(stats["largest_batch"], len(batch))
+
+            stats["processed"] += len(merged)
+            stats["max_queue_depth"] = max(stats["max_queue_depth"], max(map(len, runs)))
+            return len(merged)
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Get staging buffer and persistence counters
+
+        Returns:
+            Dictionary with:
+            {
+                "queue_depth": int,        # Metrics staged now, all threads
+                "queue_capacity": int,     # Per thread buffer
+                "thread_buffers": int,
+                "max_queue_depth": int,    # Deepest thread buffer seen by the worker
+                "processed": int,          # Metrics merged by the worker
+                "batches": int,
+                "avg_batch_size": float,
+                "largest_batch": int,
+                "dropped": int,            # Lost to backpressure
+                "sampled_out": int,        # Skipped by SAMPLE
+                "blocked": int,            # record_* calls that had to wait (BLOCK)
+                "persist_errors": int,     # Malformed metrics dropped, or storage failed to save
+                "aggregate_dropped": int,  # Tasks too late for the aggregate buckets
+                "backpressure": str
+            }
+        """
+        with self._stats_lock:
+            stats = dict(self._queue_stats)
+            buffers = list(self._thread_buffers)
+        for buffer in buffers:
+            stats["dropped"] += buffer.dropped
+            stats["sampled_out"] += buffer.sampled_out
+            stats["blocked"] += buffer.blocked
+        stats["queue_depth"] = sum(len(buffer.rows) for buffer in buffers)
+        stats["queue_capacity"] = self._buffer_capacity if self.async_mode else 0
+        stats["thread_buffers"] = len(buffers)
+        stats["avg_batch_size"] = (
+            stats["processed"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        with self._lock:
+            stats["aggregate_dropped"] = self._task_aggregates.dropped_rows
+        stats["backpressure"] = self.worker_config.backpressure.value
+        return stats
 
     def shutdown(self) -> None:
         """
         Shutdown metrics collector and flush pending metrics
 
-        Waits for async queue to drain before shutting down.
+        Stops the worker, then merges whatever the thread buffers still hold.
         """
-        if self.async_mode:
+        if self.async_mode and not self._shutdown:
             self.logger.info("Shutting down async worker...")
 
-            # Wait for queue to drain
-            self._queue.join()
-
-            # Signal shutdown
+            # Signal shutdown and wake the worker
             self._shutdown = True
+            self._wakeup.set()
 
             # Wait for worker thread
             if self._worker_thread:
                 self._worker_thread.join(timeout=5.0)
 
+            self.flush()
             self.logger.info("Async worker shutdown complete")
 
     # ========================================================================
@@ -656,27 +1296,52 @@ class MetricsCollector:
         """
         Get metric collection performance overhead
 
+        Times are sampled: one record_* call in overhead_sample_every
+        (starting with the first) is measured.
+
         Returns:
             Dictionary with overhead statistics:
             {
                 "avg_collection_time_ms": float,
                 "max_collection_time_ms": float,
-                "total_collections": int
+                "total_collections": int,
+                "sampled_collections": int
             }
         """
-        if not self._collection_times:
-            return {
-                "avg_collection_time_ms": 0.0,
-                "max_collection_time_ms": 0.0,
-                "total_collections": 0
-            }
-
+        with self._stats_lock:
+            total = self._retired_records + sum(b.recorded for b in self._thread_buffers)
+            samples = self._overhead_samples
+            total_ns = self._overhead_total_ns
+            max_ns = self._overhead_max_ns
         return {
-            "avg_collection_time_ms": mean(self._collection_times),
-            "max_collection_time_ms": max(self._collection_times),
-            "total_collections": len(self._collection_times)
+            "avg_collection_time_ms": total_ns / samples / 1e6 if samples else 0.0,
+            "max_collection_time_ms": max_ns / 1e6,
+            "total_collections": total,
+            "sampled_collections": samples
         }
 
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """
+        Get in-memory metric buffer usage
+
+        Returns:
+            Dictionary per metric type with "count", "capacity" and
+            "column_bytes" (bytes preallocated for the typed columns)
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": len(buffer),
+                    "capacity": buffer.capacity,
+                    "column_bytes": buffer.memory_bytes(),
+                }
+                for name, buffer in (
+                    ("task", self._task_metrics),
+                    ("agent", self._agent_metrics),
+                    ("swarm", self._swarm_metrics),
+                )
+            }
+
     def __del__(self):
         """Cleanup on object destruction"""
         try:
@@ -695,6 +1360,7 @@ class MetricsStorage:
 
     Will be implemented by parallel agent in Phase 6A.
     This class ensures MetricsCollector can function independently.
+    The real implementation is moai_flow.monitoring.metrics_storage.MetricsStorage.
     """
 
     def save_task_metric(self, metric: Dict[str, Any]) -> None:
@@ -709,6 +1375,18 @@ class MetricsStorage:
         """Save swarm metric to persistent storage"""
         pass
 
+    def save_task_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """Save task metrics to persistent storage in one call"""
+        return len(metrics)
+
+    def save_agent_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """Save agent metrics to persistent storage in one call"""
+        return len(metrics)
+
+    def save_swarm_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """Save swarm metrics to persistent storage in one call"""
+        return len(metrics)
+
 
 # ============================================================================
 # Module Exports
@@ -716,6 +1394,9 @@ class MetricsStorage:
 
 __all__ = [
     "MetricsCollector",
+    "MetricBufferConfig",
+    "AsyncWorkerConfig",
+    "BackpressurePolicy",
     "MetricsStorage",
     "TaskMetric",
     "AgentMetric",
@@ -11,10 +11,15 @@ Features:
 - Optimized indexing for fast time-series queries
 - Flexible aggregation support (avg, sum, count, min, max)
 - Automatic retention management (30-day default)
-- Thread-safe operations with connection pooling
+- Runs on the shared StorageEngine (connection pool, read-only query
+  connections, versioned migrations); opening it on SwarmDB's file puts
+  both on one engine
 - JSON metadata support for extensibility
 
-Schema Version: 1.0.0
+The task/agent/swarm metrics tables are owned here; SwarmDB no longer
+creates its own copies (schema 3.1.0).
+
+Schema Version: 2.0.0 (task_metrics epoch-millisecond time column)
 """
 
 import json
@@ -22,11 +27,14 @@ import logging
 import sqlite3
 import threading
 from contextlib import contextmanager
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from moai_flow.memory.connection_manager import ConnectionConfig
+from moai_flow.memory.storage_engine import StorageEngine, to_epoch_ms
+
 
 # ============================================================================
 # Enums and Constants
@@ -75,7 +83,7 @@ class TaskResult(str, Enum):
 # Extended SwarmDB Schema for Metrics
 # ============================================================================
 
-METRICS_SCHEMA_VERSION = "1.0.0"
+METRICS_SCHEMA_VERSION = "2.0.0"
 
 METRICS_SCHEMA_SQL = """
 -- Task metrics table
@@ -87,13 +95,10 @@ CREATE TABLE IF NOT EXISTS task_metrics (
     tokens_used INTEGER DEFAULT 0,
     files_changed INTEGER DEFAULT 0,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    timestamp_ms INTEGER,  -- Epoch milliseconds (UTC), filled by trigger if omitted
     PRIMARY KEY (task_id, timestamp)
 );
 
-CREATE INDEX IF NOT EXISTS idx_task_metrics_agent ON task_metrics(agent_id, timestamp);
-CREATE INDEX IF NOT EXISTS idx_task_metrics_time ON task_metrics(timestamp);
-CREATE INDEX IF NOT EXISTS idx_task_metrics_result ON task_metrics(result, timestamp);
-
 -- Agent metrics table
 CREATE TABLE IF NOT EXISTS agent_metrics (
     metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -130,6 +135,49 @@ CREATE TABLE IF NOT EXISTS metrics_schema_info (
 INSERT OR REPLACE INTO metrics_schema_info (key, value) VALUES ('version', ?);
 """
 
+# task_metrics indexes on epoch milliseconds, created once the column exists
+# and is backfilled. The per-agent index covers duration/result scans.
+METRICS_TIME_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_task_metrics_agent_time
+    ON task_metrics(agent_id, timestamp_ms, result, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_task_metrics_time_ms ON task_metrics(timestamp_ms);
+CREATE INDEX IF NOT EXISTS idx_task_metrics_result_time ON task_metrics(result, timestamp_ms);
+
+-- Writers that omit timestamp_ms (raw SQL, older MetricsStorage); naive
+-- timestamps are local time. Recreated so older bodies are replaced.
+DROP TRIGGER IF EXISTS trg_task_metrics_timestamp_ms;
+CREATE TRIGGER trg_task_metrics_timestamp_ms
+AFTER INSERT ON task_metrics WHEN NEW.timestamp_ms IS NULL
+BEGIN
+    UPDATE task_metrics
+    SET timestamp_ms = COALESCE(
+        CAST(ROUND((julianday(NEW.timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER),
+        CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER)
+    )
+    WHERE rowid = NEW.rowid;
+END
+"""
+
+# Schema 1.0.0 indexes on the TEXT timestamp, replaced by the ones above
+_LEGACY_TASK_INDEXES = (
+    "idx_task_metrics_agent",
+    "idx_task_metrics_time",
+    "idx_task_metrics_result",
+)
+
+
+def _utc(value: Optional[datetime] = None) -> datetime:
+    """
+    Aware UTC datetime for storage and time-range queries.
+
+    MetricsCollector writes UTC ("...Z") timestamps, so every other writer
+    and cutoff is normalized to UTC too. Naive values are local time, as
+    datetime.now() returns. Defaults to now.
+    """
+    if value is None:
+        return datetime.now(timezone.utc)
+    return value.astimezone(timezone.utc)
+
 
 # ============================================================================
 # MetricsStorage Implementation
@@ -161,71 +209,103 @@ class MetricsStorage:
         ... )
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        engine: Optional[StorageEngine] = None,
+        connection_config: Optional[ConnectionConfig] = None
+    ):
         """
         Initialize MetricsStorage.
 
         Args:
             db_path: Path to SQLite database file (defaults to .swarm/metrics.db)
+            engine: StorageEngine to run on (defaults to the shared engine for db_path)
+            connection_config: Connection pool configuration, used when this
+                storage opens the database's StorageEngine
         """
-        self.db_path = db_path or Path.cwd() / ".swarm" / "metrics.db"
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if engine is not None:
+            self.db_path = Path(engine.db_path)
+        else:
+            self.db_path = db_path or Path.cwd() / ".swarm" / "metrics.db"
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.logger = logging.getLogger(__name__)
         self._lock = threading.RLock()
-        self._connection_pool: Dict[int, sqlite3.Connection] = {}
+        self._engine = engine.acquire() if engine else StorageEngine.open(
+            self.db_path, connection_config
+        )
+        self._closed = False
 
         # Initialize schema
-        self._initialize_schema()
+        try:
+            self._initialize_schema()
+        except Exception:
+            self._engine.release()
+            raise
+
+    @property
+    def engine(self) -> StorageEngine:
+        """StorageEngine this storage runs on"""
+        return self._engine
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
-        thread_id = threading.get_ident()
-
-        if thread_id not in self._connection_pool:
-            conn = sqlite3.connect(
-                str(self.db_path),
-                check_same_thread=False,
-                timeout=10.0
-            )
-            conn.row_factory = sqlite3.Row  # Enable dict-like row access
-            self._connection_pool[thread_id] = conn
+        """Get thread-local read-write database connection"""
+        return self._engine.get_connection()
 
-        return self._connection_pool[thread_id]
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Get thread-local read-only connection for queries"""
+        return self._engine.get_read_connection()
 
     def _initialize_schema(self) -> None:
         """Initialize metrics schema"""
         with self._lock:
             try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-
-                # Execute schema with version
-                for statement in METRICS_SCHEMA_SQL.split(';'):
-                    statement = statement.strip()
-                    if statement:
-                        # Replace version placeholder
-                        statement = statement.replace('?', f"'{METRICS_SCHEMA_VERSION}'")
-                        cursor.execute(statement)
-
-                conn.commit()
+                self._engine.apply_schema(
+                    "metrics_storage", METRICS_SCHEMA_VERSION, self._migrate_schema
+                )
                 self.logger.info(f"Initialized MetricsStorage schema v{METRICS_SCHEMA_VERSION}")
 
             except Exception as e:
                 self.logger.error(f"Failed to initialize metrics schema: {e}")
                 raise
 
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """Create metrics tables and upgrade schema 1.0.0 (run once per version by the engine)"""
+        cursor = conn.cursor()
+
+        # Execute schema with version
+        for statement in METRICS_SCHEMA_SQL.split(';'):
+            statement = statement.strip()
+            if statement:
+                # Replace version placeholder
+                statement = statement.replace('?', f"'{METRICS_SCHEMA_VERSION}'")
+                cursor.execute(statement)
+
+        # Tables created by schema 1.0.0 (or SwarmDB before 3.1.0) lack timestamp_ms
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(task_metrics)")}
+        if "timestamp_ms" not in columns:
+            conn.execute("ALTER TABLE task_metrics ADD COLUMN timestamp_ms INTEGER")
+        conn.execute(
+            """
+            UPDATE task_metrics
+            SET timestamp_ms = CAST(ROUND((
+                COALESCE(julianday(timestamp, 'utc'), julianday('now')) - 2440587.5
+            ) * 86400000) AS INTEGER)
+            WHERE timestamp_ms IS NULL
+            """
+        )
+
+        for index in _LEGACY_TASK_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+        # executescript: the trigger body contains semicolons
+        conn.executescript(METRICS_TIME_INDEX_SQL)
+
     @contextmanager
     def transaction(self):
         """Context manager for database transactions"""
-        conn = self._get_connection()
-        try:
+        with self._engine.transaction() as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Transaction rolled back: {e}")
-            raise
 
     # ========================================================================
     # Task Metrics Operations
@@ -253,7 +333,7 @@ class MetricsStorage:
             files_changed: Number of files modified
             timestamp: Metric timestamp (defaults to now)
         """
-        timestamp = timestamp or datetime.now()
+        timestamp = _utc(timestamp)
         result_str = result.value if isinstance(result, TaskResult) else result
 
         with self.transaction() as conn:
@@ -261,10 +341,20 @@ class MetricsStorage:
             cursor.execute(
                 """
                 INSERT INTO task_metrics
-                (task_id, agent_id, duration_ms, result, tokens_used, files_changed, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (task_id, agent_id, duration_ms, result, tokens_used, files_changed,
+                 timestamp, timestamp_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (task_id, agent_id, duration_ms, result_str, tokens_used, files_changed, timestamp.isoformat())
+                (
+                    task_id,
+                    agent_id,
+                    duration_ms,
+                    result_str,
+                    tokens_used,
+                    files_changed,
+                    timestamp.isoformat(),
+                    to_epoch_ms(timestamp)
+                )
             )
 
         self.logger.debug(f"Stored task metric: {task_id} ({result_str}, {duration_ms}ms)")
@@ -290,7 +380,7 @@ class MetricsStorage:
         Returns:
             List of task metric dictionaries
         """
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
         query = "SELECT * FROM task_metrics WHERE 1=1"
@@ -311,10 +401,10 @@ class MetricsStorage:
 
         if time_range:
             start_time, end_time = time_range
-            query += " AND timestamp BETWEEN ? AND ?"
-            params.extend([start_time.isoformat(), end_time.isoformat()])
+            query += " AND timestamp_ms BETWEEN ? AND ?"
+            params.extend([to_epoch_ms(_utc(start_time)), to_epoch_ms(_utc(end_time))])
 
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        query += " ORDER BY timestamp_ms DESC LIMIT ?"
         params.append(limit)
 
         cursor.execute(query, params)
@@ -346,7 +436,7 @@ class MetricsStorage:
         Returns:
             Metric ID
         """
-        timestamp = timestamp or datetime.now()
+        timestamp = _utc(timestamp)
         metric_type_str = metric_type.value if isinstance(metric_type, MetricType) else metric_type
 
         with self.transaction() as conn:
@@ -389,7 +479,7 @@ class MetricsStorage:
         Returns:
             List of agent metric dictionaries
         """
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
         query = "SELECT * FROM agent_metrics WHERE 1=1"
@@ -407,7 +497,7 @@ class MetricsStorage:
         if time_range:
             start_time, end_time = time_range
             query += " AND timestamp BETWEEN ? AND ?"
-            params.extend([start_time.isoformat(), end_time.isoformat()])
+            params.extend([_utc(start_time).isoformat(), _utc(end_time).isoformat()])
 
         query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
@@ -452,7 +542,7 @@ class MetricsStorage:
         Returns:
             Metric ID
         """
-        timestamp = timestamp or datetime.now()
+        timestamp = _utc(timestamp)
         metric_type_str = metric_type.value if isinstance(metric_type, MetricType) else metric_type
 
         with self.transaction() as conn:
@@ -495,7 +585,7 @@ class MetricsStorage:
         Returns:
             List of swarm metric dictionaries
         """
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
         query = "SELECT * FROM swarm_metrics WHERE 1=1"
@@ -513,7 +603,7 @@ class MetricsStorage:
         if time_range:
             start_time, end_time = time_range
             query += " AND timestamp BETWEEN ? AND ?"
-            params.extend([start_time.isoformat(), end_time.isoformat()])
+            params.extend([_utc(start_time).isoformat(), _utc(end_time).isoformat()])
 
         query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
@@ -533,6 +623,109 @@ class MetricsStorage:
 
         return metrics
 
+    # ========================================================================
+    # MetricsCollector Batch API
+    # ========================================================================
+
+    def save_task_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """
+        Store task metrics from MetricsCollector in one transaction.
+
+        Args:
+            metrics: TaskMetric.to_dict() dictionaries (ISO timestamps)
+
+        Returns:
+            Number of rows written
+        """
+        rows = [
+            (
+                m["task_id"],
+                m["agent_id"],
+                m["duration_ms"],
+                m["result"],
+                m.get("tokens_used", 0),
+                m.get("files_changed", 0),
+                m["timestamp"],
+                to_epoch_ms(m["timestamp"])
+            )
+            for m in metrics
+        ]
+        with self.transaction() as conn:
+            # Same task and timestamp is the same metric delivered twice
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO task_metrics
+                (task_id, agent_id, duration_ms, result, tokens_used, files_changed,
+                 timestamp, timestamp_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        return len(rows)
+
+    def save_agent_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """
+        Store agent metrics from MetricsCollector in one transaction.
+
+        Args:
+            metrics: AgentMetric.to_dict() dictionaries
+
+        Returns:
+            Number of rows written
+        """
+        return self._save_scoped_batch("agent_metrics", "agent_id", metrics)
+
+    def save_swarm_metrics_batch(self, metrics: List[Dict[str, Any]]) -> int:
+        """
+        Store swarm metrics from MetricsCollector in one transaction.
+
+        Args:
+            metrics: SwarmMetric.to_dict() dictionaries
+
+        Returns:
+            Number of rows written
+        """
+        return self._save_scoped_batch("swarm_metrics", "swarm_id", metrics)
+
+    def _save_scoped_batch(
+        self,
+        table: str,
+        scope_column: str,
+        metrics: List[Dict[str, Any]]
+    ) -> int:
+        rows = [
+            (
+                m[scope_column],
+                m["metric_type"],
+                m["value"],
+                json.dumps(m.get("metadata") or {}),
+                m["timestamp"]
+            )
+            for m in metrics
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                f"""
+                INSERT INTO {table}
+                ({scope_column}, metric_type, value, metadata, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        return len(rows)
+
+    def save_task_metric(self, metric: Dict[str, Any]) -> None:
+        """Store one MetricsCollector task metric dictionary"""
+        self.save_task_metrics_batch([metric])
+
+    def save_agent_metric(self, metric: Dict[str, Any]) -> None:
+        """Store one MetricsCollector agent metric dictionary"""
+        self.save_agent_metrics_batch([metric])
+
+    def save_swarm_metric(self, metric: Dict[str, Any]) -> None:
+        """Store one MetricsCollector swarm metric dictionary"""
+        self.save_swarm_metrics_batch([metric])
+
     # ========================================================================
     # Generic Metrics Operations
     # ========================================================================
@@ -554,7 +747,7 @@ class MetricsStorage:
         Returns:
             Metric ID (for agent/swarm metrics) or None (for task metrics)
         """
-        timestamp = timestamp or datetime.now()
+        timestamp = _utc(timestamp)
 
         if metric_type == "task":
             self.store_task_metric(
@@ -655,7 +848,7 @@ class MetricsStorage:
         Returns:
             Aggregation result dictionary
         """
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
 
         agg_func = aggregation.value if isinstance(aggregation, AggregationType) else aggregation
@@ -717,8 +910,12 @@ class MetricsStorage:
         # Apply time range
         if time_range:
             start_time, end_time = time_range
-            query += " AND timestamp BETWEEN ? AND ?"
-            params.extend([start_time.isoformat(), end_time.isoformat()])
+            if metric_type == "task":
+                query += " AND timestamp_ms BETWEEN ? AND ?"
+                params.extend([to_epoch_ms(_utc(start_time)), to_epoch_ms(_utc(end_time))])
+            else:
+                query += " AND timestamp BETWEEN ? AND ?"
+                params.extend([_utc(start_time).isoformat(), _utc(end_time).isoformat()])
 
         cursor.execute(query, params)
         result = cursor.fetchone()
@@ -753,7 +950,8 @@ class MetricsStorage:
         Returns:
             Dictionary with counts of deleted records by table
         """
-        cutoff_date = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        cutoff = _utc() - timedelta(days=retention_days)
+        cutoff_date = cutoff.isoformat()
 
         deleted_counts = {}
 
@@ -762,8 +960,8 @@ class MetricsStorage:
 
             # Clean task metrics
             cursor.execute(
-                "DELETE FROM task_metrics WHERE timestamp < ?",
-                (cutoff_date,)
+                "DELETE FROM task_metrics WHERE timestamp_ms < ?",
+                (to_epoch_ms(cutoff),)
             )
             deleted_counts["task_metrics"] = cursor.rowcount
 
@@ -798,16 +996,13 @@ class MetricsStorage:
         self.logger.info("Metrics database vacuumed")
 
     def close(self) -> None:
-        """Close all database connections"""
+        """Release the storage engine (the last user closes its connections)"""
         with self._lock:
-            for conn in self._connection_pool.values():
-                try:
-                    conn.close()
-                except Exception as e:
-                    self.logger.error(f"Error closing connection: {e}")
-
-            self._connection_pool.clear()
-            self.logger.debug("All connections closed")
+            if self._closed:
+                return
+            self._engine.release()
+            self._closed = True
+            self.logger.debug("Storage engine released")
 
     def __enter__(self):
         """Context manager entry"""
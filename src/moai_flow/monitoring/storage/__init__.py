@@ -15,11 +15,13 @@ from moai_flow.monitoring.storage.metrics_persistence import (
     MetricsPersistence,
     RetentionPolicy,
     CompressionConfig,
+    HistogramConfig,
 )
 from moai_flow.monitoring.storage.metrics_query import (
     MetricsQuery,
     QueryFilter,
     AggregationFunc,
+    PercentileMode,
 )
 from moai_flow.monitoring.storage.metrics_exporter import (
     MetricsExporter,
@@ -30,9 +32,11 @@ __all__ = [
     "MetricsPersistence",
     "RetentionPolicy",
     "CompressionConfig",
+    "HistogramConfig",
     "MetricsQuery",
     "QueryFilter",
     "AggregationFunc",
+    "PercentileMode",
     "MetricsExporter",
     "ExportFormat",
 ]
@@ -7,14 +7,28 @@ Provides comprehensive persistent storage with:
 - Write buffering (batch writes every 5s or 100 metrics)
 - Data compression for historical metrics (>7 days old)
 - Retention policies (7-day detailed, 30-day hourly, 90-day daily)
-- Connection pooling for concurrent access
+- Shared StorageEngine (connection pool, versioned schema); when another
+  component on the same file runs the group-commit writer (e.g. SwarmDB),
+  buffered metrics are committed in the same batches as lifecycle events
 - Auto-cleanup jobs
 
 Schema Design:
 - task_metrics: Task-level performance data
 - agent_metrics: Agent-level performance data
 - swarm_metrics: Swarm-level performance data
-- metrics_archive: Compressed historical data (>7 days)
+- metrics_archive: Compressed historical data (>7 days); each block records
+  its min/max timestamp and agent bloom bits so MetricsQuery can read back
+  only the blocks a query touches. Blocks are columnar (per-column zlib;
+  delta int64 ids/timestamps, float64 values, dictionary-encoded strings);
+  older JSON blocks stay readable
+- metrics_write_generation: Per-table write counters, bumped in every
+  flush transaction (MetricsQuery validates cached results against them)
+- metrics_histograms: Hourly log-scale value histograms, updated in every
+  flush transaction (MetricsQuery answers approximate percentiles from them)
+- metrics_rollups: Hourly and daily count/sum/min/max per agent (or swarm)
+  and metric type, updated in every flush transaction and kept for the
+  hourly_days/daily_days retention tiers (MetricsQuery.aggregate_by_time
+  reads them instead of raw rows)
 
 Performance Target: <50ms writes, <100ms reads for 1M metrics
 
@@ -24,18 +38,33 @@ LOC: ~600
 import gzip
 import json
 import logging
+import math
 import queue
 import sqlite3
+import struct
+import sys
 import threading
 import time
 import zlib
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from moai_flow.memory.connection_manager import ConnectionConfig
+from moai_flow.memory.storage_engine import StorageEngine, WriteChannel
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 
 # ============================================================================
@@ -73,12 +102,18 @@ class CompressionConfig:
         min_age_days: Minimum age for compression (default: 7)
         compression_level: zlib compression level 1-9 (default: 6)
         batch_size: Records per compression batch (default: 1000)
+        archive_format: "columnar" or "json" archive blocks (default: columnar)
+        float32_values: Store REAL columns of columnar blocks as float32,
+            halving their size but keeping only about 7 significant digits
+            (default: False)
     """
 
     enabled: bool = True
     min_age_days: int = 7
     compression_level: int = 6
     batch_size: int = 1000
+    archive_format: str = "columnar"
+    float32_values: bool = False
 
 
 @dataclass
@@ -99,11 +134,32 @@ class WriteBufferConfig:
     auto_flush_on_shutdown: bool = True
 
 
+@dataclass
+class HistogramConfig:
+    """
+    Flush-time value histogram configuration.
+
+    Attributes:
+        enabled: Maintain histograms while flushing (default: True)
+        fields: Histogrammed columns per table (default: task durations and
+            tokens, agent and swarm values)
+    """
+
+    enabled: bool = True
+    fields: Dict[str, Tuple[str, ...]] = field(
+        default_factory=lambda: {
+            "task_metrics": ("duration_ms", "tokens_used"),
+            "agent_metrics": ("value",),
+            "swarm_metrics": ("value",),
+        }
+    )
+
+
 # ============================================================================
 # SQLite Schema
 # ============================================================================
 
-PERSISTENCE_SCHEMA_VERSION = "2.0.0"
+PERSISTENCE_SCHEMA_VERSION = "2.4.0"
 
 PERSISTENCE_SCHEMA_SQL = """
 -- Task metrics table (detailed)
@@ -115,11 +171,12 @@ CREATE TABLE IF NOT EXISTS task_metrics (
     duration_ms INTEGER,
     tokens_used INTEGER DEFAULT 0,
     success INTEGER NOT NULL,
-    metadata TEXT,
-    INDEX idx_task_time (timestamp, task_id),
-    INDEX idx_agent_time (timestamp, agent_id)
+    metadata TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_task_time ON task_metrics(timestamp, task_id);
+CREATE INDEX IF NOT EXISTS idx_agent_time ON task_metrics(timestamp, agent_id);
+
 -- Agent metrics table (detailed)
 CREATE TABLE IF NOT EXISTS agent_metrics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -127,10 +184,12 @@ CREATE TABLE IF NOT EXISTS agent_metrics (
     timestamp INTEGER NOT NULL,
     metric_type TEXT NOT NULL,
     value REAL NOT NULL,
-    metadata TEXT,
-    INDEX idx_agent_metric_time (agent_id, metric_type, timestamp)
+    metadata TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_agent_metric_time
+    ON agent_metrics(agent_id, metric_type, timestamp);
+
 -- Swarm metrics table (detailed)
 CREATE TABLE IF NOT EXISTS swarm_metrics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -138,10 +197,12 @@ CREATE TABLE IF NOT EXISTS swarm_metrics (
     timestamp INTEGER NOT NULL,
     metric_type TEXT NOT NULL,
     value REAL NOT NULL,
-    metadata TEXT,
-    INDEX idx_swarm_metric_time (swarm_id, metric_type, timestamp)
+    metadata TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_swarm_metric_time
+    ON swarm_metrics(swarm_id, metric_type, timestamp);
+
 -- Compressed archive for historical data
 CREATE TABLE IF NOT EXISTS metrics_archive (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -151,9 +212,49 @@ CREATE TABLE IF NOT EXISTS metrics_archive (
     compressed_data BLOB NOT NULL,
     record_count INTEGER NOT NULL,
     created_at INTEGER NOT NULL,
-    INDEX idx_archive_date (archive_date, metric_table)
+    min_timestamp INTEGER,
+    max_timestamp INTEGER,
+    agent_bloom INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_archive_date ON metrics_archive(archive_date, metric_table);
+
+-- Write generations: generation moves on every write to a table,
+-- rewrite_generation only when rows are deleted or archived
+CREATE TABLE IF NOT EXISTS metrics_write_generation (
+    metric_table TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0,
+    rewrite_generation INTEGER NOT NULL DEFAULT 0
 );
 
+-- Value histograms: row counts per log-scale bin, per hour bucket, for the
+-- whole table (scope '') and per agent (scope = agent_id)
+CREATE TABLE IF NOT EXISTS metrics_histograms (
+    metric_table TEXT NOT NULL,
+    field TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric_table, field, scope, bucket_start, bin)
+) WITHOUT ROWID;
+
+-- Rollups: per-bucket aggregates of each rolled-up field, at 'hour' and
+-- 'day' resolution (buckets are UTC-aligned epoch seconds)
+CREATE TABLE IF NOT EXISTS metrics_rollups (
+    resolution TEXT NOT NULL,
+    metric_table TEXT NOT NULL,
+    field TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    metric_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sum NUMERIC NOT NULL,
+    min NUMERIC,
+    max NUMERIC,
+    PRIMARY KEY (resolution, metric_table, field, bucket_start, scope, metric_type)
+) WITHOUT ROWID;
+
 -- Schema version tracking
 CREATE TABLE IF NOT EXISTS storage_schema_info (
     key TEXT PRIMARY KEY,
@@ -165,6 +266,440 @@ INSERT OR REPLACE INTO storage_schema_info (key, value)
 VALUES ('version', '{version}');
 """
 
+# Batched insert per buffered table
+_INSERT_SQL = {
+    "task_metrics": """
+        INSERT INTO task_metrics
+        (task_id, agent_id, timestamp, duration_ms, tokens_used, success, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "agent_metrics": """
+        INSERT INTO agent_metrics
+        (agent_id, timestamp, metric_type, value, metadata)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "swarm_metrics": """
+        INSERT INTO swarm_metrics
+        (swarm_id, timestamp, metric_type, value, metadata)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+}
+
+
+_BUMP_GENERATION_SQL = """
+    INSERT INTO metrics_write_generation (metric_table, generation, rewrite_generation)
+    VALUES (?, 1, ?)
+    ON CONFLICT(metric_table) DO UPDATE SET
+        generation = generation + 1,
+        rewrite_generation = rewrite_generation + excluded.rewrite_generation
+"""
+
+
+# ============================================================================
+# Value Histograms
+# ============================================================================
+
+# Histogram buckets are aligned to the hour (epoch seconds)
+HISTOGRAM_BUCKET_SECONDS = 3600
+
+# Bin width: any value is within 1% of its bin's representative value
+HISTOGRAM_RELATIVE_ACCURACY = 0.01
+
+# Bin for zero and negative values
+HISTOGRAM_ZERO_BIN = -(2**31)
+
+_HISTOGRAM_GAMMA = (1 + HISTOGRAM_RELATIVE_ACCURACY) / (1 - HISTOGRAM_RELATIVE_ACCURACY)
+_HISTOGRAM_INV_LOG_GAMMA = 1.0 / math.log(_HISTOGRAM_GAMMA)
+
+# Record positions per table: (scope column, timestamp, {field: position}).
+# Only task and agent metrics are scoped, matching MetricsQuery's agent filter.
+_HISTOGRAM_LAYOUT = {
+    "task_metrics": (1, 2, {"duration_ms": 3, "tokens_used": 4}),
+    "agent_metrics": (0, 1, {"value": 3}),
+    "swarm_metrics": (None, 1, {"value": 3}),
+}
+
+_UPSERT_HISTOGRAM_SQL = """
+    INSERT INTO metrics_histograms (metric_table, field, scope, bucket_start, bin, count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(metric_table, field, scope, bucket_start, bin) DO UPDATE SET
+        count = count + excluded.count
+"""
+
+
+def histogram_bin(value: float) -> int:
+    """Log-scale bin holding value (same mapping as QuantileSketch)."""
+    if value <= 0:
+        return HISTOGRAM_ZERO_BIN
+    return math.ceil(math.log(value) * _HISTOGRAM_INV_LOG_GAMMA)
+
+
+def histogram_bin_value(bin_index: int) -> float:
+    """Representative value of a bin, within the relative accuracy of its members."""
+    if bin_index == HISTOGRAM_ZERO_BIN:
+        return 0.0
+    return 2.0 * _HISTOGRAM_GAMMA ** bin_index / (_HISTOGRAM_GAMMA + 1.0)
+
+
+def _histogram_counts(
+    records: List[Tuple[str, Tuple]], fields: Dict[str, Tuple[str, ...]]
+) -> Counter:
+    """Count records per (table, field, scope, bucket, bin)."""
+    counts: Counter = Counter()
+    for table_name, record in records:
+        layout = _HISTOGRAM_LAYOUT.get(table_name)
+        table_fields = fields.get(table_name)
+        if layout is None or not table_fields:
+            continue
+        scope_pos, time_pos, positions = layout
+        bucket = record[time_pos] - record[time_pos] % HISTOGRAM_BUCKET_SECONDS
+        for field_name in table_fields:
+            value = record[positions[field_name]]
+            if value is None:
+                continue
+            bin_index = histogram_bin(value)
+            counts[(table_name, field_name, "", bucket, bin_index)] += 1
+            if scope_pos is not None:
+                counts[(table_name, field_name, record[scope_pos], bucket, bin_index)] += 1
+    return counts
+
+
+# ============================================================================
+# Archive Blocks
+# ============================================================================
+
+# Block index columns added in 2.4.0 (created by ALTER TABLE on older databases)
+_ARCHIVE_INDEX_COLUMNS = ("min_timestamp", "max_timestamp", "agent_bloom")
+
+_ARCHIVE_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_archive_block_time
+    ON metrics_archive(metric_table, max_timestamp, min_timestamp)
+"""
+
+# Bloom filter width; 63 bits keeps the mask a non-negative SQLite INTEGER
+ARCHIVE_BLOOM_BITS = 63
+
+# Column each table's blocks are bloom-indexed on
+ARCHIVE_SCOPE_COLUMNS = {
+    "task_metrics": "agent_id",
+    "agent_metrics": "agent_id",
+    "swarm_metrics": "swarm_id",
+}
+
+
+def archive_bloom_bits(value: str) -> int:
+    """Bloom filter bits (two hash positions) of one agent or swarm id."""
+    digest = zlib.crc32(value.encode("utf-8"))
+    return (1 << (digest % ARCHIVE_BLOOM_BITS)) | (
+        1 << ((digest >> 16) % ARCHIVE_BLOOM_BITS)
+    )
+
+
+# Columnar blocks start with this magic; JSON blocks are bare zlib streams.
+# Layout: magic, uint32 header length, JSON header, then each column's
+# zlib-compressed little-endian buffer (and dictionary, for strings)
+ARCHIVE_COLUMNAR_MAGIC = b"MFA1"
+
+# Column encodings
+_DELTA_I64 = "delta_i64"  # int64 first value, then differences (ids, timestamps)
+_I64 = "i64"
+_F32 = "f32"
+_F64 = "f64"
+_DICT = "dict"  # int32 codes into a JSON list of the distinct values
+
+_DELTA_COLUMNS = ("id", "timestamp")
+
+# array typecode and NumPy dtype per numeric encoding
+_ARRAY_TYPES = {
+    _DELTA_I64: ("q", "<i8"),
+    _I64: ("q", "<i8"),
+    _F32: ("f", "<f4"),
+    _F64: ("d", "<f8"),
+    _DICT: ("i", "<i4"),
+}
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _array_bytes(values: array) -> bytes:
+    """Little-endian bytes of an array"""
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _bytes_array(kind: str, data: bytes) -> array:
+    """Array from little-endian bytes"""
+    values = array(_ARRAY_TYPES[kind][0])
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _encode_column(
+    name: str, values: List[Any], float32: bool
+) -> Tuple[str, array, Optional[List[Any]]]:
+    """Pick an encoding for a column: (kind, buffer, dictionary)."""
+    if all(type(value) is int for value in values):
+        if name in _DELTA_COLUMNS:
+            deltas = [values[0]] + [b - a for a, b in zip(values, values[1:])]
+            return _DELTA_I64, array("q", deltas), None
+        return _I64, array("q", values), None
+    if all(type(value) in (int, float) for value in values):
+        kind = _F32 if float32 else _F64
+        return kind, array(_ARRAY_TYPES[kind][0], values), None
+
+    # Strings, NULLs and mixed columns
+    dictionary: Dict[Any, int] = {}
+    codes = array("i", [dictionary.setdefault(value, len(dictionary)) for value in values])
+    return _DICT, codes, list(dictionary)
+
+
+def encode_archive_block(
+    records: List[Dict[str, Any]], compression_level: int = 6, float32: bool = False
+) -> bytes:
+    """
+    Encode rows as a columnar archive block.
+
+    Args:
+        records: Rows (all with the same columns)
+        compression_level: zlib level for each column
+        float32: Store float columns as float32 rather than float64
+
+    Returns:
+        Block bytes for metrics_archive.compressed_data
+    """
+    columns = []
+    payload = []
+    for name in records[0] if records else ():
+        kind, values, dictionary = _encode_column(
+            name, [record[name] for record in records], float32
+        )
+        data = zlib.compress(_array_bytes(values), compression_level)
+        column = {"name": name, "kind": kind, "size": len(data)}
+        payload.append(data)
+        if dictionary is not None:
+            encoded = zlib.compress(
+                json.dumps(dictionary, separators=(",", ":")).encode("utf-8"),
+                compression_level,
+            )
+            column["dict_size"] = len(encoded)
+            payload.append(encoded)
+        columns.append(column)
+
+    header = json.dumps(
+        {"rows": len(records), "columns": columns}, separators=(",", ":")
+    ).encode("utf-8")
+    return b"".join([ARCHIVE_COLUMNAR_MAGIC, struct.pack("<I", len(header)), header] + payload)
+
+
+def decode_archive_columns(
+    compressed_data: bytes, columns: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Read columns of an archive block, decompressing only those asked for.
+
+    Numeric columns of columnar blocks come back as NumPy arrays viewing
+    the decompressed buffer (np.frombuffer, no copy; delta columns are one
+    cumulative sum) when NumPy is installed, otherwise as array.array.
+    String columns, and every column of a legacy JSON block, are lists.
+
+    Args:
+        compressed_data: metrics_archive.compressed_data
+        columns: Column names to read (default: all)
+
+    Returns:
+        {column: values} in block column order
+    """
+    if not compressed_data.startswith(ARCHIVE_COLUMNAR_MAGIC):
+        rows = json.loads(zlib.decompress(compressed_data).decode("utf-8"))
+        names = columns if columns is not None else (list(rows[0]) if rows else [])
+        return {name: [row[name] for row in rows] for name in names}
+
+    view = memoryview(compressed_data)
+    offset = len(ARCHIVE_COLUMNAR_MAGIC)
+    (header_size,) = struct.unpack_from("<I", view, offset)
+    offset += 4
+    header = json.loads(bytes(view[offset:offset + header_size]).decode("utf-8"))
+    offset += header_size
+
+    wanted = None if columns is None else set(columns)
+    result: Dict[str, Any] = {}
+    for column in header["columns"]:
+        kind = column["kind"]
+        end = offset + column["size"]
+        dict_end = end + column.get("dict_size", 0)
+        if wanted is None or column["name"] in wanted:
+            data = zlib.decompress(view[offset:end])
+            if kind == _DICT:
+                dictionary = json.loads(zlib.decompress(view[end:dict_end]).decode("utf-8"))
+                result[column["name"]] = [
+                    dictionary[code] for code in _bytes_array(kind, data)
+                ]
+            elif NUMPY_AVAILABLE:
+                values = np.frombuffer(data, dtype=_ARRAY_TYPES[kind][1])
+                result[column["name"]] = np.cumsum(values) if kind == _DELTA_I64 else values
+            else:
+                values = _bytes_array(kind, data)
+                if kind == _DELTA_I64:
+                    values = array("q", accumulate(values))
+                result[column["name"]] = values
+        offset = dict_end
+    return result
+
+
+def decode_archive_block(compressed_data: bytes) -> List[Dict[str, Any]]:
+    """Decompress an archive block (columnar or JSON) back into its rows."""
+    if not compressed_data.startswith(ARCHIVE_COLUMNAR_MAGIC):
+        return json.loads(zlib.decompress(compressed_data).decode("utf-8"))
+
+    columns = decode_archive_columns(compressed_data)
+    names = list(columns)
+    # float32 columns widen to the exact float of the stored value
+    values = [
+        column.tolist() if not isinstance(column, list) else column
+        for column in columns.values()
+    ]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _archive_block_index(
+    table_name: str, records: List[Dict[str, Any]]
+) -> Tuple[int, int, int]:
+    """(min timestamp, max timestamp, bloom bits) of a block's rows."""
+    scope_column = ARCHIVE_SCOPE_COLUMNS[table_name]
+    bloom = 0
+    for scope in {record[scope_column] for record in records}:
+        bloom |= archive_bloom_bits(scope)
+    timestamps = [record["timestamp"] for record in records]
+    return min(timestamps), max(timestamps), bloom
+
+
+def _index_archive_blocks(conn: sqlite3.Connection) -> None:
+    """Add the block index columns and fill them in for existing blocks."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(metrics_archive)")}
+    for column in _ARCHIVE_INDEX_COLUMNS:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE metrics_archive ADD COLUMN {column} INTEGER")
+    conn.execute(_ARCHIVE_INDEX_SQL)
+
+    blocks = conn.execute(
+        """
+        SELECT id, metric_table, compressed_data FROM metrics_archive
+        WHERE min_timestamp IS NULL
+        """
+    ).fetchall()
+    for block_id, table_name, compressed_data in blocks:
+        conn.execute(
+            """
+            UPDATE metrics_archive
+            SET min_timestamp = ?, max_timestamp = ?, agent_bloom = ?
+            WHERE id = ?
+            """,
+            _archive_block_index(table_name, decode_archive_block(compressed_data))
+            + (block_id,),
+        )
+
+
+# ============================================================================
+# Rollups
+# ============================================================================
+
+# Rollup resolutions, coarsest first: name -> bucket width in seconds
+ROLLUP_RESOLUTIONS = {"day": 86400, "hour": 3600}
+
+# Record positions per table: (scope, timestamp, metric_type, {field: position})
+_ROLLUP_LAYOUT = {
+    "task_metrics": (
+        1, 2, None, {"duration_ms": 3, "tokens_used": 4, "success": 5}
+    ),
+    "agent_metrics": (0, 1, 2, {"value": 3}),
+    "swarm_metrics": (0, 1, 2, {"value": 3}),
+}
+
+# Rolled-up fields per table
+ROLLUP_FIELDS = {
+    table_name: tuple(layout[3]) for table_name, layout in _ROLLUP_LAYOUT.items()
+}
+
+_UPSERT_ROLLUP_CONFLICT = """
+    ON CONFLICT(resolution, metric_table, field, bucket_start, scope, metric_type)
+    DO UPDATE SET
+        count = count + excluded.count,
+        sum = sum + excluded.sum,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max)
+"""
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO metrics_rollups
+    (resolution, metric_table, field, bucket_start, scope, metric_type, count, sum, min, max)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""" + _UPSERT_ROLLUP_CONFLICT
+
+
+def _rollup_rows(records: List[Tuple[str, Tuple]]) -> List[Tuple]:
+    """Aggregate records into rollup upsert rows for every resolution."""
+    rollups: Dict[Tuple, List] = {}
+    for table_name, record in records:
+        scope_pos, time_pos, type_pos, positions = _ROLLUP_LAYOUT[table_name]
+        timestamp = record[time_pos]
+        scope = record[scope_pos]
+        metric_type = record[type_pos] if type_pos is not None else ""
+        for field_name, position in positions.items():
+            value = record[position]
+            if value is None:
+                continue
+            for resolution, width in ROLLUP_RESOLUTIONS.items():
+                key = (
+                    resolution, table_name, field_name,
+                    timestamp - timestamp % width, scope, metric_type,
+                )
+                entry = rollups.get(key)
+                if entry is None:
+                    rollups[key] = [1, value, value, value]
+                else:
+                    entry[0] += 1
+                    entry[1] += value
+                    if value < entry[2]:
+                        entry[2] = value
+                    if value > entry[3]:
+                        entry[3] = value
+    return [key + tuple(entry) for key, entry in rollups.items()]
+
+
+def _backfill_rollups(conn: sqlite3.Connection) -> None:
+    """Build rollups from the rows already stored (run when the table is created)."""
+    for table_name, fields in ROLLUP_FIELDS.items():
+        scope = "swarm_id" if table_name == "swarm_metrics" else "agent_id"
+        metric_type = "''" if table_name == "task_metrics" else "metric_type"
+        for field_name in fields:
+            for resolution, width in ROLLUP_RESOLUTIONS.items():
+                conn.execute(
+                    f"""
+                    INSERT INTO metrics_rollups
+                    (resolution, metric_table, field, bucket_start, scope,
+                     metric_type, count, sum, min, max)
+                    SELECT ?, ?, ?, timestamp - timestamp % {width}, {scope},
+                        {metric_type}, COUNT({field_name}), SUM({field_name}),
+                        MIN({field_name}), MAX({field_name})
+                    FROM {table_name}
+                    WHERE {field_name} IS NOT NULL
+                    GROUP BY 4, 5, 6
+                    """
+                    + _UPSERT_ROLLUP_CONFLICT,
+                    (resolution, table_name, field_name),
+                )
+
+
+def _bump_generations(
+    conn: sqlite3.Connection, tables: List[str], rewrite: bool = False
+) -> None:
+    """Advance the write generation of tables (inside the writing transaction)."""
+    conn.executemany(_BUMP_GENERATION_SQL, [(table, int(rewrite)) for table in tables])
+
 
 # ============================================================================
 # MetricsPersistence Implementation
@@ -179,7 +714,7 @@ class MetricsPersistence:
     - Write buffering for optimal batch writes
     - Data compression for historical metrics
     - Retention policies with automatic cleanup
-    - Connection pooling for concurrent access
+    - Shared StorageEngine connection pool and group commit
     - Optimized indexes for fast queries
 
     Example:
@@ -204,6 +739,9 @@ class MetricsPersistence:
         retention_policy: Optional[RetentionPolicy] = None,
         compression_config: Optional[CompressionConfig] = None,
         write_buffer_config: Optional[WriteBufferConfig] = None,
+        engine: Optional[StorageEngine] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        histogram_config: Optional[HistogramConfig] = None,
     ):
         """
         Initialize metrics persistence.
@@ -213,9 +751,16 @@ class MetricsPersistence:
             retention_policy: Retention policy configuration
             compression_config: Compression configuration
             write_buffer_config: Write buffer configuration
+            engine: StorageEngine to run on (defaults to the shared engine for db_path)
+            connection_config: Connection pool configuration, used when this
+                instance opens the database's StorageEngine (default: 30s busy timeout)
+            histogram_config: Flush-time value histogram configuration
         """
-        self.db_path = db_path or Path.cwd() / ".swarm" / "metrics_persistent.db"
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if engine is not None:
+            self.db_path = Path(engine.db_path)
+        else:
+            self.db_path = db_path or Path.cwd() / ".swarm" / "metrics_persistent.db"
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.logger = logging.getLogger(__name__)
 
@@ -223,10 +768,16 @@ class MetricsPersistence:
         self.retention_policy = retention_policy or RetentionPolicy()
         self.compression_config = compression_config or CompressionConfig()
         self.write_buffer_config = write_buffer_config or WriteBufferConfig()
+        self.histogram_config = histogram_config or HistogramConfig()
 
-        # Connection pool (thread-local)
+        # Shared storage engine (connection pool, schema, group commit)
         self._lock = threading.RLock()
-        self._connection_pool: Dict[int, sqlite3.Connection] = {}
+        self._engine = engine.acquire() if engine else StorageEngine.open(
+            self.db_path,
+            connection_config or ConnectionConfig(busy_timeout_seconds=30.0),
+        )
+        self._channel: Optional[WriteChannel] = None
+        self._closed = False
 
         # Write buffer
         self._write_buffer: Dict[str, List[Tuple]] = {
@@ -244,46 +795,34 @@ class MetricsPersistence:
         self._last_cleanup_time: Optional[datetime] = None
 
         # Initialize
-        self._initialize_schema()
+        try:
+            self._initialize_schema()
+        except Exception:
+            self._engine.release()
+            raise
         if self.write_buffer_config.enabled:
             self._start_flush_thread()
         if self.retention_policy.auto_cleanup:
             self._start_cleanup_thread()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection with connection pooling."""
-        thread_id = threading.get_ident()
+    @property
+    def engine(self) -> StorageEngine:
+        """StorageEngine this instance runs on."""
+        return self._engine
 
-        if thread_id not in self._connection_pool:
-            conn = sqlite3.connect(
-                str(self.db_path), check_same_thread=False, timeout=30.0
-            )
-            conn.row_factory = sqlite3.Row
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
-            self._connection_pool[thread_id] = conn
-
-        return self._connection_pool[thread_id]
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get thread-local read-write connection from the storage engine."""
+        return self._engine.get_connection()
 
     def _initialize_schema(self) -> None:
         """Initialize database schema."""
         with self._lock:
             try:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-
-                # Execute schema
-                schema_sql = PERSISTENCE_SCHEMA_SQL.format(
-                    version=PERSISTENCE_SCHEMA_VERSION
+                self._engine.apply_schema(
+                    "metrics_persistence",
+                    PERSISTENCE_SCHEMA_VERSION,
+                    self._migrate_schema,
                 )
-                for statement in schema_sql.split(";"):
-                    statement = statement.strip()
-                    if statement:
-                        cursor.execute(statement)
-
-                conn.commit()
                 self.logger.info(
                     f"Initialized MetricsPersistence schema v{PERSISTENCE_SCHEMA_VERSION}"
                 )
@@ -292,17 +831,26 @@ class MetricsPersistence:
                 self.logger.error(f"Failed to initialize persistence schema: {e}")
                 raise
 
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """Create persistence tables (run once per version by the engine)."""
+        cursor = conn.cursor()
+        schema_sql = PERSISTENCE_SCHEMA_SQL.format(version=PERSISTENCE_SCHEMA_VERSION)
+        for statement in schema_sql.split(";"):
+            statement = statement.strip()
+            if statement:
+                cursor.execute(statement)
+
+        _index_archive_blocks(conn)
+
+        # Databases from before rollups: roll up the rows they already hold
+        if cursor.execute("SELECT 1 FROM metrics_rollups LIMIT 1").fetchone() is None:
+            _backfill_rollups(conn)
+
     @contextmanager
     def transaction(self):
         """Context manager for database transactions."""
-        conn = self._get_connection()
-        try:
+        with self._engine.transaction() as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Transaction rolled back: {e}")
-            raise
 
     # ========================================================================
     # Write Operations (Buffered)
@@ -414,74 +962,101 @@ class MetricsPersistence:
 
             # Check if buffer is full
             buffer_size = sum(len(buf) for buf in self._write_buffer.values())
-            if buffer_size >= self.write_buffer_config.max_size:
-                self._flush_buffer()
+            is_full = buffer_size >= self.write_buffer_config.max_size
 
-    def _flush_buffer(self) -> None:
-        """Flush write buffer to database (batch write)."""
+        # Flush outside the lock so other producers keep buffering
+        if is_full:
+            self._flush_buffer(wait=False)
+
+    def _take_buffer(self) -> List[Tuple[str, Tuple]]:
+        """Swap out buffered records as (table, record) pairs."""
         with self._buffer_lock:
-            if not any(self._write_buffer.values()):
-                return
+            records = [
+                (table_name, record)
+                for table_name, buffer in self._write_buffer.items()
+                for record in buffer
+            ]
+            for buffer in self._write_buffer.values():
+                buffer.clear()
+        return records
+
+    def _write_metric_rows(
+        self, conn: sqlite3.Connection, records: List[Tuple[str, Tuple]]
+    ) -> None:
+        """Insert (table, record) pairs with one executemany per table."""
+        grouped: Dict[str, List[Tuple]] = defaultdict(list)
+        for table_name, record in records:
+            grouped[table_name].append(record)
+
+        for table_name, rows in grouped.items():
+            conn.executemany(_INSERT_SQL[table_name], rows)
+        if self.histogram_config.enabled:
+            counts = _histogram_counts(records, self.histogram_config.fields)
+            conn.executemany(
+                _UPSERT_HISTOGRAM_SQL, [key + (count,) for key, count in counts.items()]
+            )
+        conn.executemany(_UPSERT_ROLLUP_SQL, _rollup_rows(records))
+        _bump_generations(conn, list(grouped))
 
-            start_time = time.time()
-            total_records = 0
+    def _flush_buffer(self, wait: bool = True) -> None:
+        """
+        Flush write buffer to database (batch write).
 
-            try:
-                with self.transaction() as conn:
-                    cursor = conn.cursor()
-
-                    # Flush task metrics
-                    if self._write_buffer["task_metrics"]:
-                        cursor.executemany(
-                            """
-                            INSERT INTO task_metrics
-                            (task_id, agent_id, timestamp, duration_ms, tokens_used, success, metadata)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            self._write_buffer["task_metrics"],
-                        )
-                        total_records += len(self._write_buffer["task_metrics"])
-                        self._write_buffer["task_metrics"].clear()
-
-                    # Flush agent metrics
-                    if self._write_buffer["agent_metrics"]:
-                        cursor.executemany(
-                            """
-                            INSERT INTO agent_metrics
-                            (agent_id, timestamp, metric_type, value, metadata)
-                            VALUES (?, ?, ?, ?, ?)
-                            """,
-                            self._write_buffer["agent_metrics"],
-                        )
-                        total_records += len(self._write_buffer["agent_metrics"])
-                        self._write_buffer["agent_metrics"].clear()
-
-                    # Flush swarm metrics
-                    if self._write_buffer["swarm_metrics"]:
-                        cursor.executemany(
-                            """
-                            INSERT INTO swarm_metrics
-                            (swarm_id, timestamp, metric_type, value, metadata)
-                            VALUES (?, ?, ?, ?, ?)
-                            """,
-                            self._write_buffer["swarm_metrics"],
-                        )
-                        total_records += len(self._write_buffer["swarm_metrics"])
-                        self._write_buffer["swarm_metrics"].clear()
+        When the engine's group-commit writer is running (another component
+        on this database enabled it), records are handed to it and share its
+        transactions; otherwise they are written in one transaction here.
 
-                flush_time_ms = (time.time() - start_time) * 1000
-                self.logger.debug(
-                    f"Flushed {total_records} metrics in {flush_time_ms:.2f}ms"
+        Args:
+            wait: Block until handed-off records are committed
+        """
+        records = self._take_buffer()
+        if not records:
+            return
+
+        start_time = time.time()
+
+        if self._engine.writer_running:
+            if self._channel is None:
+                self._channel = self._engine.open_channel(
+                    "metrics", self._write_metric_rows
                 )
+            self._channel.submit_many(records)
+            if wait:
+                self._engine.flush()
+            return
 
-            except Exception as e:
-                self.logger.error(f"Failed to flush buffer: {e}")
-                raise
+        try:
+            with self.transaction() as conn:
+                self._write_metric_rows(conn, records)
+        except Exception as e:
+            # Put records back so the next flush retries them
+            with self._buffer_lock:
+                for table_name, record in records:
+                    self._write_buffer[table_name].append(record)
+            self.logger.error(f"Failed to flush buffer: {e}")
+            raise
+
+        flush_time_ms = (time.time() - start_time) * 1000
+        self.logger.debug(f"Flushed {len(records)} metrics in {flush_time_ms:.2f}ms")
 
     def flush(self) -> None:
         """Manually flush write buffer."""
         self._flush_buffer()
 
+    def get_write_generations(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the write generation of each table.
+
+        Returns:
+            {table: {"generation": int, "rewrite_generation": int}}
+        """
+        rows = self._get_connection().execute(
+            "SELECT metric_table, generation, rewrite_generation FROM metrics_write_generation"
+        ).fetchall()
+        return {
+            row[0]: {"generation": row[1], "rewrite_generation": row[2]} for row in rows
+        }
+
     def _start_flush_thread(self) -> None:
         """Start background flush thread."""
         if self._flush_thread and self._flush_thread.is_alive():
@@ -492,7 +1067,7 @@ class MetricsPersistence:
         def flush_loop():
             while not self._flush_stop_event.is_set():
                 try:
-                    self._flush_buffer()
+                    self._flush_buffer(wait=False)
                 except Exception as e:
                     self.logger.error(f"Error in flush loop: {e}")
 
@@ -556,22 +1131,29 @@ class MetricsPersistence:
                     if not records:
                         continue
 
-                    # Convert to JSON and compress
+                    # Encode the batch as one archive block
                     records_data = [dict(row) for row in records]
-                    json_data = json.dumps(records_data)
-                    compressed_data = zlib.compress(
-                        json_data.encode("utf-8"),
-                        level=self.compression_config.compression_level,
-                    )
+                    if self.compression_config.archive_format == "json":
+                        compressed_data = zlib.compress(
+                            json.dumps(records_data).encode("utf-8"),
+                            level=self.compression_config.compression_level,
+                        )
+                    else:
+                        compressed_data = encode_archive_block(
+                            records_data,
+                            self.compression_config.compression_level,
+                            self.compression_config.float32_values,
+                        )
 
-                    # Store in archive
+                    # Store in archive, indexed by time range and agents
                     archive_date = cutoff_date.strftime("%Y-%m-%d")
                     cursor.execute(
                         """
                         INSERT INTO metrics_archive
                         (archive_date, metric_table, aggregation_level,
-                         compressed_data, record_count, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
+                         compressed_data, record_count, created_at,
+                         min_timestamp, max_timestamp, agent_bloom)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                         """,
                         (
                             archive_date,
@@ -580,7 +1162,8 @@ class MetricsPersistence:
                             compressed_data,
                             len(records),
                             int(datetime.now().timestamp()),
-                        ),
+                        )
+                        + _archive_block_index(table_name, records_data),
                     )
 
                     # Delete archived records
@@ -590,6 +1173,8 @@ class MetricsPersistence:
                         record_ids,
                     )
 
+                    _bump_generations(conn, [table_name, "metrics_archive"], rewrite=True)
+
                     stats["compressed_records"] += len(records)
                     stats["archived_records"] += 1
 
@@ -627,6 +1212,7 @@ class MetricsPersistence:
             "hourly_deleted": 0,
             "daily_deleted": 0,
             "archives_deleted": 0,
+            "histogram_bins_deleted": 0,
         }
 
         try:
@@ -649,6 +1235,33 @@ class MetricsPersistence:
                     (daily_cutoff_timestamp,),
                 )
                 stats["archives_deleted"] = cursor.rowcount
+                if cursor.rowcount:
+                    _bump_generations(conn, ["metrics_archive"], rewrite=True)
+
+                # Histograms outlive compressed rows; drop them with the archives
+                cursor.execute(
+                    "DELETE FROM metrics_histograms WHERE bucket_start < ?",
+                    (daily_cutoff_timestamp,),
+                )
+                stats["histogram_bins_deleted"] = cursor.rowcount
+
+                # Rollups also outlive compressed rows, one retention tier each
+                for resolution, cutoff, stat in (
+                    ("hour", int(hourly_cutoff.timestamp()), "hourly_deleted"),
+                    ("day", daily_cutoff_timestamp, "daily_deleted"),
+                ):
+                    cursor.execute(
+                        """
+                        DELETE FROM metrics_rollups
+                        WHERE resolution = ? AND bucket_start < ?
+                        """,
+                        (resolution, cutoff),
+                    )
+                    stats[stat] = cursor.rowcount
+                if stats["hourly_deleted"] or stats["daily_deleted"]:
+                    _bump_generations(
+                        conn, ["task_metrics", "agent_metrics", "swarm_metrics"], rewrite=True
+                    )
 
             self.logger.info(
                 f"Cleanup complete: {stats['detailed_deleted']} detailed records compressed, "
@@ -736,15 +1349,12 @@ class MetricsPersistence:
             except Exception as e:
                 self.logger.error(f"Error flushing buffer on shutdown: {e}")
 
-        # Close connections
+        # Release the storage engine (the last user closes its connections)
         with self._lock:
-            for conn in self._connection_pool.values():
-                try:
-                    conn.close()
-                except Exception as e:
-                    self.logger.error(f"Error closing connection: {e}")
-
-            self._connection_pool.clear()
+            if self._closed:
+                return
+            self._engine.release()
+            self._closed = True
             self.logger.info("MetricsPersistence closed")
 
     def __enter__(self):
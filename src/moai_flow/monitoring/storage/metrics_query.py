@@ -6,7 +6,12 @@ Provides comprehensive query interface with:
 - 10 query methods for time-range and filtered queries
 - Aggregation support (avg, sum, count, min, max, percentile)
 - Prepared statements for performance
-- LRU cache for recent queries
+- LRU cache for aggregate queries, invalidated per table by the write
+  generations MetricsPersistence bumps on each flush
+- Time-series aggregation from hourly/daily rollups where they apply
+- Metric queries, averages, exact percentiles, top agents, slowest tasks
+  and summary stats read compressed archive blocks back transparently,
+  decompressing only blocks whose time range and agent bloom bits match
 - Pagination support for large result sets
 
 Query Methods:
@@ -15,7 +20,8 @@ Query Methods:
 3. get_agent_metrics() - Agent-specific queries
 4. get_swarm_metrics() - Swarm-specific queries
 5. aggregate_by_time() - Time-series aggregation
-6. calculate_percentile() - p95, p99 calculations
+6. calculate_percentile() - p95, p99 calculations (exact or approximate;
+   calculate_percentiles() returns several in one pass)
 7. calculate_average() - Average values
 8. get_top_agents() - Top performers
 9. get_slowest_tasks() - Slowest tasks
@@ -26,16 +32,30 @@ Performance Target: <100ms query latency for 1M metrics
 LOC: ~400
 """
 
+import json
 import logging
+import operator
 import sqlite3
 import statistics
+import threading
+import time
 from collections import OrderedDict
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from moai_flow.monitoring.storage.metrics_persistence import (
+    ARCHIVE_SCOPE_COLUMNS,
+    HISTOGRAM_BUCKET_SECONDS,
+    ROLLUP_FIELDS,
+    ROLLUP_RESOLUTIONS,
+    archive_bloom_bits,
+    decode_archive_block,
+    histogram_bin_value,
+)
 
 
 # ============================================================================
@@ -82,6 +102,13 @@ class AggregationFunc(str, Enum):
     PERCENTILE = "percentile"
 
 
+class PercentileMode(str, Enum):
+    """Percentile calculation modes."""
+
+    EXACT = "exact"
+    APPROXIMATE = "approximate"
+
+
 class TimeInterval(str, Enum):
     """Time aggregation interval types."""
 
@@ -92,6 +119,134 @@ class TimeInterval(str, Enum):
     MONTH = "month"
 
 
+# QueryFilter fields each table's queries apply (besides the time range)
+_FILTER_FIELDS = {
+    "task_metrics": ("agent_id", "task_id", "success"),
+    "agent_metrics": ("agent_id", "metric_type"),
+    "swarm_metrics": ("swarm_id", "metric_type"),
+}
+
+
+# SQLite has no native date truncation, so time buckets are strftime labels
+_INTERVAL_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+}
+
+# Rollup resolutions whose buckets nest in each interval, coarsest first
+_INTERVAL_ROLLUPS = {
+    "minute": (),
+    "hour": ("hour",),
+    "day": ("day", "hour"),
+    "week": ("day", "hour"),
+    "month": ("day", "hour"),
+}
+
+# Aggregations computable from (count, sum, min, max)
+_ROLLUP_AGGREGATIONS: Dict[str, Callable[[int, Any, Any, Any], Any]] = {
+    "AVG": lambda count, total, low, high: total / count,
+    "SUM": lambda count, total, low, high: total,
+    "COUNT": lambda count, total, low, high: count,
+    "MIN": lambda count, total, low, high: low,
+    "MAX": lambda count, total, low, high: high,
+}
+
+
+def _merge_buckets(buckets: Dict[str, List], rows) -> None:
+    """Fold (time_bucket, count, sum, min, max) rows into buckets."""
+    for time_bucket, count, total, low, high in rows:
+        entry = buckets.get(time_bucket)
+        if entry is None:
+            buckets[time_bucket] = [count, total, low, high]
+        else:
+            entry[0] += count
+            entry[1] += total
+            entry[2] = min(entry[2], low)
+            entry[3] = max(entry[3], high)
+
+
+# Percentiles calculate_percentiles returns by default
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _percentile_key(percentile: float) -> str:
+    """Result key for a percentile, e.g. 0.95 -> 'p95', 0.999 -> 'p99.9'"""
+    return f"p{round(percentile * 100, 6):g}"
+
+
+def _percentile_rank(percentile: float, count: int) -> int:
+    """Zero-based rank of a percentile among count sorted values."""
+    return min(int(count * percentile), count - 1)
+
+
+_OPERATORS = {">=": operator.ge, "<=": operator.le, "<": operator.lt, "=": operator.eq}
+
+_row_timestamp = operator.itemgetter("timestamp")
+
+
+def _row_conditions(metric_table: str, filter: QueryFilter) -> List[Tuple[str, str, Any]]:
+    """(column, operator, value) row conditions of a filter, for SQL and archived rows"""
+    conditions: List[Tuple[str, str, Any]] = []
+
+    if filter.start_time:
+        conditions.append(("timestamp", ">=", int(filter.start_time.timestamp())))
+
+    if filter.end_time:
+        conditions.append(("timestamp", "<=", int(filter.end_time.timestamp())))
+
+    if filter.agent_id and metric_table in ["task_metrics", "agent_metrics"]:
+        conditions.append(("agent_id", "=", filter.agent_id))
+
+    if filter.swarm_id and metric_table == "swarm_metrics":
+        conditions.append(("swarm_id", "=", filter.swarm_id))
+
+    if filter.task_id and metric_table == "task_metrics":
+        conditions.append(("task_id", "=", filter.task_id))
+
+    if filter.success is not None and metric_table == "task_metrics":
+        conditions.append(("success", "=", 1 if filter.success else 0))
+
+    if filter.metric_type and metric_table in ["agent_metrics", "swarm_metrics"]:
+        conditions.append(("metric_type", "=", filter.metric_type))
+
+    return conditions
+
+
+def _scope_conditions(filter: QueryFilter, agent: bool = True) -> List[Tuple[str, str, Any]]:
+    """Time range (and agent_id) conditions, as the aggregate queries apply them"""
+    conditions: List[Tuple[str, str, Any]] = []
+    if filter.start_time:
+        conditions.append(("timestamp", ">=", int(filter.start_time.timestamp())))
+    if filter.end_time:
+        conditions.append(("timestamp", "<=", int(filter.end_time.timestamp())))
+    if agent and filter.agent_id:
+        conditions.append(("agent_id", "=", filter.agent_id))
+    return conditions
+
+
+def _sql_where(conditions: List[Tuple[str, str, Any]]) -> Tuple[str, List[Any]]:
+    """' AND column op ?' clauses and their parameters"""
+    where = "".join(f" AND {column} {op} ?" for column, op, _ in conditions)
+    return where, [value for _, _, value in conditions]
+
+
+def _bucket_label(time_format: str, timestamp: int) -> str:
+    """strftime label of an epoch-seconds timestamp, as SQLite's 'unixepoch' gives it"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(time_format)
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy a cached result so callers cannot modify the cache entry"""
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
 # ============================================================================
 # MetricsQuery Implementation
 # ============================================================================
@@ -103,10 +258,17 @@ class MetricsQuery:
 
     Provides 10 comprehensive query methods with optimization:
     - Prepared statements for fast execution
-    - LRU cache for recent queries
+    - LRU cache for aggregate queries (see get_cache_stats)
     - Index-aware query planning
     - Pagination support
 
+    Cached results are tagged with the write generation of every table
+    they read. MetricsPersistence bumps a table's generation in the same
+    transaction as each flush, so a hit is only served while the table
+    is unchanged. Results for closed time ranges (ending more than
+    closed_range_grace_seconds ago) survive appends and are only
+    invalidated when rows are deleted or archived.
+
     Example:
         >>> query = MetricsQuery()
         >>> filter = QueryFilter(
@@ -122,13 +284,24 @@ class MetricsQuery:
         ... )
     """
 
-    def __init__(self, db_path: Optional[Path] = None, cache_size: int = 100):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        cache_size: int = 100,
+        closed_range_grace_seconds: float = 300.0,
+        archive_cache_blocks: int = 16,
+    ):
         """
         Initialize metrics query interface.
 
         Args:
             db_path: Path to SQLite database (default: .swarm/metrics_persistent.db)
-            cache_size: LRU cache size for query results (default: 100)
+            cache_size: LRU cache size for query results, 0 disables (default: 100)
+            closed_range_grace_seconds: A filter whose end_time is older than
+                this is a closed range; metrics written later with older
+                timestamps are not seen by its cached results (default: 300)
+            archive_cache_blocks: Decompressed archive blocks kept in memory
+                (default: 16)
         """
         self.db_path = db_path or Path.cwd() / ".swarm" / "metrics_persistent.db"
 
@@ -140,6 +313,21 @@ class MetricsQuery:
 
         self.logger = logging.getLogger(__name__)
         self._cache_size = cache_size
+        self._closed_range_grace = closed_range_grace_seconds
+
+        # Query result cache: key -> (result, generation stamp, closed range)
+        self._cache: "OrderedDict[Tuple, Tuple[Any, Tuple[int, ...], bool]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+        # Decompressed archive blocks: block id -> rows
+        self._block_cache: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._block_cache_size = archive_cache_blocks
+        self._block_stats = {"hits": 0, "misses": 0}
+
+        # (write, rewrite) generation per table, re-read when data_version moves
+        self._generations: Dict[str, Tuple[int, int]] = {}
+        self._data_version: Optional[int] = None
 
         # Connection
         self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
@@ -155,6 +343,10 @@ class MetricsQuery:
         """
         Get all metrics from table with optional filtering.
 
+        Rows compressed into metrics_archive are included. Only archive
+        blocks whose time range and agent bloom bits overlap the filter are
+        decompressed, newest first, until the requested page is complete.
+
         Args:
             metric_table: Table name ('task_metrics', 'agent_metrics', 'swarm_metrics')
             filter: Query filter configuration
@@ -163,47 +355,42 @@ class MetricsQuery:
             List of metric dictionaries
         """
         filter = filter or QueryFilter()
+        conditions = _row_conditions(metric_table, filter)
 
         query = f"SELECT * FROM {metric_table} WHERE 1=1"
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
-
-        if filter.agent_id and metric_table in ["task_metrics", "agent_metrics"]:
-            query += " AND agent_id = ?"
-            params.append(filter.agent_id)
-
-        if filter.swarm_id and metric_table == "swarm_metrics":
-            query += " AND swarm_id = ?"
-            params.append(filter.swarm_id)
-
-        if filter.task_id and metric_table == "task_metrics":
-            query += " AND task_id = ?"
-            params.append(filter.task_id)
-
-        if filter.success is not None and metric_table == "task_metrics":
-            query += " AND success = ?"
-            params.append(1 if filter.success else 0)
-
-        if filter.metric_type and metric_table in ["agent_metrics", "swarm_metrics"]:
-            query += " AND metric_type = ?"
-            params.append(filter.metric_type)
-
-        # Pagination
-        query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-        params.extend([filter.limit, filter.offset])
-
-        cursor = self._conn.cursor()
-        cursor.execute(query, params)
+        query += "".join(f" AND {column} {op} ?" for column, op, _ in conditions)
+        params: List[Any] = [value for _, _, value in conditions]
+
+        blocks = self._archive_blocks(metric_table, filter)
+        if not blocks:
+            # Pagination
+            query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+            params.extend([filter.limit, filter.offset])
+
+            cursor = self._conn.cursor()
+            cursor.execute(query, params)
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        # Archived rows are older than live ones but may interleave; take the
+        # whole page window from both and merge newest first
+        window = filter.offset + filter.limit
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(window)
+        rows = [dict(row) for row in self._conn.execute(query, params).fetchall()]
+
+        for block_id, max_timestamp in blocks:
+            if len(rows) >= window and max_timestamp < rows[window - 1]["timestamp"]:
+                break
+            rows.extend(
+                dict(row)
+                for row in self._archive_block(block_id)
+                if all(_OPERATORS[op](row[column], value) for column, op, value in conditions)
+            )
+            rows.sort(key=_row_timestamp, reverse=True)
+            del rows[window:]
 
-        return [dict(row) for row in cursor.fetchall()]
+        return rows[filter.offset:window]
 
     # ========================================================================
     # Query Method 2: Get Task Metrics
@@ -320,6 +507,13 @@ class MetricsQuery:
         """
         Aggregate metrics by time interval.
 
+        Hourly and coarser intervals over rolled-up fields are read from
+        the daily and hourly rollups MetricsPersistence maintains, so a
+        90-day daily chart reads one row per day per agent and metric
+        type; only partial hours at the range edges touch raw rows. There
+        "count" is the number of non-null values. Minute intervals and
+        other fields aggregate raw rows.
+
         Args:
             metric_table: Table name
             field: Field to aggregate ('duration_ms', 'value', etc.)
@@ -336,47 +530,181 @@ class MetricsQuery:
             aggregation.value if isinstance(aggregation, AggregationFunc) else aggregation
         ).upper()
 
-        # SQLite doesn't have native date truncation, so we use strftime
-        interval_format = {
-            "minute": "%Y-%m-%d %H:%M:00",
-            "hour": "%Y-%m-%d %H:00:00",
-            "day": "%Y-%m-%d",
-            "week": "%Y-W%W",
-            "month": "%Y-%m",
-        }
-
-        time_format = interval_format.get(interval_str, "%Y-%m-%d %H:00:00")
+        return self._cached(
+            ("aggregate_by_time", field, interval_str, agg_func),
+            metric_table,
+            filter,
+            lambda: self._aggregate_by_time(metric_table, field, interval_str, agg_func, filter),
+            fields=("agent_id",),
+        )
 
-        query = f"""
+    def _aggregate_by_time(
+        self,
+        metric_table: str,
+        column: str,
+        interval_str: str,
+        agg_func: str,
+        filter: QueryFilter,
+    ) -> List[Dict[str, Any]]:
+        """Run aggregate_by_time against the rollups where possible, else raw rows."""
+        time_format = _INTERVAL_FORMATS.get(interval_str, "%Y-%m-%d %H:00:00")
+        resolutions = _INTERVAL_ROLLUPS.get(interval_str, ("hour",))
+
+        if (
+            resolutions
+            and agg_func in _ROLLUP_AGGREGATIONS
+            and column in ROLLUP_FIELDS.get(metric_table, ())
+        ):
+            try:
+                return self._aggregate_from_rollups(
+                    metric_table, column, time_format, resolutions, agg_func, filter
+                )
+            except sqlite3.OperationalError as e:
+                # Database written before rollups existed
+                self.logger.debug(f"Rollups unavailable, aggregating raw rows: {e}")
+
+        if agg_func not in _ROLLUP_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {agg_func}")
+
+        # Raw rows, live and archived; "count" is the number of rows
+        conditions = _scope_conditions(filter, metric_table in ["task_metrics", "agent_metrics"])
+        where, params = _sql_where(conditions)
+        row_counts: Dict[str, int] = {}
+        buckets: Dict[str, List] = {}
+        cursor = self._conn.execute(
+            f"""
             SELECT
                 strftime('{time_format}', datetime(timestamp, 'unixepoch')) as time_bucket,
-                {agg_func}({field}) as value,
-                COUNT(*) as count
+                COUNT(*), COUNT({column}), SUM({column}), MIN({column}), MAX({column})
             FROM {metric_table}
-            WHERE 1=1
+            WHERE 1=1{where}
+            GROUP BY time_bucket
+            """,
+            params,
+        )
+        for time_bucket, rows, count, total, low, high in cursor:
+            row_counts[time_bucket] = rows
+            if count:
+                _merge_buckets(buckets, [(time_bucket, count, total, low, high)])
+
+        for row in self._archived_rows(metric_table, filter, conditions):
+            time_bucket = _bucket_label(time_format, row["timestamp"])
+            row_counts[time_bucket] = row_counts.get(time_bucket, 0) + 1
+            value = row.get(column)
+            if value is not None:
+                _merge_buckets(buckets, [(time_bucket, 1, value, value, value)])
+
+        return [
+            {
+                "time_bucket": time_bucket,
+                "value": (
+                    _ROLLUP_AGGREGATIONS[agg_func](*buckets[time_bucket])
+                    if time_bucket in buckets
+                    else (0 if agg_func == "COUNT" else None)
+                ),
+                "count": row_counts[time_bucket],
+            }
+            for time_bucket in sorted(row_counts)
+        ]
+
+    def _aggregate_from_rollups(
+        self,
+        metric_table: str,
+        column: str,
+        time_format: str,
+        resolutions: Tuple[str, ...],
+        agg_func: str,
+        filter: QueryFilter,
+    ) -> List[Dict[str, Any]]:
         """
+        Aggregate from the coarsest rollups covering the time range.
 
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
-
+        The range is split into whole buckets of the coarsest resolution
+        and the partial buckets at its edges, which go to the next finer
+        resolution and finally to the raw rows, live and archived. Rollups
+        keep data after its detailed rows are archived, so old ranges are
+        still answered.
+        """
+        start = int(filter.start_time.timestamp()) if filter.start_time else None
+        end = int(filter.end_time.timestamp()) + 1 if filter.end_time else None
+        scope = None
         if filter.agent_id and metric_table in ["task_metrics", "agent_metrics"]:
-            query += " AND agent_id = ?"
-            params.append(filter.agent_id)
-
-        query += " GROUP BY time_bucket ORDER BY time_bucket"
-
-        cursor = self._conn.cursor()
-        cursor.execute(query, params)
-
-        return [dict(row) for row in cursor.fetchall()]
+            scope = filter.agent_id
+
+        buckets: Dict[str, List] = {}
+        ranges = [(start, end)]
+        for resolution in resolutions:
+            width = ROLLUP_RESOLUTIONS[resolution]
+            remaining = []
+            for low, high in ranges:
+                first = None if low is None else -(-low // width) * width
+                last = None if high is None else high // width * width
+                if first is not None and last is not None and first >= last:
+                    remaining.append((low, high))
+                    continue
+
+                query = f"""
+                    SELECT
+                        strftime('{time_format}', datetime(bucket_start, 'unixepoch')),
+                        SUM(count), SUM(sum), MIN(min), MAX(max)
+                    FROM metrics_rollups
+                    WHERE resolution = ? AND metric_table = ? AND field = ?
+                """
+                params: List[Any] = [resolution, metric_table, column]
+                if first is not None:
+                    query += " AND bucket_start >= ?"
+                    params.append(first)
+                if last is not None:
+                    query += " AND bucket_start < ?"
+                    params.append(last)
+                if scope is not None:
+                    query += " AND scope = ?"
+                    params.append(scope)
+                _merge_buckets(buckets, self._conn.execute(query + " GROUP BY 1", params))
+
+                if low is not None and low < first:
+                    remaining.append((low, first))
+                if high is not None and last < high:
+                    remaining.append((last, high))
+            ranges = remaining
+
+        for low, high in ranges:
+            query = f"""
+                SELECT
+                    strftime('{time_format}', datetime(timestamp, 'unixepoch')),
+                    COUNT({column}), SUM({column}), MIN({column}), MAX({column})
+                FROM {metric_table}
+                WHERE {column} IS NOT NULL AND timestamp >= ? AND timestamp < ?
+            """
+            params = [low, high]
+            if scope is not None:
+                query += " AND agent_id = ?"
+                params.append(scope)
+            _merge_buckets(buckets, self._conn.execute(query + " GROUP BY 1", params))
+
+            edge = QueryFilter(
+                agent_id=scope,
+                start_time=datetime.fromtimestamp(low, tz=timezone.utc),
+                end_time=datetime.fromtimestamp(high - 1, tz=timezone.utc),
+            )
+            conditions = [("timestamp", ">=", low), ("timestamp", "<", high)]
+            if scope is not None:
+                conditions.append(("agent_id", "=", scope))
+            _merge_buckets(buckets, (
+                (_bucket_label(time_format, row["timestamp"]), 1, value, value, value)
+                for row in self._archived_rows(metric_table, edge, conditions)
+                for value in (row.get(column),)
+                if value is not None
+            ))
+
+        return [
+            {
+                "time_bucket": time_bucket,
+                "value": _ROLLUP_AGGREGATIONS[agg_func](*buckets[time_bucket]),
+                "count": buckets[time_bucket][0],
+            }
+            for time_bucket in sorted(buckets)
+        ]
 
     # ========================================================================
     # Query Method 6: Calculate Percentile
@@ -388,52 +716,200 @@ class MetricsQuery:
         field: str,
         percentile: float,
         filter: Optional[QueryFilter] = None,
+        mode: Union[PercentileMode, str] = PercentileMode.EXACT,
     ) -> float:
         """
         Calculate percentile for metric field.
 
+        Exact mode counts the matching rows and lets SQLite pick the row at
+        the percentile's rank from one ordered pass; only that value is
+        fetched into Python. When archive blocks overlap the filter, their
+        values join the same pass. Approximate mode sums the hourly
+        histograms MetricsPersistence maintains at flush time, so its cost
+        does not grow with the row count.
+
         Args:
             metric_table: Table name
             field: Field to calculate percentile on
             percentile: Percentile value (0.0-1.0, e.g., 0.95 for p95)
             filter: Query filter configuration
+            mode: PercentileMode.EXACT or PercentileMode.APPROXIMATE
+                (default: exact)
 
         Returns:
             Percentile value
         """
+        return self.calculate_percentiles(
+            metric_table, field, (percentile,), filter, mode
+        )[_percentile_key(percentile)]
+
+    def calculate_percentiles(
+        self,
+        metric_table: str,
+        field: str,
+        percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+        filter: Optional[QueryFilter] = None,
+        mode: Union[PercentileMode, str] = PercentileMode.EXACT,
+    ) -> Dict[str, float]:
+        """
+        Calculate several percentiles for metric field in one pass.
+
+        Exact mode numbers the rows in one ordered pass in SQLite and
+        fetches one row per rank; approximate mode walks the cumulative
+        histogram once. In approximate mode values are within 1% of the
+        exact result, and the time range is widened to whole hours.
+
+        Args:
+            metric_table: Table name
+            field: Field to calculate percentiles on
+            percentiles: Percentile values (0.0-1.0)
+                (default: 0.5, 0.9, 0.95, 0.99)
+            filter: Query filter configuration
+            mode: PercentileMode.EXACT or PercentileMode.APPROXIMATE
+                (default: exact)
+
+        Returns:
+            {"p50": value, "p90": value, ...} in the order requested
+        """
         filter = filter or QueryFilter()
+        mode = PercentileMode(mode)
+        percentiles = tuple(percentiles)
+
+        return self._cached(
+            ("calculate_percentiles", field, percentiles, mode.value),
+            metric_table,
+            filter,
+            lambda: self._calculate_percentiles(
+                metric_table, field, percentiles, filter, mode
+            ),
+            fields=("agent_id",),
+        )
 
-        query = f"SELECT {field} FROM {metric_table} WHERE 1=1"
-        params = []
+    def _calculate_percentiles(
+        self,
+        metric_table: str,
+        column: str,
+        percentiles: Tuple[float, ...],
+        filter: QueryFilter,
+        mode: PercentileMode,
+    ) -> Dict[str, float]:
+        """Run calculate_percentiles against SQLite."""
+        if mode is PercentileMode.APPROXIMATE:
+            result = self._approximate_percentiles(metric_table, column, percentiles, filter)
+            if result is not None:
+                return result
+            self.logger.debug(
+                f"No histogram for {metric_table}.{column}, using exact percentiles"
+            )
+        return self._exact_percentiles(metric_table, column, percentiles, filter)
 
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
+    def _exact_percentiles(
+        self,
+        metric_table: str,
+        column: str,
+        percentiles: Tuple[float, ...],
+        filter: QueryFilter,
+    ) -> Dict[str, float]:
+        """
+        Percentiles from one ordered pass in SQLite.
 
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
+        Archived values join the live rows through json_each(), and
+        ROW_NUMBER() picks every rank in the same pass, so only one row
+        per rank is fetched into Python.
+        """
+        conditions = _scope_conditions(filter, metric_table in ["task_metrics", "agent_metrics"])
+        where, params = _sql_where(conditions)
+        where = f" WHERE {column} IS NOT NULL{where}"
+
+        archived = [
+            row[column]
+            for row in self._archived_rows(metric_table, filter, conditions)
+            if row.get(column) is not None
+        ]
+
+        cursor = self._conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {metric_table}{where}", params)
+        count = cursor.fetchone()[0] + len(archived)
+
+        if not count:
+            return {_percentile_key(p): 0.0 for p in percentiles}
+
+        ranks = {p: _percentile_rank(p, count) for p in percentiles}
+        select = f"SELECT {column} AS value FROM {metric_table}{where}"
+        if archived:
+            select += " UNION ALL SELECT value FROM json_each(?)"
+            params = params + [json.dumps(archived)]
+
+        cursor.execute(
+            f"""
+            SELECT rank, value FROM (
+                SELECT value, ROW_NUMBER() OVER (ORDER BY value) - 1 AS rank
+                FROM ({select})
+            )
+            WHERE rank IN (SELECT value FROM json_each(?))
+            """,
+            params + [json.dumps(sorted(set(ranks.values())))],
+        )
+        values = dict(cursor.fetchall())
+
+        return {_percentile_key(p): values[ranks[p]] for p in percentiles}
+
+    def _approximate_percentiles(
+        self,
+        metric_table: str,
+        column: str,
+        percentiles: Tuple[float, ...],
+        filter: QueryFilter,
+    ) -> Optional[Dict[str, float]]:
+        """
+        Percentiles from the flush-time histograms.
 
+        Returns:
+            Percentiles, or None when no histogram covers the query (the
+            database predates histograms or they are disabled for column)
+        """
+        query = """
+            SELECT bin, SUM(count) FROM metrics_histograms
+            WHERE metric_table = ? AND field = ? AND scope = ?
+        """
+        scope = ""
         if filter.agent_id and metric_table in ["task_metrics", "agent_metrics"]:
-            query += " AND agent_id = ?"
-            params.append(filter.agent_id)
+            scope = filter.agent_id
+        params: List[Any] = [metric_table, column, scope]
 
-        query += f" ORDER BY {field}"
+        # Whole hour buckets overlapping the range
+        if filter.start_time:
+            query += " AND bucket_start > ?"
+            params.append(int(filter.start_time.timestamp()) - HISTOGRAM_BUCKET_SECONDS)
 
-        cursor = self._conn.cursor()
-        cursor.execute(query, params)
+        if filter.end_time:
+            query += " AND bucket_start <= ?"
+            params.append(int(filter.end_time.timestamp()))
 
-        values = [row[0] for row in cursor.fetchall() if row[0] is not None]
+        query += " GROUP BY bin ORDER BY bin"
 
-        if not values:
-            return 0.0
+        try:
+            bins = self._conn.execute(query, params).fetchall()
+        except sqlite3.OperationalError:
+            return None
 
-        # Calculate percentile
-        index = int(len(values) * percentile)
-        index = min(index, len(values) - 1)
+        count = sum(row[1] for row in bins)
+        if not count:
+            return None
 
-        return values[index]
+        ranks = sorted((_percentile_rank(p, count), p) for p in percentiles)
+        result = {}
+        seen = 0
+        position = 0
+        for bin_index, bin_count in bins:
+            seen += bin_count
+            while position < len(ranks) and ranks[position][0] < seen:
+                result[ranks[position][1]] = histogram_bin_value(bin_index)
+                position += 1
+            if position == len(ranks):
+                break
+
+        return {_percentile_key(p): result[p] for p in percentiles}
 
     # ========================================================================
     # Query Method 7: Calculate Average
@@ -448,6 +924,8 @@ class MetricsQuery:
         """
         Calculate average for metric field.
 
+        Rows compressed into metrics_archive are included.
+
         Args:
             metric_table: Table name
             field: Field to average
@@ -458,28 +936,36 @@ class MetricsQuery:
         """
         filter = filter or QueryFilter()
 
-        query = f"SELECT AVG({field}) as avg_value FROM {metric_table} WHERE 1=1"
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
+        return self._cached(
+            ("calculate_average", field),
+            metric_table,
+            filter,
+            lambda: self._calculate_average(metric_table, field, filter),
+            fields=("agent_id",),
+        )
 
-        if filter.agent_id and metric_table in ["task_metrics", "agent_metrics"]:
-            query += " AND agent_id = ?"
-            params.append(filter.agent_id)
+    def _calculate_average(
+        self, metric_table: str, column: str, filter: QueryFilter
+    ) -> float:
+        """Run calculate_average against SQLite and the matching archive blocks."""
+        conditions = _scope_conditions(filter, metric_table in ["task_metrics", "agent_metrics"])
+        where, params = _sql_where(conditions)
 
         cursor = self._conn.cursor()
-        cursor.execute(query, params)
+        cursor.execute(
+            f"SELECT COUNT({column}), SUM({column}) FROM {metric_table} WHERE 1=1{where}",
+            params,
+        )
+        count, total = cursor.fetchone()
+        total = total or 0
 
-        result = cursor.fetchone()
+        for row in self._archived_rows(metric_table, filter, conditions):
+            value = row.get(column)
+            if value is not None:
+                count += 1
+                total += value
 
-        return result["avg_value"] if result["avg_value"] is not None else 0.0
+        return total / count if count else 0.0
 
     # ========================================================================
     # Query Method 8: Get Top Agents
@@ -506,6 +992,25 @@ class MetricsQuery:
         """
         filter = filter or QueryFilter()
 
+        return self._cached(
+            ("get_top_agents", metric_type, order.lower(), limit),
+            "task_metrics",
+            filter,
+            lambda: self._get_top_agents(metric_type, order, limit, filter),
+            fields=(),
+        )
+
+    def _get_top_agents(
+        self, metric_type: str, order: str, limit: int, filter: QueryFilter
+    ) -> List[Dict[str, Any]]:
+        """Run get_top_agents against SQLite and the matching archive blocks."""
+        conditions = _scope_conditions(filter, agent=False)
+        where, params = _sql_where(conditions)
+        archived = self._archived_rows("task_metrics", replace(filter, agent_id=None), conditions)
+
+        if archived:
+            return self._top_agents_with_archive(metric_type, order, limit, where, params, archived)
+
         query = f"""
             SELECT
                 agent_id,
@@ -514,21 +1019,7 @@ class MetricsQuery:
                 AVG(tokens_used) as avg_tokens_used,
                 SUM(success) * 1.0 / COUNT(*) as success_rate
             FROM task_metrics
-            WHERE 1=1
-        """
-
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
-
-        query += f"""
+            WHERE 1=1{where}
             GROUP BY agent_id
             HAVING task_count > 0
             ORDER BY {metric_type} {order.upper()}
@@ -541,6 +1032,61 @@ class MetricsQuery:
 
         return [dict(row) for row in cursor.fetchall()]
 
+    def _top_agents_with_archive(
+        self,
+        metric_type: str,
+        order: str,
+        limit: int,
+        where: str,
+        params: List[Any],
+        archived: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """get_top_agents over live per-agent sums merged with archived rows."""
+        # agent_id -> [tasks, duration count, duration sum, token count, token sum, successes]
+        totals: Dict[str, List] = {}
+        query = f"""
+            SELECT agent_id, COUNT(*), COUNT(duration_ms), TOTAL(duration_ms),
+                   COUNT(tokens_used), TOTAL(tokens_used), TOTAL(success)
+            FROM task_metrics
+            WHERE 1=1{where}
+            GROUP BY agent_id
+        """
+        for agent_id, *sums in self._conn.execute(query, params):
+            totals[agent_id] = sums
+        for row in archived:
+            entry = totals.setdefault(row["agent_id"], [0, 0, 0.0, 0, 0.0, 0.0])
+            entry[0] += 1
+            if row["duration_ms"] is not None:
+                entry[1] += 1
+                entry[2] += row["duration_ms"]
+            if row["tokens_used"] is not None:
+                entry[3] += 1
+                entry[4] += row["tokens_used"]
+            entry[5] += row["success"] or 0
+
+        agents = [
+            {
+                "agent_id": agent_id,
+                "task_count": tasks,
+                "avg_duration_ms": duration / durations if durations else None,
+                "avg_tokens_used": tokens / token_counts if token_counts else None,
+                "success_rate": successes / tasks,
+            }
+            for agent_id, (tasks, durations, duration, token_counts, tokens, successes)
+            in totals.items()
+        ]
+
+        # metric_type names a result column, or a field whose average is ranked
+        key = metric_type if metric_type in ("task_count", "success_rate") else f"avg_{metric_type}"
+        if agents and key not in agents[0]:
+            key = "avg_duration_ms"
+        descending = order.lower() == "desc"
+        # NULLs sort first ascending and last descending, as in SQLite
+        agents.sort(
+            key=lambda agent: (agent[key] is not None, agent[key] or 0), reverse=descending
+        )
+        return agents[:limit]
+
     # ========================================================================
     # Query Method 9: Get Slowest Tasks
     # ========================================================================
@@ -561,8 +1107,23 @@ class MetricsQuery:
         filter = filter or QueryFilter()
         filter.limit = limit
 
+        return self._cached(
+            ("get_slowest_tasks", limit),
+            "task_metrics",
+            filter,
+            lambda: self._get_slowest_tasks(limit, filter),
+            fields=("agent_id",),
+        )
+
+    def _get_slowest_tasks(
+        self, limit: int, filter: QueryFilter
+    ) -> List[Dict[str, Any]]:
+        """Run get_slowest_tasks against SQLite and the matching archive blocks."""
+        conditions = _scope_conditions(filter)
+        where, params = _sql_where(conditions)
+
         # Get task metrics sorted by duration
-        query = """
+        query = f"""
             SELECT
                 task_id,
                 agent_id,
@@ -571,31 +1132,26 @@ class MetricsQuery:
                 success,
                 timestamp
             FROM task_metrics
-            WHERE 1=1
+            WHERE 1=1{where}
+            ORDER BY duration_ms DESC LIMIT ?
         """
-
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
-
-        if filter.agent_id:
-            query += " AND agent_id = ?"
-            params.append(filter.agent_id)
-
-        query += " ORDER BY duration_ms DESC LIMIT ?"
         params.append(limit)
 
         cursor = self._conn.cursor()
         cursor.execute(query, params)
+        rows = [dict(row) for row in cursor.fetchall()]
 
-        return [dict(row) for row in cursor.fetchall()]
+        archived = self._archived_rows("task_metrics", filter, conditions)
+        if not archived:
+            return rows
+
+        columns = ("task_id", "agent_id", "duration_ms", "tokens_used", "success", "timestamp")
+        rows.extend({column: row[column] for column in columns} for row in archived)
+        rows.sort(
+            key=lambda row: (row["duration_ms"] is not None, row["duration_ms"] or 0),
+            reverse=True,
+        )
+        return rows[:limit]
 
     # ========================================================================
     # Query Method 10: Get Summary Stats
@@ -615,66 +1171,304 @@ class MetricsQuery:
         """
         filter = filter or QueryFilter()
 
+        return self._cached(
+            ("get_summary_stats",),
+            "task_metrics",
+            filter,
+            lambda: self._get_summary_stats(filter),
+            fields=("agent_id",),
+        )
+
+    def _get_summary_stats(self, filter: QueryFilter) -> Dict[str, Any]:
+        """Run get_summary_stats against SQLite and the matching archive blocks."""
+        # Apply filters (the percentiles below use the same ones)
+        conditions = _scope_conditions(filter)
+        where, params = _sql_where(conditions)
+
         # Task summary
-        task_query = """
+        task_query = f"""
             SELECT
                 COUNT(*) as total_tasks,
-                SUM(success) as successful_tasks,
-                AVG(duration_ms) as avg_duration_ms,
-                AVG(tokens_used) as avg_tokens_used,
+                TOTAL(success) as successful_tasks,
+                COUNT(duration_ms) as duration_count,
+                TOTAL(duration_ms) as total_duration_ms,
+                COUNT(tokens_used) as tokens_count,
                 SUM(tokens_used) as total_tokens_used
             FROM task_metrics
-            WHERE 1=1
+            WHERE 1=1{where}
         """
 
-        params = []
-
-        # Apply filters
-        if filter.start_time:
-            task_query += " AND timestamp >= ?"
-            params.append(int(filter.start_time.timestamp()))
-
-        if filter.end_time:
-            task_query += " AND timestamp <= ?"
-            params.append(int(filter.end_time.timestamp()))
-
         cursor = self._conn.cursor()
         cursor.execute(task_query, params)
         task_stats = dict(cursor.fetchone())
+        task_stats["total_tokens_used"] = task_stats["total_tokens_used"] or 0
+
+        archived = self._archived_rows("task_metrics", filter, conditions)
+        for row in archived:
+            task_stats["total_tasks"] += 1
+            task_stats["successful_tasks"] += row["success"] or 0
+            if row["duration_ms"] is not None:
+                task_stats["duration_count"] += 1
+                task_stats["total_duration_ms"] += row["duration_ms"]
+            if row["tokens_used"] is not None:
+                task_stats["tokens_count"] += 1
+                task_stats["total_tokens_used"] += row["tokens_used"]
 
         # Agent summary
-        agent_query = """
-            SELECT COUNT(DISTINCT agent_id) as unique_agents
-            FROM task_metrics
-            WHERE 1=1
-        """
+        if archived:
+            cursor.execute(f"SELECT DISTINCT agent_id FROM task_metrics WHERE 1=1{where}", params)
+            agents = {row[0] for row in cursor}
+            agents.update(row["agent_id"] for row in archived)
+            unique_agents = len(agents - {None})
+        else:
+            cursor.execute(
+                f"SELECT COUNT(DISTINCT agent_id) FROM task_metrics WHERE 1=1{where}", params
+            )
+            unique_agents = cursor.fetchone()[0]
 
-        cursor.execute(agent_query, params)
-        agent_stats = dict(cursor.fetchone())
+        total_tasks = task_stats["total_tasks"]
+        successful_tasks = int(task_stats["successful_tasks"])
 
         # Calculate success rate
-        success_rate = 0.0
-        if task_stats["total_tasks"] > 0:
-            success_rate = task_stats["successful_tasks"] / task_stats["total_tasks"]
+        success_rate = successful_tasks / total_tasks if total_tasks else 0.0
 
-        # Calculate percentiles
-        p95_duration = self.calculate_percentile("task_metrics", "duration_ms", 0.95, filter)
-        p99_duration = self.calculate_percentile("task_metrics", "duration_ms", 0.99, filter)
+        # Calculate percentiles (one scan for both)
+        percentiles = self.calculate_percentiles(
+            "task_metrics", "duration_ms", (0.95, 0.99), filter
+        )
 
         summary = {
-            "total_tasks": task_stats["total_tasks"] or 0,
-            "successful_tasks": task_stats["successful_tasks"] or 0,
+            "total_tasks": total_tasks,
+            "successful_tasks": successful_tasks,
             "success_rate": success_rate,
-            "avg_duration_ms": task_stats["avg_duration_ms"] or 0.0,
-            "p95_duration_ms": p95_duration,
-            "p99_duration_ms": p99_duration,
-            "avg_tokens_per_task": task_stats["avg_tokens_used"] or 0.0,
-            "total_tokens_used": task_stats["total_tokens_used"] or 0,
-            "unique_agents": agent_stats["unique_agents"] or 0,
+            "avg_duration_ms": (
+                task_stats["total_duration_ms"] / task_stats["duration_count"]
+                if task_stats["duration_count"] else 0.0
+            ),
+            "p95_duration_ms": percentiles["p95"],
+            "p99_duration_ms": percentiles["p99"],
+            "avg_tokens_per_task": (
+                task_stats["total_tokens_used"] / task_stats["tokens_count"]
+                if task_stats["tokens_count"] else 0.0
+            ),
+            "total_tokens_used": task_stats["total_tokens_used"],
+            "unique_agents": unique_agents,
         }
 
         return summary
 
+    # ========================================================================
+    # Query Result Cache
+    # ========================================================================
+
+    def _cached(
+        self,
+        method: Tuple,
+        metric_table: str,
+        filter: QueryFilter,
+        compute: Callable[[], Any],
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Any:
+        """
+        Serve a query result from the LRU cache or compute and cache it.
+
+        Args:
+            method: Method name and the arguments that shape its result
+            metric_table: Table the query reads
+            filter: Query filter
+            compute: Runs the query against SQLite
+            fields: QueryFilter fields the query applies besides the time
+                range (default: all fields relevant to metric_table,
+                plus limit and offset)
+
+        Returns:
+            Query result (a copy when served from the cache)
+        """
+        if self._cache_size <= 0:
+            return compute()
+
+        generations = self._table_generations()
+        if generations is None:
+            return compute()
+
+        closed = (
+            filter.end_time is not None
+            and filter.end_time.timestamp() < time.time() - self._closed_range_grace
+        )
+        # Closed ranges only care about deletions (the rewrite generation)
+        stamp = generations.get(metric_table, (0, 0))[1 if closed else 0]
+        key = (method, metric_table, self._filter_key(metric_table, filter, fields))
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[1] == stamp and entry[2] == closed:
+                    self._cache.move_to_end(key)
+                    self._cache_stats["hits"] += 1
+                    return _copy_result(entry[0])
+                del self._cache[key]
+                self._cache_stats["invalidations"] += 1
+            self._cache_stats["misses"] += 1
+
+        result = compute()
+
+        with self._cache_lock:
+            self._cache[key] = (result, stamp, closed)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._cache_stats["evictions"] += 1
+
+        return _copy_result(result)
+
+    @staticmethod
+    def _filter_key(
+        metric_table: str, filter: QueryFilter, fields: Optional[Tuple[str, ...]]
+    ) -> Tuple:
+        """Normalize a QueryFilter to the values the query actually uses."""
+        start = int(filter.start_time.timestamp()) if filter.start_time else None
+        end = int(filter.end_time.timestamp()) if filter.end_time else None
+        if fields is None:
+            fields = _FILTER_FIELDS.get(metric_table, ()) + ("limit", "offset")
+        return (start, end) + tuple((name, getattr(filter, name)) for name in fields)
+
+    def _table_generations(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Current (write, rewrite) generation per table.
+
+        The generation table is only re-read after another connection
+        committed (PRAGMA data_version changed).
+
+        Returns:
+            Generations by table, or None if the database has no
+            generation table (caching is then skipped)
+        """
+        with self._cache_lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                try:
+                    rows = self._conn.execute(
+                        """
+                        SELECT metric_table, generation, rewrite_generation
+                        FROM metrics_write_generation
+                        """
+                    ).fetchall()
+                except sqlite3.OperationalError:
+                    return None
+                self._generations = {row[0]: (row[1], row[2]) for row in rows}
+                self._data_version = version
+            return self._generations
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query result cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, invalidations (stale
+            entries dropped after a write), evictions, size and capacity,
+            plus archive_blocks (decompressed-block cache hits, misses,
+            size and capacity)
+        """
+        with self._cache_lock:
+            stats = dict(self._cache_stats)
+            stats["size"] = len(self._cache)
+            stats["archive_blocks"] = dict(
+                self._block_stats,
+                size=len(self._block_cache),
+                capacity=self._block_cache_size,
+            )
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["capacity"] = self._cache_size
+        return stats
+
+    def clear_cache(self) -> None:
+        """Drop all cached query results and archive blocks."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._block_cache.clear()
+
+    # ========================================================================
+    # Archive Blocks
+    # ========================================================================
+
+    def _archive_blocks(
+        self, metric_table: str, filter: QueryFilter
+    ) -> List[Tuple[int, int]]:
+        """
+        Archive blocks that may hold rows matching filter.
+
+        Blocks are selected on their min/max timestamp and, with an agent
+        (or swarm) filter, their bloom bits.
+
+        Returns:
+            (block id, max timestamp) pairs, newest block first
+        """
+        query = """
+            SELECT id, max_timestamp FROM metrics_archive
+            WHERE metric_table = ? AND aggregation_level = 'detailed'
+        """
+        params: List[Any] = [metric_table]
+
+        if filter.start_time:
+            query += " AND max_timestamp >= ?"
+            params.append(int(filter.start_time.timestamp()))
+
+        if filter.end_time:
+            query += " AND min_timestamp <= ?"
+            params.append(int(filter.end_time.timestamp()))
+
+        scope = filter.swarm_id if metric_table == "swarm_metrics" else filter.agent_id
+        if scope and metric_table in ARCHIVE_SCOPE_COLUMNS:
+            bits = archive_bloom_bits(scope)
+            query += " AND (agent_bloom & ?) = ?"
+            params.extend([bits, bits])
+
+        query += " ORDER BY max_timestamp DESC"
+
+        try:
+            return self._conn.execute(query, params).fetchall()
+        except sqlite3.OperationalError:
+            # Database without an archive block index
+            return []
+
+    def _archived_rows(
+        self,
+        metric_table: str,
+        filter: QueryFilter,
+        conditions: List[Tuple[str, str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Rows of the candidate archive blocks that match conditions."""
+        return [
+            row
+            for block_id, _ in self._archive_blocks(metric_table, filter)
+            for row in self._archive_block(block_id)
+            if all(_OPERATORS[op](row[column], value) for column, op, value in conditions)
+        ]
+
+    def _archive_block(self, block_id: int) -> List[Dict[str, Any]]:
+        """Rows of an archive block, from the decompressed-block cache if present."""
+        with self._cache_lock:
+            rows = self._block_cache.get(block_id)
+            if rows is not None:
+                self._block_cache.move_to_end(block_id)
+                self._block_stats["hits"] += 1
+                return rows
+            self._block_stats["misses"] += 1
+
+        row = self._conn.execute(
+            "SELECT compressed_data FROM metrics_archive WHERE id = ?", (block_id,)
+        ).fetchone()
+        rows = decode_archive_block(row[0]) if row else []
+
+        # Block ids are never reused, so cached blocks cannot go stale
+        with self._cache_lock:
+            self._block_cache[block_id] = rows
+            while len(self._block_cache) > self._block_cache_size:
+                self._block_cache.popitem(last=False)
+
+        return rows
+
     # ========================================================================
     # Resource Management
     # ========================================================================
@@ -12,7 +12,7 @@ from datetime import datetime, UTC
 import psutil
 import pytest
 
-from moai_flow.memory import SwarmDB
+from moai_flow.memory import AsyncSwarmDB, GroupCommitConfig
 from moai_flow.core.swarm_coordinator import SwarmCoordinator, AgentState
 
 
@@ -79,10 +79,12 @@ class LoadTestMetrics:
 class LoadTestRunner:
     """Execute load tests with configurable concurrency."""
 
-    def __init__(self, num_agents: int = 100):
+    def __init__(self, num_agents: int = 100, group_commit: bool = True):
         self.num_agents = num_agents
         self.metrics = LoadTestMetrics()
-        self.db = SwarmDB()
+        # Concurrent inserts are coalesced on the facade's writer thread;
+        # group commit additionally batches them into shared transactions
+        self.db = AsyncSwarmDB(group_commit=GroupCommitConfig(enabled=group_commit))
 
     async def simulate_agent_lifecycle(self, agent_id: str) -> float:
         """Simulate complete agent lifecycle: spawn → task → complete."""
@@ -90,11 +92,11 @@ class LoadTestRunner:
 
         try:
             # Spawn agent
-            await asyncio.to_thread(
-                self.db.insert_event,
+            await self.db.insert_event(
                 {
                     "event_type": "agent_spawned",
                     "agent_id": agent_id,
+                    "agent_type": "load_test_agent",
                     "timestamp": datetime.now(UTC).isoformat(),
                     "parent_id": "load_test_coordinator",
                     "capabilities": ["test_capability"]
@@ -104,22 +106,22 @@ class LoadTestRunner:
             # Agent executes task
             await asyncio.sleep(0.001)  # Simulate minimal work
 
-            await asyncio.to_thread(
-                self.db.insert_event,
+            await self.db.insert_event(
                 {
                     "event_type": "task_completed",
                     "agent_id": agent_id,
+                    "agent_type": "load_test_agent",
                     "timestamp": datetime.now(UTC).isoformat(),
                     "result": "success"
                 }
             )
 
             # Agent completes
-            await asyncio.to_thread(
-                self.db.insert_event,
+            await self.db.insert_event(
                 {
                     "event_type": "agent_completed",
                     "agent_id": agent_id,
+                    "agent_type": "load_test_agent",
                     "timestamp": datetime.now(UTC).isoformat()
                 }
             )
@@ -148,6 +150,9 @@ class LoadTestRunner:
         # Execute concurrently
         await asyncio.gather(*tasks)
 
+        # Events are only durable once the writer and group-commit queue drain
+        await self.db.flush()
+
         self.metrics.end_time = datetime.now(UTC)
         monitor_task.cancel()
 
@@ -260,7 +265,7 @@ async def test_load_200_agents_stress():
 @pytest.mark.asyncio
 async def test_database_query_performance_under_load():
     """Test database query performance with concurrent operations."""
-    db = SwarmDB()
+    db = AsyncSwarmDB()
     metrics = LoadTestMetrics()
     metrics.start_time = datetime.now(UTC)
 
@@ -268,10 +273,7 @@ async def test_database_query_performance_under_load():
         start = time.perf_counter()
         try:
             # Test query performance
-            await asyncio.to_thread(
-                db.get_active_agents,
-                agent_type="load_test_agent"
-            )
+            await db.get_active_agents()
             metrics.record_response(time.perf_counter() - start)
         except Exception as e:
             metrics.record_error(str(e))
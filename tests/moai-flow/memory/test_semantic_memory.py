@@ -6,6 +6,7 @@ Tests:
 - Knowledge storage and retrieval
 - Confidence scoring and updates
 - Full-text search
+- Hashed-vector similarity search
 - Code pattern management
 - Knowledge pruning
 - Statistics and metrics
@@ -23,8 +24,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from moai_flow.memory.swarm_db import SwarmDB
 from moai_flow.memory.semantic_memory import (
     SemanticMemory,
+    SemanticCacheConfig,
     KnowledgeCategory
 )
+from moai_flow.memory.vector_index import VectorIndexConfig
 
 
 @pytest.fixture
@@ -311,6 +314,202 @@ class TestSearch:
 
         assert len(results) <= 5
 
+    def test_search_ranked_by_relevance(self, memory):
+        """Test BM25 ranking prefers topic and tag matches"""
+        memory.store_knowledge(
+            topic="caching",
+            knowledge={"note": "Use Redis for caching hot keys"},
+            tags=["caching", "redis"],
+            confidence=0.5
+        )
+        memory.store_knowledge(
+            topic="deployment",
+            knowledge={"note": "Disable caching in staging"},
+            confidence=0.9
+        )
+
+        results = memory.search_knowledge("caching")
+
+        assert [r["topic"] for r in results] == ["caching", "deployment"]
+        assert results[0]["score"] > results[1]["score"]
+        assert "[caching]" in results[0]["snippet"].lower()
+
+    def test_search_pagination(self, memory):
+        """Test offset-based pagination over ranked results"""
+        for i in range(10):
+            memory.store_knowledge(
+                topic=f"page_{i}",
+                knowledge={"text": "paginated entry"}
+            )
+
+        first = memory.search_knowledge("paginated", limit=4)
+        second = memory.search_knowledge("paginated", limit=4, offset=4)
+        third = memory.search_knowledge("paginated", limit=4, offset=8)
+
+        ids = [r["id"] for r in first + second + third]
+        assert len(ids) == 10
+        assert len(set(ids)) == 10
+
+    def test_search_index_follows_updates(self, memory):
+        """Test triggers keep the FTS index in sync with writes"""
+        knowledge_id = memory.store_knowledge(
+            topic="queue",
+            knowledge={"broker": "rabbitmq"}
+        )
+        memory.update_knowledge(knowledge_id, knowledge={"broker": "kafka"})
+
+        assert memory.search_knowledge("rabbitmq") == []
+        assert len(memory.search_knowledge("kafka")) == 1
+
+        memory.db.vacuum()
+        assert memory.search_knowledge("kafka")[0]["id"] == knowledge_id
+
+    def test_optimize_rebuilds_search_index(self, memory):
+        """Test optimize() (run by vacuum) rebuilds the FTS index"""
+        memory.store_knowledge(topic="broker", knowledge={"name": "kafka"})
+        clear_index = (
+            "INSERT INTO semantic_knowledge_fts(semantic_knowledge_fts) "
+            "VALUES ('delete-all')"
+        )
+        with memory.db.transaction() as conn:
+            conn.execute(clear_index)
+        assert memory.search_knowledge("kafka") == []
+
+        memory.optimize()
+        assert len(memory.search_knowledge("kafka")) == 1
+
+        with memory.db.transaction() as conn:
+            conn.execute(clear_index)
+        memory.db.vacuum()
+        assert len(memory.search_knowledge("kafka")) == 1
+
+    def test_search_query_syntax_is_escaped(self, memory):
+        """Test FTS operators in user input are treated as text"""
+        memory.store_knowledge(topic="ops", knowledge={"note": "NOT a problem"})
+
+        results = memory.search_knowledge('ops" AND (NOT')
+
+        assert len(results) == 1
+
+    def test_search_like_fallback(self, memory):
+        """Test LIKE search is used when FTS5 is unavailable"""
+        memory.store_knowledge(
+            topic="fallback_topic",
+            knowledge={"text": "substring match"}
+        )
+        memory.fts_enabled = False
+
+        results = memory.search_knowledge("string mat")
+
+        assert len(results) == 1
+        assert results[0]["score"] is None
+        assert results[0]["snippet"] is None
+
+
+class TestVectorSearch:
+    """Test hashed-vector similarity search"""
+
+    def test_vector_search_matches_reworded_topic(self, memory):
+        """Test vector search bridges word order, case and snake_case"""
+        memory.store_knowledge(
+            topic="handle_api_errors",
+            knowledge={"code": "@handle_api_errors decorator"}
+        )
+        memory.store_knowledge(
+            topic="jwt_authentication",
+            knowledge={"decision": "Use JWT with refresh tokens"}
+        )
+
+        results = memory.search_knowledge("API error handling", mode="vector")
+        assert results[0]["topic"] == "handle_api_errors"
+        assert 0 < results[0]["score"] <= 1.0
+        assert results[0]["snippet"] is None
+
+    def test_vector_search_filters(self, memory):
+        """Test confidence and category filters still fill the page"""
+        for i in range(6):
+            memory.store_knowledge(
+                topic=f"retry_policy_{i}",
+                knowledge={"text": "retry with exponential backoff"},
+                confidence=0.9 if i % 2 else 0.1,
+                category=KnowledgeCategory.ERROR_RESOLUTION
+            )
+
+        results = memory.search_knowledge(
+            "retry backoff", mode="vector", limit=3, min_confidence=0.5,
+            category=KnowledgeCategory.ERROR_RESOLUTION
+        )
+
+        assert len(results) == 3
+        assert all(r["confidence"] == 0.9 for r in results)
+
+    def test_vector_index_follows_updates_and_pruning(self, memory):
+        """Test updates re-vectorize and pruned entries disappear"""
+        knowledge_id = memory.store_knowledge(topic="queue", knowledge={"broker": "rabbitmq"})
+        memory.update_knowledge(knowledge_id, knowledge={"broker": "kafka"})
+
+        assert memory.search_knowledge("rabbitmq", mode="vector") == []
+        assert memory.search_knowledge("kafka", mode="vector")[0]["id"] == knowledge_id
+
+        memory.update_confidence(knowledge_id, 0.1)
+        conn = memory.db._get_connection()
+        conn.execute(
+            "UPDATE semantic_knowledge SET created_at = ? WHERE id = ?",
+            ((datetime.now() - timedelta(days=60)).isoformat(), knowledge_id)
+        )
+        conn.commit()
+        memory.prune_low_confidence()
+
+        assert memory.search_knowledge("kafka", mode="vector", min_confidence=0.0) == []
+
+    def test_search_patterns(self, memory):
+        """Test patterns are vectorized on store and replaced by name"""
+        memory.store_pattern(
+            pattern_name="api_error_decorator",
+            pattern_data={"description": "Decorator for consistent API error handling"}
+        )
+        memory.store_pattern(
+            pattern_name="db_session_scope",
+            pattern_data={"description": "Context manager around a database session"}
+        )
+        memory.store_pattern(
+            pattern_name="api_error_decorator",
+            pattern_data={"description": "Wrap endpoints to translate exceptions"}
+        )
+
+        results = memory.search_patterns("error handling for endpoints")
+
+        assert results[0]["pattern_name"] == "api_error_decorator"
+        assert [r["pattern_name"] for r in results].count("api_error_decorator") == 1
+
+    def test_vectors_persist_and_backfill(self, temp_db):
+        """Test reopening reuses stored vectors and vectorizes older rows"""
+        memory = SemanticMemory(temp_db, project_id="vectors")
+        memory.store_knowledge(topic="connection_pooling", knowledge={"size": "ten"})
+        memory.close()
+
+        # Rows written without vectors (e.g. before vector search existed)
+        temp_db._get_connection().execute("DELETE FROM semantic_vectors")
+        temp_db._get_connection().commit()
+
+        reopened = SemanticMemory(temp_db, project_id="vectors")
+        results = reopened.search_knowledge("pool connections", mode="vector")
+
+        assert [r["topic"] for r in results] == ["connection_pooling"]
+        assert reopened.get_statistics()["vectors"]["knowledge"]["vectors"] == 1
+        reopened.close()
+
+    def test_vector_search_disabled(self, temp_db):
+        """Test vector mode raises when disabled"""
+        memory = SemanticMemory(
+            temp_db, project_id="no-vectors",
+            vector_config=VectorIndexConfig(enabled=False)
+        )
+        memory.store_knowledge(topic="topic", knowledge={"text": "value"})
+
+        with pytest.raises(ValueError):
+            memory.search_knowledge("value", mode="vector")
+
 
 class TestListKnowledge:
     """Test listing knowledge"""
@@ -372,6 +571,20 @@ class TestCodePatterns:
 
         assert isinstance(pattern_id, str)
 
+    def test_store_pattern_updates_in_place(self, memory):
+        """Test re-storing a pattern keeps its ID and usage count"""
+        pattern_id = memory.store_pattern(pattern_name="retry", pattern_data={"v": 1})
+        memory.get_pattern("retry")
+        memory.flush_access_counts()
+
+        assert memory.store_pattern(pattern_name="retry", pattern_data={"v": 2}) == pattern_id
+        assert memory.get_pattern("retry")["pattern_data"] == {"v": 2}
+        row = memory.db._get_connection().execute(
+            "SELECT id, usage_count FROM code_patterns WHERE pattern_name = 'retry'"
+        ).fetchone()
+        assert row["id"] == pattern_id
+        assert row["usage_count"] == 1
+
     def test_get_pattern(self, memory):
         """Test retrieving pattern"""
         memory.store_pattern(
@@ -553,6 +766,164 @@ class TestStatistics:
         assert result is not None
 
 
+class TestLookupCache:
+    """Test read-through cache and batched access tracking"""
+
+    def test_repeated_retrieve_hits_cache(self, memory):
+        """Test repeated lookups are served from cache"""
+        memory.store_knowledge(topic="cached", knowledge={"v": 1})
+
+        for _ in range(5):
+            assert memory.retrieve_knowledge("cached")["knowledge"] == {"v": 1}
+
+        cache = memory.get_statistics()["cache"]
+        assert cache["misses"] == 1
+        assert cache["hits"] == 4
+
+    def test_cached_result_is_isolated(self, memory):
+        """Test callers cannot mutate cached entries"""
+        memory.store_knowledge(topic="cached", knowledge={"v": 1})
+
+        first = memory.retrieve_knowledge("cached")
+        first["knowledge"]["v"] = 99
+
+        assert memory.retrieve_knowledge("cached")["knowledge"] == {"v": 1}
+
+    def test_writes_invalidate_cache(self, memory):
+        """Test updates are visible immediately"""
+        knowledge_id = memory.store_knowledge(topic="cached", knowledge={"v": 1})
+        memory.retrieve_knowledge("cached")
+
+        memory.update_knowledge(knowledge_id, knowledge={"v": 2})
+        assert memory.retrieve_knowledge("cached")["knowledge"] == {"v": 2}
+
+        memory.update_confidence(knowledge_id, 0.95)
+        assert memory.retrieve_knowledge("cached")["confidence"] == 0.95
+
+    def test_pattern_cache_invalidated_on_store(self, memory):
+        """Test list_patterns sees newly stored patterns"""
+        memory.store_pattern(pattern_name="p1", pattern_data={"code": "a"})
+        assert len(memory.list_patterns()) == 1
+
+        memory.store_pattern(pattern_name="p2", pattern_data={"code": "b"})
+        assert len(memory.list_patterns()) == 2
+
+    def test_lru_eviction(self, temp_db):
+        """Test least recently used entries are evicted"""
+        memory = SemanticMemory(
+            temp_db,
+            project_id="test-project",
+            cache_config=SemanticCacheConfig(max_entries=2)
+        )
+        for topic in ("a", "b", "c"):
+            memory.store_knowledge(topic=topic, knowledge={})
+        for topic in ("a", "b", "c"):
+            memory.retrieve_knowledge(topic)
+
+        cache = memory.get_statistics()["cache"]
+        assert cache["entries"] == 2
+        assert cache["evictions"] == 1
+
+    def test_ttl_expiry(self, temp_db):
+        """Test entries older than the TTL are reloaded"""
+        memory = SemanticMemory(
+            temp_db,
+            project_id="test-project",
+            cache_config=SemanticCacheConfig(ttl_seconds=0.0)
+        )
+        memory.store_knowledge(topic="short", knowledge={})
+        memory.retrieve_knowledge("short")
+        memory.retrieve_knowledge("short")
+
+        cache = memory.get_statistics()["cache"]
+        assert cache["hits"] == 0
+        assert cache["expirations"] == 1
+
+    def test_access_counts_written_back_in_batches(self, temp_db):
+        """Test access counts are buffered and flushed together"""
+        memory = SemanticMemory(
+            temp_db,
+            project_id="test-project",
+            cache_config=SemanticCacheConfig(access_flush_interval_seconds=3600)
+        )
+        memory.store_knowledge(topic="tracked", knowledge={})
+        memory.store_pattern(pattern_name="used", pattern_data={})
+        for _ in range(3):
+            memory.retrieve_knowledge("tracked")
+            memory.get_pattern("used")
+
+        conn = temp_db._get_connection()
+        row = conn.execute("SELECT access_count FROM semantic_knowledge").fetchone()
+        assert row["access_count"] == 0
+
+        assert memory.flush_access_counts() == 2
+        row = conn.execute("SELECT access_count FROM semantic_knowledge").fetchone()
+        assert row["access_count"] == 3
+        row = conn.execute("SELECT usage_count FROM code_patterns").fetchone()
+        assert row["usage_count"] == 3
+
+    def test_flush_refreshes_cached_counts(self, temp_db):
+        """Test cached lookups return the flushed access count"""
+        memory = SemanticMemory(
+            temp_db,
+            project_id="test-project",
+            cache_config=SemanticCacheConfig(access_flush_interval_seconds=3600)
+        )
+        memory.store_knowledge(topic="tracked", knowledge={})
+        memory.retrieve_knowledge("tracked")
+        memory.retrieve_knowledge("tracked")
+
+        memory.flush_access_counts()
+
+        assert memory.retrieve_knowledge("tracked")["access_count"] == 2
+
+    def test_failed_flush_keeps_counts(self, temp_db, monkeypatch):
+        """Test buffered counts are kept when the write-back fails"""
+        memory = SemanticMemory(
+            temp_db,
+            project_id="test-project",
+            cache_config=SemanticCacheConfig(access_flush_interval_seconds=3600)
+        )
+        memory.store_knowledge(topic="tracked", knowledge={})
+        memory.retrieve_knowledge("tracked")
+
+        def failing_transaction():
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(temp_db, "transaction", failing_transaction)
+        with pytest.raises(RuntimeError):
+            memory.flush_access_counts()
+        monkeypatch.undo()
+        memory.retrieve_knowledge("tracked")
+
+        assert memory.flush_access_counts() == 1
+        row = temp_db._get_connection().execute(
+            "SELECT access_count FROM semantic_knowledge"
+        ).fetchone()
+        assert row["access_count"] == 2
+
+    def test_access_counts_survive_close_and_reopen(self, tmp_path):
+        """Test buffered counts are flushed when the database closes"""
+        db_path = tmp_path / "swarm.db"
+        cache_config = SemanticCacheConfig(access_flush_interval_seconds=3600)
+
+        db = SwarmDB(db_path=db_path)
+        memory = SemanticMemory(db, project_id="test-project", cache_config=cache_config)
+        memory.store_knowledge(topic="tracked", knowledge={})
+        memory.store_pattern(pattern_name="used", pattern_data={})
+        for _ in range(2):
+            memory.retrieve_knowledge("tracked")
+            memory.get_pattern("used")
+        db.close()
+
+        with SwarmDB(db_path=db_path) as reopened:
+            conn = reopened._get_connection()
+            row = conn.execute("SELECT access_count FROM semantic_knowledge").fetchone()
+            assert row["access_count"] == 2
+            row = conn.execute("SELECT usage_count FROM code_patterns").fetchone()
+            assert row["usage_count"] == 2
+
+
 class TestProjectIsolation:
     """Test project-scoped isolation"""
 
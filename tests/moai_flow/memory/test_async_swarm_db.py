@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Tests for AsyncSwarmDB (asyncio facade over the memory layer).
+
+Covers:
+- Awaitable SwarmDB reads and writes
+- Coalescing of concurrent writes into shared commits
+- Per-call failure isolation inside a batch
+- Wrapped SemanticMemory and ContextHints
+- Durability of group-committed writes and read/write routing
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from moai_flow.memory.async_swarm_db import AsyncMemoryConfig, AsyncSwarmDB
+from moai_flow.memory.context_hints import ContextHints
+from moai_flow.memory.semantic_memory import SemanticMemory
+from moai_flow.memory.storage_engine import GroupCommitConfig
+from moai_flow.memory.swarm_db import SwarmDB
+
+
+def _event(i: int) -> dict:
+    return {
+        "event_type": "spawn",
+        "agent_id": f"agent-{i}",
+        "agent_type": "expert-backend",
+        "timestamp": "2025-01-01T00:00:00",
+    }
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    swarm_db = SwarmDB(db_path=tmp_path / "async.db")
+    yield swarm_db
+    swarm_db.close()
+
+
+class TestAsyncSwarmDB:
+    """Test suite for AsyncSwarmDB."""
+
+    def test_write_then_read(self, db):
+        """Awaited writes are visible to awaited reads."""
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                event_id = await adb.insert_event(_event(1))
+                events = await adb.get_events(agent_id="agent-1")
+                return event_id, events
+
+        event_id, events = asyncio.run(scenario())
+        assert [e["event_id"] for e in events] == [event_id]
+
+    def test_concurrent_writes_are_coalesced(self, db):
+        """Writes issued together share commits."""
+        async def scenario():
+            async with AsyncSwarmDB(db, AsyncMemoryConfig(max_batch_size=64)) as adb:
+                await asyncio.gather(*(adb.insert_event(_event(i)) for i in range(200)))
+                return adb.get_stats(), len(await adb.get_events(limit=1000))
+
+        stats, count = asyncio.run(scenario())
+        assert count == 200
+        assert stats["writes"] == 200
+        assert stats["batches_committed"] < 200
+        assert stats["largest_batch"] <= 64
+
+    def test_failed_write_only_fails_its_own_call(self, db):
+        """A raising call rolls back to its savepoint; the rest of the batch commits."""
+        def broken_write():
+            with db.transaction():
+                db.store_memory("s", "context", "k", "v")
+                raise ValueError("boom")
+
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                return await asyncio.gather(
+                    adb.insert_event(_event(1)),
+                    adb.write(broken_write),
+                    adb.insert_event(_event(2)),
+                    return_exceptions=True,
+                )
+
+        results = asyncio.run(scenario())
+        assert isinstance(results[1], ValueError)
+        assert len(db.get_events()) == 2
+        assert db.get_memory("s", "context", "k") is None
+
+    def test_partial_write_of_failed_call_is_discarded(self, db):
+        """A call that raises without its own transaction() commits nothing."""
+        def half_write():
+            conn = db._get_connection()
+            conn.execute(
+                "INSERT INTO session_memory (session_id, memory_type, key, value, timestamp) "
+                "VALUES ('s', 'context', 'half', '1', '2025-01-01T00:00:00')"
+            )
+            raise ValueError("boom")
+
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                return await asyncio.gather(
+                    adb.write(half_write),
+                    adb.insert_event(_event(1)),
+                    return_exceptions=True,
+                )
+
+        results = asyncio.run(scenario())
+        assert isinstance(results[0], ValueError)
+        assert len(db.get_events()) == 1
+        assert db.get_memory("s", "context", "half") is None
+
+    def test_failed_flush_fails_batch_and_keeps_writer(self, db, monkeypatch):
+        """A group-commit flush error fails the batch; later writes still run."""
+        flush = db.engine.flush
+        calls = []
+
+        def failing_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("writer gone")
+            return flush()
+
+        monkeypatch.setattr(db.engine, "flush", failing_once)
+
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                first = await asyncio.gather(adb.insert_event(_event(1)), return_exceptions=True)
+                second = await adb.insert_event(_event(2))
+                return first, second
+
+        first, second = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+        assert isinstance(first[0], RuntimeError)
+        assert second is not None
+
+    def test_in_memory_database(self):
+        """:memory: databases are served entirely by the writer thread."""
+        async def scenario():
+            async with AsyncSwarmDB(db_path=":memory:") as adb:
+                await adb.insert_event(_event(1))
+                return len(await adb.get_events()), adb.get_stats()
+
+        count, stats = asyncio.run(scenario())
+        assert count == 1
+        assert stats["reads"] == 0
+
+    def test_wrapped_components(self, db):
+        """SemanticMemory and ContextHints calls become awaitables."""
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                semantic = adb.wrap(SemanticMemory(db, "project"))
+                hints = adb.wrap(ContextHints(db, "session-1"))
+                await semantic.store_knowledge(
+                    "api", {"pattern": "REST"}, category="architecture"
+                )
+                await hints.set_preference("verbose_output", True)
+                return (
+                    await semantic.retrieve_knowledge("api"),
+                    await hints.get_preference("verbose_output"),
+                )
+
+        knowledge, verbose = asyncio.run(scenario())
+        assert knowledge["knowledge"] == {"pattern": "REST"}
+        assert verbose is True
+
+    def test_group_committed_write_is_durable_when_awaited(self, tmp_path: Path):
+        """Awaiting a write waits for the group-commit writer too."""
+        path = tmp_path / "group.db"
+        db = SwarmDB(
+            db_path=path,
+            group_commit=GroupCommitConfig(enabled=True, flush_interval_ms=10_000),
+        )
+
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                await adb.insert_event(_event(1))
+                other = SwarmDB(db_path=path)
+                try:
+                    conn = other.engine.get_read_connection()
+                    return conn.execute("SELECT COUNT(*) FROM agent_events").fetchone()[0]
+                finally:
+                    other.close()
+
+        assert asyncio.run(scenario()) == 1
+        db.close()
+
+    def test_access_tracking_reads_run_on_writer(self, db):
+        """Methods that write access counts are not sent to the reader pool."""
+        async def scenario():
+            async with AsyncSwarmDB(db) as adb:
+                semantic = adb.wrap(SemanticMemory(db, "project"))
+                await semantic.store_knowledge("api", {"pattern": "REST"})
+                reads = adb.get_stats()["reads"]
+                await semantic.retrieve_knowledge("api")
+                await semantic.get_statistics()
+                after_writes = adb.get_stats()["reads"]
+                await semantic.list_knowledge()
+                return reads, after_writes, adb.get_stats()["reads"]
+
+        before, after_writes, after_read = asyncio.run(scenario())
+        assert after_writes == before
+        assert after_read == before + 1
+
+    def test_closed_facade_rejects_calls(self, db):
+        """Calls after close() raise instead of hanging."""
+        async def scenario():
+            adb = AsyncSwarmDB(db)
+            await adb.close()
+            await adb.insert_event(_event(1))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(scenario())
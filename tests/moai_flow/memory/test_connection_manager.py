@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Tests for ConnectionManager (bounded WAL connection pool).
+
+Covers:
+- WAL mode and pragmas on read-write connections
+- Read-only query connections
+- Reaping of connections owned by exited threads
+- Pool size limits
+- Shared connection for in-memory databases
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from moai_flow.memory.connection_manager import ConnectionConfig, ConnectionManager
+from moai_flow.memory.swarm_db import SwarmDB
+
+
+@pytest.fixture
+def manager(tmp_path: Path):
+    """Connection manager over a temporary database file."""
+    mgr = ConnectionManager(tmp_path / "pool.db")
+    yield mgr
+    mgr.close_all()
+
+
+def _run_in_thread(target) -> None:
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def _run_concurrently(target, count: int) -> None:
+    """Run target in `count` threads that are all alive at the same time."""
+    barrier = threading.Barrier(count)
+
+    def worker():
+        target()
+        barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConnectionManager:
+    """Test suite for ConnectionManager."""
+
+    def test_writer_uses_wal(self, manager: ConnectionManager):
+        """Read-write connections are opened in WAL mode."""
+        conn = manager.get_connection()
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_connection_is_thread_affine(self, manager: ConnectionManager):
+        """The same thread gets the same connection back."""
+        assert manager.get_connection() is manager.get_connection()
+        assert manager.get_read_connection() is manager.get_read_connection()
+
+    def test_read_connection_rejects_writes(self, manager: ConnectionManager):
+        """Query connections cannot modify the database."""
+        writer = manager.get_connection()
+        writer.execute("CREATE TABLE t (x INTEGER)")
+        writer.commit()
+
+        reader = manager.get_read_connection()
+        assert reader is not writer
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("INSERT INTO t VALUES (1)")
+
+    def test_reader_sees_committed_writes(self, manager: ConnectionManager):
+        """Readers observe data committed by the writer."""
+        writer = manager.get_connection()
+        writer.execute("CREATE TABLE t (x INTEGER)")
+        writer.execute("INSERT INTO t VALUES (42)")
+        writer.commit()
+
+        reader = manager.get_read_connection()
+        assert reader.execute("SELECT x FROM t").fetchone()[0] == 42
+
+    def test_dead_thread_connections_reaped(self, manager: ConnectionManager):
+        """Connections left behind by exited threads are closed."""
+        _run_concurrently(manager.get_connection, 5)
+
+        assert manager.get_stats()["write_connections"] == 5
+        assert manager.reap_dead_connections() == 5
+        assert manager.get_stats()["write_connections"] == 0
+
+    def test_reader_threads_open_no_writers(self, manager: ConnectionManager):
+        """Reader threads get only a read-only connection."""
+        _run_concurrently(manager.get_read_connection, 3)
+
+        stats = manager.get_stats()
+        assert stats["read_connections"] == 3
+        assert stats["write_connections"] == 0
+
+    def test_database_created_at_startup(self, tmp_path: Path):
+        """The file exists in WAL mode before any reader opens it."""
+        path = tmp_path / "fresh.db"
+        mgr = ConnectionManager(path)
+
+        assert path.exists()
+        reader = mgr.get_read_connection()
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        assert mgr.get_stats()["write_connections"] == 0
+        mgr.close_all()
+
+    def test_pool_is_bounded(self, tmp_path: Path):
+        """A full pool reaps dead owners instead of growing."""
+        mgr = ConnectionManager(
+            tmp_path / "bounded.db",
+            ConnectionConfig(max_connections=2)
+        )
+        for _ in range(5):
+            _run_concurrently(mgr.get_connection, 2)
+
+        # Exited owners are reaped or their slots recycled, never exceeded
+        assert mgr.get_stats()["write_connections"] <= 2
+        mgr.close_all()
+
+    def test_pool_exhausted_raises(self, tmp_path: Path):
+        """Live owners holding every slot time out the caller."""
+        mgr = ConnectionManager(
+            tmp_path / "full.db",
+            ConnectionConfig(max_connections=1, acquire_timeout_seconds=0.1)
+        )
+        mgr.get_connection()
+
+        errors = []
+
+        def worker():
+            try:
+                mgr.get_connection()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+        _run_in_thread(worker)
+        assert len(errors) == 1
+        mgr.close_all()
+
+    def test_release_thread_connections(self, manager: ConnectionManager):
+        """Explicit release frees the calling thread's slots."""
+        manager.get_read_connection()
+        manager.release_thread_connections()
+
+        stats = manager.get_stats()
+        assert stats["write_connections"] == 0
+        assert stats["read_connections"] == 0
+
+    def test_memory_database_shared(self):
+        """In-memory databases share one connection across threads."""
+        mgr = ConnectionManager(":memory:")
+        conn = mgr.get_connection()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+
+        seen = []
+        _run_in_thread(lambda: seen.append(mgr.get_read_connection()))
+
+        assert seen[0] is conn
+        mgr.close_all()
+
+
+class TestSwarmDBConnections:
+    """SwarmDB integration with the connection manager."""
+
+    def test_accepts_string_path(self, tmp_path: Path):
+        """String paths are accepted."""
+        db = SwarmDB(db_path=str(tmp_path / "str.db"))
+        assert isinstance(db.db_path, Path)
+        db.close()
+
+    def test_memory_database_visible_across_threads(self):
+        """":memory:" databases keep one schema for all threads."""
+        db = SwarmDB(db_path=":memory:")
+        db.register_agent("agent-1", "expert-backend")
+
+        found = []
+        _run_in_thread(lambda: found.append(db.get_agent("agent-1")))
+
+        assert found[0]["agent_type"] == "expert-backend"
+        db.close()
+
+    def test_queries_use_read_connections(self, tmp_path: Path):
+        """Query methods are served from read-only connections."""
+        db = SwarmDB(db_path=tmp_path / "rw.db")
+        db.register_agent("agent-1", "expert-backend")
+
+        assert len(db.get_active_agents()) == 1
+        assert db.get_connection_stats()["read_connections"] == 1
+        db.close()
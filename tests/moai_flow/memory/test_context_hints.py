@@ -695,3 +695,107 @@ class TestEdgeCases:
         context_hints.set_preference("nullable", None)
 
         assert context_hints.get_preference("nullable") is None
+
+
+# Task history and tool usage tables (moai_flow.memory.context_hints implementation)
+from moai_flow.memory.context_hints import (  # noqa: E402
+    MAX_TASK_HISTORY,
+    ContextHints as SessionContextHints,
+)
+
+
+@pytest.fixture
+def session_hints(tmp_path):
+    """Create ContextHints backed by a file database."""
+    db = SwarmDB(db_path=tmp_path / "hints.db")
+    yield SessionContextHints(db, session_id="session-1")
+    db.close()
+
+
+class TestTaskHistoryTables:
+    """Test suite for task_history and tool_usage tables."""
+
+    def test_task_history_rolling_window(self, session_hints):
+        """Only the last MAX_TASK_HISTORY tasks are kept."""
+        for i in range(MAX_TASK_HISTORY + 20):
+            session_hints.record_task_pattern("implementation", {"index": i})
+
+        patterns = session_hints.get_task_patterns(limit=MAX_TASK_HISTORY + 50)
+        count = session_hints.db._get_connection().execute(
+            "SELECT COUNT(*) FROM task_history"
+        ).fetchone()[0]
+
+        assert count == MAX_TASK_HISTORY
+        assert len(patterns) == MAX_TASK_HISTORY
+        assert patterns[0]["index"] == 20
+        assert patterns[-1]["index"] == MAX_TASK_HISTORY + 19
+
+    def test_recording_does_not_grow_session_memory(self, session_hints):
+        """Task and tool records no longer write session_memory rows."""
+        conn = session_hints.db._get_connection()
+        before = conn.execute("SELECT COUNT(*) FROM session_memory").fetchone()[0]
+
+        for _ in range(10):
+            session_hints.record_task_pattern("testing", {"tools_used": ["pytest"]})
+
+        after = conn.execute("SELECT COUNT(*) FROM session_memory").fetchone()[0]
+        assert after == before
+
+    def test_tool_usage_counters(self, session_hints):
+        """Tool usage is counted with upserts."""
+        for tool in ["pytest", "ruff", "pytest", "pytest", "ruff", "mypy"]:
+            session_hints.record_tool_usage(tool)
+
+        assert session_hints.get_tool_preferences() == {"pytest": 3, "ruff": 2, "mypy": 1}
+        assert session_hints.get_most_used_tools(2) == [("pytest", 3), ("ruff", 2)]
+
+    def test_analyze_workflow_patterns(self, session_hints):
+        """Analysis is aggregated from the task_history table."""
+        session_hints.record_task_pattern(
+            "planning", {"success": True, "agents_used": ["manager-spec"]}
+        )
+        session_hints.record_task_pattern(
+            "implementation",
+            {"success": False, "duration_ms": 100, "agents_used": ["expert-backend"]},
+        )
+        session_hints.record_task_pattern(
+            "implementation",
+            {"success": True, "duration_ms": 300, "agents_used": ["expert-backend"]},
+        )
+
+        analysis = session_hints.analyze_workflow_patterns()
+
+        assert analysis["total_tasks"] == 3
+        assert analysis["success_rate"] == {"planning": 1.0, "implementation": 0.5}
+        assert analysis["average_duration"] == {"implementation": 200.0}
+        assert analysis["common_sequences"][0] == (("planning", "implementation"), 1)
+        assert analysis["preferred_agents"][0] == ("expert-backend", 2)
+
+    def test_suggest_next_action_uses_last_task(self, session_hints):
+        """Suggestions are based on the most recent task."""
+        session_hints.record_task_pattern("planning", {"spec_id": "SPEC-007"})
+
+        assert session_hints.suggest_next_action() == "Run /moai:2-run SPEC-007 to start implementation"
+
+    def test_legacy_blobs_imported(self, tmp_path):
+        """History and tool stats stored as session_memory blobs are imported."""
+        db = SwarmDB(db_path=tmp_path / "legacy.db")
+        db.store_memory(
+            "session-1", "context_hint", "context_hints:session-1:task_history",
+            [{"task_type": "planning", "timestamp": "2025-01-01T00:00:00", "success": True}],
+        )
+        db.store_memory(
+            "session-1", "context_hint", "context_hints:session-1:tool_stats", {"pytest": 4}
+        )
+
+        hints = SessionContextHints(db, session_id="session-1")
+
+        assert hints.get_task_patterns()[0]["task_type"] == "planning"
+        assert hints.get_tool_preferences() == {"pytest": 4}
+        assert db.get_memory("session-1", "context_hint", "context_hints:session-1:tool_stats") is None
+        assert db.get_memory("session-1", "context_hint", "context_hints:session-1:task_history") is None
+        assert db.engine.get_schema_versions()["context_hints"] == "1.0.0"
+
+        SessionContextHints(db, session_id="session-1")
+        assert len(hints.get_task_patterns()) == 1
+        db.close()
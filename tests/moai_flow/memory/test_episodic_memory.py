@@ -957,3 +957,170 @@ class TestEdgeCases:
         event = episodic_memory.get_event(event_id)
 
         assert event["context"]["nullable"] is None
+
+
+# Context index tests (moai_flow.memory.episodic_memory implementation)
+from moai_flow.memory.episodic_memory import (  # noqa: E402
+    EpisodeIndexConfig,
+    EpisodicMemory as ProjectEpisodicMemory,
+)
+
+
+@pytest.fixture
+def project_memory(tmp_path):
+    """Create project-scoped EpisodicMemory backed by a file database."""
+    db = SwarmDB(db_path=tmp_path / "episodes.db")
+    yield ProjectEpisodicMemory(db, project_id="test-project")
+    db.close()
+
+
+class TestContextIndex:
+    """Test suite for the inverted context index."""
+
+    def test_finds_old_relevant_episode(self, project_memory):
+        """Relevant episodes beyond the most recent 100 are still found."""
+        target_id = project_memory.record_event(
+            "command", {}, context={"spec": "SPEC-042", "phase": "impl"}
+        )
+        for i in range(150):
+            project_memory.record_event(
+                "command", {}, context={"spec": f"SPEC-{i:03d}-x", "phase": "plan"}
+            )
+
+        similar = project_memory.find_similar_episodes(
+            {"spec": "SPEC-042", "phase": "impl"}, limit=1
+        )
+
+        assert similar[0]["id"] == target_id
+
+    def test_ranks_by_exact_similarity(self, project_memory):
+        """Candidates are ranked with the exact similarity score."""
+        partial_id = project_memory.record_event(
+            "command", {}, context={"a": 1, "b": 2, "c": 3, "d": 4}
+        )
+        full_id = project_memory.record_event(
+            "command", {}, context={"a": 1, "b": 2}
+        )
+
+        similar = project_memory.find_similar_episodes({"a": 1, "b": 2}, limit=2)
+
+        assert [e["id"] for e in similar] == [full_id, partial_id]
+
+    def test_event_type_filter(self, project_memory):
+        """event_type restricts candidates."""
+        project_memory.record_event("command", {}, context={"k": "v"})
+        decision_id = project_memory.record_decision(
+            "agent_selection", ["a", "b"], "a", "why", context={"k": "v"}
+        )
+
+        similar = project_memory.find_similar_episodes(
+            {"k": "v"}, limit=5, event_type="decision"
+        )
+
+        assert [e["id"] for e in similar] == [decision_id]
+
+    def test_pads_with_recent_episodes(self, project_memory):
+        """Without matches, the most recent episodes are returned."""
+        for i in range(3):
+            project_memory.record_event("command", {}, context={"n": i})
+
+        similar = project_memory.find_similar_episodes({"other": True}, limit=2)
+
+        assert len(similar) == 2
+
+    def test_postings_capped(self, tmp_path):
+        """Posting lists are trimmed to the configured size."""
+        db = SwarmDB(db_path=tmp_path / "capped.db")
+        memory = ProjectEpisodicMemory(
+            db,
+            project_id="test-project",
+            index_config=EpisodeIndexConfig(max_postings_per_token=10, prune_interval=5),
+        )
+        for _ in range(50):
+            memory.record_event("command", {}, context={"phase": "impl"})
+
+        count = db._get_connection().execute(
+            "SELECT COUNT(*) FROM episode_context_index"
+        ).fetchone()[0]
+
+        assert count <= 10 + 5
+        db.close()
+
+    def test_existing_episodes_backfilled(self, tmp_path):
+        """Episodes recorded before the index existed are indexed on open."""
+        db = SwarmDB(db_path=tmp_path / "legacy.db")
+        memory = ProjectEpisodicMemory(db, project_id="test-project")
+        old_id = memory.record_event("command", {}, context={"spec": "SPEC-001"})
+
+        conn = db._get_connection()
+        conn.execute("DROP TABLE episode_context_index")
+        conn.commit()
+
+        reopened = ProjectEpisodicMemory(db, project_id="test-project")
+        similar = reopened.find_similar_episodes({"spec": "SPEC-001"}, limit=1)
+
+        assert similar[0]["id"] == old_id
+        db.close()
+
+
+class TestOutcomeSummary:
+    """Test suite for SQL-side outcome statistics."""
+
+    def _decide(self, memory, outcome, duration_ms=None, decision_type="agent_selection"):
+        decision_id = memory.record_decision(decision_type, ["a", "b"], "a", "why")
+        metrics = {"duration_ms": duration_ms} if duration_ms is not None else {}
+        memory.record_outcome(decision_id, outcome, metrics)
+        return decision_id
+
+    def test_statistics_from_summary(self, project_memory):
+        """Statistics aggregate outcomes per decision type."""
+        self._decide(project_memory, "success", 1000)
+        self._decide(project_memory, "success", 3000)
+        self._decide(project_memory, "failure")
+        self._decide(project_memory, "success", 500, decision_type="other")
+
+        stats = project_memory.get_outcome_statistics("agent_selection")
+
+        assert stats["total_decisions"] == 3
+        assert stats["success_rate"] == pytest.approx(200 / 3)
+        assert stats["avg_duration_ms"] == 2000
+        assert stats["outcome_counts"] == {"success": 2, "failure": 1}
+
+    def test_replaced_outcome_counted_once(self, project_memory):
+        """Re-recording an outcome moves the decision between groups."""
+        decision_id = self._decide(project_memory, "failure", 100)
+        project_memory.record_outcome(decision_id, "success", {"duration_ms": 300})
+
+        stats = project_memory.get_outcome_statistics("agent_selection")
+
+        assert stats["outcome_counts"] == {"success": 1}
+        assert stats["avg_duration_ms"] == 300
+
+    def test_cleanup_updates_summary(self, project_memory):
+        """Deleting old episodes removes their outcomes."""
+        decision_id = self._decide(project_memory, "success", 100)
+        conn = project_memory.db._get_connection()
+        conn.execute(
+            "UPDATE episodes SET timestamp = '2000-01-01T00:00:00' WHERE id = ?",
+            (decision_id,),
+        )
+        conn.commit()
+
+        project_memory.cleanup_old_episodes(days=30)
+
+        assert project_memory.get_outcome_statistics("agent_selection")["total_decisions"] == 0
+
+    def test_existing_outcomes_backfilled(self, project_memory):
+        """Outcomes recorded before the summary table are summarized on open."""
+        self._decide(project_memory, "success", 1000)
+        self._decide(project_memory, "partial")
+
+        conn = project_memory.db._get_connection()
+        conn.execute("DROP TABLE episode_outcome_summary")
+        conn.commit()
+
+        reopened = ProjectEpisodicMemory(project_memory.db, project_id="test-project")
+        stats = reopened.get_outcome_statistics("agent_selection")
+
+        assert stats["outcome_counts"] == {"success": 1, "partial": 1}
+        assert stats["avg_duration_ms"] == 1000
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental binary session snapshots.
+
+Covers:
+- Checkpoint on first persist, deltas afterwards
+- Agent removal and event ordering across segments
+- Late events picked up by insertion order
+- No-op persists and the max_deltas re-checkpoint
+- Crash-truncated tails and the legacy JSON fallback
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from moai_flow.memory import SnapshotConfig, SwarmDB, load_session_state
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = SwarmDB(db_path=tmp_path / "swarm.db")
+    for i in range(3):
+        database.register_agent(f"agent-{i}", "expert-backend", "running", {"index": i})
+        database.insert_event({
+            "event_type": "spawn",
+            "agent_id": f"agent-{i}",
+            "agent_type": "expert-backend",
+            "timestamp": f"2025-01-01T00:00:0{i}",
+            "metadata": {"index": i},
+        })
+    yield database
+    database.close()
+
+
+class TestSessionSnapshot:
+    """Test suite for persist_session_state / load_session_state."""
+
+    def test_checkpoint_round_trip(self, db, tmp_path: Path):
+        """A checkpoint restores active agents and newest-first events."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+
+        state = load_session_state(snap)
+        assert state["session_id"] == "session-1"
+        assert state["deltas"] == 0
+        assert {a["agent_id"] for a in state["active_agents"]} == {
+            "agent-0", "agent-1", "agent-2"
+        }
+        assert [e["agent_id"] for e in state["recent_events"]] == [
+            "agent-2", "agent-1", "agent-0"
+        ]
+        assert state["recent_events"][0]["metadata"] == {"index": 2}
+
+    def test_delta_appends_only_changes(self, db, tmp_path: Path):
+        """A second persist appends removed agents and new events."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+        checkpoint_size = snap.stat().st_size
+
+        time.sleep(0.01)
+        db.update_agent_status("agent-0", "complete")
+        db.insert_event({
+            "event_type": "complete",
+            "agent_id": "agent-0",
+            "agent_type": "expert-backend",
+            "timestamp": "2025-01-01T00:00:09",
+        })
+        db.persist_session_state(path=snap)
+
+        state = load_session_state(snap)
+        assert snap.stat().st_size > checkpoint_size
+        assert state["session_id"] == "session-1"
+        assert state["deltas"] == 1
+        assert {a["agent_id"] for a in state["active_agents"]} == {"agent-1", "agent-2"}
+        assert state["recent_events"][0]["event_type"] == "complete"
+
+    def test_delta_includes_late_events(self, db, tmp_path: Path):
+        """Events inserted after a segment are kept even with older timestamps."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+
+        db.insert_event({
+            "event_type": "error",
+            "agent_id": "agent-1",
+            "agent_type": "expert-backend",
+            "timestamp": "2024-12-31T23:59:00",
+        })
+        db.persist_session_state(path=snap)
+
+        state = load_session_state(snap)
+        assert state["deltas"] == 1
+        assert state["recent_events"][-1]["event_type"] == "error"
+        assert len(state["recent_events"]) == 4
+
+    def test_unchanged_state_writes_nothing(self, db, tmp_path: Path):
+        """Persisting without changes leaves the file untouched."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+        size = snap.stat().st_size
+
+        db.persist_session_state(path=snap)
+
+        assert snap.stat().st_size == size
+        assert load_session_state(snap)["deltas"] == 0
+
+    def test_max_deltas_rewrites_checkpoint(self, tmp_path: Path):
+        """After max_deltas deltas the next persist compacts into a checkpoint."""
+        db = SwarmDB(
+            db_path=tmp_path / "swarm.db",
+            snapshot_config=SnapshotConfig(max_deltas=2)
+        )
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+        for i in range(3):
+            db.insert_event({
+                "event_type": "heartbeat",
+                "agent_id": "agent-0",
+                "agent_type": "expert-backend",
+                "timestamp": f"2025-01-01T00:01:0{i}",
+            })
+            db.persist_session_state(path=snap)
+        db.close()
+
+        state = load_session_state(snap)
+        assert state["deltas"] == 0
+        assert len(state["recent_events"]) == 3
+
+    def test_truncated_tail_is_ignored(self, db, tmp_path: Path):
+        """A delta cut short by a crash falls back to the complete segments."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+        db.insert_event({
+            "event_type": "error",
+            "agent_id": "agent-1",
+            "agent_type": "expert-backend",
+            "timestamp": "2025-01-01T00:00:09",
+        })
+        db.persist_session_state(path=snap)
+
+        snap.write_bytes(snap.read_bytes()[:-3])
+
+        state = load_session_state(snap)
+        assert state["deltas"] == 0
+        assert len(state["recent_events"]) == 3
+
+    def test_delta_after_torn_tail_is_readable(self, db, tmp_path: Path):
+        """The next delta replaces a torn tail instead of landing behind it."""
+        snap = tmp_path / "state.snap"
+        db.persist_session_state("session-1", path=snap)
+        checkpoint_size = snap.stat().st_size
+        db.insert_event({
+            "event_type": "error",
+            "agent_id": "agent-1",
+            "agent_type": "expert-backend",
+            "timestamp": "2025-01-01T00:00:09",
+        })
+        db.persist_session_state(path=snap)
+        snap.write_bytes(snap.read_bytes()[:checkpoint_size + 20])
+
+        db.insert_event({
+            "event_type": "complete",
+            "agent_id": "agent-2",
+            "agent_type": "expert-backend",
+            "timestamp": "2025-01-01T00:00:10",
+        })
+        db.persist_session_state(path=snap)
+
+        state = load_session_state(snap)
+        assert state["deltas"] == 1
+        assert [e["event_type"] for e in state["recent_events"][:2]] == ["complete", "error"]
+        assert len(state["recent_events"]) == 5
+
+    def test_legacy_json_fallback(self, tmp_path: Path):
+        """Without a snapshot the pre-snapshot JSON file is loaded."""
+        legacy = {"session_id": "old", "active_agents": [], "recent_events": []}
+        (tmp_path / "session-state.json").write_text(json.dumps(legacy))
+
+        assert load_session_state(tmp_path / "session-state.snap") == legacy
+        assert load_session_state(tmp_path / "missing" / "session-state.snap") is None
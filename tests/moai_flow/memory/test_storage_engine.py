@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Tests for StorageEngine (shared storage layer).
+
+Covers:
+- One shared engine per database file, closed by the last release
+- Versioned, run-once schema migrations per component
+- Group commit across write channels
+- batch() and nested transaction() savepoint scoping
+- SwarmDB, MetricsStorage and MetricsPersistence on one engine
+- UTC retention cutoffs on machines outside UTC
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from moai_flow.memory.storage_engine import GroupCommitConfig, StorageEngine, to_epoch_ms
+from moai_flow.memory.swarm_db import SwarmDB
+from moai_flow.monitoring.metric_buffer import to_epoch_us
+from moai_flow.monitoring.metrics_storage import MetricsStorage
+from moai_flow.monitoring.storage.metrics_persistence import (
+    MetricsPersistence,
+    RetentionPolicy,
+    WriteBufferConfig,
+)
+
+
+def _create_table(name: str):
+    def migrate(conn: sqlite3.Connection) -> None:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (value INTEGER)")
+    return migrate
+
+
+def _insert_into(name: str):
+    def handler(conn: sqlite3.Connection, items) -> None:
+        conn.executemany(f"INSERT INTO {name} (value) VALUES (?)", [(i,) for i in items])
+    return handler
+
+
+class TestStorageEngine:
+    """Test suite for StorageEngine."""
+
+    def test_open_shares_engine_per_path(self, tmp_path: Path):
+        """Components opening the same file get one engine until the last release."""
+        first = StorageEngine.open(tmp_path / "shared.db")
+        second = StorageEngine.open(str(tmp_path / "shared.db"))
+        assert first is second
+
+        first.release()
+        assert StorageEngine.open(tmp_path / "shared.db") is second
+        second.release()
+        second.release()
+
+        assert StorageEngine.open(tmp_path / "shared.db") is not first
+
+    def test_memory_engines_are_not_shared(self):
+        """Every :memory: engine is its own database."""
+        first = StorageEngine.open(":memory:")
+        second = StorageEngine.open(":memory:")
+        assert first is not second
+        first.release()
+        second.release()
+
+    def test_apply_schema_runs_once_per_version(self, tmp_path: Path):
+        """Schema work is skipped in-process and across reopens until the version changes."""
+        calls = []
+
+        def migrate(conn):
+            calls.append(1)
+            _create_table("items")(conn)
+
+        engine = StorageEngine.open(tmp_path / "schema.db")
+        assert engine.apply_schema("component", "1.0.0", migrate) is True
+        assert engine.apply_schema("component", "1.0.0", migrate) is False
+        engine.release()
+
+        reopened = StorageEngine.open(tmp_path / "schema.db")
+        assert reopened.apply_schema("component", "1.0.0", migrate) is False
+        assert reopened.apply_schema("component", "1.1.0", migrate) is True
+        assert reopened.get_schema_versions() == {"component": "1.1.0"}
+        assert len(calls) == 2
+        reopened.release()
+
+    def test_failed_migration_is_not_recorded(self, tmp_path: Path):
+        """A migration that raises is retried on the next open."""
+        def broken(conn):
+            raise sqlite3.OperationalError("boom")
+
+        engine = StorageEngine.open(tmp_path / "broken.db")
+        with pytest.raises(sqlite3.OperationalError):
+            engine.apply_schema("component", "1.0.0", broken)
+
+        assert "component" not in engine.get_schema_versions()
+        assert engine.apply_schema("component", "1.0.0", _create_table("items")) is True
+        engine.release()
+
+    def test_channels_share_group_commits(self, tmp_path: Path):
+        """Items from several channels are committed in the same transactions."""
+        engine = StorageEngine.open(tmp_path / "group.db")
+        engine.apply_schema("a", "1", _create_table("a_items"))
+        engine.apply_schema("b", "1", _create_table("b_items"))
+        config = GroupCommitConfig(enabled=True, max_batch_size=500, flush_interval_ms=200)
+        channel_a = engine.open_channel("a", _insert_into("a_items"), config)
+        channel_b = engine.open_channel("b", _insert_into("b_items"))
+
+        for i in range(100):
+            channel_a.submit(i)
+            channel_b.submit(i)
+        assert engine.flush(timeout=10)
+
+        conn = engine.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM a_items").fetchone()[0] == 100
+        assert conn.execute("SELECT COUNT(*) FROM b_items").fetchone()[0] == 100
+        stats = engine.get_writer_stats()
+        assert stats["items_written"] == 200
+        assert stats["batches_committed"] < 200
+        assert channel_a.stats["written"] == channel_b.stats["written"] == 100
+        engine.release()
+
+    def test_flush_wakes_a_waiting_writer(self, tmp_path: Path):
+        """flush() commits queued items without waiting out the interval."""
+        engine = StorageEngine.open(tmp_path / "wake.db")
+        engine.apply_schema("a", "1", _create_table("items"))
+        config = GroupCommitConfig(enabled=True, flush_interval_ms=60_000)
+        channel = engine.open_channel("a", _insert_into("items"), config)
+
+        channel.submit(1)
+        assert engine.flush(timeout=5)
+
+        assert engine.get_connection().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        engine.release()
+
+    def test_failed_batch_counts_write_errors(self, tmp_path: Path):
+        """A failing handler rolls back its batch and is counted per channel."""
+        engine = StorageEngine.open(tmp_path / "errors.db")
+        channel = engine.open_channel("missing", _insert_into("no_such_table"))
+
+        channel.submit(1)
+        assert engine.flush(timeout=10)
+
+        assert channel.stats["write_errors"] == 1
+        assert channel.stats["written"] == 0
+        assert channel.stats["dropped"] == 1
+        engine.release()
+
+    def test_synchronous_write_errors_raise(self, tmp_path: Path):
+        """Items written without the background writer raise on failure."""
+        engine = StorageEngine.open(tmp_path / "sync.db")
+        engine.apply_schema("a", "1", _create_table("items"))
+        good = engine.open_channel("a", _insert_into("items"))
+        bad = engine.open_channel("missing", _insert_into("no_such_table"))
+        engine._stop_writer()
+
+        good.submit(1)
+        with pytest.raises(sqlite3.OperationalError):
+            bad.submit(1)
+
+        assert engine.get_connection().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        assert good.stats["written"] == 1
+        assert bad.stats["write_errors"] == 1
+        engine.release()
+
+    def test_batch_turns_transactions_into_savepoints(self, tmp_path: Path):
+        """Transactions inside batch() commit together; a failing one rolls back alone."""
+        engine = StorageEngine.open(tmp_path / "batch.db")
+        engine.apply_schema("a", "1", _create_table("items"))
+
+        with engine.batch():
+            with engine.transaction() as conn:
+                conn.execute("INSERT INTO items (value) VALUES (1)")
+            with pytest.raises(ValueError):
+                with engine.transaction() as conn:
+                    conn.execute("INSERT INTO items (value) VALUES (2)")
+                    raise ValueError("boom")
+            assert engine.get_connection().in_transaction
+
+        values = engine.get_connection().execute("SELECT value FROM items").fetchall()
+        assert [row[0] for row in values] == [1]
+        engine.release()
+
+
+    def test_nested_transactions_use_savepoints(self, tmp_path: Path):
+        """An inner transaction() neither commits nor rolls back the outer one."""
+        engine = StorageEngine.open(tmp_path / "nested.db")
+        engine.apply_schema("a", "1", _create_table("items"))
+
+        with engine.transaction() as conn:
+            conn.execute("INSERT INTO items (value) VALUES (1)")
+            with pytest.raises(ValueError):
+                with engine.transaction() as inner:
+                    inner.execute("INSERT INTO items (value) VALUES (2)")
+                    raise ValueError("boom")
+            with engine.transaction() as inner:
+                inner.execute("INSERT INTO items (value) VALUES (3)")
+            assert conn.in_transaction
+
+        with pytest.raises(ValueError):
+            with engine.transaction() as conn:
+                conn.execute("INSERT INTO items (value) VALUES (4)")
+                with engine.transaction() as inner:
+                    inner.execute("INSERT INTO items (value) VALUES (5)")
+                raise ValueError("outer")
+
+        values = engine.get_connection().execute("SELECT value FROM items").fetchall()
+        assert [row[0] for row in values] == [1, 3]
+        engine.release()
+
+
+class TestSharedComponents:
+    """SwarmDB and metrics components running on one engine."""
+
+    def test_swarm_db_and_metrics_share_one_writer(self, tmp_path: Path):
+        """Buffered metrics ride on SwarmDB's group commit when both use one file."""
+        path = tmp_path / "swarm.db"
+        db = SwarmDB(db_path=path, group_commit=GroupCommitConfig(enabled=True))
+        persistence = MetricsPersistence(
+            db_path=path,
+            retention_policy=RetentionPolicy(auto_cleanup=False),
+            write_buffer_config=WriteBufferConfig(enabled=False),
+        )
+        assert persistence.engine is db.engine
+
+        for i in range(20):
+            db.insert_event({
+                "event_type": "spawn",
+                "agent_id": f"agent-{i}",
+                "agent_type": "expert-backend",
+                "timestamp": "2025-01-01T00:00:00",
+            })
+            persistence.write_task_metric(f"task-{i}", f"agent-{i}", 100, 10, True)
+        persistence.flush()
+
+        conn = db._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM agent_events").fetchone()[0] == 20
+        assert conn.execute("SELECT COUNT(*) FROM task_metrics").fetchone()[0] == 20
+        assert db.engine.get_writer_stats()["items_written"] == 40
+
+        persistence.close()
+        db.close()
+
+    def test_bad_event_does_not_drop_its_batch(self, tmp_path: Path):
+        """Only the failing event is dropped; good events and metrics still commit."""
+        path = tmp_path / "swarm.db"
+        db = SwarmDB(
+            db_path=path,
+            group_commit=GroupCommitConfig(enabled=True, flush_interval_ms=500),
+        )
+        persistence = MetricsPersistence(
+            db_path=path,
+            retention_policy=RetentionPolicy(auto_cleanup=False),
+            write_buffer_config=WriteBufferConfig(enabled=False),
+        )
+        event = {
+            "event_type": "spawn",
+            "agent_id": "agent-0",
+            "agent_type": "expert-backend",
+            "timestamp": "2025-01-01T00:00:00",
+        }
+        db.insert_event(event, event_id="duplicate")
+        db.flush()
+
+        for i in range(5):
+            db.insert_event(event)
+            persistence.write_task_metric(f"task-{i}", "agent-0", 100, 10, True)
+        db.insert_event(event, event_id="duplicate")
+        for i in range(5, 10):
+            db.insert_event(event)
+            persistence.write_task_metric(f"task-{i}", "agent-0", 100, 10, True)
+        persistence.flush()
+
+        conn = db._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM agent_events").fetchone()[0] == 11
+        assert conn.execute("SELECT COUNT(*) FROM task_metrics").fetchone()[0] == 10
+        stats = db.get_group_commit_stats()
+        assert stats["events_dropped"] == 1
+        assert stats["events_written"] == 11
+        writer_stats = db.engine.get_writer_stats()
+        assert writer_stats["write_errors"] == 1
+        assert writer_stats["items_dropped"] == 1
+
+        persistence.close()
+        db.close()
+
+    def test_swarm_db_drops_empty_legacy_metrics_tables(self, tmp_path: Path):
+        """Metrics tables SwarmDB used to create are removed when unused."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE task_metrics (task_id TEXT, timestamp DATETIME)")
+        conn.execute("CREATE TABLE agent_metrics (agent_id TEXT, timestamp DATETIME)")
+        conn.execute("INSERT INTO agent_metrics VALUES ('a1', '2025-01-01')")
+        conn.commit()
+        conn.close()
+
+        db = SwarmDB(db_path=path)
+        tables = {
+            row[0] for row in db._get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        db.close()
+
+        assert "task_metrics" not in tables
+        assert "agent_metrics" in tables  # Holds rows
+
+    def test_metrics_storage_keeps_tables_on_swarm_db_file(self, tmp_path: Path):
+        """MetricsStorage on SwarmDB's file owns the metrics tables."""
+        path = tmp_path / "swarm.db"
+        storage = MetricsStorage(db_path=path)
+        db = SwarmDB(db_path=path)
+
+        storage.store_task_metric("t1", "agent-1", 1500, "success")
+
+        assert db.engine is storage.engine
+        assert storage.get_task_metrics(agent_id="agent-1")[0]["duration_ms"] == 1500
+        db.close()
+        storage.close()
+
+    def test_metrics_storage_upgrades_v1_task_metrics(self, tmp_path: Path):
+        """Schema 1.0.0 task metrics are backfilled and queried by epoch milliseconds."""
+        path = tmp_path / "metrics.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE task_metrics (
+                task_id TEXT NOT NULL,
+                agent_id TEXT NOT NULL,
+                duration_ms INTEGER,
+                result TEXT NOT NULL,
+                tokens_used INTEGER DEFAULT 0,
+                files_changed INTEGER DEFAULT 0,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (task_id, timestamp)
+            );
+            CREATE INDEX idx_task_metrics_time ON task_metrics(timestamp);
+            INSERT INTO task_metrics (task_id, agent_id, duration_ms, result, timestamp)
+            VALUES ('old', 'agent-1', 500, 'success', '2025-01-01T12:00:00');
+            """
+        )
+        conn.close()
+
+        storage = MetricsStorage(db_path=path)
+        rows = storage.get_task_metrics(
+            time_range=(datetime(2025, 1, 1), datetime(2025, 1, 1) + timedelta(days=1))
+        )
+        indexes = {
+            row[0] for row in storage._get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        storage.close()
+
+        assert [row["task_id"] for row in rows] == ["old"]
+        # Naive legacy timestamps are local time
+        assert rows[0]["timestamp_ms"] == datetime(2025, 1, 1, 12).timestamp() * 1000
+        assert "idx_task_metrics_agent_time" in indexes
+        assert "idx_task_metrics_time" not in indexes
+
+
+@pytest.fixture
+def tokyo_time():
+    """Run with a local time zone nine hours ahead of UTC."""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Tokyo"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+class TestUtcRetention:
+    """Retention cutoffs compare against UTC epoch times."""
+
+    def test_cleanup_old_events_uses_utc(self, tmp_path: Path, tokyo_time):
+        """An event 20 hours old survives a one-day retention in any time zone."""
+        db = SwarmDB(db_path=tmp_path / "swarm.db")
+        now = datetime.now(timezone.utc)
+        for event_id, hours in (("recent", 20), ("old", 30)):
+            db.insert_event({
+                "event_type": "spawn",
+                "agent_id": "agent-1",
+                "agent_type": "expert-backend",
+                "timestamp": (now - timedelta(hours=hours)).isoformat(),
+            }, event_id=event_id)
+
+        assert db.cleanup_old_events(days=1) == 1
+        assert [event["event_id"] for event in db.get_events()] == ["recent"]
+        db.close()
+
+    def test_metrics_storage_writers_and_cutoff_use_utc(self, tmp_path: Path, tokyo_time):
+        """Collector rows (UTC) and store_* rows (local time) expire alike."""
+        storage = MetricsStorage(db_path=tmp_path / "metrics.db")
+        now = datetime.now(timezone.utc)
+        for task_id, hours in (("recent", 20), ("old", 30)):
+            storage.save_task_metrics_batch([{
+                "task_id": f"collector-{task_id}",
+                "agent_id": "agent-1",
+                "duration_ms": 100,
+                "result": "success",
+                "timestamp": (now - timedelta(hours=hours)).isoformat().replace("+00:00", "Z"),
+            }])
+            storage.store_task_metric(
+                f"local-{task_id}", "agent-1", 100, "success",
+                timestamp=datetime.now() - timedelta(hours=hours),
+            )
+            storage.store_agent_metric(
+                f"agent-{task_id}", "throughput", 1.0,
+                timestamp=datetime.now() - timedelta(hours=hours),
+            )
+
+        deleted = storage.cleanup_old_metrics(retention_days=1)
+        tasks = {row["task_id"] for row in storage.get_task_metrics()}
+        storage.close()
+
+        assert deleted["task_metrics"] == 2
+        assert deleted["agent_metrics"] == 1
+        assert tasks == {"collector-recent", "local-recent"}
+
+    def test_naive_timestamps_are_local_time(self, tokyo_time):
+        """Naive datetimes and strings convert as local time everywhere."""
+        local = datetime(2026, 1, 1, 9, 0)
+        utc_ms = 1767225600000  # 2026-01-01T00:00:00Z
+
+        assert to_epoch_ms(local) == utc_ms
+        assert to_epoch_ms(local.isoformat()) == utc_ms
+        assert to_epoch_ms("2026-01-01T00:00:00Z") == utc_ms
+        assert to_epoch_us(local) == utc_ms * 1000
+
+    def test_naive_local_events_expire_on_time(self, tmp_path: Path, tokyo_time):
+        """Events stamped with naive local time honour the UTC cutoff."""
+        db = SwarmDB(db_path=tmp_path / "swarm.db")
+        now = datetime.now()
+        for event_id, hours in (("recent", 20), ("old", 27)):
+            db.insert_event({
+                "event_type": "spawn",
+                "agent_id": "agent-1",
+                "agent_type": "expert-backend",
+                "timestamp": (now - timedelta(hours=hours)).isoformat(),
+            }, event_id=event_id)
+        conn = db._get_connection()
+        conn.execute(
+            """
+            INSERT INTO agent_events (event_id, event_type, agent_id, agent_type, timestamp)
+            VALUES ('raw-old', 'spawn', 'agent-1', 'expert-backend', ?)
+            """,
+            ((now - timedelta(hours=27)).isoformat(),)
+        )
+        conn.commit()
+
+        assert db.cleanup_old_events(days=1) == 2
+        assert [event["event_id"] for event in db.get_events()] == ["recent"]
+        db.close()
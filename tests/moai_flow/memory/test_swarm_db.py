@@ -20,6 +20,7 @@ Test Areas:
 import json
 import sqlite3
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
@@ -768,3 +769,615 @@ class TestSwarmDBPerformance:
 
         # Should handle queries efficiently
         assert elapsed < 2.0  # 2 seconds for 1k queries
+
+
+# Event ingestion tests (bulk insert and group commit)
+def _make_event(i: int) -> Dict[str, Any]:
+    return {
+        "event_type": "spawn",
+        "agent_id": f"agent-{i}",
+        "agent_type": "expert-backend",
+        "timestamp": f"2025-01-01T00:00:{i % 60:02d}",
+        "metadata": {"index": i},
+    }
+
+
+def _count_events(db: SwarmDB) -> int:
+    return db._get_connection().execute(
+        "SELECT COUNT(*) FROM agent_events"
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def event_db(tmp_path: Path):
+    """File-backed SwarmDB for event ingestion tests."""
+    db = SwarmDB(db_path=tmp_path / "events.db")
+    yield db
+    db.close()
+
+
+class TestBulkEventIngestion:
+    """Tests for SwarmDB.insert_events."""
+
+    def test_insert_events_returns_ids_in_order(self, event_db: SwarmDB):
+        """Bulk insert writes every row and returns IDs in input order."""
+        events = [_make_event(i) for i in range(50)]
+        events[0]["event_id"] = "fixed-id"
+
+        event_ids = event_db.insert_events(events)
+
+        assert len(event_ids) == 50
+        assert event_ids[0] == "fixed-id"
+        assert _count_events(event_db) == 50
+
+    def test_insert_events_empty(self, event_db: SwarmDB):
+        """Empty input is a no-op."""
+        assert event_db.insert_events([]) == []
+        assert _count_events(event_db) == 0
+
+    def test_insert_events_is_atomic(self, event_db: SwarmDB):
+        """An invalid event rejects the whole batch."""
+        events = [_make_event(0), {"event_type": "spawn"}]
+
+        with pytest.raises(KeyError):
+            event_db.insert_events(events)
+
+        assert _count_events(event_db) == 0
+
+
+class TestGroupCommit:
+    """Tests for the background group-commit writer."""
+
+    def test_events_committed_in_batches(self, tmp_path: Path):
+        """Queued events are flushed with far fewer commits than rows."""
+        from moai_flow.memory.swarm_db import GroupCommitConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "gc.db",
+            group_commit=GroupCommitConfig(enabled=True, max_batch_size=100),
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: db.insert_event(_make_event(i)), range(500)))
+
+        assert db.flush(timeout=10.0) is True
+        assert _count_events(db) == 500
+
+        stats = db.get_group_commit_stats()
+        assert stats["enabled"] is True
+        assert stats["events_written"] == 500
+        assert stats["batches_committed"] < 500
+        assert stats["pending_events"] == 0
+        db.close()
+
+    def test_get_events_sees_queued_events(self, tmp_path: Path):
+        """Reads flush the queue first (read-your-writes)."""
+        from moai_flow.memory.swarm_db import GroupCommitConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "gc.db",
+            group_commit=GroupCommitConfig(enabled=True, flush_interval_ms=5000),
+        )
+        db.insert_event(_make_event(1))
+
+        events = db.get_events(agent_id="agent-1")
+
+        assert len(events) == 1
+        assert events[0]["metadata"] == {"index": 1}
+        db.close()
+
+    def test_close_is_durable(self, tmp_path: Path):
+        """close() commits everything still in the queue."""
+        from moai_flow.memory.swarm_db import GroupCommitConfig
+
+        db_file = tmp_path / "gc.db"
+        db = SwarmDB(
+            db_path=db_file,
+            group_commit=GroupCommitConfig(enabled=True, flush_interval_ms=5000),
+        )
+        for i in range(25):
+            db.insert_event(_make_event(i))
+        db.close()
+
+        reopened = SwarmDB(db_path=db_file)
+        assert _count_events(reopened) == 25
+        reopened.close()
+
+    def test_invalid_event_raises_in_caller(self, tmp_path: Path):
+        """Validation happens before queueing, so errors reach the caller."""
+        from moai_flow.memory.swarm_db import GroupCommitConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "gc.db",
+            group_commit=GroupCommitConfig(enabled=True),
+        )
+
+        with pytest.raises(KeyError):
+            db.insert_event({"event_type": "spawn", "agent_id": "a1"})
+
+        assert db.flush(timeout=1.0) is True
+        db.close()
+
+
+class TestSessionMemoryUpsert:
+    """Tests for versioned session memory upserts and compaction."""
+
+    def _row_count(self, db: SwarmDB) -> int:
+        return db._get_connection().execute(
+            "SELECT COUNT(*) FROM session_memory"
+        ).fetchone()[0]
+
+    def test_store_memory_keeps_one_row_per_key(self, event_db: SwarmDB):
+        """Repeated stores update the live row in place."""
+        for i in range(20):
+            version = event_db.store_memory("s1", "context_hint", "prefs", {"n": i})
+
+        assert version == 20
+        assert self._row_count(event_db) == 1
+        assert event_db.get_memory("s1", "context_hint", "prefs") == {"n": 19}
+
+    def test_history_disabled_by_default(self, event_db: SwarmDB):
+        """No history is written unless retention is configured."""
+        event_db.store_memory("s1", "context_hint", "prefs", 1)
+        event_db.store_memory("s1", "context_hint", "prefs", 2)
+
+        assert event_db.get_memory_history("s1", "context_hint", "prefs") == []
+
+    def test_history_keeps_last_k_versions(self, tmp_path: Path):
+        """History retains exactly the last K versions per key."""
+        from moai_flow.memory.swarm_db import SessionMemoryConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "history.db",
+            memory_config=SessionMemoryConfig(history_versions=3),
+        )
+        for i in range(10):
+            db.store_memory("s1", "context_hint", "prefs", i)
+
+        history = db.get_memory_history("s1", "context_hint", "prefs")
+        assert [h["version"] for h in history] == [10, 9, 8]
+        assert [h["value"] for h in history] == [9, 8, 7]
+        db.close()
+
+    def test_legacy_database_compacted_on_open(self, tmp_path: Path):
+        """Databases with append-only duplicates are compacted once."""
+        db_file = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(db_file))
+        conn.execute(
+            """
+            CREATE TABLE session_memory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                memory_type TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                timestamp TEXT NOT NULL,
+                ttl_hours INTEGER,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        for i in range(5):
+            conn.execute(
+                "INSERT INTO session_memory (session_id, memory_type, key, value, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ("s1", "context_hint", "prefs", json.dumps(i), f"2025-01-01T00:00:0{i}"),
+            )
+        conn.commit()
+        conn.close()
+
+        db = SwarmDB(db_path=db_file)
+
+        assert self._row_count(db) == 1
+        assert db.get_memory("s1", "context_hint", "prefs") == 4
+        assert db.store_memory("s1", "context_hint", "prefs", 5) == 6
+        db.close()
+
+    def test_compact_memory_trims_history(self, tmp_path: Path):
+        """compact_memory trims history to the requested version count."""
+        from moai_flow.memory.swarm_db import SessionMemoryConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "compact.db",
+            memory_config=SessionMemoryConfig(history_versions=5),
+        )
+        for i in range(5):
+            db.store_memory("s1", "context_hint", "prefs", i)
+
+        stats = db.compact_memory(history_versions=2)
+
+        assert stats == {"removed_rows": 0, "trimmed_history": 3}
+        assert len(db.get_memory_history("s1", "context_hint", "prefs")) == 2
+        db.close()
+
+
+class TestSessionMemoryTTL:
+    """Tests for TTL expiry and the background sweeper."""
+
+    def _expire_all(self, db: SwarmDB) -> None:
+        conn = db._get_connection()
+        conn.execute("UPDATE session_memory SET expires_at = 0 WHERE expires_at IS NOT NULL")
+        conn.commit()
+
+    def test_expired_memory_hidden_from_reads(self, event_db: SwarmDB):
+        """get_memory ignores expired entries before they are swept."""
+        event_db.store_memory("s1", "context_hint", "temp", "v", ttl_hours=1)
+        event_db.store_memory("s1", "context_hint", "keep", "v")
+        assert event_db.get_memory("s1", "context_hint", "temp") == "v"
+
+        self._expire_all(event_db)
+
+        assert event_db.get_memory("s1", "context_hint", "temp") is None
+        assert event_db.get_memory("s1", "context_hint", "keep") == "v"
+
+    def test_sweep_deletes_in_batches(self, tmp_path: Path):
+        """Sweeping removes only expired rows, in bounded batches."""
+        from moai_flow.memory.swarm_db import SessionMemoryConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "ttl.db",
+            memory_config=SessionMemoryConfig(sweep_batch_size=10, sweep_pause_ms=0),
+        )
+        for i in range(25):
+            db.store_memory("s1", "context_hint", f"temp-{i}", i, ttl_hours=1)
+        db.store_memory("s1", "context_hint", "keep", "v")
+        self._expire_all(db)
+
+        assert db.sweep_expired_memory(max_batches=1) == 10
+        assert db.get_sweeper_stats()["expired_pending"] == 15
+        assert db.sweep_expired_memory() == 15
+
+        stats = db.get_sweeper_stats()
+        assert stats["rows_deleted"] == 25
+        assert stats["batches"] == 3
+        assert stats["expired_pending"] == 0
+        assert db.get_memory("s1", "context_hint", "keep") == "v"
+        db.close()
+
+    def test_background_sweeper(self, tmp_path: Path):
+        """The sweeper thread deletes expired rows on its own."""
+        from moai_flow.memory.swarm_db import SessionMemoryConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "ttl.db",
+            memory_config=SessionMemoryConfig(
+                ttl_sweeper_enabled=True, sweep_interval_seconds=0.02
+            ),
+        )
+        db.store_memory("s1", "context_hint", "temp", "v", ttl_hours=1)
+        self._expire_all(db)
+
+        deadline = time.time() + 5.0
+        while db.get_sweeper_stats()["rows_deleted"] == 0 and time.time() < deadline:
+            time.sleep(0.02)
+
+        stats = db.get_sweeper_stats()
+        assert stats["enabled"] is True
+        assert stats["rows_deleted"] == 1
+        db.close()
+        assert db.get_sweeper_stats()["enabled"] is False
+
+
+class TestEventPartitions:
+    """Tests for time-partitioned agent event storage."""
+
+    @staticmethod
+    def _event(i: int, timestamp: str) -> Dict[str, Any]:
+        return {**_make_event(i), "timestamp": timestamp}
+
+    @staticmethod
+    def _partitioned_db(tmp_path: Path, granularity: str = "month") -> SwarmDB:
+        from moai_flow.memory.swarm_db import EventPartitionConfig
+
+        return SwarmDB(
+            db_path=tmp_path / "partitioned.db",
+            partition_config=EventPartitionConfig(enabled=True, granularity=granularity),
+        )
+
+    def test_events_routed_to_monthly_partitions(self, tmp_path: Path):
+        """Each event lands in the partition for its month."""
+        db = self._partitioned_db(tmp_path)
+        db.insert_events([
+            self._event(0, "2025-01-15T10:00:00Z"),
+            self._event(1, "2025-02-01T00:00:00Z"),
+            self._event(2, "2025-02-20T12:00:00Z"),
+        ])
+
+        partitions = db.get_event_partitions()
+        assert [p["name"] for p in partitions] == ["agent_events_2025_01", "agent_events_2025_02"]
+        assert partitions[0]["range_end"] == "2025-02-01"
+
+        conn = db._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM agent_events_2025_02").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM agent_events_all").fetchone()[0] == 3
+        assert _count_events(db) == 0
+        db.close()
+
+    def test_get_events_prunes_by_time_range(self, tmp_path: Path):
+        """Time-bounded queries only return events in range, newest first."""
+        from moai_flow.memory.swarm_db import _to_epoch_ms
+
+        db = self._partitioned_db(tmp_path, granularity="day")
+        db.insert_events([
+            self._event(i, f"2025-03-{day:02d}T08:00:00Z")
+            for i, day in enumerate(range(1, 11))
+        ])
+
+        events = db.get_events(since="2025-03-04T00:00:00Z", until="2025-03-06T23:59:59Z")
+        assert [e["timestamp"][:10] for e in events] == ["2025-03-06", "2025-03-05", "2025-03-04"]
+        assert db._event_sources(
+            db._get_connection(),
+            _to_epoch_ms("2025-03-04T00:00:00Z"),
+            _to_epoch_ms("2025-03-06T23:59:59Z"),
+        ) == ["agent_events_2025_03_06", "agent_events_2025_03_05", "agent_events_2025_03_04"]
+
+        latest = db.get_events(limit=4)
+        assert [e["agent_id"] for e in latest] == ["agent-9", "agent-8", "agent-7", "agent-6"]
+        db.close()
+
+    def test_cleanup_drops_expired_partitions(self, tmp_path: Path):
+        """Retention drops old partitions and trims only the boundary one."""
+        from datetime import datetime, timedelta, timezone
+
+        db = self._partitioned_db(tmp_path, granularity="day")
+        now = datetime.now(timezone.utc)
+        db.insert_events([
+            self._event(0, (now - timedelta(days=40)).isoformat()),
+            self._event(1, (now - timedelta(days=35)).isoformat()),
+            self._event(2, (now - timedelta(days=33)).isoformat()),
+            self._event(3, now.isoformat()),
+        ])
+        assert len(db.get_event_partitions()) == 4
+
+        deleted = db.cleanup_old_events(days=30)
+
+        # Dropped partitions are not counted (that would scan them)
+        assert deleted == 0
+        names = [p["name"] for p in db.get_event_partitions()]
+        assert names == [f"agent_events_{now:%Y_%m_%d}"]
+        assert [e["agent_id"] for e in db.get_events()] == ["agent-3"]
+        tables = {
+            row[0] for row in db._get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        assert f"agent_events_{now - timedelta(days=40):%Y_%m_%d}" not in tables
+        db.close()
+
+    def test_existing_events_moved_into_partitions(self, tmp_path: Path):
+        """Enabling partitioning migrates rows and persists the setting."""
+        db = SwarmDB(db_path=tmp_path / "partitioned.db")
+        db.insert_events([self._event(i, f"2024-12-{i + 1:02d}T00:00:00Z") for i in range(5)])
+        db.close()
+
+        db = self._partitioned_db(tmp_path)
+        assert _count_events(db) == 0
+        assert len(db.get_events()) == 5
+        db.close()
+
+        # Partitioning is a property of the database, not the caller
+        db = SwarmDB(db_path=tmp_path / "partitioned.db")
+        db.insert_event(self._event(9, "2025-01-02T00:00:00Z"))
+        assert [p["name"] for p in db.get_event_partitions()] == [
+            "agent_events_2024_12", "agent_events_2025_01"
+        ]
+        assert len(db.get_events()) == 6
+        db.close()
+
+    def test_group_commit_writes_to_partitions(self, tmp_path: Path):
+        """The group-commit writer routes batches through partitions."""
+        from moai_flow.memory.swarm_db import EventPartitionConfig, GroupCommitConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "partitioned.db",
+            group_commit=GroupCommitConfig(enabled=True),
+            partition_config=EventPartitionConfig(enabled=True, granularity="week"),
+        )
+        for i in range(20):
+            db.insert_event(self._event(i, f"2025-01-{i + 1:02d}T00:00:00Z"))
+
+        assert len(db.get_events(limit=50)) == 20
+        assert len(db.get_event_partitions()) == 4
+        db.close()
+
+    def test_invalid_granularity(self):
+        """Unknown partition sizes are rejected."""
+        from moai_flow.memory.swarm_db import EventPartitionConfig
+
+        with pytest.raises(ValueError):
+            EventPartitionConfig(enabled=True, granularity="year")
+
+
+class TestIterEvents:
+    """Tests for streaming, keyset-paginated event iteration."""
+
+    def test_iterates_all_events_in_pages(self, event_db: SwarmDB):
+        """Every event is yielded once, newest first, across many pages."""
+        event_db.insert_events([_make_event(i) for i in range(250)])
+
+        events = list(event_db.iter_events(batch_size=7))
+
+        assert len(events) == 250
+        assert len({e["event_id"] for e in events}) == 250
+        keys = [(e["timestamp"], e["id"]) for e in events]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_ascending_with_filters_and_limit(self, event_db: SwarmDB):
+        """Filters and ordering run in SQL; limit stops the stream."""
+        events = [_make_event(i) for i in range(30)]
+        for event in events[::3]:
+            event["event_type"] = "complete"
+        event_db.insert_events(events)
+
+        completed = list(event_db.iter_events(
+            event_type="complete", ascending=True, limit=4, batch_size=3
+        ))
+
+        assert [e["metadata"]["index"] for e in completed] == [0, 3, 6, 9]
+
+    def test_metadata_decoded_lazily(self, event_db: SwarmDB):
+        """Metadata JSON is parsed only when accessed."""
+        from moai_flow.memory.swarm_db import _UNDECODED
+
+        event_db.insert_event(_make_event(1))
+
+        event = next(event_db.iter_events())
+
+        assert event._metadata is _UNDECODED
+        assert event.raw_metadata == '{"index": 1}'
+        assert event.metadata == {"index": 1}
+        assert event.to_dict()["metadata"] == {"index": 1}
+        assert event.get("missing") is None
+
+    def test_spans_partitions(self, tmp_path: Path):
+        """Pagination continues across partitions in time order."""
+        from moai_flow.memory.swarm_db import EventPartitionConfig
+
+        db = SwarmDB(
+            db_path=tmp_path / "partitioned.db",
+            partition_config=EventPartitionConfig(enabled=True, granularity="day"),
+        )
+        db.insert_events([
+            {**_make_event(i), "timestamp": f"2025-04-{i % 5 + 1:02d}T00:00:{i:02d}"}
+            for i in range(25)
+        ])
+
+        events = list(db.iter_events(ascending=True, batch_size=4, since="2025-04-02"))
+
+        assert len(events) == 20
+        timestamps = [e["timestamp"] for e in events]
+        assert timestamps == sorted(timestamps)
+        db.close()
+
+    def test_export_events(self, event_db: SwarmDB, tmp_path: Path):
+        """Events stream to a JSON Lines file."""
+        event_db.insert_events([_make_event(i) for i in range(10)])
+
+        output = tmp_path / "export" / "events.jsonl"
+        assert event_db.export_events(output) == 10
+
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert lines[0]["metadata"] == {"index": 0}
+        assert lines[-1]["agent_id"] == "agent-9"
+
+
+class TestSchemaV3Timestamps:
+    """Tests for epoch-millisecond columns and the v3 migration."""
+
+    V2_SCHEMA = """
+    CREATE TABLE agent_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id TEXT UNIQUE NOT NULL,
+        event_type TEXT NOT NULL,
+        agent_id TEXT NOT NULL,
+        agent_type TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        metadata TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_agent_events_agent_id ON agent_events(agent_id);
+    CREATE INDEX idx_agent_events_timestamp ON agent_events(timestamp);
+    CREATE TABLE task_metrics (
+        task_id TEXT NOT NULL,
+        agent_id TEXT NOT NULL,
+        duration_ms INTEGER,
+        result TEXT NOT NULL,
+        tokens_used INTEGER DEFAULT 0,
+        files_changed INTEGER DEFAULT 0,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (task_id, timestamp)
+    );
+    CREATE INDEX idx_task_metrics_time ON task_metrics(timestamp);
+    """
+
+    def _create_v2_database(self, path: Path, events: int) -> None:
+        conn = sqlite3.connect(path)
+        conn.executescript(self.V2_SCHEMA)
+        conn.executemany(
+            """
+            INSERT INTO agent_events (event_id, event_type, agent_id, agent_type, timestamp, metadata)
+            VALUES (?, 'spawn', ?, 'expert-backend', ?, '{}')
+            """,
+            [
+                (f"e{i}", f"agent-{i % 3}", f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}")
+                for i in range(events)
+            ],
+        )
+        conn.execute(
+            "INSERT INTO task_metrics (task_id, agent_id, result, timestamp) "
+            "VALUES ('t1', 'agent-0', 'success', '2025-01-01 12:00:00')"
+        )
+        conn.commit()
+        conn.close()
+
+    def test_events_store_epoch_ms(self, event_db: SwarmDB):
+        """Inserted events carry UTC epoch milliseconds."""
+        event_db.insert_event({**_make_event(0), "timestamp": "2025-01-01T01:00:00+01:00"})
+
+        event = event_db.get_events()[0]
+
+        assert event["timestamp"] == "2025-01-01T01:00:00+01:00"
+        assert event["timestamp_ms"] == 1735689600000
+
+    def test_migrates_v2_database_in_batches(self, tmp_path: Path, monkeypatch):
+        """Existing TEXT rows are backfilled batch by batch and reindexed."""
+        import moai_flow.memory.swarm_db as swarm_db_module
+
+        monkeypatch.setattr(swarm_db_module, "_MIGRATION_BATCH_SIZE", 7)
+        path = tmp_path / "v2.db"
+        self._create_v2_database(path, events=50)
+
+        db = SwarmDB(db_path=path)
+        conn = db._get_connection()
+
+        assert conn.execute(
+            "SELECT COUNT(*) FROM agent_events WHERE timestamp_ms IS NULL"
+        ).fetchone()[0] == 0
+        # Metrics tables belong to MetricsStorage; ones holding rows are kept
+        assert conn.execute("SELECT COUNT(*) FROM task_metrics").fetchone()[0] == 1
+        indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert "idx_agent_events_agent_time" in indexes
+        assert "idx_agent_events_timestamp" not in indexes
+        assert conn.execute(
+            "SELECT value FROM schema_info WHERE key = 'version'"
+        ).fetchone()[0] == "3.1.0"
+
+        events = db.get_events(agent_id="agent-1", since="2025-01-01T00:00:30", limit=5)
+        assert [e["timestamp"] for e in events][:2] == ["2025-01-01T00:00:49", "2025-01-01T00:00:46"]
+        db.close()
+
+    def test_trigger_fills_timestamp_ms_for_raw_inserts(self, event_db: SwarmDB):
+        """Writers that omit timestamp_ms still get it computed."""
+        conn = event_db._get_connection()
+        conn.execute(
+            "INSERT INTO agent_events (event_id, event_type, agent_id, agent_type, timestamp) "
+            "VALUES ('raw-1', 'spawn', 'agent-0', 'expert-backend', '2025-01-01T00:00:01Z')"
+        )
+        conn.commit()
+
+        assert conn.execute(
+            "SELECT timestamp_ms FROM agent_events WHERE event_id = 'raw-1'"
+        ).fetchone()[0] == 1735689601000
+
+    def test_agent_range_query_uses_covering_index(self, event_db: SwarmDB):
+        """Per-agent time-range scans are served by the composite index."""
+        plan = " ".join(
+            row[3] for row in event_db._get_connection().execute(
+                """
+                EXPLAIN QUERY PLAN
+                SELECT event_type, COUNT(*) FROM agent_events
+                WHERE agent_id = ? AND timestamp_ms BETWEEN ? AND ?
+                GROUP BY event_type
+                """,
+                ("agent-1", 0, 1),
+            )
+        )
+
+        assert "COVERING INDEX idx_agent_events_agent_time" in plan
+
+    def test_invalid_range_bound_raises(self, event_db: SwarmDB):
+        """Unparseable since/until values are rejected."""
+        with pytest.raises(ValueError):
+            event_db.get_events(since="yesterday")
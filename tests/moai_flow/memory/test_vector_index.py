@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for VectorIndex and HashingVectorizer (local vector search).
+
+Covers:
+- Tokenization, hashing stability and normalization
+- Row registration, replacement and removal
+- Matrix file reuse and rebuild
+- IVF partitioning (NumPy only)
+"""
+
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+from moai_flow.memory.vector_index import (
+    NUMPY_AVAILABLE,
+    HashingVectorizer,
+    VectorIndex,
+    VectorIndexConfig,
+    blob_to_vector,
+    vector_to_blob,
+)
+
+
+@pytest.fixture
+def vectorizer():
+    return HashingVectorizer(dimensions=256)
+
+
+class TestHashingVectorizer:
+    """Test suite for HashingVectorizer."""
+
+    def test_tokenize_splits_identifiers_and_stems(self):
+        """snake_case, camelCase and suffixes reduce to shared words."""
+        assert HashingVectorizer.tokenize("handle_api_errors") == ["handl", "api", "error"]
+        assert HashingVectorizer.tokenize("APIErrorHandling") == ["api", "error", "handl"]
+
+    def test_vectors_are_normalized_and_stable(self, vectorizer):
+        """Vectors have unit length and do not depend on the process hash seed."""
+        first = vectorizer.vectorize("retry with backoff", title="retry_policy")
+        second = vectorizer.vectorize("retry with backoff", title="retry_policy")
+
+        assert first == second
+        assert math.isclose(sum(v * v for v in first), 1.0, rel_tol=1e-5)
+        assert blob_to_vector(vector_to_blob(first)) == first
+
+    def test_empty_text_is_zero_vector(self, vectorizer):
+        assert not any(vectorizer.vectorize("  --  "))
+
+    def test_dimensions_must_be_power_of_two(self):
+        with pytest.raises(ValueError):
+            HashingVectorizer(dimensions=300)
+
+
+class TestVectorIndex:
+    """Test suite for VectorIndex."""
+
+    @pytest.mark.parametrize("in_memory", [True, False])
+    def test_search_ranks_by_cosine(self, vectorizer, tmp_path: Path, in_memory):
+        """The closest text ranks first, in memory and file-backed."""
+        index = VectorIndex(256, None if in_memory else tmp_path / "m.vec")
+        texts = ["jwt refresh tokens", "api error handling", "database connection pool"]
+        for row, text in enumerate(texts):
+            index.add(f"k{row}", row, vectorizer.vectorize(text))
+
+        results = index.search(vectorizer.vectorize("handling API errors"), k=2)
+
+        assert results[0][0] == "k1"
+        assert results[0][1] > results[1][1]
+        index.close()
+
+    def test_replace_and_remove(self, vectorizer):
+        """Re-adding a key retires its old row; removed keys are never returned."""
+        index = VectorIndex(256)
+        index.add("a", 0, vectorizer.vectorize("rabbitmq broker"))
+        index.add("a", 1, vectorizer.vectorize("kafka broker"))
+        index.add("b", 2, vectorizer.vectorize("kafka streams"))
+
+        assert sorted(key for key, _ in index.search(vectorizer.vectorize("kafka"), k=5)) == ["a", "b"]
+        assert len(index) == 2
+
+        assert index.remove(["b", "missing"]) == 1
+        assert [key for key, _ in index.search(vectorizer.vectorize("kafka"), k=5)] == ["a"]
+
+    def test_load_reuses_or_rebuilds_matrix_file(self, vectorizer, tmp_path: Path):
+        """A matching file is reused; a truncated one is rebuilt from the blobs."""
+        path = tmp_path / "m.vec"
+        entries = [
+            (f"k{i}", i, vector_to_blob(vectorizer.vectorize(f"entry number {i} topic {i}")))
+            for i in range(5)
+        ]
+        query = vectorizer.vectorize("topic 3")
+
+        index = VectorIndex(256, path)
+        index.load(entries)
+        expected = index.search(query, k=1)
+        index.close()
+        assert path.stat().st_size == 5 * 256 * 4
+
+        with open(path, "r+b") as f:
+            f.truncate(3 * 256 * 4)
+
+        reloaded = VectorIndex(256, path)
+        reloaded.load(entries)
+        assert reloaded.search(query, k=1) == expected
+        assert path.stat().st_size == 5 * 256 * 4
+        reloaded.close()
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="IVF partitioning requires NumPy")
+    def test_ivf_partitions_find_nearest_rows(self, vectorizer):
+        """A stored vector is found in its own partition."""
+        rng = random.Random(7)
+        words = [f"word{i}" for i in range(200)]
+        config = VectorIndexConfig(ivf_clusters=16, ivf_probe=2, ivf_min_rows=100)
+        index = VectorIndex(256, config=config)
+        vectors = []
+        for row in range(400):
+            vectors.append(vectorizer.vectorize(" ".join(rng.sample(words, 5))))
+            index.add(f"k{row}", row, vectors[-1])
+
+        for row in (0, 123, 399):
+            _, score = index.search(vectors[row], k=1)[0]
+            assert score == pytest.approx(1.0, abs=1e-5)
+        assert index.get_stats()["ivf_trained"]
+
+        # Rows added after training are assigned to a partition immediately
+        index.add("new", 400, vectorizer.vectorize("brand new entry"))
+        assert index.search(vectorizer.vectorize("brand new entry"), k=1)[0][0] == "new"
@@ -17,11 +17,17 @@ Test Categories:
 4. Retention and Cleanup
 5. Concurrency and Thread Safety
 6. Error Handling and Edge Cases
+7. Hourly and Daily Rollups
+8. Archive Block Index
+9. Columnar Archive Format
 """
 
+import json
 import pytest
+import struct
 import tempfile
 import time
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -31,6 +37,10 @@ from moai_flow.monitoring.storage.metrics_persistence import (
     RetentionPolicy,
     CompressionConfig,
     WriteBufferConfig,
+    archive_bloom_bits,
+    decode_archive_block,
+    decode_archive_columns,
+    encode_archive_block,
 )
 
 
@@ -356,6 +366,233 @@ class TestRetention:
         assert result["count"] == 5  # Only recent data remains
 
 
+class TestRollups:
+    """Test flush-time rollups and their retention tiers."""
+
+    def _rollups(self, persistence, resolution):
+        return persistence._get_connection().execute(
+            """
+            SELECT bucket_start, scope, count, sum, min, max FROM metrics_rollups
+            WHERE resolution = ? AND metric_table = 'task_metrics'
+              AND field = 'duration_ms'
+            ORDER BY bucket_start, scope
+            """,
+            (resolution,),
+        ).fetchall()
+
+    def test_flushes_accumulate_into_rollups(self, persistence):
+        """Each flush adds to the hour and day buckets of its rows."""
+        base = datetime.fromtimestamp(1_735_732_800)  # 2025-01-01 12:00 UTC
+        for duration, minutes in ((100, 5), (300, 50), (200, 70)):
+            persistence.write_task_metric(
+                "task", "agent_001", duration, 10, True,
+                timestamp=base + timedelta(minutes=minutes),
+            )
+            persistence.flush()
+
+        hourly = [tuple(row) for row in self._rollups(persistence, "hour")]
+        daily = [tuple(row) for row in self._rollups(persistence, "day")]
+
+        assert hourly == [
+            (1_735_732_800, "agent_001", 2, 400, 100, 300),
+            (1_735_736_400, "agent_001", 1, 200, 200, 200),
+        ]
+        assert daily == [(1_735_689_600, "agent_001", 3, 600, 100, 300)]
+
+    def test_retention_tiers(self, persistence):
+        """Hourly rollups go after hourly_days, daily ones after daily_days."""
+        now = datetime.now()
+        for days in (5, 40, 120):
+            persistence.write_task_metric(
+                f"task_{days}", "agent_001", 1000, 10, True,
+                timestamp=now - timedelta(days=days),
+            )
+        persistence.flush()
+
+        stats = persistence.cleanup_old_data()
+
+        # One rollup row per task field (duration, tokens, success)
+        assert stats["hourly_deleted"] == 2 * 3
+        assert stats["daily_deleted"] == 1 * 3
+        assert len(self._rollups(persistence, "hour")) == 1
+        assert len(self._rollups(persistence, "day")) == 2
+
+    def test_backfill_on_upgrade(self, temp_db_path):
+        """Opening a database from before rollups rolls up its rows."""
+        persistence = MetricsPersistence(
+            db_path=temp_db_path,
+            retention_policy=RetentionPolicy(auto_cleanup=False),
+            write_buffer_config=WriteBufferConfig(enabled=False),
+        )
+        for i in range(10):
+            persistence.write_task_metric(f"task_{i}", f"agent_{i % 2}", 100 * i, 10, True)
+        persistence.flush()
+        with persistence.transaction() as conn:
+            conn.execute("DELETE FROM metrics_rollups")
+            conn.execute(
+                """
+                UPDATE storage_schema_versions SET version = '2.2.0'
+                WHERE component = 'metrics_persistence'
+                """
+            )
+        persistence.close()
+
+        with MetricsPersistence(
+            db_path=temp_db_path,
+            retention_policy=RetentionPolicy(auto_cleanup=False),
+            write_buffer_config=WriteBufferConfig(enabled=False),
+        ) as reopened:
+            daily = self._rollups(reopened, "day")
+
+        assert sum(row["count"] for row in daily) == 10
+        assert sum(row["sum"] for row in daily) == 4500
+        assert {row["scope"] for row in daily} == {"agent_0", "agent_1"}
+
+
+class TestArchiveBlockIndex:
+    """Test the per-block time range and agent bloom bits of archives."""
+
+    def _write_old(self, persistence, agents):
+        old = datetime.now() - timedelta(days=10)
+        for i, agent_id in enumerate(agents):
+            persistence.write_task_metric(
+                f"task_{i}", agent_id, 1000, 10, True, timestamp=old + timedelta(minutes=i)
+            )
+        persistence.flush()
+        return int(old.timestamp())
+
+    def _blocks(self, persistence):
+        return persistence._get_connection().execute(
+            """
+            SELECT min_timestamp, max_timestamp, agent_bloom FROM metrics_archive
+            WHERE metric_table = 'task_metrics'
+            """
+        ).fetchall()
+
+    def test_compression_indexes_blocks(self, persistence):
+        """Archived blocks carry their time range and agent bloom bits."""
+        start = self._write_old(persistence, ["agent_a", "agent_b", "agent_a"])
+
+        persistence.compress_historical_data()
+
+        (block,) = self._blocks(persistence)
+        assert block["min_timestamp"] == start
+        assert block["max_timestamp"] == start + 120
+        assert block["agent_bloom"] == archive_bloom_bits("agent_a") | archive_bloom_bits("agent_b")
+
+    def test_upgrade_indexes_existing_blocks(self, temp_db_path):
+        """Blocks archived before the index existed are indexed on upgrade."""
+        config = dict(
+            retention_policy=RetentionPolicy(auto_cleanup=False),
+            write_buffer_config=WriteBufferConfig(enabled=False),
+        )
+        with MetricsPersistence(db_path=temp_db_path, **config) as persistence:
+            start = self._write_old(persistence, ["agent_a"])
+            persistence.compress_historical_data()
+            with persistence.transaction() as conn:
+                conn.execute("DROP INDEX idx_archive_block_time")
+                for column in ("min_timestamp", "max_timestamp", "agent_bloom"):
+                    conn.execute(f"ALTER TABLE metrics_archive DROP COLUMN {column}")
+                conn.execute(
+                    """
+                    UPDATE storage_schema_versions SET version = '2.3.0'
+                    WHERE component = 'metrics_persistence'
+                    """
+                )
+
+        with MetricsPersistence(db_path=temp_db_path, **config) as reopened:
+            (block,) = self._blocks(reopened)
+
+        assert tuple(block) == (start, start, archive_bloom_bits("agent_a"))
+
+
+def _agent_rows(count):
+    return [
+        {
+            "id": 1000 + i,
+            "agent_id": f"agent_{i % 4}",
+            "timestamp": 1_735_732_800 + i * 30,
+            "metric_type": "cpu",
+            "value": 0.25 + i * 0.01,
+            "metadata": None if i % 2 else '{"host": "a"}',
+        }
+        for i in range(count)
+    ]
+
+
+class TestArchiveFormat:
+    """Test columnar archive blocks and legacy JSON blocks."""
+
+    def test_columnar_round_trip(self):
+        """Rows survive encoding exactly; opt-in float32 keeps about 7 digits."""
+        rows = _agent_rows(200)
+
+        exact = decode_archive_block(encode_archive_block(rows))
+        narrow = decode_archive_block(encode_archive_block(rows, float32=True))
+
+        assert exact == rows
+        assert [row["timestamp"] for row in narrow] == [row["timestamp"] for row in rows]
+        assert [row["metadata"] for row in narrow] == [row["metadata"] for row in rows]
+        assert [row["value"] for row in narrow] == pytest.approx(
+            [row["value"] for row in rows], rel=1e-6
+        )
+
+    def test_float32_columns_decode_to_stored_value(self):
+        """Opt-in float32 columns decode to the float of the stored float32."""
+        values = [0.199, 16777217.0]
+        rows = [dict(row, value=value) for row, value in zip(_agent_rows(2), values)]
+        block = encode_archive_block(rows, float32=True)
+
+        stored = [struct.unpack("<f", struct.pack("<f", value))[0] for value in values]
+        assert [row["value"] for row in decode_archive_block(block)] == stored
+        column = decode_archive_columns(block, ["value"])["value"]
+        assert getattr(column, "dtype", None) == "float32" or column.typecode == "f"
+
+    def test_read_selected_columns(self):
+        """Single columns decode without the rest of the block."""
+        rows = _agent_rows(50)
+
+        columns = decode_archive_columns(encode_archive_block(rows), ["timestamp", "agent_id"])
+
+        assert list(columns) == ["agent_id", "timestamp"]
+        assert list(columns["timestamp"]) == [row["timestamp"] for row in rows]
+        assert columns["agent_id"] == [row["agent_id"] for row in rows]
+
+    def test_columnar_is_smaller_than_json(self):
+        """Column-wise encoding beats zlib over JSON rows."""
+        rows = _agent_rows(1000)
+
+        columnar = encode_archive_block(rows)
+        legacy = zlib.compress(json.dumps(rows).encode("utf-8"), 6)
+
+        assert len(columnar) < len(legacy)
+
+    def test_json_blocks_stay_readable(self, temp_db_path):
+        """Databases keep serving blocks archived in the JSON format."""
+        old = datetime.now() - timedelta(days=10)
+        for archive_format in ("json", "columnar"):
+            with MetricsPersistence(
+                db_path=temp_db_path,
+                retention_policy=RetentionPolicy(auto_cleanup=False),
+                compression_config=CompressionConfig(archive_format=archive_format),
+                write_buffer_config=WriteBufferConfig(enabled=False),
+            ) as persistence:
+                persistence.write_task_metric(
+                    f"task_{archive_format}", "agent_001", 1500, 10, True, timestamp=old
+                )
+                persistence.flush()
+                persistence.compress_historical_data()
+
+            blocks = persistence._get_connection().execute(
+                "SELECT compressed_data FROM metrics_archive ORDER BY id"
+            ).fetchall()
+        rows = [decode_archive_block(block[0])[0] for block in blocks]
+
+        assert [row["task_id"] for row in rows] == ["task_json", "task_columnar"]
+        assert rows[0] == rows[1] | {"id": rows[0]["id"], "task_id": "task_json"}
+        assert decode_archive_columns(blocks[0][0], ["duration_ms"]) == {"duration_ms": [1500]}
+
+
 # ============================================================================
 # Test Category 5: Concurrency and Thread Safety
 # ============================================================================
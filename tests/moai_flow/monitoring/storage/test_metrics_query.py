@@ -17,18 +17,29 @@ Test Categories:
 5. Top/Bottom Queries
 6. Summary Statistics
 7. Performance Benchmarks
+8. Query Result Cache
+9. Exact and Approximate Percentiles
+10. Rollup-Backed Time Series
+11. Archived Metrics
 """
 
 import pytest
+import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from moai_flow.monitoring.storage.metrics_persistence import MetricsPersistence
+from moai_flow.monitoring.storage.metrics_persistence import (
+    CompressionConfig,
+    MetricsPersistence,
+    RetentionPolicy,
+    WriteBufferConfig,
+)
 from moai_flow.monitoring.storage.metrics_query import (
     MetricsQuery,
     QueryFilter,
     AggregationFunc,
+    PercentileMode,
     TimeInterval,
 )
 
@@ -461,6 +472,358 @@ class TestEdgeCases:
         # Connection should be closed after exit
 
 
+# ============================================================================
+# Query Result Cache
+# ============================================================================
+
+
+@pytest.fixture
+def writer(populated_db):
+    """Persistence instance that only writes when flushed."""
+    persistence = MetricsPersistence(
+        db_path=populated_db,
+        retention_policy=RetentionPolicy(auto_cleanup=False),
+        write_buffer_config=WriteBufferConfig(enabled=False),
+    )
+    yield persistence
+    persistence.close()
+
+
+class TestQueryCache:
+    """Test the LRU result cache and write-generation invalidation."""
+
+    def test_repeated_query_is_served_from_cache(self, query):
+        """A repeated dashboard query hits the cache and returns a copy."""
+        filter = QueryFilter(start_time=datetime.now() - timedelta(hours=3))
+
+        first = query.get_summary_stats(filter)
+        first["total_tasks"] = -1
+        second = query.get_summary_stats(
+            QueryFilter(start_time=filter.start_time, limit=5)
+        )
+
+        stats = query.get_cache_stats()
+        assert second["total_tasks"] == 100
+        # Summary plus its percentile lookup, then one hit (limit is unused)
+        assert stats["misses"] == 2 and stats["hits"] == 1
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_flush_invalidates_only_written_tables(self, query, writer):
+        """A flush to task_metrics leaves cached agent_metrics results valid."""
+        query.get_top_agents(metric_type="avg_duration_ms")
+        query.calculate_average("agent_metrics", "value")
+
+        writer.write_task_metric("task_new", "agent_9", 10, 1, True)
+        writer.flush()
+
+        top = query.get_top_agents(metric_type="avg_duration_ms")
+        query.calculate_average("agent_metrics", "value")
+
+        stats = query.get_cache_stats()
+        assert top[0]["agent_id"] == "agent_9"
+        assert stats["invalidations"] == 1
+        assert stats["hits"] == 1
+        assert writer.get_write_generations()["task_metrics"]["generation"] >= 2
+
+    def test_closed_range_survives_appends(self, query, writer):
+        """Closed time ranges stay cached until rows are deleted or archived."""
+        now = datetime.now()
+        closed = QueryFilter(start_time=now - timedelta(hours=3), end_time=now - timedelta(hours=1))
+        before = query.calculate_average("task_metrics", "duration_ms", closed)
+
+        writer.write_task_metric("task_new", "agent_0", 99_999, 1, True)
+        writer.flush()
+        assert query.calculate_average("task_metrics", "duration_ms", closed) == before
+        assert query.get_cache_stats()["hits"] == 1
+
+        writer.compress_historical_data(cutoff_date=now - timedelta(minutes=90))
+        query.calculate_average("task_metrics", "duration_ms", closed)
+        assert query.get_cache_stats()["invalidations"] == 1
+
+    def test_lru_eviction_and_disable(self, populated_db):
+        """The cache holds cache_size entries; cache_size=0 turns it off."""
+        with MetricsQuery(db_path=populated_db, cache_size=2) as query:
+            for field in ("duration_ms", "tokens_used", "duration_ms", "success"):
+                query.calculate_average("task_metrics", field)
+            stats = query.get_cache_stats()
+            assert stats["size"] == 2
+            assert stats["evictions"] == 1
+            assert stats["hits"] == 1
+
+        with MetricsQuery(db_path=populated_db, cache_size=0) as query:
+            query.calculate_average("task_metrics", "duration_ms")
+            query.calculate_average("task_metrics", "duration_ms")
+            assert query.get_cache_stats()["hits"] == 0
+
+
+# ============================================================================
+# Exact and Approximate Percentiles
+# ============================================================================
+
+# populated_db task durations, sorted
+DURATIONS = [1000 + i * 50 for i in range(100)]
+
+
+class TestPercentiles:
+    """Test single-pass exact and histogram-backed approximate percentiles."""
+
+    def test_exact_percentiles_in_one_call(self, query):
+        """calculate_percentiles matches the per-percentile results."""
+        result = query.calculate_percentiles("task_metrics", "duration_ms")
+
+        assert result == {"p50": 3500, "p90": 5500, "p95": 5750, "p99": 5950}
+        for p in (0.5, 0.9, 0.95, 0.99):
+            key = f"p{int(p * 100)}"
+            assert query.calculate_percentile("task_metrics", "duration_ms", p) == result[key]
+        # Low percentiles scan from the other end
+        assert query.calculate_percentiles("task_metrics", "duration_ms", (0.1, 0.001)) == {
+            "p10": 1500,
+            "p0.1": 1000,
+        }
+
+    def test_exact_percentile_with_agent_filter(self, query):
+        """Filters apply to the count and the ranked scan alike."""
+        agent_durations = DURATIONS[2::5]
+
+        p50 = query.calculate_percentile(
+            "task_metrics", "duration_ms", 0.5, QueryFilter(agent_id="agent_2")
+        )
+
+        assert p50 == agent_durations[10]
+
+    def test_approximate_percentiles_within_accuracy(self, query):
+        """Histogram percentiles are within 1% of the exact values."""
+        exact = query.calculate_percentiles("task_metrics", "duration_ms")
+        approx = query.calculate_percentiles(
+            "task_metrics", "duration_ms", mode=PercentileMode.APPROXIMATE
+        )
+        agent_approx = query.calculate_percentile(
+            "task_metrics", "duration_ms", 0.5, QueryFilter(agent_id="agent_2"), mode="approximate"
+        )
+
+        for key, value in exact.items():
+            assert approx[key] == pytest.approx(value, rel=0.011)
+        assert agent_approx == pytest.approx(DURATIONS[2::5][10], rel=0.011)
+
+    def test_approximate_falls_back_without_histogram(self, query):
+        """Fields without histograms are answered exactly."""
+        approx = query.calculate_percentile(
+            "task_metrics", "success", 0.5, mode=PercentileMode.APPROXIMATE
+        )
+
+        assert approx == 1
+
+    def test_histograms_written_at_flush(self, populated_db, writer):
+        """Each flush adds its rows to the whole-table and per-agent histograms."""
+        writer.write_task_metric("task_new", "agent_0", 0, 1, True)
+        writer.flush()
+
+        counts = dict(writer.engine.get_connection().execute(
+            """
+            SELECT scope, SUM(count) FROM metrics_histograms
+            WHERE metric_table = 'task_metrics' AND field = 'duration_ms'
+            GROUP BY scope
+            """
+        ).fetchall())
+
+        assert counts[""] == 101
+        assert counts["agent_0"] == 21
+        with MetricsQuery(db_path=populated_db) as query:
+            assert query.calculate_percentile(
+                "task_metrics", "duration_ms", 0.0, mode="approximate"
+            ) == 0.0
+
+
+# ============================================================================
+# Rollup-Backed Time Series
+# ============================================================================
+
+
+def _raw_series(db_path, time_format, agg_func, start, agent_id=None):
+    """aggregate_by_time computed straight from task_metrics rows."""
+    query = f"""
+        SELECT strftime('{time_format}', datetime(timestamp, 'unixepoch')),
+               {agg_func}(duration_ms), COUNT(*)
+        FROM task_metrics WHERE timestamp >= ?
+    """
+    params = [int(start.timestamp())]
+    if agent_id:
+        query += " AND agent_id = ?"
+        params.append(agent_id)
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(query + " GROUP BY 1 ORDER BY 1", params).fetchall()
+
+
+class TestRollupTimeSeries:
+    """Test aggregate_by_time routed to the hourly and daily rollups."""
+
+    @pytest.mark.parametrize(
+        "interval,time_format",
+        [
+            (TimeInterval.HOUR, "%Y-%m-%d %H:00:00"),
+            (TimeInterval.DAY, "%Y-%m-%d"),
+            (TimeInterval.WEEK, "%Y-W%W"),
+        ],
+    )
+    @pytest.mark.parametrize("agent_id", [None, "agent_3"])
+    def test_rollups_match_raw_rows(self, populated_db, query, interval, time_format, agent_id):
+        """Whole buckets from rollups plus raw edges equal the raw aggregation."""
+        start = datetime.now() - timedelta(minutes=75, seconds=30)
+        filter = QueryFilter(start_time=start, agent_id=agent_id)
+
+        for agg in ("avg", "sum", "min", "max", "count"):
+            series = query.aggregate_by_time("task_metrics", "duration_ms", interval, agg, filter)
+            expected = _raw_series(populated_db, time_format, agg, start, agent_id)
+
+            assert [row["time_bucket"] for row in series] == [row[0] for row in expected]
+            assert [row["count"] for row in series] == [row[2] for row in expected]
+            assert [row["value"] for row in series] == pytest.approx([row[1] for row in expected])
+
+    def test_rollups_answer_after_archival(self, query, writer):
+        """Daily and hourly series survive compression of the detailed rows."""
+        filter = QueryFilter(start_time=datetime.now() - timedelta(days=2))
+        before = query.aggregate_by_time(
+            "task_metrics", "duration_ms", TimeInterval.DAY, AggregationFunc.SUM
+        )
+        minutes = query.aggregate_by_time(
+            "task_metrics", "duration_ms", TimeInterval.MINUTE, AggregationFunc.SUM, filter
+        )
+
+        writer.compress_historical_data(cutoff_date=datetime.now() + timedelta(minutes=1))
+
+        after = query.aggregate_by_time(
+            "task_metrics", "duration_ms", TimeInterval.DAY, AggregationFunc.SUM
+        )
+        assert after == before
+        assert sum(row["count"] for row in after) == 100
+        # Minute buckets come from the archived rows
+        assert query.aggregate_by_time(
+            "task_metrics", "duration_ms", TimeInterval.MINUTE, AggregationFunc.SUM, filter
+        ) == minutes
+
+
+# ============================================================================
+# Archived Metrics
+# ============================================================================
+
+
+@pytest.fixture
+def archiver(populated_db):
+    """Persistence instance archiving 10 rows per table per compression run."""
+    persistence = MetricsPersistence(
+        db_path=populated_db,
+        retention_policy=RetentionPolicy(auto_cleanup=False),
+        compression_config=CompressionConfig(batch_size=10),
+        write_buffer_config=WriteBufferConfig(enabled=False),
+    )
+    yield persistence
+    persistence.close()
+
+
+def _archive(archiver, minutes_ago, runs):
+    """Compress rows older than minutes_ago into `runs` blocks per table."""
+    cutoff = datetime.now() - timedelta(minutes=minutes_ago)
+    for _ in range(runs):
+        archiver.compress_historical_data(cutoff_date=cutoff)
+
+
+class TestArchivedMetrics:
+    """Test reading compressed archive blocks back through get_metrics."""
+
+    def test_archived_rows_are_still_returned(self, query, archiver):
+        """Pages look the same before and after rows are archived."""
+        pages = [QueryFilter(limit=1000), QueryFilter(limit=20, offset=40)]
+        before = [query.get_metrics("task_metrics", page) for page in pages]
+
+        _archive(archiver, minutes_ago=30, runs=5)
+
+        assert [query.get_metrics("task_metrics", page) for page in pages] == before
+        assert len(query.get_task_metrics(QueryFilter(limit=1000))) == 100
+
+    def test_only_overlapping_blocks_are_decompressed(self, query, archiver):
+        """Time ranges and agent bloom bits select blocks; blocks are cached."""
+        _archive(archiver, minutes_ago=30, runs=5)
+        now = datetime.now()
+        # The third block holds task_020..task_029, written 80-71 minutes ago
+        one_block = QueryFilter(
+            start_time=now - timedelta(minutes=79.5), end_time=now - timedelta(minutes=74.5)
+        )
+
+        rows = query.get_task_metrics(one_block)
+        query.get_task_metrics(one_block)
+        query.get_task_metrics(QueryFilter(agent_id="agent_unknown"))
+        query.get_task_metrics(QueryFilter(limit=10))
+
+        blocks = query.get_cache_stats()["archive_blocks"]
+        assert [row["task_id"] for row in rows] == [f"task_0{i}" for i in range(25, 20, -1)]
+        assert blocks["misses"] == 1
+        assert blocks["hits"] == 1
+
+    def test_filters_apply_to_archived_rows(self, query, archiver):
+        """Agent, success and metric type filters match archived rows too."""
+        _archive(archiver, minutes_ago=0, runs=20)
+
+        failed = query.get_task_metrics(QueryFilter(success=False, limit=1000))
+        agent = query.get_task_metrics(QueryFilter(agent_id="agent_2", limit=1000))
+        throughput = query.get_agent_metrics(QueryFilter(metric_type="throughput"))
+
+        assert query.get_metrics("task_metrics", QueryFilter(limit=1)) != []
+        assert len(failed) == 10
+        assert all(row["success"] == 0 for row in failed)
+        assert len(agent) == 20
+        assert len(throughput) == 50
+
+    def test_aggregates_include_archived_rows(self, query, archiver):
+        """Averages, exact percentiles, rankings and summaries survive archival."""
+        agent = QueryFilter(agent_id="agent_3")
+
+        def snapshot():
+            return (
+                query.calculate_average("task_metrics", "duration_ms"),
+                query.calculate_average("agent_metrics", "value", agent),
+                query.calculate_percentiles("task_metrics", "duration_ms"),
+                query.calculate_percentile("task_metrics", "duration_ms", 0.95, agent),
+                query.get_top_agents(order="desc", limit=3),
+                query.get_slowest_tasks(limit=5),
+                query.get_summary_stats(),
+                query.get_summary_stats(agent),
+            )
+
+        before = snapshot()
+        # Half the task rows archived, half live
+        _archive(archiver, minutes_ago=50, runs=20)
+        assert snapshot() == before
+
+        _archive(archiver, minutes_ago=0, runs=20)
+        assert len(query._archived_rows("task_metrics", QueryFilter(), [])) == 100
+        after = snapshot()
+        assert after == before
+        assert after[6]["total_tasks"] == 100
+        assert after[6]["unique_agents"] == 5
+
+    @pytest.mark.parametrize("interval", [TimeInterval.MINUTE, TimeInterval.HOUR])
+    def test_time_series_spans_archive_and_live_rows(self, query, archiver, interval):
+        """Raw and rollup-edge buckets read archived rows next to live ones."""
+        now = datetime.now()
+        filter = QueryFilter(
+            start_time=now - timedelta(minutes=75, seconds=30),
+            end_time=now - timedelta(minutes=10, seconds=30),
+        )
+        series = {
+            agg: query.aggregate_by_time("task_metrics", "duration_ms", interval, agg, filter)
+            for agg in ("avg", "count", "max")
+        }
+
+        # Rows older than 50 minutes archived, the rest live
+        _archive(archiver, minutes_ago=50, runs=20)
+
+        for agg, before in series.items():
+            assert query.aggregate_by_time(
+                "task_metrics", "duration_ms", interval, agg, filter
+            ) == before
+        assert sum(row["count"] for row in series["count"]) == 65
+
+
 # ============================================================================
 # Performance Benchmarks
 # ============================================================================
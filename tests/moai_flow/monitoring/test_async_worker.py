@@ -0,0 +1,328 @@
+"""
+Tests for the MetricsCollector async worker.
+
+Test Areas:
+1. Batch draining through the storage batch API
+2. Backpressure policies (drop oldest, block, sample)
+3. Persistence failure accounting
+4. Batched writes into the SQLite MetricsStorage
+5. Per-thread buffers merged in time order
+6. Wall-clock steps applied when rows are stored
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from moai_flow.monitoring.metrics_collector import (
+    AsyncWorkerConfig,
+    BackpressurePolicy,
+    MetricsCollector,
+    TaskMetric,
+    TaskResult,
+)
+from moai_flow.monitoring.metric_buffer import parse_timestamp
+from moai_flow.monitoring.metrics_storage import MetricsStorage
+
+
+def _stall_worker(collector):
+    """Hold the flush lock so the worker cannot drain the thread buffers."""
+    collector._flush_lock.acquire()
+    return collector._flush_lock.release
+
+
+def _record(collector, count, start=0):
+    for i in range(start, start + count):
+        collector.record_task_metric(f"task-{i}", "agent-1", float(i), TaskResult.SUCCESS)
+
+
+class TestBatchDraining:
+    """Test that the worker hands batches to storage."""
+
+    def test_worker_uses_batch_api(self):
+        """Queued metrics reach storage through save_task_metrics_batch."""
+        storage = Mock()
+        collector = MetricsCollector(
+            storage=storage,
+            async_mode=True,
+            worker_config=AsyncWorkerConfig(max_batch_size=64),
+        )
+        release = _stall_worker(collector)
+        _record(collector, 100)
+        release()
+        collector.shutdown()
+
+        saved = [m for call in storage.save_task_metrics_batch.call_args_list for m in call.args[0]]
+        stats = collector.get_queue_stats()
+
+        assert len(collector._task_metrics) == 100
+        assert [m["task_id"] for m in saved] == [f"task-{i}" for i in range(100)]
+        assert storage.save_task_metric.call_count == 0
+        assert stats["processed"] == 100
+        assert stats["batches"] == 2
+        assert stats["largest_batch"] == 64
+
+    def test_single_save_fallback(self):
+        """Storage without a batch method gets one save call per metric."""
+        storage = Mock(spec=["save_task_metric"])
+        collector = MetricsCollector(storage=storage, async_mode=True)
+        _record(collector, 5)
+        collector.shutdown()
+
+        assert storage.save_task_metric.call_count == 5
+
+    def test_persist_errors_are_counted(self):
+        """A failing batch is logged and counted; metrics stay in memory."""
+        storage = Mock()
+        storage.save_task_metrics_batch.side_effect = Exception("disk full")
+        collector = MetricsCollector(storage=storage, async_mode=True)
+        _record(collector, 3)
+        collector.shutdown()
+
+        assert len(collector._task_metrics) == 3
+        assert collector.get_queue_stats()["persist_errors"] == 3
+
+    def test_malformed_metric_is_dropped_alone(self):
+        """A bad row is dropped and counted; the rest of its batch persists."""
+        storage = Mock()
+        collector = MetricsCollector(storage=storage, async_mode=True)
+        release = _stall_worker(collector)
+        _record(collector, 5)
+        collector.record_task_metric("task-bad", "agent-1", 1.0, result="success")
+        _record(collector, 5, start=5)
+        release()
+        collector.flush()
+
+        saved = [m for call in storage.save_task_metrics_batch.call_args_list for m in call.args[0]]
+
+        assert len(collector._task_metrics) == 10
+        assert len(saved) == 10
+        assert saved[0]["result"] == "success"
+        assert collector.get_queue_stats()["persist_errors"] == 1
+        collector.shutdown()
+
+    def test_sync_mode_never_raises(self):
+        """Sync recording logs and counts malformed metrics instead of raising."""
+        storage = Mock()
+        collector = MetricsCollector(storage=storage, async_mode=False)
+        collector.record_task_metric("task-1", "agent-1", 1.0, result="success")
+        collector.record_task_metric("task-2", "agent-1", 1.0, TaskResult.SUCCESS, tokens_used=None)
+        _record(collector, 1)
+
+        assert len(collector._task_metrics) == 1
+        assert storage.save_task_metric.call_count == 1
+        assert collector.get_queue_stats()["persist_errors"] == 2
+
+
+class TestBackpressure:
+    """Test queue-full policies."""
+
+    def test_drop_oldest_keeps_newest(self):
+        """DROP_OLDEST evicts queued metrics and never blocks the caller."""
+        collector = MetricsCollector(async_mode=True, queue_size=4)
+        release = _stall_worker(collector)
+        _record(collector, 20)
+        release()
+        collector.shutdown()
+
+        stats = collector.get_queue_stats()
+        task_ids = [m.task_id for m in collector._task_metrics]
+
+        assert stats["dropped"] == 16
+        assert stats["processed"] == 4
+        assert task_ids == ["task-16", "task-17", "task-18", "task-19"]
+        assert stats["backpressure"] == "drop_oldest"
+
+    def test_block_times_out_and_drops(self):
+        """BLOCK waits block_timeout_ms for space, then drops the metric."""
+        collector = MetricsCollector(
+            async_mode=True,
+            queue_size=2,
+            worker_config=AsyncWorkerConfig(
+                backpressure=BackpressurePolicy.BLOCK, block_timeout_ms=5
+            ),
+        )
+        release = _stall_worker(collector)
+        _record(collector, 6)
+        release()
+        collector.shutdown()
+
+        stats = collector.get_queue_stats()
+
+        assert stats["blocked"] == 4
+        assert stats["dropped"] == 4
+        assert stats["processed"] == 2
+
+    def test_block_waits_for_worker(self):
+        """A blocked caller proceeds once the worker frees space."""
+        collector = MetricsCollector(
+            async_mode=True,
+            queue_size=1,
+            worker_config=AsyncWorkerConfig(
+                backpressure=BackpressurePolicy.BLOCK, block_timeout_ms=2000
+            ),
+        )
+        release = _stall_worker(collector)
+        _record(collector, 1)
+        threading.Timer(0.05, release).start()
+        _record(collector, 2, start=1)
+        collector.shutdown()
+
+        stats = collector.get_queue_stats()
+
+        assert stats["dropped"] == 0
+        assert len(collector._task_metrics) == 3
+
+    def test_sample_above_high_water_mark(self):
+        """SAMPLE keeps one metric in sample_every once the queue is filling up."""
+        collector = MetricsCollector(
+            async_mode=True,
+            queue_size=1000,
+            worker_config=AsyncWorkerConfig(
+                backpressure=BackpressurePolicy.SAMPLE,
+                sample_every=10,
+                high_water_mark=0.1,
+            ),
+        )
+        release = _stall_worker(collector)
+        _record(collector, 300)
+        release()
+        collector.shutdown()
+
+        stats = collector.get_queue_stats()
+
+        # The first 100 are staged, then 1 in 10 of the remaining 200
+        assert stats["sampled_out"] == 180
+        assert stats["dropped"] == 0
+        assert stats["processed"] + stats["sampled_out"] == 300
+
+
+class TestStorageBatchApi:
+    """Test the SQLite MetricsStorage batch methods used by the worker."""
+
+    def test_collector_batches_into_sqlite(self, tmp_path):
+        """Metrics recorded asynchronously are readable from MetricsStorage."""
+        storage = MetricsStorage(db_path=tmp_path / "metrics.db")
+        collector = MetricsCollector(storage=storage, async_mode=True)
+        _record(collector, 50)
+        collector.record_agent_metric("agent-1", "cpu", 0.5)
+        collector.record_swarm_metric("swarm-1", "active_agents", 3)
+        collector.shutdown()
+
+        tasks = storage.get_task_metrics(agent_id="agent-1", limit=100)
+
+        assert len(tasks) == 50
+        assert {t["result"] for t in tasks} == {"success"}
+        assert len(storage.get_agent_metrics("agent-1")) == 1
+        assert collector.get_queue_stats()["persist_errors"] == 0
+        storage.close()
+
+    def test_redelivered_task_metric_is_replaced(self, tmp_path):
+        """The same task and timestamp saved twice is one row."""
+        storage = MetricsStorage(db_path=tmp_path / "metrics.db")
+        metric = {
+            "task_id": "task-1",
+            "agent_id": "agent-1",
+            "duration_ms": 10.0,
+            "result": "success",
+            "timestamp": "2025-01-01T12:00:00Z",
+        }
+
+        assert storage.save_task_metrics_batch([metric, dict(metric, duration_ms=12.0)]) == 2
+        rows = storage.get_task_metrics(task_id="task-1")
+
+        assert len(rows) == 1
+        assert rows[0]["duration_ms"] == 12.0
+        storage.close()
+
+
+class TestThreadBuffers:
+    """Test per-thread staging and merging."""
+
+    def test_threads_merge_in_time_order(self):
+        """Rows from several threads are stored in timestamp order."""
+        collector = MetricsCollector(async_mode=True)
+        release = _stall_worker(collector)
+        threads = [
+            threading.Thread(target=_record, args=(collector, 200, n * 1000))
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert collector.get_queue_stats()["queue_depth"] == 800
+        release()
+        assert collector.flush() == 800
+
+        stats = collector.get_queue_stats()
+        assert len(collector._task_metrics) == 800
+        assert not collector._task_metrics._unordered
+        assert collector.get_collection_overhead()["total_collections"] == 800
+        assert stats["thread_buffers"] >= 4
+        collector.shutdown()
+
+    def test_exited_thread_buffers_are_retired(self):
+        """Buffers of finished threads are dropped once drained; counts survive."""
+        collector = MetricsCollector(async_mode=True)
+        worker = threading.Thread(target=_record, args=(collector, 10))
+        worker.start()
+        worker.join()
+        collector.flush()
+
+        _record(collector, 1, start=10)
+
+        assert collector.get_queue_stats()["thread_buffers"] == 1
+        assert collector.get_collection_overhead()["total_collections"] == 11
+        collector.shutdown()
+
+    def test_overhead_is_sampled(self):
+        """Only one record_* call in overhead_sample_every is timed."""
+        collector = MetricsCollector(async_mode=False, overhead_sample_every=100)
+        _record(collector, 250)
+
+        overhead = collector.get_collection_overhead()
+
+        assert overhead["total_collections"] == 250
+        assert overhead["sampled_collections"] == 3
+        assert overhead["max_collection_time_ms"] >= overhead["avg_collection_time_ms"] > 0
+        collector.shutdown()
+
+
+class TestClockOffset:
+    """Test that staged monotonic times follow the current wall clock."""
+
+    DAY_NS = 86_400 * 10**9
+
+    def test_wall_clock_step_applies_on_flush(self, monkeypatch):
+        """A wall-clock step after construction shows up in flushed timestamps."""
+        storage = Mock()
+        collector = MetricsCollector(storage=storage, async_mode=True)
+        real_time_ns = time.time_ns
+        monkeypatch.setattr(time, "time_ns", lambda: real_time_ns() + self.DAY_NS)
+
+        _record(collector, 1)
+        collector.flush()
+        expected_us = time.time_ns() // 1000
+
+        saved = storage.save_task_metrics_batch.call_args.args[0][0]
+        assert abs(parse_timestamp(saved["timestamp"]) - expected_us) < 10**6
+        collector.shutdown()
+
+    def test_sync_timestamp_round_trips(self):
+        """A metric stored in sync mode keeps its own timestamp exactly."""
+        storage = Mock()
+        collector = MetricsCollector(storage=storage, async_mode=False)
+        metric = TaskMetric(
+            task_id="task-1",
+            agent_id="agent-1",
+            duration_ms=1.0,
+            result=TaskResult.SUCCESS,
+            timestamp="2026-01-02T03:04:05.123456",
+        )
+        collector._record_task_sync(metric)
+
+        saved = storage.save_task_metric.call_args.args[0]
+        assert parse_timestamp(saved["timestamp"]) == parse_timestamp(metric.timestamp)
+        collector.shutdown()
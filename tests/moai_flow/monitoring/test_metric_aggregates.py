@@ -0,0 +1,228 @@
+"""
+Tests for streaming metric aggregates and quantile sketches.
+
+Test Areas:
+1. QuantileSketch exact and log-bucket modes
+2. Sketch and aggregate merging
+3. Welford variance
+4. MetricsCollector statistics from time buckets
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from moai_flow.monitoring.metric_aggregates import (
+    AggregateConfig,
+    AggregateIndex,
+    QuantileSketch,
+    TaskAggregate,
+)
+from moai_flow.monitoring.metric_buffer import MetricBufferConfig, format_timestamp, to_epoch_us
+from moai_flow.monitoring.metrics_collector import MetricsCollector, TaskMetric, TaskResult
+
+
+def _nearest_rank(values, q):
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+class TestQuantileSketch:
+    """Test quantile estimation."""
+
+    def test_small_sketch_is_exact(self):
+        """Below exact_threshold quantiles match statistics.median."""
+        sketch = QuantileSketch()
+        values = [1000, 1200, 1400, 1600]
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.exact is not None
+        assert sketch.quantile(0.5) == statistics.median(values)
+        assert sketch.quantile(0.0) == 1000
+        assert sketch.quantile(1.0) == 1600
+
+    def test_bucketed_sketch_within_relative_accuracy(self):
+        """Log buckets keep every quantile within the configured relative error."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(7, 1.2) for _ in range(20_000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.exact is None
+        for q in (0.5, 0.95, 0.99):
+            expected = _nearest_rank(values, q)
+            assert abs(sketch.quantile(q) - expected) / expected <= 0.011
+
+    def test_zero_values_use_zero_bucket(self):
+        """Non-positive values do not break log bucketing."""
+        sketch = QuantileSketch(exact_threshold=0)
+        for value in (0, 0, 0, 10):
+            sketch.add(value)
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(10, rel=0.01)
+
+    def test_merge_matches_single_sketch(self):
+        """Merged sketches answer like one sketch over all values."""
+        rng = random.Random(3)
+        values = [rng.uniform(1, 5000) for _ in range(3000)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 3 else right).add(value)
+
+        left.merge(right)
+
+        assert left.count == whole.count
+        assert left.bins == whole.bins
+        assert left.quantile(0.95) == whole.quantile(0.95)
+
+    def test_round_trip_dict(self):
+        """to_dict/from_dict preserve the sketch."""
+        sketch = QuantileSketch(exact_threshold=4)
+        for value in range(1, 50):
+            sketch.add(value)
+
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+
+        assert restored.quantile(0.9) == sketch.quantile(0.9)
+
+
+class TestTaskAggregate:
+    """Test running statistics."""
+
+    def test_welford_variance_and_merge(self):
+        """Chan's merge gives the same variance as one pass."""
+        values = [float(v) for v in range(1, 101)]
+        whole, a, b = (TaskAggregate(4) for _ in range(3))
+        for i, value in enumerate(values):
+            whole.add(value, 0, 1, 0)
+            (a if i < 37 else b).add(value, i % 2, 1, 0)
+
+        a.merge(b)
+
+        assert whole.variance == pytest.approx(statistics.pvariance(values))
+        assert a.variance == pytest.approx(whole.variance)
+        assert a.mean == pytest.approx(50.5)
+        assert a.result_counts[:2] == [50, 50]
+        assert a.total_tokens == 100
+
+    def test_aggregate_round_trip_dict(self):
+        """Aggregates can be shipped between processes."""
+        aggregate = TaskAggregate(4)
+        aggregate.add(1500.0, 0, 10, 1)
+
+        restored = TaskAggregate.from_dict(aggregate.to_dict())
+
+        assert restored.count == 1
+        assert restored.quantile(0.5) == 1500.0
+        assert TaskAggregate.from_dict(TaskAggregate(4).to_dict()).count == 0
+
+
+class TestCollectorAggregates:
+    """Test MetricsCollector statistics from streaming aggregates."""
+
+    def _record_at(self, collector, timestamp, agent_id, duration_ms):
+        collector._record_task_sync(TaskMetric(
+            task_id="task-1",
+            agent_id=agent_id,
+            duration_ms=duration_ms,
+            result=TaskResult.SUCCESS,
+            timestamp=format_timestamp(to_epoch_us(timestamp)),
+        ))
+
+    def test_partial_buckets_are_exact(self):
+        """Time ranges cutting a bucket are answered from in-memory rows."""
+        collector = MetricsCollector(async_mode=False)
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for second in range(0, 180, 10):
+            self._record_at(collector, base + timedelta(seconds=second), "agent-1", float(second))
+
+        stats = collector.get_task_stats(
+            time_range=(base + timedelta(seconds=25), base + timedelta(seconds=125))
+        )
+
+        assert stats["count"] == 10
+        assert stats["min_duration_ms"] == 30.0
+        assert stats["max_duration_ms"] == 120.0
+        collector.shutdown()
+
+    def test_evicted_partial_bucket_counts_whole(self):
+        """Without the rows, a cut bucket contributes its whole aggregate."""
+        collector = MetricsCollector(
+            async_mode=False,
+            buffer_config=MetricBufferConfig(task_capacity=2),
+        )
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for second in (0, 10, 20, 70):
+            self._record_at(collector, base + timedelta(seconds=second), "agent-1", float(second))
+
+        stats = collector.get_task_stats(
+            time_range=(base + timedelta(seconds=15), base + timedelta(seconds=80))
+        )
+
+        assert stats["count"] == 4
+        collector.shutdown()
+
+    def test_evicted_buckets_answered_from_buffer(self):
+        """Time older than the kept buckets, late rows included, is scanned."""
+        collector = MetricsCollector(
+            async_mode=False,
+            aggregate_config=AggregateConfig(max_buckets=2),
+        )
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for minute in range(4):
+            self._record_at(collector, base + timedelta(minutes=minute), "agent-1", float(minute))
+        self._record_at(collector, base, "agent-1", 10.0)
+
+        stats = collector.get_task_stats()
+        early = collector.get_task_stats(
+            agent_id="agent-1",
+            time_range=(base, base + timedelta(seconds=90))
+        )
+
+        assert stats["count"] == 5
+        assert stats["max_duration_ms"] == 10.0
+        assert early["count"] == 3
+        assert collector.get_queue_stats()["aggregate_dropped"] == 1
+        collector.shutdown()
+
+    def test_bucket_limit_spans_retention_window(self):
+        """Without an explicit limit, buckets cover the retention window."""
+        collector = MetricsCollector(
+            async_mode=False,
+            buffer_config=MetricBufferConfig(retention_seconds=7 * 86400),
+        )
+
+        assert collector._task_aggregates.max_buckets == 7 * 1440 + 1
+        assert AggregateIndex(4).max_buckets == 1440
+        collector.shutdown()
+
+    def test_percentiles_and_cross_collector_merge(self):
+        """Percentiles come from sketches; aggregates merge across collectors."""
+        config = AggregateConfig(exact_threshold=16)
+        first = MetricsCollector(async_mode=False, aggregate_config=config)
+        second = MetricsCollector(async_mode=False, aggregate_config=config)
+        for i in range(1, 201):
+            target = first if i % 2 else second
+            target.record_task_metric(f"task-{i}", "agent-1", float(i * 10), TaskResult.SUCCESS)
+
+        merged = first.get_aggregate(agent_id="agent-1")
+        merged.merge(second.get_aggregate(agent_id="agent-1"))
+        stats = MetricsCollector.stats_from_aggregate(merged)
+        percentiles = first.get_duration_percentiles((50, 99))
+
+        assert stats["count"] == 200
+        assert stats["avg_duration_ms"] == pytest.approx(1005.0)
+        assert stats["p99_duration_ms"] == pytest.approx(1990, rel=0.02)
+        assert stats["stddev_duration_ms"] == pytest.approx(
+            statistics.pstdev(range(10, 2001, 10))
+        )
+        assert set(percentiles) == {"p50", "p99"}
+        assert percentiles["p50"] == pytest.approx(1000, rel=0.02)
+        first.shutdown()
+        second.shutdown()
@@ -0,0 +1,164 @@
+"""
+Tests for MetricRingBuffer - bounded columnar metric storage.
+
+Test Areas:
+1. Capacity bound and oldest-first eviction
+2. Retention window
+3. Time-range selection across the ring wrap
+4. Interning and id encoding
+5. MetricsCollector on bounded buffers
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from moai_flow.monitoring.metric_buffer import (
+    ID,
+    STRING,
+    MetricBufferConfig,
+    MetricRingBuffer,
+    format_timestamp,
+    now_us,
+    to_epoch_us,
+)
+from moai_flow.monitoring.metrics_collector import MetricsCollector, TaskResult
+
+
+def _row(timestamp, values, metadata):
+    return (timestamp, values, metadata)
+
+
+@pytest.fixture
+def buffer():
+    return MetricRingBuffer(
+        capacity=4,
+        columns=(("task_id", ID), ("agent_id", STRING), ("value", "d")),
+        factory=_row,
+    )
+
+
+class TestRingBuffer:
+    """Test capacity, eviction and materialization."""
+
+    def test_overwrites_oldest_when_full(self, buffer):
+        """Capacity is a hard bound; the oldest rows are dropped first."""
+        for i in range(6):
+            buffer.append(1_000 + i, (f"task-{i}", "agent-1", float(i)), {"i": i} if i % 2 else None)
+
+        assert len(buffer) == 4
+        assert [row[1][0] for row in buffer] == ["task-2", "task-3", "task-4", "task-5"]
+        assert buffer[0][2] == {}
+        assert buffer[-1][2] == {"i": 5}
+        assert len(buffer._metadata) == 2
+
+    def test_rows_round_trip(self, buffer):
+        """Ids, strings and timestamps read back exactly."""
+        timestamp = to_epoch_us(datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc))
+        buffer.append(timestamp, ("task-007", "agent-1", 1.5))
+        buffer.append(timestamp, ("task-0", "agent-1", 2.5), raw_timestamp="2025-01-01")
+
+        assert buffer[0] == ("2025-01-01T12:00:00.123456Z", ("task-007", "agent-1", 1.5), {})
+        assert buffer[1][0] == "2025-01-01"
+        assert buffer[1][1][0] == "task-0"
+
+    def test_unique_ids_do_not_grow_string_tables(self):
+        """Numeric id suffixes are stored as integers; other strings are compacted."""
+        buffer = MetricRingBuffer(
+            capacity=10,
+            columns=(("task_id", ID), ("label", STRING)),
+            factory=_row,
+        )
+        for i in range(1_000):
+            buffer.append(i, (f"task-{i}", f"label-{i:05d}"))
+
+        assert len(buffer._interners[0]) == 1
+        assert len(buffer._interners[1]) <= 21
+        assert [row[1][1] for row in buffer][-1] == "label-00999"
+
+    def test_retention_window_evicts_old_rows(self):
+        """Rows older than retention_seconds are dropped."""
+        buffer = MetricRingBuffer(
+            capacity=100,
+            columns=(("value", "d"),),
+            factory=_row,
+            retention_seconds=60,
+        )
+        now = now_us()
+        buffer.append(now - 120_000_000, (1.0,))
+        buffer.append(now - 90_000_000, (2.0,))
+        buffer.append(now, (3.0,))
+
+        assert [row[1][0] for row in buffer] == [3.0]
+
+
+class TestSelect:
+    """Test column selection by time range."""
+
+    def test_select_across_wrap(self, buffer):
+        """Sorted timestamps are bisected into at most two array slices."""
+        for i in range(7):
+            buffer.append(i * 10, (f"task-{i}", "agent-1", float(i)))
+
+        runs = buffer.select(("value",), start_us=40, end_us=60)
+        assert [v for (values,) in runs for v in values] == [4.0, 5.0, 6.0]
+
+        runs = buffer.select(("value", "timestamp"))
+        assert len(runs) == 2
+        assert [t for _, timestamps in runs for t in timestamps] == [30, 40, 50, 60]
+
+    def test_select_with_out_of_order_rows(self, buffer):
+        """Out-of-order timestamps fall back to row filtering."""
+        for timestamp in (10, 30, 20, 40):
+            buffer.append(timestamp, ("task-1", "agent-1", float(timestamp)))
+
+        runs = buffer.select(("value",), start_us=15, end_us=35)
+        assert sorted(v for (values,) in runs for v in values) == [20.0, 30.0]
+
+        # Once the disordered row is evicted, bisection is used again
+        buffer.append(50, ("task-1", "agent-1", 50.0))
+        buffer.append(60, ("task-1", "agent-1", 60.0))
+        assert not buffer._unordered
+
+
+class TestCollectorBuffers:
+    """Test MetricsCollector memory bounds."""
+
+    def test_collector_memory_is_bounded(self):
+        """Task history never exceeds task_capacity; aggregates still cover evicted rows."""
+        collector = MetricsCollector(
+            async_mode=False,
+            buffer_config=MetricBufferConfig(task_capacity=50),
+        )
+        for i in range(120):
+            collector.record_task_metric(
+                task_id=f"task-{i}",
+                agent_id=f"agent-{i % 2}",
+                duration_ms=float(i),
+                result=TaskResult.SUCCESS if i % 4 else TaskResult.FAILURE,
+                tokens_used=10,
+            )
+
+        stats = collector.get_task_stats(agent_id="agent-1")
+        usage = collector.get_memory_usage()["task"]
+
+        assert len(collector._task_metrics) == 50
+        assert usage["count"] == 50 and usage["capacity"] == 50
+        assert stats["count"] == 60
+        assert stats["min_duration_ms"] == 1.0
+        assert stats["total_tokens"] == 600
+        assert collector.get_collection_overhead()["total_collections"] == 120
+        collector.shutdown()
+
+    def test_time_range_uses_epoch_bounds(self):
+        """time_range bounds select by stored timestamps."""
+        collector = MetricsCollector(async_mode=False)
+        collector.record_task_metric("task-1", "agent-1", 100, TaskResult.SUCCESS)
+
+        now = datetime.now(timezone.utc)
+        recent = collector.get_task_stats(time_range=(now - timedelta(minutes=1), now + timedelta(minutes=1)))
+        future = collector.get_task_stats(time_range=(now + timedelta(hours=1), now + timedelta(hours=2)))
+
+        assert recent["count"] == 1
+        assert future["count"] == 0
+        assert format_timestamp(to_epoch_us(now)).startswith(now.isoformat()[:19])
+        collector.shutdown()
@@ -19,7 +19,7 @@ Test Areas:
 
 import pytest
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 from unittest.mock import Mock, MagicMock
 
@@ -130,8 +130,7 @@ class TestCollectorInitialization:
         )
 
         assert collector.async_mode is True
-        assert collector._queue is not None
-        assert collector._queue.maxsize == 50
+        assert collector._buffer_capacity == 50
         assert collector._worker_thread is not None
         assert collector._worker_thread.is_alive()
 
@@ -654,7 +653,7 @@ class TestTimeRangeFiltering:
 
     def test_filter_tasks_by_time_range(self, collector_sync):
         """Test filtering task stats by time range."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         
         # Record metric with timestamp manipulation (not exposed in API, testing internal)
         collector_sync.record_task_metric(
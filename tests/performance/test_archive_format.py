@@ -0,0 +1,148 @@
+"""
+Metrics Archive Format Benchmark (JSON rows vs columnar blocks)
+
+Encodes the same task and agent metric rows as 1000-row archive blocks:
+- json: the previous format - zlib(json.dumps([dict(row), ...]))
+- columnar: per-column zlib buffers (delta int64 ids/timestamps, float64
+  values, dictionary-encoded strings)
+
+and compares:
+- size: compressed bytes per row
+- rows: decoding whole blocks back into row dicts
+- scan: reading one numeric column (summing it) across all blocks
+
+Run directly for a larger run:
+    python tests/performance/test_archive_format.py
+"""
+
+import json
+import random
+import time
+import zlib
+from typing import Callable, Dict, List
+
+import pytest
+
+from moai_flow.monitoring.storage.metrics_persistence import (
+    decode_archive_block,
+    decode_archive_columns,
+    encode_archive_block,
+)
+
+BLOCK_ROWS = 1000
+
+
+def _task_rows(count: int, rng: random.Random) -> List[Dict]:
+    start = 1_735_732_800
+    return [
+        {
+            "id": i + 1,
+            "task_id": f"task-{i:07d}",
+            "agent_id": f"expert-{rng.choice(('backend', 'frontend', 'database', 'security'))}",
+            "timestamp": start + i * 3 + rng.randrange(3),
+            "duration_ms": int(rng.lognormvariate(7, 1.0)),
+            "tokens_used": rng.randrange(200, 5000),
+            "success": int(rng.random() < 0.9),
+            "metadata": None,
+        }
+        for i in range(count)
+    ]
+
+
+def _agent_rows(count: int, rng: random.Random) -> List[Dict]:
+    start = 1_735_732_800
+    return [
+        {
+            "id": i + 1,
+            "agent_id": f"agent-{i % 16}",
+            "timestamp": start + i * 5,
+            "metric_type": ("cpu", "memory", "queue_depth")[i % 3],
+            "value": rng.random() * 100,
+            "metadata": "{}",
+        }
+        for i in range(count)
+    ]
+
+
+def _json_block(rows: List[Dict]) -> bytes:
+    """The former archive block encoding"""
+    return zlib.compress(json.dumps(rows).encode("utf-8"), 6)
+
+
+def _timed(run: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) * 1000
+
+
+def _scan_json(blocks: List[bytes], column: str) -> float:
+    return sum(row[column] for block in blocks for row in decode_archive_block(block))
+
+
+def _scan_columnar(blocks: List[bytes], column: str) -> float:
+    return sum(
+        float(sum(decode_archive_columns(block, [column])[column])) for block in blocks
+    )
+
+
+def run_benchmark(rows: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """
+    Compare both formats on task and agent metric rows.
+
+    Returns:
+        {table: {"json_bytes_per_row", "columnar_bytes_per_row",
+                 "json_rows_ms", "columnar_rows_ms",
+                 "json_scan_ms", "columnar_scan_ms"}}
+    """
+    rng = random.Random(42)
+    results = {}
+    for table, data, column in (
+        ("task_metrics", _task_rows(rows, rng), "duration_ms"),
+        ("agent_metrics", _agent_rows(rows, rng), "value"),
+    ):
+        chunks = [data[i:i + BLOCK_ROWS] for i in range(0, len(data), BLOCK_ROWS)]
+        json_blocks = [_json_block(chunk) for chunk in chunks]
+        columnar_blocks = [encode_archive_block(chunk) for chunk in chunks]
+
+        assert _scan_columnar(columnar_blocks, column) == pytest.approx(
+            _scan_json(json_blocks, column), rel=1e-6
+        )
+        results[table] = {
+            "json_bytes_per_row": sum(map(len, json_blocks)) / rows,
+            "columnar_bytes_per_row": sum(map(len, columnar_blocks)) / rows,
+            "json_rows_ms": _timed(lambda: [decode_archive_block(b) for b in json_blocks]),
+            "columnar_rows_ms": _timed(
+                lambda: [decode_archive_block(b) for b in columnar_blocks]
+            ),
+            "json_scan_ms": _timed(lambda: _scan_json(json_blocks, column)),
+            "columnar_scan_ms": _timed(lambda: _scan_columnar(columnar_blocks, column)),
+        }
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, float]], rows: int) -> None:
+    print(f"\n=== Archive blocks of {BLOCK_ROWS} rows, {rows:,} rows per table ===")
+    for table, result in results.items():
+        print(
+            f"{table:<14} size {result['json_bytes_per_row']:6.1f} -> "
+            f"{result['columnar_bytes_per_row']:6.1f} B/row   "
+            f"rows {result['json_rows_ms']:7.1f} -> {result['columnar_rows_ms']:7.1f}ms   "
+            f"one-column scan {result['json_scan_ms']:7.1f} -> "
+            f"{result['columnar_scan_ms']:7.1f}ms"
+        )
+
+
+@pytest.mark.slow
+def test_columnar_blocks_are_smaller_and_scan_faster():
+    """Columnar blocks are smaller and single-column scans are cheaper."""
+    rows = 50_000
+    results = run_benchmark(rows)
+    _print_results(results, rows)
+
+    for result in results.values():
+        assert result["columnar_bytes_per_row"] < result["json_bytes_per_row"]
+        assert result["columnar_scan_ms"] < result["json_scan_ms"]
+
+
+if __name__ == "__main__":
+    _print_results(run_benchmark(), 100_000)
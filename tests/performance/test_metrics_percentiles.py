@@ -0,0 +1,127 @@
+"""
+MetricsQuery Percentile Benchmark (fetch-all vs exact vs approximate)
+
+Measures p95 of task durations over a large task_metrics table:
+- fetch_all: the previous path - every value fetched in order, then indexed
+- exact: COUNT, then one ROW_NUMBER() pass in SQLite fetching only the rank rows
+- approximate: summed flush-time histograms, independent of the row count
+
+Each path is timed on a fresh MetricsQuery with the result cache disabled.
+Python-side peak memory is taken with tracemalloc.
+
+Run directly for a larger run:
+    python tests/performance/test_metrics_percentiles.py
+"""
+
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pytest
+
+from moai_flow.monitoring.storage.metrics_persistence import (
+    MetricsPersistence,
+    RetentionPolicy,
+    WriteBufferConfig,
+)
+from moai_flow.monitoring.storage.metrics_query import MetricsQuery, PercentileMode
+
+
+def _populate(db_path: Path, count: int) -> None:
+    """Write count task metrics spread over the last day, in 10k-row flushes."""
+    rng = random.Random(42)
+    persistence = MetricsPersistence(
+        db_path=db_path,
+        retention_policy=RetentionPolicy(auto_cleanup=False),
+        write_buffer_config=WriteBufferConfig(
+            max_size=10_000, flush_interval_seconds=3600
+        ),
+    )
+    now = datetime.now()
+    for i in range(count):
+        persistence.write_task_metric(
+            task_id=f"task-{i}",
+            agent_id=f"agent-{i % 16}",
+            duration_ms=int(rng.lognormvariate(7, 1.0)),
+            tokens_used=500,
+            success=True,
+            timestamp=now - timedelta(seconds=rng.randrange(86_400)),
+        )
+    persistence.flush()
+    persistence.close()
+
+
+def _fetch_all_p95(query: MetricsQuery) -> float:
+    """The former calculate_percentile body"""
+    cursor = query._conn.execute(
+        "SELECT duration_ms FROM task_metrics WHERE 1=1 ORDER BY duration_ms"
+    )
+    values = [row[0] for row in cursor.fetchall() if row[0] is not None]
+    return values[min(int(len(values) * 0.95), len(values) - 1)]
+
+
+def _measure(db_path: Path, run: Callable[[MetricsQuery], float]) -> Tuple[float, float, int]:
+    """(p95, elapsed ms, Python peak bytes) for one uncached run"""
+    with MetricsQuery(db_path=db_path, cache_size=0) as query:
+        tracemalloc.start()
+        start = time.perf_counter()
+        value = run(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return value, elapsed_ms, peak
+
+
+def run_benchmark(count: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Time p95 over count task metrics on all three paths.
+
+    Returns:
+        {path: {"p95": ..., "ms": ..., "peak_kb": ...}}
+    """
+    paths = {
+        "fetch_all": _fetch_all_p95,
+        "exact": lambda q: q.calculate_percentile("task_metrics", "duration_ms", 0.95),
+        "approximate": lambda q: q.calculate_percentile(
+            "task_metrics", "duration_ms", 0.95, mode=PercentileMode.APPROXIMATE
+        ),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "metrics.db"
+        _populate(db_path, count)
+        for name, run in paths.items():
+            value, elapsed_ms, peak = _measure(db_path, run)
+            results[name] = {"p95": value, "ms": elapsed_ms, "peak_kb": peak / 1024}
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, float]], count: int) -> None:
+    print(f"\n=== p95 of task duration over {count:,} rows ===")
+    for name, result in results.items():
+        print(
+            f"{name:<12} p95 {result['p95']:10.1f}   {result['ms']:9.2f}ms   "
+            f"peak {result['peak_kb']:10.1f}KB"
+        )
+
+
+@pytest.mark.slow
+def test_percentile_paths():
+    """Exact avoids materializing values; approximate is fast and within 1%."""
+    count = 200_000
+    results = run_benchmark(count)
+    _print_results(results, count)
+
+    assert results["exact"]["p95"] == results["fetch_all"]["p95"]
+    assert results["approximate"]["p95"] == pytest.approx(results["exact"]["p95"], rel=0.011)
+    assert results["exact"]["peak_kb"] < results["fetch_all"]["peak_kb"] / 10
+    assert results["approximate"]["ms"] < results["exact"]["ms"]
+    assert results["approximate"]["ms"] < 50
+
+
+if __name__ == "__main__":
+    _print_results(run_benchmark(), 1_000_000)
@@ -0,0 +1,136 @@
+"""
+MetricsQuery Time-Series Benchmark (raw rows vs rollups)
+
+Measures a 90-day daily chart of average task duration:
+- raw: the previous path - strftime() over every row, grouped at query time
+- rollups: aggregate_by_time reading the daily rollups, with the partial
+  day at the start of the range from hourly rollups and raw rows
+
+Each path is timed on a fresh MetricsQuery with the result cache disabled.
+
+Run directly for a larger run:
+    python tests/performance/test_metrics_rollups.py
+"""
+
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from moai_flow.monitoring.storage.metrics_persistence import (
+    MetricsPersistence,
+    RetentionPolicy,
+    WriteBufferConfig,
+)
+from moai_flow.monitoring.storage.metrics_query import (
+    AggregationFunc,
+    MetricsQuery,
+    QueryFilter,
+    TimeInterval,
+)
+
+DAYS = 90
+
+
+def _populate(db_path: Path, count: int) -> None:
+    """Write count task metrics spread over DAYS days, in 10k-row flushes."""
+    rng = random.Random(42)
+    persistence = MetricsPersistence(
+        db_path=db_path,
+        retention_policy=RetentionPolicy(auto_cleanup=False),
+        write_buffer_config=WriteBufferConfig(
+            max_size=10_000, flush_interval_seconds=3600
+        ),
+    )
+    now = datetime.now()
+    for i in range(count):
+        persistence.write_task_metric(
+            task_id=f"task-{i}",
+            agent_id=f"agent-{i % 16}",
+            duration_ms=int(rng.lognormvariate(7, 1.0)),
+            tokens_used=500,
+            success=True,
+            timestamp=now - timedelta(seconds=rng.randrange(DAYS * 86_400)),
+        )
+    persistence.flush()
+    persistence.close()
+
+
+def _raw_series(query: MetricsQuery, start: datetime) -> list:
+    """The former aggregate_by_time body"""
+    cursor = query._conn.execute(
+        """
+        SELECT strftime('%Y-%m-%d', datetime(timestamp, 'unixepoch')) as time_bucket,
+               AVG(duration_ms) as value, COUNT(*) as count
+        FROM task_metrics WHERE 1=1 AND timestamp >= ?
+        GROUP BY time_bucket ORDER BY time_bucket
+        """,
+        (int(start.timestamp()),),
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def run_benchmark(count: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Time a DAYS-day daily average chart over count task metrics.
+
+    Returns:
+        {path: {"ms": ..., "buckets": ..., "rows": ...}}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "metrics.db"
+        _populate(db_path, count)
+        start = datetime.now() - timedelta(days=DAYS)
+        paths = {
+            "raw": lambda q: _raw_series(q, start),
+            "rollups": lambda q: q.aggregate_by_time(
+                "task_metrics",
+                "duration_ms",
+                TimeInterval.DAY,
+                AggregationFunc.AVG,
+                QueryFilter(start_time=start),
+            ),
+        }
+        for name, run in paths.items():
+            with MetricsQuery(db_path=db_path, cache_size=0) as query:
+                begin = time.perf_counter()
+                series = run(query)
+                elapsed_ms = (time.perf_counter() - begin) * 1000
+            results[name] = {
+                "ms": elapsed_ms,
+                "buckets": len(series),
+                "rows": sum(row["count"] for row in series),
+                "series": series,
+            }
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, float]], count: int) -> None:
+    print(f"\n=== {DAYS}-day daily average over {count:,} task rows ===")
+    for name, result in results.items():
+        print(
+            f"{name:<8} {result['ms']:9.2f}ms   {result['buckets']} buckets   "
+            f"{result['rows']:,} rows covered"
+        )
+
+
+@pytest.mark.slow
+def test_rollup_chart_matches_raw_and_is_faster():
+    """The rollup chart equals the raw one and is several times cheaper."""
+    count = 200_000
+    results = run_benchmark(count)
+    _print_results(results, count)
+
+    raw, rollups = results["raw"]["series"], results["rollups"]["series"]
+    assert [row["count"] for row in rollups] == [row["count"] for row in raw]
+    assert [row["value"] for row in rollups] == pytest.approx([row["value"] for row in raw])
+    assert results["rollups"]["ms"] * 5 < results["raw"]["ms"]
+
+
+if __name__ == "__main__":
+    _print_results(run_benchmark(), 1_000_000)
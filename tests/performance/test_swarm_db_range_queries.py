@@ -0,0 +1,215 @@
+"""
+SwarmDB Range Query Benchmark (schema v2 TEXT vs schema v3 epoch-ms)
+
+Compares the time-range query shapes used against agent_events on:
+- v2: ISO TEXT timestamps with single-column indexes
+- v3: epoch-millisecond timestamps with composite covering indexes
+
+Run directly for a larger dataset:
+    python tests/performance/test_swarm_db_range_queries.py
+"""
+
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+
+from moai_flow.memory.swarm_db import SwarmDB, _to_epoch_ms
+
+
+V2_EVENTS_SCHEMA = """
+CREATE TABLE agent_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT UNIQUE NOT NULL,
+    event_type TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    agent_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    metadata TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_agent_events_agent_id ON agent_events(agent_id);
+CREATE INDEX idx_agent_events_event_type ON agent_events(event_type);
+CREATE INDEX idx_agent_events_timestamp ON agent_events(timestamp);
+"""
+
+EVENT_TYPES = ("spawn", "complete", "error", "heartbeat")
+START = datetime(2025, 1, 1)
+
+
+def _events(count: int, agents: int):
+    """Events spread over ~30 days, one every ~26 seconds"""
+    step = timedelta(days=30) / count
+    for i in range(count):
+        moment = START + step * i
+        yield (
+            f"evt-{i}",
+            EVENT_TYPES[i % len(EVENT_TYPES)],
+            f"agent-{i % agents}",
+            "expert-backend",
+            moment.isoformat(),
+            '{"index": %d}' % i,
+            _to_epoch_ms(moment),
+        )
+
+
+def _build_v2(path: Path, count: int, agents: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(V2_EVENTS_SCHEMA)
+    conn.executemany(
+        """
+        INSERT INTO agent_events
+        (event_id, event_type, agent_id, agent_type, timestamp, metadata)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (row[:6] for row in _events(count, agents)),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def _build_v3(path: Path, count: int, agents: int) -> sqlite3.Connection:
+    db = SwarmDB(db_path=path)
+    conn = db._get_connection()
+    conn.executemany(
+        """
+        INSERT INTO agent_events
+        (event_id, event_type, agent_id, agent_type, timestamp, metadata, timestamp_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        _events(count, agents),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    db.close()
+    return sqlite3.connect(path)
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_benchmark(
+    tmp_dir: Path,
+    count: int = 100_000,
+    agents: int = 20,
+    repeat: int = 20
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time per-agent range aggregation and newest-N range scans on v2 and v3.
+
+    Returns:
+        {query_name: {"v2_ms": ..., "v3_ms": ..., "speedup": ...}}
+    """
+    v2 = _build_v2(tmp_dir / "v2.db", count, agents)
+    v3 = _build_v3(tmp_dir / "v3.db", count, agents)
+
+    since, until = START + timedelta(days=10), START + timedelta(days=17)
+    since_iso, until_iso = since.isoformat(), until.isoformat()
+    since_ms, until_ms = _to_epoch_ms(since), _to_epoch_ms(until)
+
+    queries = {
+        "agent_type_counts_7d": (
+            lambda: v2.execute(
+                """
+                SELECT event_type, COUNT(*) FROM agent_events
+                WHERE agent_id = ? AND timestamp BETWEEN ? AND ?
+                GROUP BY event_type
+                """,
+                ("agent-3", since_iso, until_iso),
+            ).fetchall(),
+            lambda: v3.execute(
+                """
+                SELECT event_type, COUNT(*) FROM agent_events
+                WHERE agent_id = ? AND timestamp_ms BETWEEN ? AND ?
+                GROUP BY event_type
+                """,
+                ("agent-3", since_ms, until_ms),
+            ).fetchall(),
+        ),
+        "agent_latest_100_in_range": (
+            lambda: v2.execute(
+                """
+                SELECT * FROM agent_events
+                WHERE agent_id = ? AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp DESC LIMIT 100
+                """,
+                ("agent-3", since_iso, until_iso),
+            ).fetchall(),
+            lambda: v3.execute(
+                """
+                SELECT * FROM agent_events
+                WHERE agent_id = ? AND timestamp_ms BETWEEN ? AND ?
+                ORDER BY timestamp_ms DESC, id DESC LIMIT 100
+                """,
+                ("agent-3", since_ms, until_ms),
+            ).fetchall(),
+        ),
+        "type_count_7d": (
+            lambda: v2.execute(
+                """
+                SELECT COUNT(*) FROM agent_events
+                WHERE event_type = ? AND timestamp BETWEEN ? AND ?
+                """,
+                ("error", since_iso, until_iso),
+            ).fetchall(),
+            lambda: v3.execute(
+                """
+                SELECT COUNT(*) FROM agent_events
+                WHERE event_type = ? AND timestamp_ms BETWEEN ? AND ?
+                """,
+                ("error", since_ms, until_ms),
+            ).fetchall(),
+        ),
+    }
+
+    results = {}
+    for name, (v2_query, v3_query) in queries.items():
+        v2_ms = _time_ms(v2_query, repeat)
+        v3_ms = _time_ms(v3_query, repeat)
+        results[name] = {
+            "v2_ms": v2_ms,
+            "v3_ms": v3_ms,
+            "speedup": v2_ms / v3_ms if v3_ms else float("inf"),
+        }
+
+    v2.close()
+    v3.close()
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print("\n=== SwarmDB Range Queries: schema v2 vs v3 ===")
+    for name, result in results.items():
+        print(
+            f"{name:<28} v2 {result['v2_ms']:8.2f}ms   "
+            f"v3 {result['v3_ms']:8.2f}ms   {result['speedup']:5.1f}x"
+        )
+
+
+@pytest.mark.slow
+def test_range_query_speedup(tmp_path: Path):
+    """Schema v3 range queries beat the v2 TEXT/single-index layout."""
+    results = run_benchmark(tmp_path, count=50_000, repeat=10)
+    _print_results(results)
+
+    assert results["agent_type_counts_7d"]["speedup"] > 1.5
+    assert results["type_count_7d"]["speedup"] > 1.5
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _print_results(run_benchmark(Path(tmp), count=500_000, agents=50))